@@ -5,23 +5,68 @@ Auto Preview - Antigravity Kit
 Manages (start/stop/status) the local development server for previewing the application.
 
 Usage:
-    python .agent/scripts/auto_preview.py start [port]
+    python .agent/scripts/auto_preview.py start [port] [--warmup /,/login] [--timeout 120]
+    python .agent/scripts/auto_preview.py start [port] --prod [--rebuild]
     python .agent/scripts/auto_preview.py stop
     python .agent/scripts/auto_preview.py status
+
+`start` waits until the server answers HTTP before reporting it ready, then
+requests the warm-up routes (from --warmup or "warmup" in
+.agent/preview.config.json) so they are compiled before any measurement.
+Time-to-ready and warm-up timings are written to .agent/preview.json.
+
+--prod serves a production build (`next build` + `next start`) so performance
+checks measure what ships. The build is reused while a content hash of the
+build inputs is unchanged; build time and per-route output sizes from the
+Next.js build manifests are kept in .agent/preview-build.json.
 """
 
 import os
 import sys
 import time
 import json
+import hashlib
+import socket
 import signal
 import argparse
 import subprocess
+import urllib.request
+import urllib.error
+from datetime import datetime
 from pathlib import Path
 
+# Route -> chunk attribution lives with the bundle tooling (performance-profiling skill)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "..", "skills", "performance-profiling", "scripts"))
+try:
+    from bundle_analyzer import load_routes
+    BUNDLE_ANALYZER_AVAILABLE = True
+except ImportError:
+    BUNDLE_ANALYZER_AVAILABLE = False
+
 AGENT_DIR = Path(".agent")
 PID_FILE = AGENT_DIR / "preview.pid"
 LOG_FILE = AGENT_DIR / "preview.log"
+STATE_FILE = AGENT_DIR / "preview.json"
+CONFIG_FILE = AGENT_DIR / "preview.config.json"
+
+READY_TIMEOUT = 120
+PROBE_INITIAL_DELAY = 0.25
+PROBE_MAX_DELAY = 2.0
+# First request to a dev-server route compiles it, which can take a while
+WARMUP_TIMEOUT = 120
+
+BUILD_STATE_FILE = AGENT_DIR / "preview-build.json"
+BUILD_LOG_FILE = AGENT_DIR / "preview-build.log"
+BUILD_TIMEOUT = 1800
+
+# Everything `next build` reads (env files are inlined at build time)
+BUILD_INPUT_DIRS = ["src", "public", "app", "pages", "lib", "components"]
+BUILD_INPUT_GLOBS = ["package.json", "package-lock.json", "next.config.*", "tsconfig.json",
+                     "tailwind.config.*", "postcss.config.*", "sentry.*.config.*", ".env", ".env.*"]
+# Files the build itself writes into public/ (service worker output)
+BUILD_OUTPUT_PREFIXES = ("sw.js", "workbox-", "swe-worker-", "fallback-")
+SKIP_DIRS = {"node_modules", ".next", ".git", "__pycache__"}
 
 def get_project_root():
     return Path(".").resolve()
@@ -48,7 +93,211 @@ def get_start_command(root):
         return ["npm", "start"]
     return None
 
-def start_server(port=3000):
+def get_prod_commands(root):
+    """(build, start) commands for a production preview, or None."""
+    pkg_file = root / "package.json"
+    if not pkg_file.exists():
+        return None
+    
+    with open(pkg_file, 'r') as f:
+        scripts = json.load(f).get("scripts", {})
+    
+    build = ["npm", "run", "build"] if "build" in scripts else ["npx", "next", "build"]
+    start = ["npm", "start"] if "start" in scripts else ["npx", "next", "start"]
+    return build, start
+
+def iter_build_inputs(root):
+    for pattern in BUILD_INPUT_GLOBS:
+        for path in root.glob(pattern):
+            if path.is_file():
+                yield path
+    for name in BUILD_INPUT_DIRS:
+        base = root / name
+        for dirpath, dirs, files in os.walk(base):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            for filename in files:
+                if base.name == "public" and Path(dirpath) == base and filename.startswith(BUILD_OUTPUT_PREFIXES):
+                    continue
+                yield Path(dirpath) / filename
+
+def source_hash(root, file_cache):
+    """
+    Content hash of the build inputs. Per-file digests are reused from
+    file_cache while (size, mtime) is unchanged, so only edited files are read.
+    """
+    digest = hashlib.sha256()
+    new_cache = {}
+    for path in sorted(set(iter_build_inputs(root))):
+        rel = path.relative_to(root).as_posix()
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        key = [st.st_size, st.st_mtime_ns]
+        cached = file_cache.get(rel)
+        if cached and cached[0] == key:
+            file_digest = cached[1]
+        else:
+            h = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+            file_digest = h.hexdigest()
+        new_cache[rel] = [key, file_digest]
+        digest.update(f"{rel}\0{file_digest}\n".encode())
+    return digest.hexdigest(), new_cache
+
+def read_json(path):
+    try:
+        return json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return {}
+
+def route_sizes(root):
+    """
+    Per-route JS output size (own chunks and first load). Routes come from
+    bundle_analyzer.load_routes, which falls back to the client reference
+    manifests when the build has no app-build-manifest.json.
+    """
+    if not BUNDLE_ANALYZER_AVAILABLE:
+        return {}
+    next_dir = root / ".next"
+    routes, shared = load_routes(next_dir)
+    shared = set(shared)
+
+    sizes = {}
+    def size_of(files):
+        total = 0
+        for rel in files:
+            try:
+                total += (next_dir / rel).stat().st_size
+            except OSError:
+                pass
+        return total
+
+    output = {}
+    for route, js in routes.items():
+        own = [f for f in js if f not in shared]
+        output[route] = {"own_bytes": size_of(own), "first_load_bytes": size_of(set(js) | shared)}
+    sizes["shared_bytes"] = size_of(shared)
+    sizes["routes"] = dict(sorted(output.items(), key=lambda item: -item[1]["first_load_bytes"]))
+    return sizes
+
+def ensure_build(root, build_cmd, rebuild=False):
+    """Run the production build unless the last one matches the current sources."""
+    state = read_json(BUILD_STATE_FILE)
+    print("🔎 Hashing build inputs...")
+    current_hash, file_cache = source_hash(root, state.get("files", {}))
+    
+    if not rebuild and state.get("hash") == current_hash and (root / ".next" / "BUILD_ID").exists():
+        print(f"♻️  Reusing build from {state.get('built_at')} (sources unchanged)")
+        state["reused"] = True
+        return state
+    
+    print(f"🏗️  Building ({' '.join(build_cmd)})... logs: {BUILD_LOG_FILE}")
+    started = time.monotonic()
+    with open(BUILD_LOG_FILE, "w") as log:
+        result = subprocess.run(" ".join(build_cmd) if sys.platform == 'win32' else build_cmd,
+                                cwd=str(root), stdout=log, stderr=log,
+                                shell=sys.platform == 'win32', timeout=BUILD_TIMEOUT)
+    build_seconds = round(time.monotonic() - started, 1)
+    if result.returncode != 0:
+        print(f"❌ Build failed after {build_seconds}s. Last log lines:")
+        print(tail_log(BUILD_LOG_FILE))
+        sys.exit(1)
+    
+    state = {
+        "hash": current_hash,
+        "built_at": datetime.now().isoformat(),
+        "build_seconds": build_seconds,
+        "build_id": (root / ".next" / "BUILD_ID").read_text().strip() if (root / ".next" / "BUILD_ID").exists() else None,
+        "output": route_sizes(root),
+        "files": file_cache
+    }
+    BUILD_STATE_FILE.write_text(json.dumps(state, indent=2))
+    print(f"✅ Built in {build_seconds}s")
+    state["reused"] = False
+    return state
+
+def print_route_sizes(output, limit=10):
+    routes = output.get("routes", {})
+    if not routes:
+        return
+    print(f"📦 First-load JS (shared {output.get('shared_bytes', 0) / 1024:.0f} KB), largest routes:")
+    for route, size in list(routes.items())[:limit]:
+        print(f"   {size['first_load_bytes'] / 1024:8.0f} KB  {route}")
+
+def read_state():
+    try:
+        return json.loads(STATE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+def write_state(state):
+    AGENT_DIR.mkdir(exist_ok=True)
+    STATE_FILE.write_text(json.dumps(state, indent=2))
+
+def load_warmup_routes():
+    try:
+        return json.loads(CONFIG_FILE.read_text()).get("warmup", [])
+    except (OSError, ValueError):
+        return []
+
+def port_open(port):
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=1):
+            return True
+    except OSError:
+        return False
+
+def http_status(url, timeout=10):
+    """HTTP status for url (error statuses included), or None if unreachable."""
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except (urllib.error.URLError, OSError):
+        return None
+
+def wait_until_ready(process, url, port, timeout=READY_TIMEOUT):
+    """
+    Poll the port, then HTTP, with exponential backoff until the server
+    answers below 500. Returns seconds to ready, or None on timeout/exit.
+    """
+    start = time.monotonic()
+    delay = PROBE_INITIAL_DELAY
+    while time.monotonic() - start < timeout:
+        if process.poll() is not None:
+            return None
+        if port_open(port):
+            status = http_status(url, timeout=max(1, timeout - (time.monotonic() - start)))
+            if status is not None and status < 500:
+                return round(time.monotonic() - start, 2)
+        time.sleep(delay)
+        delay = min(delay * 2, PROBE_MAX_DELAY)
+    return None
+
+def warm_up(base_url, routes):
+    """Request each route once so the dev server compiles it ahead of measurements."""
+    results = []
+    for route in routes:
+        route = '/' + route.lstrip('/')  # "dashboard" -> "/dashboard"
+        started = time.monotonic()
+        status = http_status(base_url + route, timeout=WARMUP_TIMEOUT)
+        elapsed = round(time.monotonic() - started, 2)
+        results.append({"route": route, "status": status, "seconds": elapsed})
+        marker = "✅" if status is not None and status < 400 else "⚠️ "
+        print(f"   {marker} {route} -> {status} ({elapsed}s)")
+    return results
+
+def tail_log(path=LOG_FILE, lines=20):
+    try:
+        return "\n".join(Path(path).read_text(errors="replace").splitlines()[-lines:])
+    except OSError:
+        return ""
+
+def start_server(port=3000, warmup=None, timeout=READY_TIMEOUT, wait=True, prod=False, rebuild=False):
     if PID_FILE.exists():
         try:
             pid = int(PID_FILE.read_text().strip())
@@ -59,7 +308,17 @@ def start_server(port=3000):
             pass # Invalid PID file
 
     root = get_project_root()
-    cmd = get_start_command(root)
+    AGENT_DIR.mkdir(exist_ok=True)
+    build = None
+    if prod:
+        commands = get_prod_commands(root)
+        if not commands:
+            print("❌ No package.json found")
+            sys.exit(1)
+        build = ensure_build(root, commands[0], rebuild)
+        cmd = commands[1]
+    else:
+        cmd = get_start_command(root)
     
     if not cmd:
         print("❌ No 'dev' or 'start' script found in package.json")
@@ -71,20 +330,53 @@ def start_server(port=3000):
     
     print(f"🚀 Starting preview on port {port}...")
     
+    url = f"http://localhost:{port}"
+    started_at = datetime.now().isoformat()
+    
     with open(LOG_FILE, "w") as log:
-        process = subprocess.Popen(
-            cmd,
-            cwd=str(root),
-            stdout=log,
-            stderr=log,
-            env=env,
-            shell=True # Required for npm on windows often, or consistent path handling
-        )
+        if sys.platform == 'win32':
+            # Required for npm on windows (npm.cmd)
+            process = subprocess.Popen(" ".join(cmd), cwd=str(root), stdout=log, stderr=log, env=env, shell=True)
+        else:
+            # Own process group so stop_server also ends the node child
+            process = subprocess.Popen(cmd, cwd=str(root), stdout=log, stderr=log, env=env, start_new_session=True)
     
     PID_FILE.write_text(str(process.pid))
+    state = {"pid": process.pid, "port": port, "url": url, "command": " ".join(cmd),
+             "mode": "prod" if prod else "dev", "started_at": started_at, "ready": False}
+    if build:
+        state["build"] = {k: build.get(k) for k in ("hash", "build_id", "built_at", "build_seconds", "reused")}
+        print_route_sizes(build.get("output", {}))
+    write_state(state)
     print(f"✅ Preview started! (PID: {process.pid})")
     print(f"   Logs: {LOG_FILE}")
-    print(f"   URL: http://localhost:{port}")
+    
+    if not wait:
+        print(f"   URL: {url} (not waiting for readiness)")
+        return
+    
+    print(f"⏳ Waiting for {url} ...")
+    time_to_ready = wait_until_ready(process, url, port, timeout)
+    if time_to_ready is None:
+        reason = "exited" if process.poll() is not None else f"not ready after {timeout}s"
+        state["error"] = f"Server {reason}"
+        write_state(state)
+        print(f"❌ Preview {reason}. Last log lines:")
+        print(tail_log())
+        sys.exit(1)
+    
+    state.update({"ready": True, "time_to_ready_s": time_to_ready})
+    print(f"✅ Ready in {time_to_ready}s: {url}")
+    
+    routes = warmup if warmup is not None else load_warmup_routes()
+    if routes:
+        print(f"🔥 Warming up {len(routes)} route(s)...")
+        warm_start = time.monotonic()
+        state["warmup"] = warm_up(url, routes)
+        state["warmup_s"] = round(time.monotonic() - warm_start, 2)
+        state["time_to_warm_s"] = round(time_to_ready + state["warmup_s"], 2)
+    
+    write_state(state)
 
 def stop_server():
     if not PID_FILE.exists():
@@ -95,7 +387,13 @@ def stop_server():
         pid = int(PID_FILE.read_text().strip())
         if is_running(pid):
             # Try gentle kill first
-            os.kill(pid, signal.SIGTERM) if sys.platform != 'win32' else subprocess.call(['taskkill', '/F', '/T', '/PID', str(pid)])
+            if sys.platform == 'win32':
+                subprocess.call(['taskkill', '/F', '/T', '/PID', str(pid)])
+            else:
+                try:
+                    os.killpg(pid, signal.SIGTERM)
+                except OSError:
+                    os.kill(pid, signal.SIGTERM)
             print(f"🛑 Preview stopped (PID: {pid})")
         else:
             print("ℹ️  Process was not running.")
@@ -104,19 +402,21 @@ def stop_server():
     finally:
         if PID_FILE.exists():
             PID_FILE.unlink()
+        if STATE_FILE.exists():
+            STATE_FILE.unlink()
 
 def status_server():
     running = False
     pid = None
     url = "Unknown"
+    state = read_state()
     
     if PID_FILE.exists():
         try:
             pid = int(PID_FILE.read_text().strip())
             if is_running(pid):
                 running = True
-                # Heuristic for URL, strictly we should save it
-                url = "http://localhost:3000" 
+                url = state.get("url", "http://localhost:3000")
         except:
             pass
             
@@ -124,7 +424,16 @@ def status_server():
     if running:
         print(f"✅ Status: Running")
         print(f"🔢 PID: {pid}")
-        print(f"🌐 URL: {url} (Likely)")
+        print(f"🌐 URL: {url}")
+        print(f"🏷️  Mode: {state.get('mode', 'dev')}")
+        if state.get("build"):
+            build = state["build"]
+            how = "reused" if build.get("reused") else f"built in {build.get('build_seconds')}s"
+            print(f"🏗️  Build: {build.get('build_id')} ({how})")
+        if state.get("time_to_ready_s") is not None:
+            print(f"⏱️  Ready in: {state['time_to_ready_s']}s")
+        if state.get("warmup"):
+            print(f"🔥 Warmed: {len(state['warmup'])} route(s) in {state.get('warmup_s')}s")
         print(f"📝 Logs: {LOG_FILE}")
     else:
         print("⚪ Status: Stopped")
@@ -134,11 +443,18 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("action", choices=["start", "stop", "status"])
     parser.add_argument("port", nargs="?", default="3000")
+    parser.add_argument("--warmup", help="Comma-separated routes to request once ready (e.g. /,/login)")
+    parser.add_argument("--timeout", type=int, default=READY_TIMEOUT, help="Seconds to wait for readiness")
+    parser.add_argument("--no-wait", action="store_true", help="Return immediately after spawning")
+    parser.add_argument("--prod", action="store_true", help="Serve a production build (next build + next start)")
+    parser.add_argument("--rebuild", action="store_true", help="With --prod, build even if sources are unchanged")
     
     args = parser.parse_args()
     
     if args.action == "start":
-        start_server(int(args.port))
+        warmup = [r.strip() for r in args.warmup.split(",") if r.strip()] if args.warmup else None
+        start_server(int(args.port), warmup=warmup, timeout=args.timeout, wait=not args.no_wait,
+                     prod=args.prod, rebuild=args.rebuild)
     elif args.action == "stop":
         stop_server()
     elif args.action == "status":
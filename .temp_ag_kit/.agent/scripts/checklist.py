@@ -9,15 +9,16 @@ Use this for incremental validation during development.
 Usage:
     python scripts/checklist.py .                    # Run core checks
     python scripts/checklist.py . --url <URL>        # Include performance checks
+    python scripts/checklist.py . --full             # Run the full test suite
 
 Priority Order:
     P0: Security Scan (vulnerabilities, secrets)
     P1: Lint & Type Check (code quality)
     P2: Schema Validation (if database exists)
-    P3: Test Runner (unit/integration tests)
-    P4: UX Audit (psychology laws, accessibility)
+    P3: Test Runner (tests impacted by the git diff, or all with --full)
+    P4: UX Audit (psychology laws, accessibility, React performance patterns)
     P5: SEO Check (meta tags, structure)
-    P6: Performance (lighthouse - requires URL)
+    P6: Performance (lighthouse, playwright, budgets and baseline - requires URL)
 """
 
 import sys
@@ -61,19 +62,30 @@ CORE_CHECKS = [
     ("Schema Validation", ".agent/skills/database-design/scripts/schema_validator.py", False),
     ("Test Runner", ".agent/skills/testing-patterns/scripts/test_runner.py", False),
     ("UX Audit", ".agent/skills/frontend-design/scripts/ux_audit.py", False),
+    ("React Performance", ".agent/skills/react-patterns/scripts/react_perf_audit.py", False),
     ("SEO Check", ".agent/skills/seo-fundamentals/scripts/seo_checker.py", False),
 ]
 
+# Reported but not gated until the existing findings are addressed
+# (react_perf_audit: barrel imports from @/components/admin)
+ADVISORY_ARGS = {
+    "react_perf_audit.py": ["--fail-on", "none"],
+}
+
 PERFORMANCE_CHECKS = [
     ("Lighthouse Audit", ".agent/skills/performance-profiling/scripts/lighthouse_audit.py", True),
     ("Playwright E2E", ".agent/skills/webapp-testing/scripts/playwright_runner.py", False),
+    ("API Load Test", ".agent/skills/api-patterns/scripts/api_load_test.py", False),
+    # Runs last: compares the metrics the two checks above just recorded
+    ("Performance Baseline", ".agent/skills/performance-profiling/scripts/perf_baseline.py", False),
 ]
 
 def check_script_exists(script_path: Path) -> bool:
     """Check if script file exists"""
     return script_path.exists() and script_path.is_file()
 
-def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None) -> dict:
+def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None,
+               extra_args: Optional[List[str]] = None) -> dict:
     """
     Run a validation script and capture results
     
@@ -88,8 +100,10 @@ def run_script(name: str, script_path: Path, project_path: str, url: Optional[st
     
     # Build command
     cmd = ["python", str(script_path), project_path]
-    if url and ("lighthouse" in script_path.name.lower() or "playwright" in script_path.name.lower()):
+    if url and any(k in script_path.name.lower() for k in ("lighthouse", "playwright", "load_test")):
         cmd.append(url)
+    if extra_args:
+        cmd.extend(extra_args)
     
     # Run script
     try:
@@ -172,6 +186,7 @@ Examples:
     parser.add_argument("project", help="Project path to validate")
     parser.add_argument("--url", help="URL for performance checks (lighthouse, playwright)")
     parser.add_argument("--skip-performance", action="store_true", help="Skip performance checks even if URL provided")
+    parser.add_argument("--full", action="store_true", help="Run the full test suite instead of only impacted tests")
     
     args = parser.parse_args()
     
@@ -191,7 +206,10 @@ Examples:
     print_header("📋 CORE CHECKS")
     for name, script_path, required in CORE_CHECKS:
         script = project_path / script_path
-        result = run_script(name, script, str(project_path))
+        extra_args = list(ADVISORY_ARGS.get(script.name, []))
+        if args.full and script.name == "test_runner.py":
+            extra_args.append("--full")
+        result = run_script(name, script, str(project_path), extra_args=extra_args)
         results.append(result)
         
         # If required check fails, stop
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Result Cache - Antigravity Kit
+==============================
+Per-file result cache and process-pool fan-out shared by the skill checkers
+(seo_checker, geo_checker, accessibility_checker, api_validator,
+i18n_checker, mobile_audit, react_perf_audit). Not run directly.
+
+Each checker keeps its results in <project>/.agent_cache/<script>.json:
+
+    {"version": <checker's version>, "files": {<relative path>: {"key": ..., "result": ...}}}
+
+The version belongs to the checker; a different version discards the whole
+cache, so checkers bump it whenever their rules change. An entry is reused
+while its key matches: [size, mtime_ns] (stat_key) when reading the file is
+the expensive part, or a sha1 of the content (content_key/file_key) when
+results must survive touches and checkouts. Entries for files not seen in a
+run are dropped on save.
+
+Skill scripts import it with:
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                    "..", "..", "..", "scripts"))
+    from result_cache import ResultCache, cached_map
+"""
+
+import json
+import hashlib
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+# Below this many files a process pool costs more than it saves
+PARALLEL_THRESHOLD = 32
+CHUNK_SIZE = 1 << 16
+
+
+def stat_key(path) -> list:
+    st = Path(path).stat()
+    return [st.st_size, st.st_mtime_ns]
+
+
+def content_key(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def file_key(path) -> str:
+    """sha1 of a file, read in chunks."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Results of one checker, keyed by project-relative path."""
+
+    def __init__(self, project_path, cache_file: str, version, enabled: bool = True):
+        self.path = Path(project_path) / cache_file
+        self.version = version
+        self.enabled = enabled
+        self.previous = {}
+        self.current = {}
+        if enabled:
+            try:
+                data = json.loads(self.path.read_text(encoding='utf-8'))
+                if data.get("version") == version:
+                    self.previous = data.get("files", {})
+            except (OSError, ValueError):
+                pass
+
+    def get(self, rel: str, key):
+        """Cached result for rel if its key still matches (kept for the next save), else None."""
+        entry = self.previous.get(rel)
+        if entry and entry.get("key") == key and "result" in entry:
+            self.current[rel] = entry
+            return entry["result"]
+        return None
+
+    def entry(self, rel: str) -> dict:
+        """The previous run's raw entry for rel (for checkers with extra reuse rules)."""
+        return self.previous.get(rel)
+
+    def put(self, rel: str, key, result, **extra):
+        self.current[rel] = {"key": key, "result": result, **extra}
+
+    def save(self):
+        if not self.enabled:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps({"version": self.version, "files": self.current}), encoding='utf-8')
+        except OSError:
+            pass
+
+
+def run_tasks(func, *iterables, workers: int = None) -> list:
+    """func over the zipped iterables, in a process pool from PARALLEL_THRESHOLD items (workers=1: serial)."""
+    items = list(zip(*iterables))
+    if len(items) >= PARALLEL_THRESHOLD and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(func, *zip(*items), chunksize=8))
+    return [func(*item) for item in items]
+
+
+def cached_map(project_path, files: list, func, cache_file: str, version,
+               workers: int = None, use_cache: bool = True, args: tuple = ()) -> list:
+    """
+    func(file, *args) for every file, in file order, re-running it only for files whose
+    size/mtime changed since the cached result. func must be a module-level function.
+    """
+    project_path = Path(project_path)
+    cache = ResultCache(project_path, cache_file, version, use_cache)
+    results = {}
+    pending = []
+    for f in files:
+        rel = f.relative_to(project_path).as_posix()
+        key = stat_key(f)
+        result = cache.get(rel, key)
+        if result is None:
+            pending.append((rel, f, key))
+        else:
+            results[rel] = result
+
+    checked = run_tasks(func, [f for _, f, _ in pending], *([a] * len(pending) for a in args), workers=workers)
+    for (rel, _, key), result in zip(pending, checked):
+        results[rel] = result
+        cache.put(rel, key, result)
+    cache.save()
+
+    return [results[f.relative_to(project_path).as_posix()] for f in files]
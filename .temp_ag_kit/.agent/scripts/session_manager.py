@@ -6,19 +6,73 @@ Analyzes project state, detects tech stack, tracks file statistics, and provides
 a summary of the current session.
 
 Usage:
-    python .agent/scripts/session_manager.py status [path]
+    python .agent/scripts/session_manager.py status [path] [--refresh]
     python .agent/scripts/session_manager.py info [path]
+
+The project fingerprint (stack, feature dirs, file counts) is cached in
+.agent_cache/session_state.json and only recomputed for the parts whose
+inputs changed: package.json mtime, feature directory mtimes, and the git
+index/HEAD (or directory mtimes outside git).
 """
 
 import os
 import json
 import argparse
+import subprocess
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+
+STATE_FILE = ".agent_cache/session_state.json"
+STATE_VERSION = 1
+
+FEATURE_DIRS = ["components", "modules", "features", "app", "pages", "services"]
+EXCLUDE_DIRS = {".git", "node_modules", ".next", "dist", "build", ".agent", ".gemini", "__pycache__", ".agent_cache"}
 
 def get_project_root(path: str) -> Path:
     return Path(path).resolve()
 
+# ============================================================================
+# STATE CACHE
+# ============================================================================
+
+def load_state(root: Path) -> Dict[str, Any]:
+    try:
+        with open(root / STATE_FILE, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        return state if state.get("version") == STATE_VERSION else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_state(root: Path, state: Dict[str, Any]):
+    path = root / STATE_FILE
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # Read-only checkout: status still works, just uncached
+
+def stat_key(path: Path) -> Optional[List[float]]:
+    """(mtime, size) of a path, or None if it does not exist."""
+    try:
+        st = path.stat()
+        return [st.st_mtime, st.st_size]
+    except OSError:
+        return None
+
+def git(root: Path, *args: str) -> Optional[str]:
+    try:
+        result = subprocess.run(["git", *args], cwd=root, capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+def git_dir(root: Path) -> Optional[Path]:
+    out = git(root, "rev-parse", "--absolute-git-dir")
+    return Path(out.strip()) if out else None
+
 def analyze_package_json(root: Path) -> Dict[str, Any]:
     pkg_file = root / "package.json"
     if not pkg_file.exists():
@@ -53,36 +107,152 @@ def analyze_package_json(root: Path) -> Dict[str, Any]:
     except Exception as e:
         return {"error": str(e)}
 
-def count_files(root: Path) -> Dict[str, int]:
-    stats = {"created": 0, "modified": 0, "total": 0}
-    # Simple count for now, comprehensive tracking would require git diff or extensive history
-    exclude = {".git", "node_modules", ".next", "dist", "build", ".agent", ".gemini", "__pycache__"}
-    
-    for root_dir, dirs, files in os.walk(root):
-        dirs[:] = [d for d in dirs if d not in exclude]
-        stats["total"] += len(files)
-        
-    return stats
+def cached_package_info(root: Path, state: Dict[str, Any]) -> Dict[str, Any]:
+    """analyze_package_json, re-read only when package.json changed."""
+    key = stat_key(root / "package.json")
+    cached = state.get("package")
+    if cached and cached.get("key") == key:
+        return cached["info"]
+    info = analyze_package_json(root)
+    state["package"] = {"key": key, "info": info}
+    return info
+
+def count_files_git(root: Path, state: Dict[str, Any]) -> Optional[Dict[str, int]]:
+    """
+    File counts from git: tracked total from `git ls-files` (cached until the
+    index or HEAD changes) plus created/modified from `git status --porcelain`.
+    """
+    gdir = git_dir(root)
+    if gdir is None:
+        return None
+
+    # Commits, checkouts and `git add` all rewrite the index
+    key = [stat_key(gdir / "index"), stat_key(gdir / "HEAD")]
+    cached = state.get("git_files")
+    if cached and cached.get("key") == key:
+        tracked = cached["tracked"]
+    else:
+        listing = git(root, "ls-files", "-z")
+        if listing is None:
+            return None
+        tracked = listing.count("\0")
+        state["git_files"] = {"key": key, "tracked": tracked}
+
+    porcelain = git(root, "status", "--porcelain", "-z", "--untracked-files=all")
+    if porcelain is None:
+        return None
+    created = modified = deleted = 0
+    entries = porcelain.split("\0")
+    i = 0
+    while i < len(entries):
+        entry = entries[i]
+        i += 1
+        if len(entry) < 3:
+            continue
+        code = entry[:2]
+        if code[0] in "RC":
+            i += 1  # Rename/copy: the next entry is the original path
+        if code == "??" or "A" in code:
+            created += 1
+        elif "D" in code:
+            deleted += 1
+        else:
+            modified += 1
+
+    untracked = sum(1 for e in entries if e.startswith("?? "))
+    return {
+        "created": created,
+        "modified": modified,
+        "deleted": deleted,
+        "total": tracked + untracked,
+        "source": "git"
+    }
+
+def count_files_walk(root: Path, state: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Non-git fallback. Each directory's file count and subdirectories are cached
+    with its mtime (which changes when entries are added or removed), so only
+    changed directories are listed again.
+    """
+    cached = state.get("dirs", {})
+    dirs_state = {}
+    total = 0
+    changed = 0
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        rel = str(directory.relative_to(root))
+        try:
+            mtime = directory.stat().st_mtime
+        except OSError:
+            continue
+        entry = cached.get(rel)
+        if not entry or entry["mtime"] != mtime:
+            files, subdirs = 0, []
+            try:
+                with os.scandir(directory) as it:
+                    for item in it:
+                        if item.is_dir(follow_symlinks=False):
+                            if item.name not in EXCLUDE_DIRS:
+                                subdirs.append(item.name)
+                        else:
+                            files += 1
+            except OSError:
+                continue
+            entry = {"mtime": mtime, "files": files, "subdirs": subdirs}
+            changed += 1
+        dirs_state[rel] = entry
+        total += entry["files"]
+        pending.extend(directory / d for d in entry["subdirs"])
 
-def detect_features(root: Path) -> List[str]:
+    state["dirs"] = dirs_state
+    # Without history only the number of re-listed directories is known
+    return {"created": 0, "modified": 0, "deleted": 0, "total": total,
+            "changed_dirs": changed, "source": "walk"}
+
+def count_files(root: Path, state: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+    state = state if state is not None else {}
+    return count_files_git(root, state) or count_files_walk(root, state)
+
+def detect_features(root: Path, state: Optional[Dict[str, Any]] = None) -> List[str]:
     # Heuristic: look at folder names in src/
-    features = []
     src = root / "src"
+    key = [stat_key(src / d) for d in FEATURE_DIRS]
+    cached = (state or {}).get("features")
+    if cached and cached.get("key") == key:
+        return cached["names"]
+
+    features = []
     if src.exists():
-        possible_dirs = ["components", "modules", "features", "app", "pages", "services"]
-        for d in possible_dirs:
+        for d in FEATURE_DIRS:
             p = src / d
             if p.exists() and p.is_dir():
                 # List subdirectories as likely features
                 for child in p.iterdir():
                     if child.is_dir():
                         features.append(child.name)
-    return features[:10] # Limit to top 10
+    features = features[:10] # Limit to top 10
+    if state is not None:
+        state["features"] = {"key": key, "names": features}
+    return features
 
-def print_status(root: Path):
-    info = analyze_package_json(root)
-    stats = count_files(root)
-    features = detect_features(root)
+def project_fingerprint(root: Path, refresh: bool = False) -> Dict[str, Any]:
+    """Stack, features and file counts, reusing the cached state where inputs are unchanged."""
+    state = {} if refresh else load_state(root)
+    state["version"] = STATE_VERSION
+    fingerprint = {
+        "info": cached_package_info(root, state),
+        "features": detect_features(root, state),
+        "stats": count_files(root, state)
+    }
+    save_state(root, state)
+    return fingerprint
+
+def print_status(root: Path, refresh: bool = False):
+    fingerprint = project_fingerprint(root, refresh)
+    info = fingerprint["info"]
+    stats = fingerprint["stats"]
+    features = fingerprint["features"]
     
     print("\n=== Project Status ===")
     print(f"\n📁 Project: {info.get('name', root.name)}")
@@ -101,20 +271,27 @@ def print_status(root: Path):
         print("   (No distinct feature modules detected)")
         
     print(f"\n📄 Files: {stats['total']} total files tracked")
+    if stats["source"] == "git":
+        print(f"   {stats['created']} created, {stats['modified']} modified, {stats['deleted']} deleted (git status)")
     print("\n====================\n")
 
 def main():
     parser = argparse.ArgumentParser(description="Session Manager")
     parser.add_argument("command", choices=["status", "info"], help="Command to run")
     parser.add_argument("path", nargs="?", default=".", help="Project path")
+    parser.add_argument("--refresh", action="store_true", help="Ignore the cached fingerprint")
     
     args = parser.parse_args()
     root = get_project_root(args.path)
     
     if args.command == "status":
-        print_status(root)
+        print_status(root, args.refresh)
     elif args.command == "info":
-        print(json.dumps(analyze_package_json(root), indent=2))
+        state = {} if args.refresh else load_state(root)
+        state["version"] = STATE_VERSION
+        info = cached_package_info(root, state)
+        save_state(root, state)
+        print(json.dumps(info, indent=2))
 
 if __name__ == "__main__":
     main()
@@ -15,9 +15,11 @@ Includes ALL checks:
     ✅ Schema Validation
     ✅ Test Suite (unit + integration)
     ✅ UX Audit (psychology, accessibility)
+    ✅ React Performance Patterns
     ✅ SEO Check
     ✅ Lighthouse (Core Web Vitals)
     ✅ Playwright E2E
+    ✅ Performance budgets & baseline regressions
     ✅ Bundle Analysis (if applicable)
     ✅ Mobile Audit (if applicable)
 """
@@ -99,6 +101,7 @@ VERIFICATION_SUITE = [
         "checks": [
             ("UX Audit", ".agent/skills/frontend-design/scripts/ux_audit.py", False),
             ("Accessibility Check", ".agent/skills/frontend-design/scripts/accessibility_checker.py", False),
+            ("React Performance", ".agent/skills/react-patterns/scripts/react_perf_audit.py", False),
         ]
     },
     
@@ -118,6 +121,7 @@ VERIFICATION_SUITE = [
         "checks": [
             ("Lighthouse Audit", ".agent/skills/performance-profiling/scripts/lighthouse_audit.py", True),
             ("Bundle Analysis", ".agent/skills/performance-profiling/scripts/bundle_analyzer.py", False),
+            ("API Load Test", ".agent/skills/api-patterns/scripts/api_load_test.py", False),
         ]
     },
     
@@ -127,6 +131,8 @@ VERIFICATION_SUITE = [
         "requires_url": True,
         "checks": [
             ("Playwright E2E", ".agent/skills/webapp-testing/scripts/playwright_runner.py", False),
+            # Budgets and regressions for the metrics recorded by Lighthouse/Playwright
+            ("Performance Baseline", ".agent/skills/performance-profiling/scripts/perf_baseline.py", False),
         ]
     },
     
@@ -147,6 +153,12 @@ VERIFICATION_SUITE = [
     },
 ]
 
+# Reported but not gated until the existing findings are addressed
+# (react_perf_audit: barrel imports from @/components/admin)
+ADVISORY_ARGS = {
+    "react_perf_audit.py": ["--fail-on", "none"],
+}
+
 def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None) -> dict:
     """Run validation script"""
     if not script_path.exists():
@@ -158,8 +170,9 @@ def run_script(name: str, script_path: Path, project_path: str, url: Optional[st
     
     # Build command
     cmd = ["python", str(script_path), project_path]
-    if url and ("lighthouse" in script_path.name.lower() or "playwright" in script_path.name.lower()):
+    if url and any(k in script_path.name.lower() for k in ("lighthouse", "playwright", "load_test")):
         cmd.append(url)
+    cmd.extend(ADVISORY_ARGS.get(script_path.name, []))
     
     # Run
     try:
@@ -0,0 +1,551 @@
+#!/usr/bin/env python3
+"""
+Skill: api-patterns
+Script: api_load_test.py
+Purpose: Load-test the Next.js App Router API routes against a running
+         server and report per-route throughput, latency percentiles and
+         error rate
+Usage: python api_load_test.py <project_path> [url] [--route GLOB] [--mode closed|open] [--concurrency 10]
+                                 [--rate 50] [--allow-remote]
+Output: JSON report (also in .agent_cache/api_load_test.json); exit 1 when a
+        budget is exceeded (error_rate 1% by default) or the server is
+        unreachable
+Note: Routes come from app/**/route.ts (see api_validator.py). Only opted-in
+      routes are hit: the config's "requests", plus plain GETs (no dynamic
+      segment) of routes matching --route or the config's "routes" globs.
+      Even then debug/admin/check-status/test/sync/webhook routes are never hit
+      without an explicit request template. Nothing runs by default.
+      The server is the url argument, "base_url" in the config, or the one
+      `auto_preview.py start` recorded in .agent/preview.json; origins other
+      than localhost are refused without --allow-remote.
+
+Modes:
+    closed   --concurrency workers, each sending its next request when the
+             previous one completes (measures capacity)
+    open     requests arrive at --rate per second (Poisson, or --arrival
+             uniform) whatever the response times; at most --concurrency
+             are in flight. Latency counts from the scheduled send time, so
+             queueing behind slow responses is included (no coordinated
+             omission)
+
+Config:   <project>/.agent/api-load.config.json, for example
+    {
+      "base_url": "http://localhost:3000",
+      "duration": 20, "concurrency": 10, "mode": "open", "rate": 50,
+      "budgets": {"p95_ms": 500, "error_rate": 0.01},
+      "routes": ["/api/mesas", "/api/push/vapid-key"],
+      "exclude": ["/api/stripe/*"],
+      "requests": [
+        {"route": "/api/manifest/[slug]", "path": "/api/manifest/loja-0", "weight": 3},
+        {"route": "/api/fingerprint/verify", "method": "POST", "body": {"fingerprint": "abc"},
+         "headers": {"Authorization": "Bearer ..."}, "expect": [200, 403],
+         "budgets": {"p95_ms": 800}}
+      ]
+    }
+"""
+import sys
+import ssl
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+from fnmatch import fnmatch
+from pathlib import Path
+from datetime import datetime
+from urllib.parse import urlparse
+
+sys.path.insert(0, str(Path(__file__).parent))
+from api_validator import find_api_files, route_path, HTTP_METHOD
+
+# Fix Windows console encoding
+try:
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+except:
+    pass
+
+CONFIG_FILE = ".agent/api-load.config.json"
+PREVIEW_STATE_FILE = ".agent/preview.json"
+REPORT_FILE = ".agent_cache/api_load_test.json"
+
+DEFAULTS = {
+    "mode": "closed",
+    "concurrency": 10,
+    "rate": 50.0,
+    "arrival": "poisson",
+    "duration": 20.0,
+    "timeout": 10.0,
+}
+DEFAULT_BUDGETS = {"error_rate": 0.01}
+# GET handlers that still have side effects (debug writes, payment status
+# polling that activates subscriptions, test pushes, syncs, webhooks); hit
+# only via "requests"
+UNSAFE_ROUTES = ["/api/debug/*", "/api/admin/*", "/api/*/check-status", "/api/*/test", "*sync*", "*webhook*"]
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1", "0.0.0.0"}
+# A dev server compiles a route on its first request
+WARMUP_TIMEOUT = 120
+USER_AGENT = "api-load-test/1.0"
+
+
+# ============================================================================
+# ROUTES AND TEMPLATES
+# ============================================================================
+
+def discover_routes(project_path: Path) -> list:
+    """[{"route", "file", "methods"}] for every App Router route handler."""
+    routes = []
+    for file_path, kind in find_api_files(project_path):
+        if kind != 'route':
+            continue
+        content = file_path.read_text(encoding='utf-8', errors='replace')
+        routes.append({
+            "route": route_path(file_path.parent.relative_to(project_path)),
+            "file": file_path.relative_to(project_path).as_posix(),
+            "methods": sorted(set(HTTP_METHOD.findall(content))),
+        })
+    return routes
+
+
+def build_templates(routes: list, config: dict, only: list) -> tuple:
+    """
+    (templates, skipped): configured requests plus plain GETs of the routes opted in
+    by --route / "routes", never those matching UNSAFE_ROUTES.
+    """
+    excluded = config.get("exclude", [])
+    opted_in = only or config.get("routes", [])
+    selected = lambda route: (not only or any(fnmatch(route, p) for p in only)) and \
+        not any(fnmatch(route, p) for p in excluded)
+    templates = []
+    configured = set()
+    for request in config.get("requests", []):
+        route = request.get("route") or request["path"]
+        method = request.get("method", "GET").upper()
+        configured.add((route, method))
+        if not selected(route):
+            continue
+        templates.append({
+            "name": request.get("name", f"{method} {route}"),
+            "route": route,
+            "method": method,
+            "path": request.get("path", route),
+            "headers": request.get("headers", {}),
+            "body": request.get("body"),
+            "weight": request.get("weight", 1),
+            "expect": request.get("expect"),
+            "budgets": request.get("budgets", {}),
+        })
+
+    skipped = []
+    for route in routes:
+        for method in route["methods"] or ["GET"]:
+            if (route["route"], method) in configured or not selected(route["route"]):
+                continue
+            if not any(fnmatch(route["route"], p) for p in opted_in):
+                skipped.append({"route": route["route"], "method": method, "reason": "not opted in"})
+            elif any(fnmatch(route["route"], p) for p in UNSAFE_ROUTES):
+                skipped.append({"route": route["route"], "method": method, "reason": "side effects, no template"})
+            elif method == "GET" and '[' not in route["route"]:
+                templates.append({"name": f"GET {route['route']}", "route": route["route"], "method": "GET",
+                                  "path": route["route"], "headers": {}, "body": None, "weight": 1,
+                                  "expect": None, "budgets": {}})
+            else:
+                reason = "dynamic segment" if '[' in route["route"] else "not GET"
+                skipped.append({"route": route["route"], "method": method, "reason": f"{reason}, no template"})
+    return templates, skipped
+
+
+def resolve_base_url(project_path: Path, url: str, config: dict):
+    if url:
+        # checklist.py passes a page URL; API routes live at the origin
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}"
+    if config.get("base_url"):
+        return config["base_url"].rstrip('/')
+    try:
+        state = json.loads((project_path / PREVIEW_STATE_FILE).read_text(encoding='utf-8'))
+        if state.get("ready") and state.get("url"):
+            return state["url"].rstrip('/')
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def is_local(base_url: str) -> bool:
+    return (urlparse(base_url).hostname or "localhost") in LOCAL_HOSTS
+
+
+# ============================================================================
+# HTTP/1.1 CLIENT (keep-alive, stdlib only)
+# ============================================================================
+
+class StaleConnection(ConnectionError):
+    """The server closed the connection before sending a status line."""
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, target: dict):
+        self.target = target
+        self.reader = None
+        self.writer = None
+        self.reusable = True
+
+    async def open(self):
+        self.reader, self.writer = await asyncio.open_connection(
+            self.target["host"], self.target["port"], ssl=self.target["ssl"],
+            server_hostname=self.target["host"] if self.target["ssl"] else None)
+
+    def close(self):
+        if self.writer:
+            self.writer.close()
+        self.reusable = False
+
+    async def request(self, template: dict) -> int:
+        """Send the request and read the whole response; returns the status code."""
+        body = template["body"]
+        payload = b''
+        headers = {"Host": self.target["netloc"], "User-Agent": USER_AGENT, "Accept": "*/*",
+                   "Connection": "keep-alive"}
+        if body is not None:
+            payload = body.encode() if isinstance(body, str) else json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        if payload or template["method"] in ("POST", "PUT", "PATCH"):
+            headers["Content-Length"] = str(len(payload))
+        headers.update(template["headers"])
+        head = f"{template['method']} {template['path']} HTTP/1.1\r\n" + \
+            ''.join(f"{k}: {v}\r\n" for k, v in headers.items()) + "\r\n"
+        try:
+            self.writer.write(head.encode('latin-1') + payload)
+            await self.writer.drain()
+            status_line = await self.reader.readline()
+        except (ConnectionResetError, BrokenPipeError) as e:
+            raise StaleConnection(str(e)) from e
+        if not status_line:
+            raise StaleConnection("connection closed by server")
+        version, status = status_line.split()[:2]
+        status = int(status)
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            key, _, value = line.decode('latin-1').partition(':')
+            response_headers[key.strip().lower()] = value.strip().lower()
+
+        if template["method"] == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            pass
+        elif response_headers.get("transfer-encoding") == "chunked":
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif "content-length" in response_headers:
+            await self.reader.readexactly(int(response_headers["content-length"]))
+        else:
+            await self.reader.read()
+            self.reusable = False
+        connection = response_headers.get("connection")
+        if connection == "close" or (version == b"HTTP/1.0" and connection != "keep-alive"):
+            self.reusable = False
+        return status
+
+
+def parse_target(base_url: str) -> dict:
+    url = urlparse(base_url)
+    secure = url.scheme == "https"
+    return {
+        "host": url.hostname or "localhost",
+        "port": url.port or (443 if secure else 80),
+        "netloc": url.netloc,
+        "ssl": ssl.create_default_context() if secure else None,
+        "prefix": url.path.rstrip('/'),
+    }
+
+
+class Pool:
+    """Idle keep-alive connections shared by in-flight requests."""
+
+    def __init__(self, target: dict):
+        self.target = target
+        self.idle = []
+
+    async def send(self, template: dict, timeout: float) -> int:
+        if self.idle:
+            try:
+                return await self.exchange(self.idle.pop(), template, timeout)
+            except StaleConnection:
+                pass  # The server dropped the idle keep-alive connection: retry once on a fresh one
+        conn = Connection(self.target)
+        await asyncio.wait_for(conn.open(), timeout)
+        return await self.exchange(conn, template, timeout)
+
+    async def exchange(self, conn: Connection, template: dict, timeout: float) -> int:
+        try:
+            status = await asyncio.wait_for(conn.request(template), timeout)
+        except BaseException:
+            conn.close()
+            raise
+        if conn.reusable:
+            self.idle.append(conn)
+        else:
+            conn.close()
+        return status
+
+    def close(self):
+        for conn in self.idle:
+            conn.close()
+        self.idle = []
+
+
+# ============================================================================
+# LOAD
+# ============================================================================
+
+class Stats:
+    def __init__(self, templates: list):
+        self.routes = {t["name"]: {"latencies": [], "errors": 0, "statuses": {}} for t in templates}
+
+    def record(self, template: dict, latency_ms: float, status, error: str = None):
+        route = self.routes[template["name"]]
+        route["latencies"].append(latency_ms)
+        key = str(status) if status is not None else (error or "error")
+        route["statuses"][key] = route["statuses"].get(key, 0) + 1
+        expected = template["expect"]
+        if status is None or (status not in expected if expected else status >= 400):
+            route["errors"] += 1
+
+
+async def send_one(pool: Pool, template: dict, timeout: float, stats: Stats, started: float):
+    """One request; latency is measured from `started` (the scheduled time in open loop)."""
+    try:
+        status = await pool.send(template, timeout)
+        stats.record(template, (time.perf_counter() - started) * 1000, status)
+    except asyncio.TimeoutError:
+        stats.record(template, (time.perf_counter() - started) * 1000, None, "timeout")
+    except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError) as e:
+        stats.record(template, (time.perf_counter() - started) * 1000, None, type(e).__name__)
+
+
+def picker(templates: list, rng: random.Random):
+    weights = [t["weight"] for t in templates]
+    return lambda: rng.choices(templates, weights)[0]
+
+
+async def closed_loop(pool: Pool, templates: list, settings: dict, stats: Stats, seed):
+    deadline = time.perf_counter() + settings["duration"]
+
+    async def worker(index: int):
+        choose = picker(templates, random.Random(f"{seed}:{index}"))
+        while time.perf_counter() < deadline:
+            await send_one(pool, choose(), settings["timeout"], stats, time.perf_counter())
+
+    await asyncio.gather(*(worker(i) for i in range(settings["concurrency"])))
+
+
+async def open_loop(pool: Pool, templates: list, settings: dict, stats: Stats, seed):
+    rng = random.Random(f"{seed}:arrivals")
+    choose = picker(templates, rng)
+    slots = asyncio.Semaphore(settings["concurrency"])
+    start = time.perf_counter()
+    deadline = start + settings["duration"]
+    interval = 1 / settings["rate"]
+
+    async def scheduled(template: dict, at: float):
+        async with slots:
+            await send_one(pool, template, settings["timeout"], stats, at)
+
+    tasks = []
+    at = start
+    while at < deadline:
+        delay = at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(scheduled(choose(), at)))
+        at += rng.expovariate(settings["rate"]) if settings["arrival"] == "poisson" else interval
+    await asyncio.gather(*tasks)
+
+
+async def warm_up(pool: Pool, templates: list) -> dict:
+    """Hit each template once (compiles dev-server routes); not measured."""
+    statuses = {}
+    for template in templates:
+        try:
+            statuses[template["name"]] = await pool.send(template, WARMUP_TIMEOUT)
+        except (asyncio.TimeoutError, OSError, ConnectionError, asyncio.IncompleteReadError, ValueError) as e:
+            statuses[template["name"]] = type(e).__name__
+    return statuses
+
+
+async def run_load(base_url: str, templates: list, settings: dict, seed, warmup: bool) -> dict:
+    target = parse_target(base_url)
+    for template in templates:
+        template["path"] = target["prefix"] + template["path"]
+    pool = Pool(target)
+    try:
+        warmup_statuses = await warm_up(pool, templates) if warmup else {}
+        stats = Stats(templates)
+        started = time.perf_counter()
+        if warmup_statuses and not any(isinstance(s, int) for s in warmup_statuses.values()):
+            pass  # Server unreachable: no point generating load
+        elif settings["mode"] == "open":
+            await open_loop(pool, templates, settings, stats, seed)
+        else:
+            await closed_loop(pool, templates, settings, stats, seed)
+        elapsed = time.perf_counter() - started
+    finally:
+        pool.close()
+    return {"stats": stats, "elapsed": elapsed, "warmup": warmup_statuses}
+
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+def percentile(values: list, q: float):
+    """Nearest-rank percentile of sorted values."""
+    if not values:
+        return None
+    return round(values[max(0, math.ceil(q / 100 * len(values)) - 1)], 1)
+
+
+def summarize(templates: list, result: dict, budgets: dict) -> tuple:
+    """(routes, violations) with budgets per route overriding the global ones."""
+    routes = []
+    violations = []
+    elapsed = result["elapsed"]
+    for template in templates:
+        data = result["stats"].routes[template["name"]]
+        latencies = sorted(data["latencies"])
+        count = len(latencies)
+        summary = {
+            "name": template["name"],
+            "route": template["route"],
+            "method": template["method"],
+            "requests": count,
+            "rps": round(count / elapsed, 2) if elapsed else 0,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "max_ms": round(latencies[-1], 1) if latencies else None,
+            "error_rate": round(data["errors"] / count, 4) if count else None,
+            "statuses": data["statuses"],
+        }
+        routes.append(summary)
+        limits = {**budgets, **template["budgets"]}
+        for metric, limit in limits.items():
+            if metric == "min_rps":
+                value, broken = summary["rps"], summary["rps"] < limit
+            elif metric in ("p50_ms", "p95_ms", "p99_ms", "error_rate"):
+                value = summary[metric]
+                broken = value is not None and value > limit
+            else:
+                continue
+            if broken:
+                violations.append({"name": template["name"], "metric": metric, "value": value, "budget": limit})
+    return routes, violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test App Router API routes")
+    parser.add_argument("project", nargs="?", default=".", help="Project path")
+    parser.add_argument("url", nargs="?", help="Server base URL (default: config or auto_preview server)")
+    parser.add_argument("--mode", choices=["closed", "open"], help=f"Arrival model (default {DEFAULTS['mode']})")
+    parser.add_argument("--concurrency", type=int, help="Workers (closed) or max in flight (open)")
+    parser.add_argument("--rate", type=float, help="Requests per second in open mode")
+    parser.add_argument("--arrival", choices=["poisson", "uniform"], help="Open-mode arrival process")
+    parser.add_argument("--duration", type=float, help="Seconds of measured load")
+    parser.add_argument("--timeout", type=float, help="Per-request timeout in seconds")
+    parser.add_argument("--route", action="append", default=[],
+                        help="Hit plain GETs of routes matching this glob (repeatable; default: config \"routes\")")
+    parser.add_argument("--seed", default="0", help="Seed for route mix and arrivals")
+    parser.add_argument("--no-warmup", action="store_true", help="Skip the unmeasured first request per route")
+    parser.add_argument("--allow-remote", action="store_true", help="Allow a server that is not on localhost")
+    parser.add_argument("--json", action="store_true", help="Print only the JSON report")
+    args = parser.parse_args()
+    project_path = Path(args.project).resolve()
+
+    config = {}
+    config_path = project_path / CONFIG_FILE
+    if config_path.exists():
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    settings = {key: getattr(args, key) if getattr(args, key) is not None else config.get(key, default)
+                for key, default in DEFAULTS.items()}
+    if settings["concurrency"] < 1 or settings["rate"] <= 0 or settings["duration"] <= 0:
+        parser.error("--concurrency, --rate and --duration must be positive")
+
+    output = {"script": "api_load_test", "project": str(project_path), "settings": settings}
+    routes = discover_routes(project_path)
+    templates, skipped = build_templates(routes, config, args.route)
+    base_url = resolve_base_url(project_path, args.url, config)
+    message = None
+    if not templates:
+        message = "No API routes opted in: pass --route or list \"routes\"/\"requests\" in " + CONFIG_FILE
+    elif not base_url:
+        message = "No server: pass a URL, set base_url, or run auto_preview.py start"
+    elif not is_local(base_url) and not args.allow_remote:
+        message = f"Refusing to load-test {base_url}: not localhost (pass --allow-remote)"
+    if message:
+        output.update({"passed": True, "skipped": True, "message": message})
+        print(json.dumps(output, indent=2))
+        sys.exit(0)
+
+    if not args.json:
+        print(f"\n{'='*60}")
+        print(f"[API LOAD TEST] {settings['mode']}-loop against {base_url}")
+        print(f"{'='*60}")
+        print(f"Project: {project_path}")
+        print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print("-"*60)
+        print(f"Routes: {len(routes)} found, {len(templates)} request templates, {len(skipped)} skipped")
+        load = f"{settings['concurrency']} workers" if settings["mode"] == "closed" else \
+            f"{settings['rate']}/s {settings['arrival']}, <= {settings['concurrency']} in flight"
+        print(f"Load: {load} for {settings['duration']}s")
+
+    result = asyncio.run(run_load(base_url, templates, settings, args.seed, not args.no_warmup))
+    route_results, violations = summarize(templates, result, {**DEFAULT_BUDGETS, **config.get("budgets", {})})
+    total = sum(r["requests"] for r in route_results)
+    unreachable = not any(key.isdigit() for r in route_results for key in r["statuses"])
+
+    output.update({
+        "base_url": base_url,
+        "elapsed_s": round(result["elapsed"], 2),
+        "requests": total,
+        "rps": round(total / result["elapsed"], 2) if result["elapsed"] else 0,
+        "routes": route_results,
+        "skipped_routes": skipped,
+        "warmup": result["warmup"],
+        "violations": violations,
+        "passed": not violations and not unreachable,
+    })
+    if unreachable:
+        output["message"] = f"Server at {base_url} did not answer any request"
+    try:
+        report_path = project_path / REPORT_FILE
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text(json.dumps(output, indent=2), encoding='utf-8')
+    except OSError:
+        pass
+
+    if not args.json:
+        print(f"\n{'Route':<44} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'err%':>6}")
+        for r in route_results:
+            err = f"{r['error_rate'] * 100:.1f}" if r["error_rate"] is not None else "-"
+            print(f"{r['name'][:44]:<44} {r['rps']:>8} {r['p50_ms'] or '-':>8} {r['p95_ms'] or '-':>8} "
+                  f"{r['p99_ms'] or '-':>8} {err:>6}")
+        for v in violations:
+            print(f"[!] {v['name']}: {v['metric']} {v['value']} > budget {v['budget']}" if v["metric"] != "min_rps"
+                  else f"[!] {v['name']}: {v['value']} req/s < budget {v['budget']}")
+        if output.get("message"):
+            print(f"[!] {output['message']}")
+        print()
+    print(json.dumps(output if args.json else {k: v for k, v in output.items()
+                                                if k not in ("routes", "warmup", "skipped_routes")}, indent=2))
+    sys.exit(0 if output["passed"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,27 @@
 """
 API Validator - Checks API endpoints for best practices.
 Validates OpenAPI specs, response formats, and common issues.
+
+Usage:
+    python api_validator.py <project_path> [--no-cache]
+
+API files are found in one pruned directory walk: Next.js App Router route
+handlers (app/**/route.ts), pages/api, routes/controllers/endpoints dirs,
+*api* modules and OpenAPI/Swagger specs. Code is scanned once with a single
+combined regex, and results are cached per file in
+.agent_cache/api_validator.json by content hash (and CHECKS_VERSION).
 """
+import os
 import sys
 import json
 import re
+import argparse
 from pathlib import Path
 
+# Shared per-file result cache (.agent/scripts/result_cache.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "scripts"))
+from result_cache import ResultCache, content_key
+
 # Fix Windows console encoding for Unicode output
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -15,24 +30,75 @@ try:
 except AttributeError:
     pass  # Python < 3.7
 
+# Directories to skip (dot-directories are skipped too)
+SKIP_DIRS = {'node_modules', 'dist', 'build', '__pycache__', 'coverage', 'out'}
+
+CODE_EXTENSIONS = {'.ts', '.js', '.py'}
+ROUTE_FILES = {'route.ts', 'route.js'}
+API_DIRS = {'routes', 'controllers', 'endpoints'}
+SPEC_NAMES = {'swagger.json', 'swagger.yaml', 'openapi.json', 'openapi.yaml'}
+SPEC_SUFFIXES = ('.openapi.json', '.openapi.yaml')
+# Words of a file name (apiClient -> api, Client); "api" must be one of them,
+# so cardapio.ts is not an API module
+NAME_WORD = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+')
+
+CACHE_FILE = ".agent_cache/api_validator.json"
+CHECKS_VERSION = 1
+
+# All code signals in one pass; the group name says which signal matched
+SIGNALS = {
+    'error_handling': r'try\s*{|try:|\.catch\(|except\s+|catch\s*\(',
+    'status': r'status\s*\(\s*\d{3}\s*\)|statusCode\s*[=:]\s*\d{3}|HttpStatus\.|status_code\s*=\s*\d{3}'
+              r'|\.status\(\d{3}\)|res\.status\(|status:\s*\d{3}',
+    'validation': r'(?i:validate|schema|zod|joi|yup|pydantic)|@Body\(|@Query\(',
+    'auth': r'(?i:auth|jwt|bearer|token|middleware|guard)|@Authenticated',
+    'rate_limit': r'(?i:rateLimit|throttle|rate.?limit)',
+    'logging': r'console\.log|logger\.|logging\.|log\.',
+}
+SIGNAL_SCANNER = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in SIGNALS.items()))
+HTTP_METHOD = re.compile(
+    r'export\s+(?:async\s+)?(?:function\s+|const\s+)(GET|POST|PUT|PATCH|DELETE|HEAD|OPTIONS)\b')
+
+
+def route_path(rel_dir: Path):
+    """URL of an App Router route handler directory (app/api/x/[id] -> /api/x/[id])."""
+    parts = rel_dir.parts
+    if 'app' not in parts:
+        return None
+    segments = parts[len(parts) - parts[::-1].index('app'):]
+    # Route groups "(name)" and parallel slots "@name" are not part of the URL
+    return '/' + '/'.join(s for s in segments if not s.startswith(('(', '@')))
+
+
+def classify(rel: Path):
+    """'openapi', 'route' or 'code' for API-related files, else None."""
+    name = rel.name.lower()
+    if name in SPEC_NAMES or name.endswith(SPEC_SUFFIXES):
+        return 'openapi'
+    if rel.name in ROUTE_FILES and 'app' in rel.parts:
+        return 'route'
+    if rel.suffix not in CODE_EXTENSIONS:
+        return None
+    if 'api' in (w.lower() for w in NAME_WORD.findall(rel.stem)) or rel.parent.name in API_DIRS:
+        return 'code'
+    parts = rel.parts
+    if 'pages' in parts and 'api' in parts[parts.index('pages'):]:
+        return 'code'
+    return None
+
+
 def find_api_files(project_path: Path) -> list:
-    """Find API-related files."""
-    patterns = [
-        "**/*api*.ts", "**/*api*.js", "**/*api*.py",
-        "**/routes/*.ts", "**/routes/*.js", "**/routes/*.py",
-        "**/controllers/*.ts", "**/controllers/*.js",
-        "**/endpoints/*.ts", "**/endpoints/*.py",
-        "**/*.openapi.json", "**/*.openapi.yaml",
-        "**/swagger.json", "**/swagger.yaml",
-        "**/openapi.json", "**/openapi.yaml"
-    ]
-    
+    """Find API-related files in one pruned walk; returns [(path, kind)]."""
     files = []
-    for pattern in patterns:
-        files.extend(project_path.glob(pattern))
-    
-    # Exclude node_modules, etc.
-    return [f for f in files if not any(x in str(f) for x in ['node_modules', '.git', 'dist', 'build', '__pycache__'])]
+    for root, dirs, filenames in os.walk(project_path):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS and not d.startswith('.'))
+        root_path = Path(root)
+        rel_root = root_path.relative_to(project_path)
+        for filename in sorted(filenames):
+            kind = classify(rel_root / filename)
+            if kind:
+                files.append((root_path / filename, kind))
+    return files
 
 def check_openapi_spec(file_path: Path) -> dict:
     """Check OpenAPI/Swagger specification."""
@@ -91,67 +157,53 @@ def check_openapi_spec(file_path: Path) -> dict:
     
     return {'file': str(file_path), 'passed': passed, 'issues': issues, 'type': 'openapi'}
 
-def check_api_code(file_path: Path) -> dict:
+def scan_signals(content: str) -> set:
+    """Names of the SIGNALS present in content, from a single scan."""
+    found = set()
+    for m in SIGNAL_SCANNER.finditer(content):
+        found.add(m.lastgroup)
+        if len(found) == len(SIGNALS):
+            break
+    return found
+
+def check_api_code(file_path: Path, content: str = None) -> dict:
     """Check API code for common issues."""
     issues = []
     passed = []
     
     try:
-        content = file_path.read_text(encoding='utf-8')
+        if content is None:
+            content = file_path.read_text(encoding='utf-8')
+        found = scan_signals(content)
         
         # Check for error handling
-        error_patterns = [
-            r'try\s*{', r'try:', r'\.catch\(',
-            r'except\s+', r'catch\s*\('
-        ]
-        has_error_handling = any(re.search(p, content) for p in error_patterns)
-        if has_error_handling:
+        if 'error_handling' in found:
             passed.append("[OK] Error handling present")
         else:
             issues.append("[X] No error handling found")
         
-        # Check for status codes
-        status_patterns = [
-            r'status\s*\(\s*\d{3}\s*\)', r'statusCode\s*[=:]\s*\d{3}',
-            r'HttpStatus\.', r'status_code\s*=\s*\d{3}',
-            r'\.status\(\d{3}\)', r'res\.status\('
-        ]
-        has_status = any(re.search(p, content) for p in status_patterns)
-        if has_status:
+        # Check for status codes (NextResponse.json(..., { status: 400 }) included)
+        if 'status' in found:
             passed.append("[OK] HTTP status codes used")
         else:
             issues.append("[!] No explicit HTTP status codes")
         
         # Check for validation
-        validation_patterns = [
-            r'validate', r'schema', r'zod', r'joi', r'yup',
-            r'pydantic', r'@Body\(', r'@Query\('
-        ]
-        has_validation = any(re.search(p, content, re.I) for p in validation_patterns)
-        if has_validation:
+        if 'validation' in found:
             passed.append("[OK] Input validation present")
         else:
             issues.append("[!] No input validation detected")
         
         # Check for auth middleware
-        auth_patterns = [
-            r'auth', r'jwt', r'bearer', r'token',
-            r'middleware', r'guard', r'@Authenticated'
-        ]
-        has_auth = any(re.search(p, content, re.I) for p in auth_patterns)
-        if has_auth:
+        if 'auth' in found:
             passed.append("[OK] Authentication/authorization detected")
         
         # Check for rate limiting
-        rate_patterns = [r'rateLimit', r'throttle', r'rate.?limit']
-        has_rate = any(re.search(p, content, re.I) for p in rate_patterns)
-        if has_rate:
+        if 'rate_limit' in found:
             passed.append("[OK] Rate limiting present")
         
         # Check for logging
-        log_patterns = [r'console\.log', r'logger\.', r'logging\.', r'log\.']
-        has_logging = any(re.search(p, content) for p in log_patterns)
-        if has_logging:
+        if 'logging' in found:
             passed.append("[OK] Logging present")
         
     except Exception as e:
@@ -159,9 +211,48 @@ def check_api_code(file_path: Path) -> dict:
     
     return {'file': str(file_path), 'passed': passed, 'issues': issues, 'type': 'code'}
 
+def check_file(file_path: Path, kind: str, project_path: Path, data: bytes) -> dict:
+    """Run the checks for one API file; results name files relative to the project."""
+    rel = file_path.relative_to(project_path)
+    if kind == 'openapi':
+        result = check_openapi_spec(file_path)
+    else:
+        content = data.decode('utf-8', errors='replace')
+        result = check_api_code(file_path, content)
+        if kind == 'route':
+            result['type'] = 'route'
+            result['route'] = route_path(rel.parent)
+            result['methods'] = sorted(set(HTTP_METHOD.findall(content)))
+    result['file'] = rel.as_posix()
+    return result
+
+def audit_files(project_path: Path, api_files: list, use_cache: bool = True) -> list:
+    """check_file for every API file, reusing cached results for unchanged content."""
+    cache = ResultCache(project_path, CACHE_FILE, CHECKS_VERSION, use_cache)
+    results = []
+    for file_path, kind in api_files:
+        rel = file_path.relative_to(project_path).as_posix()
+        try:
+            data = file_path.read_bytes()
+        except OSError as e:
+            results.append({'file': rel, 'passed': [], 'issues': [f"[X] Read error: {e}"], 'type': kind})
+            continue
+        key = content_key(data)
+        result = cache.get(rel, key)
+        if result is None:
+            result = check_file(file_path, kind, project_path, data)
+            cache.put(rel, key, result)
+        results.append(result)
+    cache.save()
+    
+    return results
+
 def main():
-    target = sys.argv[1] if len(sys.argv) > 1 else "."
-    project_path = Path(target)
+    parser = argparse.ArgumentParser(description="Check API endpoints for best practices")
+    parser.add_argument("project", nargs="?", default=".", help="Project path")
+    parser.add_argument("--no-cache", action="store_true", help="Re-check every file")
+    args = parser.parse_args()
+    project_path = Path(args.project).resolve()
     
     print("\n" + "=" * 60)
     print("  API VALIDATOR - Endpoint Best Practices Check")
@@ -171,23 +262,21 @@ def main():
     
     if not api_files:
         print("[!] No API files found.")
-        print("   Looking for: routes/, controllers/, api/, openapi.json/yaml")
+        print("   Looking for: app/**/route.ts, pages/api/, routes/, controllers/, openapi.json/yaml")
         sys.exit(0)
     
-    results = []
-    for file_path in api_files[:15]:  # Limit
-        if 'openapi' in file_path.name.lower() or 'swagger' in file_path.name.lower():
-            result = check_openapi_spec(file_path)
-        else:
-            result = check_api_code(file_path)
-        results.append(result)
+    results = audit_files(project_path, api_files, not args.no_cache)
     
     # Print results
     total_issues = 0
     total_passed = 0
     
     for result in results:
-        print(f"\n[FILE] {result['file']} [{result['type']}]")
+        if result['type'] == 'route':
+            methods = ','.join(result['methods']) or 'no handlers'
+            print(f"\n[FILE] {result['file']} [route {methods} {result['route']}]")
+        else:
+            print(f"\n[FILE] {result['file']} [{result['type']}]")
         for item in result['passed']:
             print(f"   {item}")
             total_passed += 1
@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+Skill: database-design
+Script: migration_order_checker.py
+Purpose: Build the effective apply order of supabase/migrations and find
+         version collisions, out-of-order references and redundant or
+         overwritten DDL
+Usage: python migration_order_checker.py <project_path> [--json] [--strict]
+Output: Apply order plus findings with migration file:line
+Note: The Supabase CLI applies files named <version>_<name>.sql in file name
+      order and records each version once in
+      supabase_migrations.schema_migrations; other files are skipped.
+      Statements are checked against the schema replayed up to that point
+      (sql_schema.py). The final replay is cached in
+      .agent_cache/schema_snapshot.json, keyed by the migration hashes, for
+      schema_validator.py, rls_policy_analyzer.py and synthetic_data.py.
+      --strict exits 1 on high severity findings.
+
+Findings:
+    unversioned-file     not named <version>_<name>.sql; the CLI never applies it
+    duplicate-version    several files share a version; only one can be recorded
+    forward-reference    uses a table that a later migration creates
+    object-exists        unguarded CREATE/ADD of something that already exists; the migration fails
+    ignored-definition   guarded CREATE/ADD (IF NOT EXISTS, DO block) whose definition differs from what exists
+    duplicate-index      same columns and predicate as an existing index
+    redundant-ddl        guarded CREATE/ADD of something identical that already exists
+    overwritten          object created, replaced or dropped across several migrations
+    mixed-versioning     sequential and timestamped versions mixed
+"""
+import sys
+import json
+import re
+import argparse
+from pathlib import Path
+from datetime import datetime
+
+sys.path.insert(0, str(Path(__file__).parent))
+from sql_schema import (
+    migration_files, load_project_schema, new_schema, split_statements, ddl_statements, apply_statement,
+    paren_group, split_top_level, column_names, ident, get_table,
+    add_column, TABLE_CONSTRAINT, CREATE_TABLE, ALTER_TABLE, CREATE_INDEX, CREATE_POLICY,
+    CREATE_FUNCTION, CREATE_VIEW, DROP, REFERENCES, NAME, FLAGS, MIGRATIONS_DIR
+)
+
+# Fix Windows console encoding
+try:
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+except:
+    pass
+
+SEVERITY = {
+    "unversioned-file": "high",
+    "duplicate-version": "high",
+    "forward-reference": "high",
+    "object-exists": "high",
+    "ignored-definition": "medium",
+    "duplicate-index": "medium",
+    "redundant-ddl": "low",
+    "overwritten": "low",
+    "mixed-versioning": "low",
+}
+
+# Same pattern the Supabase CLI uses for migration files
+VERSIONED = re.compile(r'^(\d+)_(.+)\.sql$')
+TIMESTAMP_DIGITS = 14
+TYPE_ALIASES = {
+    "decimal": "numeric", "int": "integer", "int4": "integer", "int8": "bigint", "int2": "smallint",
+    "bool": "boolean", "float8": "double precision", "float4": "real", "varchar": "character varying",
+    "timestamptz": "timestamp with time zone", "timestamp": "timestamp without time zone",
+}
+
+
+def finding(rule: str, file: str, line: int, message: str) -> dict:
+    return {"rule": rule, "severity": SEVERITY[rule], "file": file, "line": line, "message": message}
+
+
+# ============================================================================
+# APPLY ORDER
+# ============================================================================
+
+def apply_order(project_path: Path, files: list) -> tuple:
+    """(entries, findings): each file with its version and how the CLI treats it."""
+    migrations_dir = project_path / MIGRATIONS_DIR
+    entries = []
+    findings = []
+    first_file = {}
+    for path in files:
+        rel = path.relative_to(project_path).as_posix()
+        if path.parent != migrations_dir:
+            entries.append({"file": rel, "version": None, "status": "base"})
+            continue
+        m = VERSIONED.match(path.name)
+        if not m:
+            entries.append({"file": rel, "version": None, "status": "skipped"})
+            findings.append(finding("unversioned-file", rel, 1,
+                                    "Not named <version>_<name>.sql, so `supabase db push` and "
+                                    "`supabase migration up` skip it; rename it with a timestamp version "
+                                    "or move it out of supabase/migrations"))
+            continue
+        version = m.group(1)
+        if version in first_file:
+            entries.append({"file": rel, "version": version, "status": "duplicate", "same_as": first_file[version]})
+            continue
+        first_file[version] = rel
+        entries.append({"file": rel, "version": version, "status": "applied"})
+
+    groups = {}
+    for entry in entries:
+        if entry["version"]:
+            groups.setdefault(entry["version"], []).append(entry["file"])
+    for version, group in groups.items():
+        if len(group) > 1:
+            findings.append(finding(
+                "duplicate-version", group[1], 1,
+                f"Version {version} is shared by {len(group)} files ({', '.join(Path(f).name for f in group)}); "
+                f"schema_migrations records a version once, so only {Path(group[0]).name} is tracked and the "
+                f"others fail to record or are taken as already applied. Give each a unique timestamp version"
+            ))
+
+    sequential = [e for e in entries if e["version"] and len(e["version"]) < TIMESTAMP_DIGITS]
+    timestamped = [e for e in entries if e["version"] and len(e["version"]) >= TIMESTAMP_DIGITS]
+    if sequential and timestamped:
+        findings.append(finding(
+            "mixed-versioning", timestamped[0]["file"], 1,
+            f"{len(sequential)} sequential and {len(timestamped)} timestamped versions: files sort by name, so "
+            f"any new NNN_ file runs before every timestamped one. Create migrations with "
+            f"`supabase migration new` (timestamped) only"
+        ))
+    return entries, findings
+
+
+# ============================================================================
+# STATEMENT CHECKS
+# ============================================================================
+
+def declared(schema: dict, name: str) -> bool:
+    table = schema["tables"].get(name)
+    return bool(table and table["declared"])
+
+
+def same_type(a: str, b: str) -> bool:
+    """Compare column types across spelling variants (decimal/numeric, timestamptz, ...)."""
+    def canonical(col_type: str) -> str:
+        m = re.match(r'([a-z0-9_ ]+?)\s*(\(.*\))?(\[\])?$', col_type)
+        if not m:
+            return col_type
+        base = TYPE_ALIASES.get(m.group(1), m.group(1))
+        return base + re.sub(r'\s+', '', m.group(2) or '') + (m.group(3) or '')
+    return canonical(a) == canonical(b)
+
+
+def origin(item: dict) -> str:
+    return f"{item['file']}:{item['line']}"
+
+
+def record(history: dict, key: str, action: str, file: str, line: int):
+    history.setdefault(key, []).append({"action": action, "file": file, "line": line})
+
+
+def check_table_use(schema: dict, final: dict, name: str, what: str, statement: str, file: str, line: int,
+                    findings: list) -> bool:
+    """forward-reference when name is only created later; True when the table is usable here."""
+    if declared(schema, name) or not declared(final, name):
+        return True
+    skipped = re.match(r'ALTER\s+TABLE\s+IF\s+EXISTS\b', statement, re.I)
+    findings.append(finding(
+        "forward-reference", file, line,
+        f"{what} uses table \"{name}\", which is only created at {origin(final['tables'][name])}; "
+        + ("ALTER TABLE IF EXISTS silently skips it" if skipped else "this fails when migrations run in order")
+    ))
+    return False
+
+
+def check_references(schema: dict, final: dict, statement: str, own_table: str, file: str, line: int,
+                     findings: list):
+    for ref in REFERENCES.finditer(statement):
+        target = ident(ref.group(1))
+        if target != own_table:
+            check_table_use(schema, final, target, "Foreign key", statement, file,
+                            line + statement.count('\n', 0, ref.start()), findings)
+
+
+def check_create_table(schema, final, m, statement, file, line, guarded, findings, history):
+    name = ident(m.group(2))
+    check_references(schema, final, statement, name, file, line, findings)
+    existing = schema["tables"].get(name)
+    if not declared(schema, name):
+        record(history, f"table {name}", "create", file, line)
+        return
+    if not (m.group(1) or guarded):
+        findings.append(finding("object-exists", file, line,
+                                f"Table \"{name}\" already exists ({origin(existing)}); CREATE TABLE fails"))
+        return
+    scratch = new_schema()
+    apply_statement(scratch, statement, file, line)
+    columns = scratch["tables"][name]["columns"]
+    missing = [c for c in columns if c not in existing["columns"]]
+    retyped = [c for c in columns if c in existing["columns"] and not same_type(columns[c]["type"], existing["columns"][c]["type"])]
+    if not missing and not retyped:
+        findings.append(finding("redundant-ddl", file, line,
+                                f"Table \"{name}\" already exists ({origin(existing)}); this CREATE is a no-op"))
+        return
+    never = [c for c in missing if c not in final["tables"].get(name, {}).get("columns", {})]
+    details = []
+    if missing:
+        details.append(f"columns {', '.join(missing)} are not created here"
+                       + (f" ({', '.join(never)} never are)" if never else ""))
+    if retyped:
+        details.append("types differ for " + ', '.join(
+            f"{c} ({columns[c]['type']} here, {existing['columns'][c]['type']} in effect)" for c in retyped))
+    findings.append(finding("ignored-definition", file, line,
+                            f"Table \"{name}\" already exists ({origin(existing)}), so this definition is "
+                            f"skipped: {'; '.join(details)}"))
+
+
+def check_alter_table(schema, final, m, statement, file, line, guarded, findings, history):
+    name = ident(m.group(1))
+    if not check_table_use(schema, final, name, "ALTER TABLE", statement, file, line, findings):
+        return
+    check_references(schema, final, statement, name, file, line, findings)
+    table = schema["tables"].get(name)
+    if not table:
+        return
+    actions = m.group(2)
+    position = 0
+    for action in split_top_level(actions):
+        position = actions.find(action, position)
+        action_line = line + statement.count('\n', 0, m.start(2) + position)
+        add = re.match(r'ADD\s+(COLUMN\s+)?(IF\s+NOT\s+EXISTS\s+)?(.*)', action, FLAGS)
+        if not add or (not add.group(1) and TABLE_CONSTRAINT.match(add.group(3))):
+            continue
+        scratch = get_table(new_schema(), name, file, action_line)
+        add_column(scratch, add.group(3), file, action_line)
+        for column, info in scratch["columns"].items():
+            existing = table["columns"].get(column)
+            if not existing:
+                continue
+            if not (add.group(2) or guarded):
+                findings.append(finding("object-exists", file, action_line,
+                                        f"Column \"{name}.{column}\" already exists ({origin(existing)}); "
+                                        f"ADD COLUMN fails"))
+            elif not same_type(info["type"], existing["type"]):
+                findings.append(finding("ignored-definition", file, action_line,
+                                        f"Column \"{name}.{column}\" is {info['type']} here but already "
+                                        f"{existing['type']} ({origin(existing)}); the old type stays"))
+            else:
+                findings.append(finding("redundant-ddl", file, action_line,
+                                        f"Column \"{name}.{column}\" already exists ({origin(existing)})"))
+
+
+def check_create_index(schema, final, m, statement, file, line, guarded, findings, history):
+    table_name = ident(m.group(3))
+    if not check_table_use(schema, final, table_name, "CREATE INDEX", statement, file, line, findings):
+        return
+    inner, end = paren_group(statement, m.end() - 1)
+    columns = column_names(inner)
+    name = ident(m.group(2)) if m.group(2) else f"{table_name}_{'_'.join(columns)}_idx"
+    where = re.search(r'\bWHERE\b(.*)$', statement[end:], FLAGS)
+    where = ' '.join(where.group(1).split()) if where else None
+
+    for table in schema["tables"].values():
+        existing = table["indexes"].get(name)
+        if not existing:
+            continue
+        guarded = guarded or re.search(r'IF\s+NOT\s+EXISTS', statement[:m.end()], re.I)
+        if not guarded:
+            findings.append(finding("object-exists", file, line,
+                                    f"Index \"{name}\" already exists ({origin(existing)}); CREATE INDEX fails"))
+        elif table["name"] != table_name or existing["columns"] != columns or existing["where"] != where:
+            findings.append(finding("ignored-definition", file, line,
+                                    f"Index \"{name}\" already exists on {table['name']}"
+                                    f"({', '.join(existing['columns'])}) ({origin(existing)}); "
+                                    f"this {table_name}({', '.join(columns)}) definition is skipped"))
+        else:
+            findings.append(finding("redundant-ddl", file, line,
+                                    f"Index \"{name}\" already exists ({origin(existing)})"))
+        return
+
+    table = schema["tables"].get(table_name)
+    for other, existing in (table["indexes"].items() if table else ()):
+        if existing["columns"] == columns and existing["where"] == where:
+            findings.append(finding("duplicate-index", file, line,
+                                    f"Index \"{name}\" on {table_name}({', '.join(columns)}) duplicates "
+                                    f"\"{other}\" ({origin(existing)}); every write maintains both"))
+            break
+    record(history, f"index {name}", "create", file, line)
+
+
+def check_create_policy(schema, final, m, statement, file, line, guarded, findings, history):
+    table_name = ident(m.group(2))
+    if not check_table_use(schema, final, table_name, "CREATE POLICY", statement, file, line, findings):
+        return
+    name = ident(m.group(1))
+    existing = schema["tables"].get(table_name, {}).get("policies", {}).get(name)
+    if not existing:
+        record(history, f"policy \"{name}\" on {table_name}", "create", file, line)
+    elif guarded:
+        findings.append(finding("redundant-ddl", file, line,
+                                f"Policy \"{name}\" on {table_name} already exists ({origin(existing)})"))
+    else:
+        findings.append(finding("object-exists", file, line,
+                                f"Policy \"{name}\" on {table_name} already exists ({origin(existing)}); "
+                                f"CREATE POLICY fails (add DROP POLICY IF EXISTS first)"))
+
+
+def check_drop(schema, m, file, line, history):
+    kind = ' '.join(m.group(1).upper().split())
+    for name in (ident(n) for n in re.findall(NAME, m.group(2))):
+        if kind == "TABLE" and name in schema["tables"]:
+            record(history, f"table {name}", "drop", file, line)
+        elif kind == "INDEX" and any(name in t["indexes"] for t in schema["tables"].values()):
+            record(history, f"index {name}", "drop", file, line)
+        elif kind == "POLICY" and m.group(3):
+            table_name = ident(m.group(3))
+            if name in schema["tables"].get(table_name, {}).get("policies", {}):
+                record(history, f"policy \"{name}\" on {table_name}", "drop", file, line)
+        elif kind == "FUNCTION" and name in schema["functions"]:
+            record(history, f"function {name}", "drop", file, line)
+        elif kind.endswith("VIEW") and name in schema["views"]:
+            record(history, f"view {name}", "drop", file, line)
+
+
+def check_statement(schema: dict, final: dict, statement: str, file: str, line: int, guarded: bool,
+                    findings: list, history: dict):
+    """Check one DDL statement against the schema as it stands before it runs."""
+    head = statement[:12].upper()
+    args = (file, line, guarded, findings, history)
+    if head.startswith("CREATE"):
+        for pattern, check in ((CREATE_TABLE, check_create_table), (CREATE_INDEX, check_create_index),
+                               (CREATE_POLICY, check_create_policy)):
+            m = pattern.match(statement)
+            if m:
+                check(schema, final, m, statement, *args)
+                return
+        for pattern, kind, group in ((CREATE_FUNCTION, "function", 1), (CREATE_VIEW, "view", 2)):
+            m = pattern.match(statement)
+            if m:
+                name = ident(m.group(group))
+                exists = name in schema["functions" if kind == "function" else "views"]
+                record(history, f"{kind} {name}", "replace" if exists else "create", file, line)
+                return
+    elif head.startswith("ALTER"):
+        m = ALTER_TABLE.match(statement)
+        if m:
+            check_alter_table(schema, final, m, statement, *args)
+    elif head.startswith("DROP"):
+        m = DROP.match(statement)
+        if m:
+            check_drop(schema, m, file, line, history)
+
+
+def overwritten(history: dict) -> list:
+    """One finding per object created, replaced or dropped in more than one file."""
+    findings = []
+    for key, events in history.items():
+        if len({e["file"] for e in events}) < 2 or not any(e["action"] in ("replace", "drop") for e in events):
+            continue
+        last = events[-1]
+        steps = ', '.join(f"{e['action']} {Path(e['file']).name}:{e['line']}" for e in events)
+        state = "dropped" if last["action"] == "drop" else f"in effect from {Path(last['file']).name}:{last['line']}"
+        findings.append(finding("overwritten", last["file"], last["line"],
+                                f"{key[0].upper()}{key[1:]} changes {len(events)} times ({steps}); {state}"))
+    return findings
+
+
+def analyze(project_path: Path) -> dict:
+    files = migration_files(project_path)
+    entries, findings = apply_order(project_path, files)
+    final = load_project_schema(project_path)
+
+    schema = new_schema()
+    history = {}
+    for path in files:
+        name = path.relative_to(project_path).as_posix()
+        schema["files"].append(name)
+        sql = path.read_text(encoding='utf-8', errors='ignore')
+        for statement, line in split_statements(sql):
+            guarded = statement[:2].upper() == "DO"
+            for ddl, ddl_line in ddl_statements(statement, line):
+                check_statement(schema, final, ddl, name, ddl_line, guarded, findings, history)
+                apply_statement(schema, ddl, name, ddl_line)
+    findings.extend(overwritten(history))
+
+    position = {entry["file"]: i for i, entry in enumerate(entries)}
+    findings.sort(key=lambda f: (position.get(f["file"], len(position)), f["line"], f["rule"]))
+    return {"order": entries, "findings": findings, "tables": len(final["tables"])}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check Supabase migration order, versions and redundant DDL")
+    parser.add_argument("project", nargs="?", default=".", help="Project path")
+    parser.add_argument("--json", action="store_true", help="Print only the JSON report")
+    parser.add_argument("--strict", action="store_true", help="Exit 1 on high severity findings")
+    args = parser.parse_args()
+    project_path = Path(args.project).resolve()
+
+    if not migration_files(project_path):
+        output = {
+            "script": "migration_order_checker",
+            "project": str(project_path),
+            "files": 0,
+            "findings": 0,
+            "passed": True,
+            "message": "No SQL migrations found"
+        }
+        print(json.dumps(output, indent=2))
+        sys.exit(0)
+
+    result = analyze(project_path)
+    statuses = {status: sum(1 for e in result["order"] if e["status"] == status)
+                for status in ("base", "applied", "duplicate", "skipped")}
+    severities = {level: sum(1 for f in result["findings"] if f["severity"] == level)
+                  for level in ("high", "medium", "low")}
+    output = {
+        "script": "migration_order_checker",
+        "project": str(project_path),
+        "files": len(result["order"]),
+        "order": statuses,
+        "findings": len(result["findings"]),
+        "by_severity": severities,
+        "passed": not (args.strict and severities["high"]),
+        "apply_order": result["order"],
+        "details": result["findings"]
+    }
+
+    if args.json:
+        print(json.dumps(output, indent=2))
+        sys.exit(0 if output["passed"] else 1)
+
+    print(f"\n{'='*60}")
+    print(f"[MIGRATION ORDER CHECKER] Apply Order & Conflicts")
+    print(f"{'='*60}")
+    print(f"Project: {project_path}")
+    print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("-"*60)
+    print(f"Files: {len(result['order'])} ({statuses['base']} base, {statuses['applied']} applied, "
+          f"{statuses['duplicate']} duplicate versions, {statuses['skipped']} skipped)")
+
+    print("\n" + "="*60)
+    print("APPLY ORDER")
+    print("="*60)
+    step = 0
+    for entry in result["order"]:
+        if entry["status"] in ("base", "applied"):
+            step += 1
+            label = f"{step:>3}"
+        else:
+            label = "  -"
+        note = {"base": "  (base schema)", "skipped": "  SKIPPED: no version",
+                "duplicate": f"  DUPLICATE of {Path(entry.get('same_as', '')).name}"}.get(entry["status"], "")
+        print(f"{label} {entry['version'] or '':<15} {Path(entry['file']).name}{note}")
+
+    print("\n" + "="*60)
+    print("FINDINGS")
+    print("="*60)
+    if not result["findings"]:
+        print("No ordering conflicts or redundant DDL found!")
+    for item in result["findings"]:
+        print(f"\n[{item['severity'].upper()}] {item['file']}:{item['line']} {item['rule']}")
+        print(f"  {item['message']}")
+
+    print("\n" + json.dumps({k: v for k, v in output.items() if k not in ("details", "apply_order")}, indent=2))
+    sys.exit(0 if output["passed"] else 1)
+
+
+if __name__ == "__main__":
+    main()
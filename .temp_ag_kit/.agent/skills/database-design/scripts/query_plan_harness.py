@@ -0,0 +1,689 @@
+#!/usr/bin/env python3
+"""
+Skill: database-design
+Script: query_plan_harness.py
+Purpose: EXPLAIN (ANALYZE, BUFFERS) the hot queries against a throwaway
+         Postgres loaded with the migrations and synthetic data
+Usage: python query_plan_harness.py <project_path> [--dsn DSN] [--orders N] [--end-date YYYY-MM-DD]
+                                     [--save-baseline]
+Output: Plan/latency report per query; exit 1 on regressions against the baseline
+Note: Starts a private cluster with initdb/pg_ctl in a temp dir (binaries from
+      $PG_BIN, `pg_config --bindir` or PATH) unless a stand-in database is
+      given with --dsn, $QUERY_PLAN_DSN or "dsn" in the config file. A
+      stand-in must be disposable: migrations and data are loaded into it
+      (use --skip-setup to reuse what is already there).
+      Data is seeded in SQL at the configured scale, or loaded from
+      synthetic_data.py output with --data <dir> for realistic skew and
+      volumes in the millions. Seeded data ends on --end-date (default: the
+      baseline's, else today) and "now" in the queries is the day after it,
+      so runs on different days see the same rows; a baseline is only
+      compared at the same scale, seed and end date.
+      Queries run as the store owner under RLS (role authenticated with
+      request.jwt.claim.sub set), the way PostgREST runs them; "role": null
+      runs as the connecting user, like a SECURITY DEFINER function.
+
+Config:   <project>/.agent/query-plan.config.json, for example
+    {
+      "dsn": "postgresql://postgres@localhost:54322/bench",
+      "scale": {"stores": 50, "orders": 500000},
+      "queries": [{"name": "orders_by_phone", "role": "authenticated",
+                   "sql": "SELECT * FROM orders WHERE user_id = :'store_id' AND customer_phone = :'phone'"}]
+    }
+    Queries use psql variables :'store_id' (busiest store), :'day'
+    (its busiest day), :'phone' (one of its customers) and :'now' (the
+    reference time: midnight after the last day of data; use it instead
+    of now()/current_date).
+Baseline: <project>/.agent_cache/query_plan_baseline.json (--save-baseline)
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import argparse
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, str(Path(__file__).parent))
+from sql_schema import migration_files
+
+# Fix Windows console encoding
+try:
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+except:
+    pass
+
+CONFIG_FILE = ".agent/query-plan.config.json"
+BASELINE_FILE = ".agent_cache/query_plan_baseline.json"
+PLANS_DIR = ".agent_cache/query_plans"
+
+DEFAULT_SCALE = {
+    "stores": 20,
+    "customers": 5000,
+    "orders": 100000,
+    "items_per_order": 3,
+    "products_per_store": 40,
+    "days": 180,
+}
+
+# A query regresses when it is this much slower (and by at least MIN_DELTA_MS)
+TIME_TOLERANCE = 0.25
+MIN_DELTA_MS = 1.0
+BUFFER_TOLERANCE = 0.25
+MIN_DELTA_BUFFERS = 100
+
+# What the app runs most: the orders board, reports and the analytics pages
+HOT_QUERIES = [
+    {
+        # useDataCache: orders with embedded order_items, newest first
+        "name": "orders_kanban",
+        "role": "authenticated",
+        "sql": """
+            SELECT o.*, (SELECT json_agg(oi) FROM order_items oi WHERE oi.order_id = o.id) AS order_items
+            FROM orders o
+            WHERE o.user_id = :'store_id'
+            ORDER BY o.created_at DESC
+            LIMIT 100"""
+    },
+    {
+        # acesso/[token]/[pagina]/view: open orders by status
+        "name": "orders_kanban_status",
+        "role": "authenticated",
+        "sql": """
+            SELECT * FROM orders
+            WHERE user_id = :'store_id' AND status IN ('pending', 'preparing', 'ready', 'delivering')
+            ORDER BY created_at"""
+    },
+    {
+        # relatorios: orders of the last 30 days
+        "name": "report_period_orders",
+        "role": "authenticated",
+        "sql": """
+            SELECT * FROM orders
+            WHERE user_id = :'store_id'
+              AND created_at >= :'now'::timestamptz - interval '30 days' AND created_at <= :'now'::timestamptz
+              AND status <> 'cancelled'"""
+    },
+    {
+        # relatorios: order_items .in('order_id', ids)
+        "name": "report_order_items",
+        "role": "authenticated",
+        "sql": """
+            SELECT * FROM order_items
+            WHERE order_id IN (
+                SELECT id FROM orders WHERE user_id = :'store_id'
+                  AND created_at >= :'now'::timestamptz - interval '30 days'
+            )"""
+    },
+    {
+        # useAnalytics: daily_analytics for the last 30 days
+        "name": "daily_analytics_range",
+        "role": "authenticated",
+        "sql": """
+            SELECT * FROM daily_analytics
+            WHERE user_id = :'store_id' AND date >= :'now'::date - 30
+            ORDER BY date DESC"""
+    },
+    {
+        # populate_daily_analytics: the per-day rollup over orders
+        "name": "daily_analytics_rollup",
+        "role": None,
+        "sql": """
+            SELECT count(*) AS total_orders,
+                   sum(total) FILTER (WHERE payment_status = 'paid') AS revenue,
+                   count(DISTINCT customer_id) AS customers,
+                   mode() WITHIN GROUP (ORDER BY EXTRACT(HOUR FROM created_at)) AS peak_hour
+            FROM orders
+            WHERE user_id = :'store_id' AND DATE(created_at) = :'day'"""
+    },
+    {
+        # populate_daily_analytics: product stats for the day
+        "name": "daily_analytics_products",
+        "role": None,
+        "sql": """
+            SELECT COALESCE(SUM(oi.quantity), 0), COUNT(DISTINCT oi.product_id)
+            FROM order_items oi
+            JOIN orders o ON o.id = oi.order_id
+            WHERE o.user_id = :'store_id' AND DATE(o.created_at) = :'day' AND o.payment_status = 'paid'"""
+    },
+    {
+        # Checkout / loyalty: customer by phone
+        "name": "customer_by_phone",
+        "role": "authenticated",
+        "sql": "SELECT * FROM customers WHERE user_id = :'store_id' AND phone = :'phone'"
+    },
+    {
+        # Public menu (anon): available products in menu order
+        "name": "public_menu_products",
+        "role": "anon",
+        "sql": """
+            SELECT * FROM products
+            WHERE user_id = :'store_id' AND available = true
+            ORDER BY display_order"""
+    },
+]
+
+# What Supabase provides that the migrations rely on
+SUPABASE_STUBS = """
+DO $$
+DECLARE r text;
+BEGIN
+    FOREACH r IN ARRAY ARRAY['anon', 'authenticated', 'service_role'] LOOP
+        IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = r) THEN
+            EXECUTE format('CREATE ROLE %I NOLOGIN', r);
+        END IF;
+    END LOOP;
+    IF NOT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'uuid-ossp') THEN
+        EXECUTE 'CREATE OR REPLACE FUNCTION public.uuid_generate_v4() RETURNS uuid
+                 LANGUAGE sql VOLATILE AS $f$ SELECT gen_random_uuid() $f$';
+    ELSE
+        CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+    END IF;
+END $$;
+
+CREATE SCHEMA IF NOT EXISTS auth;
+CREATE TABLE IF NOT EXISTS auth.users (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    email text,
+    raw_user_meta_data jsonb DEFAULT '{}',
+    created_at timestamptz DEFAULT now()
+);
+CREATE OR REPLACE FUNCTION auth.uid() RETURNS uuid LANGUAGE sql STABLE AS
+    $$ SELECT nullif(current_setting('request.jwt.claim.sub', true), '')::uuid $$;
+CREATE OR REPLACE FUNCTION auth.role() RETURNS text LANGUAGE sql STABLE AS
+    $$ SELECT nullif(current_setting('request.jwt.claim.role', true), '') $$;
+CREATE OR REPLACE FUNCTION auth.jwt() RETURNS jsonb LANGUAGE sql STABLE AS
+    $$ SELECT coalesce(nullif(current_setting('request.jwt.claims', true), ''), '{}')::jsonb $$;
+
+CREATE SCHEMA IF NOT EXISTS storage;
+CREATE TABLE IF NOT EXISTS storage.buckets (id text PRIMARY KEY, name text, public boolean);
+CREATE TABLE IF NOT EXISTS storage.objects (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(), bucket_id text, name text, owner uuid
+);
+CREATE OR REPLACE FUNCTION storage.foldername(name text) RETURNS text[] LANGUAGE sql IMMUTABLE AS
+    $$ SELECT string_to_array(name, '/') $$;
+"""
+
+GRANTS = """
+GRANT USAGE ON SCHEMA public, auth, storage TO anon, authenticated, service_role;
+GRANT ALL ON ALL TABLES IN SCHEMA public TO anon, authenticated, service_role;
+GRANT EXECUTE ON ALL FUNCTIONS IN SCHEMA public, auth, storage TO anon, authenticated, service_role;
+"""
+
+# Deterministic (setseed, :'end_date') synthetic tenants. Store s owns customers
+# s, s + stores, s + 2*stores, ...; busy stores and dinner hours are favoured.
+SEED_SQL = """
+SELECT setseed(:seed);
+
+INSERT INTO auth.users (id, email)
+SELECT md5('store' || s)::uuid, 'store' || s || '@example.com' FROM generate_series(1, :stores) s;
+
+INSERT INTO user_settings (user_id, app_name, public_slug)
+SELECT md5('store' || s)::uuid, 'Store ' || s, 'store-' || s FROM generate_series(1, :stores) s;
+
+INSERT INTO categories (id, user_id, name, display_order)
+SELECT md5('category' || s || '-' || c)::uuid, md5('store' || s)::uuid, 'Category ' || c, c
+FROM generate_series(1, :stores) s, generate_series(1, 8) c;
+
+INSERT INTO products (id, user_id, category_id, name, price, available, display_order)
+SELECT md5('product' || s || '-' || p)::uuid, md5('store' || s)::uuid,
+       md5('category' || s || '-' || (1 + p % 8))::uuid, 'Product ' || p,
+       round((5 + random() * 60)::numeric, 2), random() > 0.1, p
+FROM generate_series(1, :stores) s, generate_series(1, :products_per_store) p;
+
+INSERT INTO customers (id, user_id, phone, name)
+SELECT md5('customer' || c)::uuid, md5('store' || (1 + (c - 1) % :stores))::uuid,
+       '55' || lpad(c::text, 9, '0'), 'Customer ' || c
+FROM generate_series(1, :customers) c;
+
+CREATE TEMP TABLE seed_orders AS
+SELECT o,
+       1 + floor(:stores * power(random(), 2))::int AS store,
+       floor(random() * greatest(:customers / :stores, 1))::int AS customer_slot,
+       1 + floor(random() * (2 * :items_per_order - 1))::int AS item_count,
+       :'end_date'::date::timestamptz
+         - make_interval(days => floor(power(random(), 1.5) * :days)::int)
+         + make_interval(hours => (ARRAY[11, 12, 12, 13, 18, 19, 19, 20, 20, 21])[1 + floor(random() * 10)::int],
+                         mins => floor(random() * 60)::int) AS created_at
+FROM generate_series(1, :orders) o;
+
+INSERT INTO orders (id, user_id, order_number, customer_name, customer_id, status, payment_method,
+                    payment_status, subtotal, total, is_delivery, created_at, updated_at)
+SELECT md5('order' || o)::uuid, md5('store' || store)::uuid, o,
+       'Customer ' || (customer_slot * :stores + store),
+       CASE WHEN customer_slot * :stores + store <= :customers
+            THEN md5('customer' || (customer_slot * :stores + store))::uuid END,
+       (ARRAY['pending', 'preparing', 'ready', 'delivering', 'delivered', 'delivered', 'delivered', 'cancelled'])
+           [1 + floor(random() * 8)::int],
+       (ARRAY['money', 'pix', 'credit', 'debit'])[1 + floor(random() * 4)::int],
+       CASE WHEN random() < 0.85 THEN 'paid' ELSE 'pending' END,
+       0, 0, random() < 0.5, created_at, created_at
+FROM seed_orders;
+
+INSERT INTO order_items (order_id, product_id, product_name, quantity, unit_price, total)
+SELECT md5('order' || so.o)::uuid, md5('product' || so.store || '-' || i.p)::uuid, 'Product ' || i.p,
+       i.quantity, 12.50, 12.50 * i.quantity
+FROM seed_orders so
+CROSS JOIN LATERAL (
+    SELECT 1 + floor(:products_per_store * power(random(), 3))::int AS p,
+           1 + floor(random() * 3)::int AS quantity
+    FROM generate_series(1, so.item_count)
+) i;
+
+UPDATE orders o SET subtotal = t.total, total = t.total
+FROM (SELECT order_id, sum(total) AS total FROM order_items GROUP BY order_id) t
+WHERE t.order_id = o.id;
+
+INSERT INTO daily_analytics (user_id, date, total_revenue, total_orders, paid_orders, cancelled_orders,
+                             delivery_orders, pickup_orders, total_customers, peak_hour)
+SELECT user_id, created_at::date,
+       coalesce(sum(total) FILTER (WHERE payment_status = 'paid'), 0), count(*),
+       count(*) FILTER (WHERE payment_status = 'paid'), count(*) FILTER (WHERE status = 'cancelled'),
+       count(*) FILTER (WHERE is_delivery), count(*) FILTER (WHERE NOT is_delivery),
+       count(DISTINCT customer_id), mode() WITHIN GROUP (ORDER BY EXTRACT(HOUR FROM created_at))::int
+FROM orders GROUP BY 1, 2;
+
+DROP TABLE seed_orders;
+ANALYZE;
+"""
+
+PARAMETERS_SQL = """
+WITH busiest AS (SELECT user_id FROM orders GROUP BY user_id ORDER BY count(*) DESC, user_id LIMIT 1)
+SELECT b.user_id,
+       (SELECT created_at::date FROM orders WHERE user_id = b.user_id
+        GROUP BY 1 ORDER BY count(*) DESC, 1 LIMIT 1),
+       (SELECT phone FROM customers WHERE user_id = b.user_id ORDER BY phone LIMIT 1)
+FROM busiest b;
+"""
+
+
+# ============================================================================
+# POSTGRES
+# ============================================================================
+
+def find_pg_bin():
+    """Directory with initdb/pg_ctl/psql, or None."""
+    candidates = []
+    if os.environ.get("PG_BIN"):
+        candidates.append(Path(os.environ["PG_BIN"]))
+    try:
+        result = subprocess.run(["pg_config", "--bindir"], capture_output=True, text=True, timeout=10)
+        if result.returncode == 0 and result.stdout.strip():
+            candidates.append(Path(result.stdout.strip()))
+    except (OSError, subprocess.TimeoutExpired):
+        pass
+    initdb = shutil.which("initdb")
+    if initdb:
+        candidates.append(Path(initdb).parent)
+    suffix = ".exe" if os.name == 'nt' else ""
+    for candidate in candidates:
+        if all((candidate / f"{tool}{suffix}").exists() for tool in ("initdb", "pg_ctl", "psql")):
+            return candidate
+    return None
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class TempCluster:
+    """A private Postgres cluster in a temp dir, removed on exit."""
+
+    def __init__(self, bin_dir: Path, keep: bool = False):
+        self.bin_dir = bin_dir
+        self.keep = keep
+        self.root = Path(tempfile.mkdtemp(prefix="query-plan-"))
+        self.data = self.root / "data"
+        self.port = free_port()
+        self.dsn = f"postgresql://postgres@127.0.0.1:{self.port}/postgres"
+
+    def __enter__(self):
+        subprocess.run(
+            [str(self.bin_dir / "initdb"), "-D", str(self.data), "-U", "postgres",
+             "--auth=trust", "-E", "UTF8", "--no-sync"],
+            check=True, capture_output=True, text=True
+        )
+        options = f"-p {self.port} -c listen_addresses=127.0.0.1 -c fsync=off -c shared_buffers=256MB"
+        if os.name != 'nt':
+            options += f" -k {self.root}"
+        subprocess.run(
+            [str(self.bin_dir / "pg_ctl"), "-D", str(self.data), "-o", options,
+             "-l", str(self.root / "postgres.log"), "-w", "start"],
+            check=True, capture_output=True, text=True
+        )
+        return self
+
+    def __exit__(self, *exc):
+        subprocess.run([str(self.bin_dir / "pg_ctl"), "-D", str(self.data), "-m", "fast", "stop"],
+                       capture_output=True, text=True)
+        if self.keep:
+            print(f"Cluster kept in {self.root}")
+        else:
+            shutil.rmtree(self.root, ignore_errors=True)
+
+
+def psql(psql_bin: str, dsn: str, sql: str, variables: dict = None, timeout: int = 3600,
+         cwd: Path = None) -> subprocess.CompletedProcess:
+    """Run SQL through psql (stdin); errors are reported, not raised."""
+    cmd = [psql_bin, "-X", "-q", "-A", "-t", "-v", "ON_ERROR_STOP=0", "-d", dsn]
+    for name, value in (variables or {}).items():
+        cmd += ["-v", f"{name}={value}"]
+    return subprocess.run(cmd + ["-f", "-"], input=sql, capture_output=True, text=True, timeout=timeout, cwd=cwd)
+
+
+def errors_of(result: subprocess.CompletedProcess) -> list:
+    return [line.split("ERROR:", 1)[1].strip() for line in result.stderr.splitlines() if "ERROR:" in line]
+
+
+# ============================================================================
+# SETUP
+# ============================================================================
+
+def apply_migrations(psql_bin: str, dsn: str, project_path: Path) -> list:
+    """Stubs, base schema and migrations in order; returns per-file errors."""
+    report = []
+    stubs = psql(psql_bin, dsn, SUPABASE_STUBS)
+    if errors_of(stubs):
+        report.append({"file": "(supabase stubs)", "errors": errors_of(stubs)})
+    for path in migration_files(project_path):
+        result = psql(psql_bin, dsn, path.read_text(encoding='utf-8', errors='ignore'))
+        errors = errors_of(result)
+        if errors:
+            report.append({"file": path.relative_to(project_path).as_posix(), "errors": errors})
+    psql(psql_bin, dsn, GRANTS)
+    return report
+
+
+def seed(psql_bin: str, dsn: str, scale: dict, seed_value: float, end_date: str) -> list:
+    result = psql(psql_bin, dsn, SEED_SQL, {**scale, "seed": seed_value, "end_date": end_date})
+    return errors_of(result)
+
+
+def load_data(psql_bin: str, dsn: str, data_dir: Path) -> list:
+    """COPY files from synthetic_data.py; load.sql uses paths relative to data_dir."""
+    result = psql(psql_bin, dsn, (data_dir / "load.sql").read_text(encoding='utf-8'), cwd=data_dir)
+    return errors_of(result)
+
+
+def query_parameters(psql_bin: str, dsn: str) -> dict:
+    result = psql(psql_bin, dsn, PARAMETERS_SQL)
+    row = result.stdout.strip().split("|") if result.stdout.strip() else []
+    if len(row) != 3:
+        raise RuntimeError(f"No seeded data to query: {result.stderr.strip()[:200]}")
+    return {"store_id": row[0], "day": row[1], "phone": row[2]}
+
+
+# ============================================================================
+# PLANS
+# ============================================================================
+
+def walk_plan(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from walk_plan(child)
+
+
+def summarize_plan(explain: dict) -> dict:
+    plan = explain["Plan"]
+    nodes = list(walk_plan(plan))
+    return {
+        "execution_ms": explain.get("Execution Time"),
+        "planning_ms": explain.get("Planning Time"),
+        "rows": plan.get("Actual Rows"),
+        "shared_hit": plan.get("Shared Hit Blocks", 0),
+        "shared_read": plan.get("Shared Read Blocks", 0),
+        "seq_scans": sorted({n["Relation Name"] for n in nodes
+                             if n["Node Type"] == "Seq Scan" and "Relation Name" in n}),
+        "signature": [
+            n["Node Type"] + (f":{n.get('Index Name') or n.get('Relation Name')}"
+                              if n.get('Index Name') or n.get('Relation Name') else "")
+            for n in nodes
+        ],
+    }
+
+
+def explain_query(psql_bin: str, dsn: str, query: dict, params: dict, runs: int) -> dict:
+    """Median of `runs` EXPLAIN ANALYZE executions after one warm-up run."""
+    role = query.get("role", "authenticated")
+    setup = ""
+    if role:
+        setup = (f"SET LOCAL ROLE {role};\n"
+                 f"SET LOCAL request.jwt.claim.sub = :'store_id';\n"
+                 f"SET LOCAL request.jwt.claim.role = '{role}';\n")
+    sql = f"BEGIN;\n{setup}EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query['sql'].strip()};\nROLLBACK;\n"
+
+    samples = []
+    for _ in range(runs + 1):
+        result = psql(psql_bin, dsn, sql, params, timeout=600)
+        errors = errors_of(result)
+        if errors:
+            return {"name": query["name"], "error": errors[0]}
+        samples.append(json.loads(result.stdout)[0])
+    summaries = [summarize_plan(s) for s in samples[1:]]
+    times = [s["execution_ms"] for s in summaries]
+    last = summaries[-1]
+    return {
+        "name": query["name"],
+        "role": role or "(connection)",
+        "execution_ms": round(statistics.median(times), 3),
+        "execution_ms_max": round(max(times), 3),
+        "planning_ms": round(statistics.median(s["planning_ms"] for s in summaries), 3),
+        "rows": last["rows"],
+        "buffers": last["shared_hit"] + last["shared_read"],
+        "shared_read": last["shared_read"],
+        "seq_scans": last["seq_scans"],
+        "signature": last["signature"],
+        "plan": samples[-1],
+    }
+
+
+def compare(result: dict, baseline: dict) -> list:
+    """Regressions of one query against its baseline entry."""
+    regressions = []
+    before, now = baseline["execution_ms"], result["execution_ms"]
+    if now - before > MIN_DELTA_MS and now > before * (1 + TIME_TOLERANCE):
+        regressions.append(f"execution {before} -> {now} ms")
+    before_buf, now_buf = baseline["buffers"], result["buffers"]
+    if now_buf - before_buf > MIN_DELTA_BUFFERS and now_buf > before_buf * (1 + BUFFER_TOLERANCE):
+        regressions.append(f"buffers {before_buf} -> {now_buf}")
+    new_scans = sorted(set(result["seq_scans"]) - set(baseline.get("seq_scans", [])))
+    if new_scans:
+        regressions.append(f"new Seq Scan on {', '.join(new_scans)}")
+    return regressions
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def load_config(project_path: Path) -> dict:
+    path = project_path / CONFIG_FILE
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def hot_queries(config: dict) -> list:
+    """Built-in catalogue, with config entries added or replacing by name."""
+    queries = {q["name"]: q for q in HOT_QUERIES}
+    for query in config.get("queries", []):
+        queries[query["name"]] = query
+    return list(queries.values())
+
+
+def run(project_path: Path, args, config: dict) -> dict:
+    dsn = args.dsn or os.environ.get("QUERY_PLAN_DSN") or config.get("dsn")
+    scale = {**DEFAULT_SCALE, **config.get("scale", {}),
+             **{k: v for k, v in vars(args).items() if k in DEFAULT_SCALE and v is not None}}
+    report = {"scale": scale, "seed": args.seed, "end_date": args.end_date, "setup_errors": [], "queries": []}
+    if args.data:
+        with open(args.data / "manifest.json", 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        report["scale"] = manifest["scale"]
+        report["seed"] = manifest["seed"]
+        report["end_date"] = manifest["end"]
+
+    def execute(psql_bin: str, target: str):
+        started = time.perf_counter()
+        if not args.skip_setup:
+            report["setup_errors"] = apply_migrations(psql_bin, target, project_path)
+            if args.data:
+                seed_errors = load_data(psql_bin, target, args.data)
+            else:
+                seed_errors = seed(psql_bin, target, scale, args.seed, report["end_date"])
+            if seed_errors:
+                report["setup_errors"].append({"file": "(synthetic data)", "errors": seed_errors})
+        report["setup_seconds"] = round(time.perf_counter() - started, 1)
+        params = query_parameters(psql_bin, target)
+        params["now"] = (date.fromisoformat(report["end_date"]) + timedelta(days=1)).isoformat()
+        report["parameters"] = params
+        for query in hot_queries(config):
+            print(f"  EXPLAIN {query['name']}...")
+            report["queries"].append(explain_query(psql_bin, target, query, params, args.runs))
+
+    if dsn:
+        psql_bin = shutil.which("psql") or str((find_pg_bin() or Path()) / "psql")
+        report["database"] = "stand-in"
+        execute(psql_bin, dsn)
+    else:
+        bin_dir = find_pg_bin()
+        if bin_dir is None:
+            return None
+        report["database"] = "temp-cluster"
+        with TempCluster(bin_dir, keep=args.keep) as cluster:
+            execute(str(bin_dir / "psql"), cluster.dsn)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN ANALYZE hot queries against a throwaway Postgres")
+    parser.add_argument("project", nargs="?", default=".", help="Project path")
+    parser.add_argument("--dsn", help="Disposable stand-in database instead of a temp cluster")
+    for name, value in DEFAULT_SCALE.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", dest=name, type=int, help=f"Scale (default {value})")
+    parser.add_argument("--seed", type=float, default=0.42, help="setseed() value for reproducible data")
+    parser.add_argument("--end-date", help="Last day of seeded data, YYYY-MM-DD "
+                                           "(default: the baseline's, else today; --data uses its manifest's)")
+    parser.add_argument("--data", type=Path, help="Load COPY files from synthetic_data.py instead of seeding")
+    parser.add_argument("--runs", type=int, default=5, help="Measured runs per query (after one warm-up)")
+    parser.add_argument("--skip-setup", action="store_true", help="Stand-in already has schema and data")
+    parser.add_argument("--keep", action="store_true", help="Keep the temp cluster directory")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--json", action="store_true", help="Print only the JSON report")
+    args = parser.parse_args()
+    project_path = Path(args.project).resolve()
+    if args.data:
+        args.data = args.data.resolve()
+        if not (args.data / "manifest.json").exists():
+            parser.error(f"--data: no manifest.json in {args.data} (run synthetic_data.py first)")
+
+    if not migration_files(project_path):
+        print(json.dumps({"script": "query_plan_harness", "project": str(project_path),
+                          "passed": True, "skipped": True, "message": "No SQL migrations found"}, indent=2))
+        sys.exit(0)
+
+    if not args.json:
+        print(f"\n{'='*60}")
+        print(f"[QUERY PLAN HARNESS] Hot Query Plans")
+        print(f"{'='*60}")
+        print(f"Project: {project_path}")
+        print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print("-"*60)
+
+    baseline_path = project_path / BASELINE_FILE
+    baseline = {}
+    if baseline_path.exists():
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    try:
+        args.end_date = date.fromisoformat(
+            args.end_date or baseline.get("end_date") or date.today().isoformat()).isoformat()
+    except ValueError:
+        parser.error(f"--end-date: expected YYYY-MM-DD, got {args.end_date}")
+
+    config = load_config(project_path)
+    try:
+        report = run(project_path, args, config)
+    except (OSError, RuntimeError, subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+        detail = getattr(e, 'stderr', None) or str(e)
+        print(json.dumps({"script": "query_plan_harness", "project": str(project_path),
+                          "passed": False, "error": str(detail).strip()[:500]}, indent=2))
+        sys.exit(1)
+
+    if report is None:
+        print(json.dumps({"script": "query_plan_harness", "project": str(project_path), "passed": True,
+                          "skipped": True,
+                          "message": "No Postgres found: install it, set PG_BIN, or pass --dsn"}, indent=2))
+        sys.exit(0)
+
+    # Full plans for inspection (explain.dalibo.com, pev2)
+    plans_dir = project_path / PLANS_DIR
+    plans_dir.mkdir(parents=True, exist_ok=True)
+    for query in report["queries"]:
+        if "plan" in query:
+            with open(plans_dir / f"{query['name']}.json", 'w', encoding='utf-8') as f:
+                json.dump([query.pop("plan")], f, indent=2)
+
+    # Same dataset: scale, seed and end date (seeded dates and :'now' derive from it)
+    comparable = all(baseline.get(k) == report[k] for k in ("scale", "seed", "end_date"))
+    baseline_queries = {q["name"]: q for q in baseline.get("queries", []) if "error" not in q}
+
+    regressions = []
+    for query in report["queries"]:
+        if "error" in query or not comparable or query["name"] not in baseline_queries:
+            continue
+        found = compare(query, baseline_queries[query["name"]])
+        query["regressions"] = found
+        regressions.extend(f"{query['name']}: {r}" for r in found)
+
+    failed_queries = [q["name"] for q in report["queries"] if "error" in q]
+    passed = not regressions and not failed_queries
+
+    if args.save_baseline and not failed_queries:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump({"timestamp": datetime.now().isoformat(), **report}, f, indent=2)
+
+    output = {
+        "script": "query_plan_harness",
+        "project": str(project_path),
+        **report,
+        "baseline": str(baseline_path) if baseline else None,
+        "baseline_comparable": comparable if baseline else None,
+        "regressions": regressions,
+        "passed": passed
+    }
+
+    if not args.json:
+        print(f"\nDatabase: {report['database']}  setup: {report['setup_seconds']}s  scale: {report['scale']}")
+        for item in report["setup_errors"]:
+            print(f"  [!] {item['file']}: {len(item['errors'])} error(s), first: {item['errors'][0][:100]}")
+        print(f"\n{'Query':<28} {'ms (median)':>12} {'max':>9} {'buffers':>9} {'rows':>8}  seq scans")
+        for query in report["queries"]:
+            if "error" in query:
+                print(f"{query['name']:<28} ERROR {query['error'][:80]}")
+                continue
+            mark = " [REGRESSED]" if query.get("regressions") else ""
+            print(f"{query['name']:<28} {query['execution_ms']:>12} {query['execution_ms_max']:>9} "
+                  f"{query['buffers']:>9} {query['rows']:>8}  {', '.join(query['seq_scans']) or '-'}{mark}")
+        if baseline and not comparable:
+            print(f"\n[!] Baseline was recorded on different data (scale/seed/end date "
+                  f"{baseline.get('end_date')}); not compared")
+        for regression in regressions:
+            print(f"[X] {regression}")
+        print(f"\nPlans written to {PLANS_DIR}/")
+
+    print(json.dumps(output, indent=2) if args.json else "\n" + json.dumps(
+        {k: output[k] for k in ("script", "project", "database", "regressions", "passed")}, indent=2))
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Skill: database-design
+Script: rls_policy_analyzer.py
+Purpose: Classify the per-row cost of Supabase row-level security policies
+Usage: python rls_policy_analyzer.py <project_path> [--json]
+Output: Findings with migration file:line and a suggested indexed form
+Note: Analyzes the policies in effect after replaying supabase/migrations
+      (see sql_schema.py); dropped or replaced policies cost nothing.
+
+Cost classes (cheapest first):
+    constant             no row data involved (USING (true))
+    column               plain column comparisons against constants/cached values
+    per-row-call         a function such as auth.uid() evaluated for every row
+    correlated-subquery  EXISTS/IN subquery re-run for every row, on indexed columns
+    correlated-unindexed same, but the correlated column has no index (seq scan per row)
+
+Findings:
+    uncached-auth-call       auth.uid()/auth.jwt()/... not wrapped in (select ...)
+    correlated-subquery      per-row subquery scoped by auth.uid(); rewrite as IN (SELECT ...) evaluated once
+                             (not reported for FOR INSERT checks, which usually see one row)
+    unindexed-correlation    correlated subquery column without an index
+    overlapping-permissive   several permissive policies apply to one command (all are OR'ed)
+    repeated-policy          same expression repeated across commands; one FOR ALL policy when it
+                             covers all four commands, otherwise a shared STABLE SQL function
+"""
+import sys
+import json
+import re
+import argparse
+from pathlib import Path
+from datetime import datetime
+
+sys.path.insert(0, str(Path(__file__).parent))
+from sql_schema import (
+    load_project_schema, paren_group, ident, leading_index,
+    function_calls, references_columns, CACHEABLE_FUNCTIONS, NAME
+)
+
+# Fix Windows console encoding
+try:
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+except:
+    pass
+
+COST_CLASSES = ["constant", "column", "per-row-call", "correlated-subquery", "correlated-unindexed"]
+SEVERITY = {
+    "unindexed-correlation": "high",
+    "uncached-auth-call": "medium",
+    "correlated-subquery": "medium",
+    "overlapping-permissive": "medium",
+    "repeated-policy": "low",
+}
+COMMANDS = ["SELECT", "INSERT", "UPDATE", "DELETE"]
+
+SUBQUERY = re.compile(r'\b(EXISTS|IN)\s*\(\s*SELECT\b', re.I)
+FROM_ITEM = re.compile(r'(' + NAME + r')(?:\s+(?:AS\s+)?(?!(?:ON|JOIN|WHERE|INNER|LEFT|RIGHT|CROSS)\b)(\w+))?', re.I)
+JOIN = re.compile(r'\b(?:INNER\s+|LEFT\s+(?:OUTER\s+)?|RIGHT\s+(?:OUTER\s+)?)?JOIN\s+', re.I)
+COLUMN_REF = re.compile(r'^((?:[\w$]+\.){1,2})([\w$]+)$')
+EQUALITY = re.compile(r'^\s*(.+?)\s*=\s*(.+?)\s*$', re.S)
+
+
+def normalize(expression: str) -> str:
+    """Canonical form for comparing policy expressions."""
+    text = re.sub(r'\s+', ' ', expression.strip().lower())
+    text = re.sub(r'\s*\(\s*', '(', text)
+    text = re.sub(r'\s*\)\s*', ')', text)
+    return text.replace('public.', '')
+
+
+def cache_auth_calls(expression: str) -> str:
+    """Expression with every uncached constant auth call wrapped in (select ...)."""
+    result = expression
+    for call in sorted(function_calls(expression), key=lambda c: c["offset"], reverse=True):
+        if call["cached"] or call["name"] not in CACHEABLE_FUNCTIONS or references_columns(call["args"]):
+            continue
+        result = f"{result[:call['offset']]}(select {call['name']}({call['args']})){result[call['end']:]}"
+    return result
+
+
+def split_and(text: str) -> list:
+    """Top-level AND terms of a condition."""
+    return [t.strip() for t in re.split(r'\bAND\b', text, flags=re.I) if t.strip()]
+
+
+def column_ref(text: str):
+    """(qualifier, column) for a qualified column reference, else None."""
+    m = COLUMN_REF.match(text.strip())
+    if not m:
+        return None
+    return ident(m.group(1).rstrip('.')), m.group(2).lower()
+
+
+def parse_subquery(body: str) -> dict:
+    """Tables (by alias) and equality conditions of 'SELECT ... FROM ... WHERE ...'."""
+    from_clause = re.search(r'\bFROM\b(.*?)(?:\bWHERE\b(.*))?$', body, re.I | re.S)
+    if not from_clause:
+        return {"tables": {}, "conditions": [], "where": [], "from": ""}
+    tables = {}
+    conditions = []
+    for part in JOIN.split(from_clause.group(1)):
+        on = re.search(r'\bON\b(.*)$', part, re.I | re.S)
+        item = FROM_ITEM.match(part.strip())
+        if item:
+            table = ident(item.group(1))
+            tables[item.group(2).lower() if item.group(2) else table] = table
+            tables.setdefault(table, table)
+        if on:
+            conditions.extend(split_and(on.group(1)))
+    where = split_and(from_clause.group(2)) if from_clause.group(2) else []
+    conditions.extend(where)
+    return {"tables": tables, "conditions": conditions, "where": where, "from": ' '.join(from_clause.group(1).split())}
+
+
+def analyze_subqueries(schema: dict, table_name: str, expression: str) -> list:
+    """Correlated subqueries in a policy expression and whether they are indexed."""
+    results = []
+    outer_names = {table_name, table_name.split('.')[-1]}
+    for m in SUBQUERY.finditer(expression):
+        body, _ = paren_group(expression, expression.index('(', m.start()))
+        query = parse_subquery(body)
+        correlations = []
+        auth_filters = []
+        for condition in query["conditions"]:
+            eq = EQUALITY.match(condition)
+            if not eq:
+                continue
+            sides = [eq.group(1), eq.group(2)]
+            refs = [column_ref(side) for side in sides]
+            inner = [r for r in refs if r and r[0] in query["tables"]]
+            outer = [r for r in refs if r and r[0] in outer_names and r[0] not in query["tables"]]
+            if inner and outer:
+                correlations.append((query["tables"][inner[0][0]], inner[0][1], outer[0][1], inner[0][0], condition))
+            elif inner and any(re.search(r'auth\.uid', side, re.I) for side in sides):
+                auth_filters.append((query["tables"][inner[0][0]], inner[0][1]))
+        if not correlations:
+            continue
+        for inner_table, inner_column, outer_column, alias, condition in correlations:
+            table = schema["tables"].get(inner_table)
+            results.append({
+                "kind": m.group(1).upper(),
+                "inner_table": inner_table,
+                "inner_column": inner_column,
+                "outer_column": outer_column,
+                "alias": alias,
+                "indexed": bool(table and leading_index(table, inner_column)),
+                "auth_filters": auth_filters,
+                "from": query["from"],
+                "filters": [c for c in query["where"] if c != condition],
+            })
+    return results
+
+
+def rewrite_correlation(schema: dict, correlation: dict) -> str:
+    """Suggested non-correlated form: the subquery runs once and is hashed."""
+    filters = ' AND '.join(cache_auth_calls(f) for f in correlation["filters"]) or 'true'
+    suggestion = (f"{correlation['outer_column']} IN (SELECT {correlation['alias']}.{correlation['inner_column']} "
+                  f"FROM {correlation['from']} WHERE {filters})")
+    for table_name, column in correlation["auth_filters"]:
+        table = schema["tables"].get(table_name)
+        if table and not leading_index(table, column):
+            suggestion += f" with CREATE INDEX ON {table_name} ({column})"
+    return suggestion
+
+
+def analyze_policy(schema: dict, table_name: str, policy_name: str, policy: dict) -> dict:
+    """Cost class and findings for one policy."""
+    findings = []
+    cost = "constant"
+
+    def bump(level: str):
+        nonlocal cost
+        if COST_CLASSES.index(level) > COST_CLASSES.index(cost):
+            cost = level
+
+    for key in ("using", "check"):
+        expression = policy[key]
+        if not expression:
+            continue
+        line = policy[key + "_line"] or policy["line"]
+        if re.search(r'[a-z_]\w*', re.sub(r"'(?:[^']|'')*'|\b(?:true|false|null|is|not)\b", ' ', expression, flags=re.I)):
+            bump("column")
+
+        uncached = [c for c in function_calls(expression)
+                    if not c["cached"] and c["name"] in CACHEABLE_FUNCTIONS and not references_columns(c["args"])]
+        if uncached or any(not c["cached"] and c["name"] in schema["functions"] for c in function_calls(expression)):
+            bump("per-row-call")
+        if uncached:
+            names = sorted({c["name"] + "()" for c in uncached})
+            findings.append({
+                "rule": "uncached-auth-call", "line": line,
+                "message": f"{', '.join(names)} evaluated for every row in {key.upper()}",
+                "suggestion": cache_auth_calls(expression)
+            })
+
+        for correlation in analyze_subqueries(schema, table_name, expression):
+            target = f"{correlation['inner_table']}.{correlation['inner_column']}"
+            # INSERT checks run once per inserted row, usually one: IN (...) would not be cheaper
+            rewritable = correlation["auth_filters"] and policy["command"] != "INSERT"
+            if correlation["indexed"]:
+                bump("correlated-subquery")
+                if not rewritable:
+                    continue  # An index lookup per row; IN (...) would scan far more
+                findings.append({
+                    "rule": "correlated-subquery", "line": line,
+                    "message": f"{correlation['kind']} subquery on {target} filtered by auth.uid() runs once per row",
+                    "suggestion": rewrite_correlation(schema, correlation)
+                })
+            else:
+                bump("correlated-unindexed")
+                suggestion = f"CREATE INDEX ON {correlation['inner_table']} ({correlation['inner_column']})"
+                if rewritable:
+                    suggestion += f", or {rewrite_correlation(schema, correlation)}"
+                findings.append({
+                    "rule": "unindexed-correlation", "line": line,
+                    "message": f"{correlation['kind']} subquery on {target} runs once per row with no index on "
+                               f"{correlation['inner_column']}",
+                    "suggestion": suggestion
+                })
+
+    return {
+        "table": table_name,
+        "policy": policy_name,
+        "command": policy["command"],
+        "file": policy["file"],
+        "line": policy["line"],
+        "cost": cost,
+        "findings": findings
+    }
+
+
+def effective_expressions(policy: dict) -> tuple:
+    """
+    (USING, WITH CHECK) as Postgres applies them to the policy's command: SELECT/DELETE
+    only filter with USING, INSERT only checks, UPDATE checks with USING when no CHECK is given.
+    """
+    using, check = policy["using"], policy["check"]
+    if policy["command"] == "INSERT":
+        return check, check
+    if policy["command"] in ("SELECT", "DELETE"):
+        return using, using
+    return using, check or using
+
+
+def analyze_table_policies(table_name: str, table: dict) -> list:
+    """Findings that involve several policies of one table."""
+    findings = []
+    policies = table["policies"]
+
+    # More than one permissive policy for a command: Postgres ORs them and evaluates each
+    for command in COMMANDS:
+        applicable = [(name, p) for name, p in policies.items()
+                      if p["permissive"] and p["command"] in (command, "ALL")]
+        by_role = {}
+        for name, policy in applicable:
+            for role in policy["roles"]:
+                by_role.setdefault(role, []).append((name, policy))
+        for role, entries in sorted(by_role.items()):
+            if len(entries) < 2:
+                continue
+            name, policy = entries[-1]
+            findings.append({
+                "table": table_name, "policy": name, "command": command,
+                "file": policy["file"], "line": policy["line"],
+                "rule": "overlapping-permissive",
+                "message": f"{len(entries)} permissive {command} policies for role {role} on {table_name} "
+                           f"({', '.join(n for n, _ in entries)}) are all evaluated and OR'ed",
+                "suggestion": "merge them into one policy, or make the narrower one RESTRICTIVE"
+            })
+
+    # The same expression written once per command
+    by_expression = {}
+    for name, policy in policies.items():
+        using, check = effective_expressions(policy)
+        if (using or check) and policy["command"] != "ALL":
+            key = (normalize(using or ""), normalize(check or ""), tuple(policy["roles"]))
+            by_expression.setdefault(key, []).append((name, policy))
+    for (using, check, _), entries in by_expression.items():
+        commands = sorted({p["command"] for _, p in entries}, key=COMMANDS.index)
+        if len(commands) < 2:
+            continue
+        name, policy = entries[0]
+        if commands == COMMANDS:
+            using, check = effective_expressions(policy)
+            suggestion = f"CREATE POLICY ... ON {table_name} FOR ALL USING ({cache_auth_calls(using)})"
+            if normalize(check) != normalize(using):
+                suggestion += f" WITH CHECK ({cache_auth_calls(check)})"
+        else:
+            # FOR ALL would also grant the commands not listed here
+            missing = [c for c in COMMANDS if c not in commands]
+            suggestion = f"keep one policy per command (FOR ALL would also allow {'/'.join(missing)}); " \
+                         f"if the expression is costly, move it into a STABLE SQL function " \
+                         f"taking the row's columns and call that from each policy"
+        findings.append({
+            "table": table_name, "policy": name, "command": '/'.join(commands),
+            "file": policy["file"], "line": policy["line"],
+            "rule": "repeated-policy",
+            "message": f"same expression repeated in {len(entries)} policies ({'/'.join(commands)}) on {table_name}",
+            "suggestion": suggestion
+        })
+    return findings
+
+
+def analyze(schema: dict) -> dict:
+    policies = []
+    findings = []
+    for table_name, table in sorted(schema["tables"].items()):
+        for policy_name, policy in table["policies"].items():
+            result = analyze_policy(schema, table_name, policy_name, policy)
+            policies.append({k: v for k, v in result.items() if k != "findings"})
+            for finding in result["findings"]:
+                findings.append({
+                    "table": table_name, "policy": policy_name, "command": policy["command"],
+                    "file": policy["file"], **finding
+                })
+        findings.extend(analyze_table_policies(table_name, table))
+
+    for finding in findings:
+        finding["severity"] = SEVERITY[finding["rule"]]
+    findings.sort(key=lambda f: (f["file"], f["line"], f["rule"]))
+    return {"policies": policies, "findings": findings}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Classify RLS policy cost in Supabase migrations")
+    parser.add_argument("project", nargs="?", default=".", help="Project path")
+    parser.add_argument("--json", action="store_true", help="Print only the JSON report")
+    args = parser.parse_args()
+    project_path = Path(args.project).resolve()
+
+    schema = load_project_schema(project_path)
+    if schema is None:
+        output = {
+            "script": "rls_policy_analyzer",
+            "project": str(project_path),
+            "policies_analyzed": 0,
+            "findings": 0,
+            "passed": True,
+            "message": "No SQL migrations found"
+        }
+        print(json.dumps(output, indent=2))
+        sys.exit(0)
+
+    result = analyze(schema)
+    costs = {cost: 0 for cost in COST_CLASSES}
+    for policy in result["policies"]:
+        costs[policy["cost"]] += 1
+    severities = {level: sum(1 for f in result["findings"] if f["severity"] == level)
+                  for level in ("high", "medium", "low")}
+
+    output = {
+        "script": "rls_policy_analyzer",
+        "project": str(project_path),
+        "policies_analyzed": len(result["policies"]),
+        "cost_classes": costs,
+        "findings": len(result["findings"]),
+        "by_severity": severities,
+        # Policy cost is advisory, like schema_validator
+        "passed": True,
+        "details": result["findings"]
+    }
+
+    if args.json:
+        print(json.dumps(output, indent=2))
+        sys.exit(0)
+
+    print(f"\n{'='*60}")
+    print(f"[RLS POLICY ANALYZER] Row-Level Security Cost")
+    print(f"{'='*60}")
+    print(f"Project: {project_path}")
+    print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("-"*60)
+    print(f"Policies: {len(result['policies'])} in {len(schema['files'])} SQL files")
+    for cost in COST_CLASSES:
+        print(f"  {cost:<22} {costs[cost]}")
+
+    print("\n" + "="*60)
+    print("FINDINGS")
+    print("="*60)
+    if not result["findings"]:
+        print("No costly policies found!")
+    for finding in result["findings"]:
+        print(f"\n[{finding['severity'].upper()}] {finding['file']}:{finding['line']} "
+              f"{finding['rule']} - \"{finding['policy']}\" ({finding['command']})")
+        print(f"  {finding['message']}")
+        print(f"  -> {finding['suggestion']}")
+
+    print("\n" + json.dumps({k: v for k, v in output.items() if k != "details"}, indent=2))
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Schema Validator - Database schema validation
-Validates Prisma schemas and checks for common issues.
+Validates Prisma schemas and Supabase SQL migrations and checks for common issues.
 
 Usage:
     python schema_validator.py <project_path>
@@ -11,14 +11,26 @@ Checks:
     - Missing relations
     - Index recommendations
     - Naming conventions
+    - SQL migrations (supabase/migrations, replayed in filename order on top of
+      supabase/scripts/supabase_schema.sql):
+        - foreign keys without a covering index
+        - RLS policies that call functions once per row
+        - tenant columns (user_id, or compared with auth.uid()) without an index
 """
 
+import os
 import sys
 import json
 import re
+import time
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).parent))
+from sql_schema import (
+    load_project_schema, index_covers, leading_index, function_calls, references_columns, CACHEABLE_FUNCTIONS
+)
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -26,22 +38,31 @@ except:
     pass
 
 
+SKIP_DIRS = {'node_modules', '.next', 'dist', 'build', '.git', '.agent_cache', '__pycache__', 'venv', '.venv'}
+
+# auth.uid() = col / col = auth.uid() / col = (select auth.uid())
+UID_COMPARISON = re.compile(
+    r'auth\.uid\s*\(\s*\)\s*\)?(?:::\w+)?\s*=\s*(\w+)\b(?!\s*\.)|\b(\w+)\s*=\s*\(?\s*(?:select\s+)?auth\.uid\b', re.I)
+
+
 def find_schema_files(project_path: Path) -> list:
-    """Find database schema files."""
+    """Find database schema files in one walk that skips dependency and build dirs."""
     schemas = []
     
-    # Prisma schema
-    prisma_files = list(project_path.glob('**/prisma/schema.prisma'))
-    schemas.extend([('prisma', f) for f in prisma_files])
+    for root, dirs, files in os.walk(project_path):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        folder = Path(root)
+        for name in files:
+            f = folder / name
+            # Prisma schema
+            if name == 'schema.prisma' and folder.name == 'prisma':
+                schemas.append(('prisma', f))
+            # Drizzle schema files
+            elif name.endswith('.ts') and folder.name in ('drizzle', 'schema'):
+                if 'schema' in name.lower() or 'table' in name.lower():
+                    schemas.append(('drizzle', f))
     
-    # Drizzle schema files
-    drizzle_files = list(project_path.glob('**/drizzle/*.ts'))
-    drizzle_files.extend(project_path.glob('**/schema/*.ts'))
-    for f in drizzle_files:
-        if 'schema' in f.name.lower() or 'table' in f.name.lower():
-            schemas.append(('drizzle', f))
-    
-    return schemas[:10]  # Limit
+    return schemas
 
 
 def validate_prisma_schema(file_path: Path) -> list:
@@ -91,6 +112,69 @@ def validate_prisma_schema(file_path: Path) -> list:
     return issues
 
 
+def validate_sql_schema(schema: dict) -> list:
+    """Performance checks on the replayed SQL schema, grouped by file."""
+    by_file = {}
+    
+    def report(file: str, line: int, message: str):
+        by_file.setdefault(file, []).append((line, f"line {line}: {message}"))
+    
+    for name, table in sorted(schema["tables"].items()):
+        if '.' in name:
+            continue  # auth.* / storage.* are managed by Supabase
+        
+        # Foreign keys: deletes/updates on the parent scan the child without an index
+        reported = set()
+        for fk in table["foreign_keys"]:
+            if index_covers(table, fk["columns"]):
+                continue
+            cols = ', '.join(fk["columns"])
+            reported.update(fk["columns"])
+            report(fk["file"], fk["line"],
+                   f"{name}({cols}) references {fk['ref_table']} without an index; "
+                   f"add CREATE INDEX ON {name} ({cols})")
+        
+        # Tenant columns every query (and every RLS check) filters on
+        tenant_columns = {'user_id'} & set(table["columns"])
+        for policy in table["policies"].values():
+            for expression in (policy["using"], policy["check"]):
+                for match in UID_COMPARISON.finditer(expression or ''):
+                    column = (match.group(1) or match.group(2)).lower()
+                    if column in table["columns"]:
+                        tenant_columns.add(column)
+        for column in sorted(tenant_columns - reported):
+            if not leading_index(table, column):
+                info = table["columns"][column]
+                report(info["file"], info["line"],
+                       f"{name} is filtered on {column} (RLS/tenant scope) but has no index starting with it; "
+                       f"add CREATE INDEX ON {name} ({column})")
+        
+        # Policies evaluated once per candidate row
+        for policy_name, policy in table["policies"].items():
+            for key in ("using", "check"):
+                expression = policy[key]
+                if not expression:
+                    continue
+                line = policy[key + "_line"] or policy["line"]
+                for call in function_calls(expression):
+                    if call["cached"]:
+                        continue
+                    if call["name"] in CACHEABLE_FUNCTIONS and not references_columns(call["args"]):
+                        report(policy["file"], line,
+                               f'policy "{policy_name}" on {name} calls {call["name"]}() for every row; '
+                               f'use (select {call["name"]}({call["args"]})) so it runs once per query')
+                    elif call["name"] in schema["functions"]:
+                        volatility = schema["functions"][call["name"]]["volatility"]
+                        report(policy["file"], line,
+                               f'policy "{policy_name}" on {name} calls {volatility} function '
+                               f'{call["name"]}() for every row')
+    
+    return [
+        {"file": file, "type": "sql", "issues": [message for _, message in sorted(issues)]}
+        for file, issues in sorted(by_file.items())
+    ]
+
+
 def main():
     project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
     
@@ -103,9 +187,12 @@ def main():
     
     # Find schema files
     schemas = find_schema_files(project_path)
-    print(f"Found {len(schemas)} schema files")
+    started = time.perf_counter()
+    sql_schema = load_project_schema(project_path)
+    sql_files = len(sql_schema["files"]) if sql_schema else 0
+    print(f"Found {len(schemas)} schema files, {sql_files} SQL migration files")
     
-    if not schemas:
+    if not schemas and not sql_schema:
         output = {
             "script": "schema_validator",
             "project": str(project_path),
@@ -135,6 +222,11 @@ def main():
                 "issues": issues
             })
     
+    if sql_schema:
+        print(f"\nReplayed {sql_files} SQL files: {len(sql_schema['tables'])} tables "
+              f"({(time.perf_counter() - started) * 1000:.0f} ms)")
+        all_issues.extend(validate_sql_schema(sql_schema))
+    
     # Summary
     print("\n" + "="*60)
     print("SCHEMA ISSUES")
@@ -157,7 +249,7 @@ def main():
     output = {
         "script": "schema_validator",
         "project": str(project_path),
-        "schemas_checked": len(schemas),
+        "schemas_checked": len(schemas) + sql_files,
         "issues_found": total_issues,
         "passed": passed,
         "issues": all_issues
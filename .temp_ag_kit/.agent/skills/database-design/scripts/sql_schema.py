@@ -0,0 +1,641 @@
+#!/usr/bin/env python3
+"""
+Skill: database-design
+Script: sql_schema.py
+Purpose: Replay SQL migrations into an in-memory schema model
+Usage: from sql_schema import load_project_schema, index_covers
+Output: {"tables": {...}, "functions": {...}, "views": {...}, "files": [...]}
+Note: Understands the DDL that Supabase migrations use (CREATE/ALTER/DROP
+      TABLE, INDEX, POLICY, FUNCTION, VIEW). Other statements are skipped.
+      DDL inside DO $$ ... $$ blocks is applied as if its IF condition held.
+      The model is plain dicts so it can be cached as JSON: load_project_schema
+      keeps the last replay in .agent_cache/schema_snapshot.json, keyed by the
+      content hashes of the replayed files, and reuses it while they match.
+
+Table model:
+    {"name", "file", "line", "declared",          # declared: has a CREATE TABLE
+     "columns": {col: {"type", "not_null", "default", "values", "file", "line"}},
+                                                  # default: has a DEFAULT (or is serial/generated)
+                                                  # values: list from CHECK (col IN (...)), else None
+     "primary_key": [cols],
+     "foreign_keys": [{"name", "columns", "ref_table", "ref_columns", "on_delete", "file", "line"}],
+     "indexes": {name: {"columns", "unique", "where", "implicit", "file", "line"}},
+     "rls": bool,
+     "policies": {name: {"command", "roles", "permissive", "using", "check", "file", "line"}}}
+"""
+import re
+import json
+import hashlib
+from pathlib import Path
+
+MIGRATIONS_DIR = "supabase/migrations"
+BASE_SCHEMA = "supabase/scripts/supabase_schema.sql"
+SNAPSHOT_FILE = ".agent_cache/schema_snapshot.json"
+# Bump when the replay or the model changes so cached snapshots are rebuilt
+MODEL_VERSION = 2
+
+# One token per literal/comment so statements split only on real semicolons
+TOKEN = re.compile(
+    r"--[^\n]*"
+    r"|/\*.*?\*/"
+    r"|'(?:[^']|'')*'"
+    r'|"(?:[^"]|"")*"'
+    r"|\$(?P<tag>[A-Za-z_]*)\$.*?\$(?P=tag)\$"
+    r"|;",
+    re.S
+)
+NESTING = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|\$(?P<tag>[A-Za-z_]*)\$.*?\$(?P=tag)\$|[(),]", re.S)
+
+NAME = r'(?:"(?:[^"]|"")+"|[\w$]+)(?:\s*\.\s*(?:"(?:[^"]|"")+"|[\w$]+))?'
+NAME_LIST = NAME + r'(?:\s*,\s*' + NAME + r')*'
+FLAGS = re.I | re.S
+
+CREATE_TABLE = re.compile(
+    r'CREATE\s+(?:(?:GLOBAL\s+|LOCAL\s+)?(?:TEMP|TEMPORARY|UNLOGGED)\s+)?TABLE\s+(IF\s+NOT\s+EXISTS\s+)?(' + NAME + r')\s*\(', FLAGS)
+ALTER_TABLE = re.compile(r'ALTER\s+TABLE\s+(?:IF\s+EXISTS\s+)?(?:ONLY\s+)?(' + NAME + r')\s+(.*)', FLAGS)
+CREATE_INDEX = re.compile(
+    r'CREATE\s+(UNIQUE\s+)?INDEX\s+(?:CONCURRENTLY\s+)?(?:IF\s+NOT\s+EXISTS\s+)?(' + NAME + r')?\s*'
+    r'ON\s+(?:ONLY\s+)?(' + NAME + r')\s*(?:USING\s+\w+\s*)?\(', FLAGS)
+CREATE_POLICY = re.compile(r'CREATE\s+POLICY\s+(' + NAME + r')\s+ON\s+(' + NAME + r')(.*)', FLAGS)
+CREATE_FUNCTION = re.compile(r'CREATE\s+(?:OR\s+REPLACE\s+)?FUNCTION\s+(' + NAME + r')\s*\(', FLAGS)
+CREATE_VIEW = re.compile(
+    r'CREATE\s+(?:OR\s+REPLACE\s+)?(MATERIALIZED\s+)?VIEW\s+(?:IF\s+NOT\s+EXISTS\s+)?(' + NAME + r')', FLAGS)
+DROP = re.compile(
+    r'DROP\s+(TABLE|INDEX|POLICY|VIEW|MATERIALIZED\s+VIEW|FUNCTION)\s+(?:CONCURRENTLY\s+)?(?:IF\s+EXISTS\s+)?'
+    r'(' + NAME_LIST + r')(?:\s+ON\s+(' + NAME + r'))?', FLAGS)
+DO_BLOCK = re.compile(r'DO\s+(?:LANGUAGE\s+\w+\s+)?\$(?P<tag>[A-Za-z_]*)\$(.*)\$(?P=tag)\$', FLAGS)
+DDL_START = re.compile(r'\b(?:CREATE|ALTER|DROP)\s+(?:UNIQUE\s+|OR\s+REPLACE\s+)?(?:TABLE|INDEX|POLICY|VIEW|FUNCTION)\b', re.I)
+
+COLUMN_KEYWORD = re.compile(
+    r'\b(?:CONSTRAINT|NOT\s+NULL|NULL|DEFAULT|PRIMARY\s+KEY|REFERENCES|UNIQUE|CHECK|GENERATED|COLLATE)\b', re.I)
+TABLE_CONSTRAINT = re.compile(r'\s*(?:CONSTRAINT\s+(' + NAME + r')\s+)?(PRIMARY\s+KEY|UNIQUE|FOREIGN\s+KEY|CHECK|EXCLUDE)\b', FLAGS)
+REFERENCES = re.compile(r'REFERENCES\s+(' + NAME + r')\s*(?:\(([^)]*)\))?', FLAGS)
+CHECK_IN = re.compile(r"CHECK\s*\(\s*(" + NAME + r")\s+IN\s*\(((?:\s*'(?:[^']|'')*'\s*,?)+)\)\s*\)", FLAGS)
+ON_DELETE = re.compile(r'ON\s+DELETE\s+(CASCADE|SET\s+NULL|SET\s+DEFAULT|RESTRICT|NO\s+ACTION)', re.I)
+
+
+# ============================================================================
+# LEXING
+# ============================================================================
+
+def blank(text: str) -> str:
+    """Replace everything but newlines with spaces, keeping offsets and lines."""
+    return re.sub(r'[^\n]', ' ', text)
+
+
+def split_statements(sql: str):
+    """Yield (statement, line) with comments blanked out; line is 1-based."""
+    parts = []
+    bounds = []
+    start = 0
+    for m in TOKEN.finditer(sql):
+        token = m.group(0)
+        if token == ';':
+            bounds.append(m.start())
+        elif token.startswith('--') or token.startswith('/*'):
+            parts.append(sql[start:m.start()])
+            parts.append(blank(token))
+            start = m.end()
+    parts.append(sql[start:])
+    text = ''.join(parts)
+
+    line = 1
+    previous = 0
+    for end in bounds + [len(text)]:
+        chunk = text[previous:end]
+        stripped = chunk.lstrip()
+        if stripped.strip():
+            yield stripped.rstrip(), line + chunk[:len(chunk) - len(stripped)].count('\n')
+        line += text.count('\n', previous, end + 1)
+        previous = end + 1
+
+
+def ident(name: str) -> str:
+    """Normalize an identifier: unquote, lowercase unquoted parts, drop 'public.'."""
+    parts = re.findall(r'"((?:[^"]|"")+)"|([\w$]+)', name)
+    names = [quoted.replace('""', '"') if quoted else plain.lower() for quoted, plain in parts]
+    if len(names) == 2 and names[0] == 'public':
+        names = names[1:]
+    return '.'.join(names)
+
+
+def paren_group(text: str, open_index: int) -> tuple:
+    """(inner text, index after the closing paren) for the '(' at open_index."""
+    depth = 0
+    for m in NESTING.finditer(text, open_index):
+        token = m.group(0)
+        if token == '(':
+            depth += 1
+        elif token == ')':
+            depth -= 1
+            if depth == 0:
+                return text[open_index + 1:m.start()], m.end()
+    return text[open_index + 1:], len(text)
+
+
+def split_top_level(text: str) -> list:
+    """Split on commas outside parentheses and literals."""
+    items = []
+    depth = 0
+    start = 0
+    for m in NESTING.finditer(text):
+        token = m.group(0)
+        if token == '(':
+            depth += 1
+        elif token == ')':
+            depth -= 1
+        elif token == ',' and depth == 0:
+            items.append(text[start:m.start()])
+            start = m.end()
+    items.append(text[start:])
+    return [item.strip() for item in items if item.strip()]
+
+
+def mask_nested(text: str) -> str:
+    """Blank literals and everything inside parentheses (keeps offsets)."""
+    out = []
+    depth = 0
+    last = 0
+    for m in NESTING.finditer(text):
+        between = text[last:m.start()]
+        out.append(blank(between) if depth > 0 else between)
+        token = m.group(0)
+        if token == '(':
+            depth += 1
+            out.append(token)
+        elif token == ')':
+            depth -= 1
+            out.append(token)
+        elif token == ',':
+            out.append(' ' if depth > 0 else token)
+        else:
+            out.append(blank(token))
+        last = m.end()
+    rest = text[last:]
+    out.append(blank(rest) if depth > 0 else rest)
+    return ''.join(out)
+
+
+def column_names(text: str) -> list:
+    """Column list of an index or constraint; expressions are kept as written."""
+    columns = []
+    for item in split_top_level(text):
+        m = re.match(r'(' + NAME + r')(?:\s+(?:ASC|DESC|NULLS\s+(?:FIRST|LAST)|[\w.]+_ops))*\s*$', item, FLAGS)
+        columns.append(ident(m.group(1)) if m else ' '.join(item.split()))
+    return columns
+
+
+# ============================================================================
+# MODEL
+# ============================================================================
+
+def new_schema() -> dict:
+    return {"tables": {}, "functions": {}, "views": {}, "files": []}
+
+
+def get_table(schema: dict, name: str, file: str, line: int) -> dict:
+    """Table by name; tables only ever altered (created elsewhere) get a stub."""
+    table = schema["tables"].get(name)
+    if table is None:
+        table = schema["tables"][name] = {
+            "name": name, "file": file, "line": line, "declared": False,
+            "columns": {}, "primary_key": [], "foreign_keys": [], "indexes": {},
+            "rls": False, "policies": {}
+        }
+    return table
+
+
+def add_index(table: dict, name: str, columns: list, unique: bool, where, implicit: bool, file: str, line: int):
+    table["indexes"][name] = {
+        "columns": columns, "unique": unique, "where": where,
+        "implicit": implicit, "file": file, "line": line
+    }
+
+
+def add_column(table: dict, definition: str, file: str, line: int):
+    m = re.match(r'\s*(' + NAME + r')\s*(.*)', definition, FLAGS)
+    if not m:
+        return
+    name = ident(m.group(1))
+    rest = m.group(2)
+    masked = mask_nested(rest)
+    keyword = COLUMN_KEYWORD.search(masked)
+    col_type = ' '.join(rest[:keyword.start() if keyword else len(rest)].split())
+    check = CHECK_IN.search(rest)
+    table["columns"][name] = {
+        "type": col_type.lower(),
+        "not_null": bool(re.search(r'\bNOT\s+NULL\b|\bPRIMARY\s+KEY\b', masked, re.I)),
+        "default": bool(re.search(r'\b(?:DEFAULT|GENERATED)\b', masked, re.I)) or 'serial' in col_type.lower(),
+        "values": [v.replace("''", "'") for v in re.findall(r"'((?:[^']|'')*)'", check.group(2))]
+                  if check and ident(check.group(1)) == name else None,
+        "file": file, "line": line
+    }
+    if re.search(r'\bPRIMARY\s+KEY\b', masked, re.I):
+        table["primary_key"] = [name]
+        add_index(table, f"{table['name']}_pkey", [name], True, None, True, file, line)
+    elif re.search(r'\bUNIQUE\b', masked, re.I):
+        add_index(table, f"{table['name']}_{name}_key", [name], True, None, True, file, line)
+    ref = REFERENCES.search(rest)
+    if ref and re.search(r'\bREFERENCES\b', masked, re.I):
+        on_delete = ON_DELETE.search(masked)
+        table["foreign_keys"].append({
+            "name": f"{table['name']}_{name}_fkey",
+            "columns": [name],
+            "ref_table": ident(ref.group(1)),
+            "ref_columns": column_names(ref.group(2)) if ref.group(2) else ["id"],
+            "on_delete": ' '.join(on_delete.group(1).upper().split()) if on_delete else "NO ACTION",
+            "file": file, "line": line
+        })
+
+
+def add_constraint(table: dict, definition: str, file: str, line: int) -> bool:
+    """Apply a table constraint; False when the text is not one."""
+    m = TABLE_CONSTRAINT.match(definition)
+    if not m:
+        return False
+    kind = ' '.join(m.group(2).upper().split())
+    rest = definition[m.end():]
+    group = re.match(r'\s*\(', rest)
+    if not group:
+        return True
+    inner, end = paren_group(rest, group.end() - 1)
+    columns = column_names(inner)
+    name = ident(m.group(1)) if m.group(1) else None
+    if kind == "PRIMARY KEY":
+        table["primary_key"] = columns
+        add_index(table, name or f"{table['name']}_pkey", columns, True, None, True, file, line)
+    elif kind == "UNIQUE":
+        add_index(table, name or f"{table['name']}_{'_'.join(columns)}_key", columns, True, None, True, file, line)
+    elif kind == "FOREIGN KEY":
+        ref = REFERENCES.search(rest, end)
+        if ref:
+            on_delete = ON_DELETE.search(rest, ref.end())
+            table["foreign_keys"].append({
+                "name": name or f"{table['name']}_{'_'.join(columns)}_fkey",
+                "columns": columns,
+                "ref_table": ident(ref.group(1)),
+                "ref_columns": column_names(ref.group(2)) if ref.group(2) else ["id"],
+                "on_delete": ' '.join(on_delete.group(1).upper().split()) if on_delete else "NO ACTION",
+                "file": file, "line": line
+            })
+    return True
+
+
+def drop_column(table: dict, column: str):
+    table["columns"].pop(column, None)
+    table["foreign_keys"] = [fk for fk in table["foreign_keys"] if column not in fk["columns"]]
+    for name in [n for n, idx in table["indexes"].items() if column in idx["columns"]]:
+        del table["indexes"][name]
+
+
+def drop_constraint(table: dict, name: str):
+    table["foreign_keys"] = [fk for fk in table["foreign_keys"] if fk["name"] != name]
+    index = table["indexes"].get(name)
+    if index and index["implicit"]:
+        del table["indexes"][name]
+
+
+def rename_column(table: dict, old: str, new: str):
+    if old in table["columns"]:
+        table["columns"][new] = table["columns"].pop(old)
+    for fk in table["foreign_keys"]:
+        fk["columns"] = [new if c == old else c for c in fk["columns"]]
+    for index in table["indexes"].values():
+        index["columns"] = [new if c == old else c for c in index["columns"]]
+    if old in table["primary_key"]:
+        table["primary_key"] = [new if c == old else c for c in table["primary_key"]]
+
+
+# ============================================================================
+# STATEMENTS
+# ============================================================================
+
+def apply_create_table(schema: dict, m, statement: str, file: str, line: int):
+    name = ident(m.group(2))
+    existing = schema["tables"].get(name)
+    if existing and existing["declared"]:
+        return  # IF NOT EXISTS (or an error in Postgres): first definition wins
+    body, _ = paren_group(statement, m.end() - 1)
+    table = get_table(schema, name, file, line)
+    table.update({"file": file, "line": line, "declared": True})
+    offset = statement.find(body)
+    position = 0
+    for item in split_top_level(body):
+        position = body.find(item, position)
+        item_line = line + statement.count('\n', 0, offset + position)
+        if not add_constraint(table, item, file, item_line):
+            if not re.match(r'LIKE\b', item, re.I):
+                add_column(table, item, file, item_line)
+
+
+def apply_alter_table(schema: dict, m, statement: str, file: str, line: int):
+    table = get_table(schema, ident(m.group(1)), file, line)
+    actions = m.group(2)
+    offset = m.start(2)
+    position = 0
+    for action in split_top_level(actions):
+        position = actions.find(action, position)
+        action_line = line + statement.count('\n', 0, offset + position)
+        add = re.match(r'ADD\s+(COLUMN\s+)?(IF\s+NOT\s+EXISTS\s+)?(.*)', action, FLAGS)
+        if add:
+            definition = add.group(3)
+            if add.group(1) or not add_constraint(table, definition, file, action_line):
+                column = re.match(r'\s*(' + NAME + r')', definition)
+                if column and ident(column.group(1)) in table["columns"]:
+                    continue  # IF NOT EXISTS (or a guarded DO block): first definition wins
+                add_column(table, definition, file, action_line)
+            continue
+        drop = re.match(r'DROP\s+(COLUMN\s+|CONSTRAINT\s+)?(?:IF\s+EXISTS\s+)?(' + NAME + r')', action, FLAGS)
+        if drop:
+            if (drop.group(1) or '').strip().upper() == 'CONSTRAINT':
+                drop_constraint(table, ident(drop.group(2)))
+            else:
+                drop_column(table, ident(drop.group(2)))
+            continue
+        rls = re.match(r'(ENABLE|DISABLE|FORCE|NO\s+FORCE)\s+ROW\s+LEVEL\s+SECURITY', action, re.I)
+        if rls:
+            if rls.group(1).upper() in ('ENABLE', 'FORCE'):
+                table["rls"] = True
+            elif rls.group(1).upper() == 'DISABLE':
+                table["rls"] = False
+            continue
+        rename = re.match(r'RENAME\s+(?:COLUMN\s+)?(' + NAME + r')\s+TO\s+(' + NAME + r')', action, FLAGS)
+        if rename and not re.match(r'RENAME\s+(TO|CONSTRAINT)\b', action, re.I):
+            rename_column(table, ident(rename.group(1)), ident(rename.group(2)))
+            continue
+        rename_table = re.match(r'RENAME\s+TO\s+(' + NAME + r')', action, FLAGS)
+        if rename_table:
+            new_name = ident(rename_table.group(1))
+            schema["tables"][new_name] = schema["tables"].pop(table["name"])
+            table["name"] = new_name
+            continue
+        alter = re.match(r'ALTER\s+(?:COLUMN\s+)?(' + NAME + r')\s+(SET|DROP)\s+NOT\s+NULL', action, FLAGS)
+        if alter and ident(alter.group(1)) in table["columns"]:
+            table["columns"][ident(alter.group(1))]["not_null"] = alter.group(2).upper() == 'SET'
+            continue
+        retype = re.match(r'ALTER\s+(?:COLUMN\s+)?(' + NAME + r')\s+(?:SET\s+DATA\s+)?TYPE\s+([^,]+?)(?:\s+USING\b.*)?$',
+                          action, FLAGS)
+        if retype and ident(retype.group(1)) in table["columns"]:
+            table["columns"][ident(retype.group(1))]["type"] = ' '.join(retype.group(2).lower().split())
+
+
+def apply_create_index(schema: dict, m, statement: str, file: str, line: int):
+    table = get_table(schema, ident(m.group(3)), file, line)
+    inner, end = paren_group(statement, m.end() - 1)
+    columns = column_names(inner)
+    name = ident(m.group(2)) if m.group(2) else f"{table['name']}_{'_'.join(columns)}_idx"
+    if re.search(r'IF\s+NOT\s+EXISTS', statement[:m.end()], re.I) and any(
+            name in t["indexes"] for t in schema["tables"].values()):
+        return
+    where = re.search(r'\bWHERE\b(.*)$', statement[end:], FLAGS)
+    add_index(table, name, columns, bool(m.group(1)), ' '.join(where.group(1).split()) if where else None,
+              False, file, line)
+
+
+def apply_create_policy(schema: dict, m, statement: str, file: str, line: int):
+    table = get_table(schema, ident(m.group(2)), file, line)
+    rest = m.group(3)
+    masked = mask_nested(rest)
+    command = re.search(r'\bFOR\s+(ALL|SELECT|INSERT|UPDATE|DELETE)\b', masked, re.I)
+    roles = re.search(r'\bTO\s+(.*?)(?=\bUSING\b|\bWITH\s+CHECK\b|$)', masked, FLAGS)
+    expressions = {}
+    for key, pattern in (("using", r'\bUSING\s*\('), ("check", r'\bWITH\s+CHECK\s*\(')):
+        clause = re.search(pattern, masked, re.I)
+        if clause:
+            inner, _ = paren_group(rest, clause.end() - 1)
+            expressions[key] = ' '.join(inner.split())
+            expressions[key + "_line"] = line + statement.count('\n', 0, m.start(3) + clause.start())
+    table["policies"][ident(m.group(1))] = {
+        "command": command.group(1).upper() if command else "ALL",
+        "roles": [ident(r) for r in re.findall(NAME, roles.group(1))] if roles else ["public"],
+        "permissive": not re.search(r'\bAS\s+RESTRICTIVE\b', masked, re.I),
+        "using": expressions.get("using"),
+        "check": expressions.get("check"),
+        "using_line": expressions.get("using_line"),
+        "check_line": expressions.get("check_line"),
+        "file": file, "line": line
+    }
+
+
+def apply_create_function(schema: dict, m, statement: str, file: str, line: int):
+    _, end = paren_group(statement, m.end() - 1)
+    masked = mask_nested(statement[end:])
+    volatility = re.search(r'\b(IMMUTABLE|STABLE|VOLATILE)\b', masked, re.I)
+    language = re.search(r'\bLANGUAGE\s+(\w+)', masked, re.I)
+    schema["functions"][ident(m.group(1))] = {
+        "volatility": volatility.group(1).upper() if volatility else "VOLATILE",
+        "security_definer": bool(re.search(r'\bSECURITY\s+DEFINER\b', masked, re.I)),
+        "language": language.group(1).lower() if language else None,
+        "file": file, "line": line
+    }
+
+
+def apply_drop(schema: dict, m):
+    kind = ' '.join(m.group(1).upper().split())
+    names = [ident(n) for n in re.findall(NAME, m.group(2))]
+    if kind == "TABLE":
+        for name in names:
+            schema["tables"].pop(name, None)
+    elif kind == "INDEX":
+        for table in schema["tables"].values():
+            for name in names:
+                table["indexes"].pop(name, None)
+    elif kind == "POLICY" and m.group(3):
+        table = schema["tables"].get(ident(m.group(3)))
+        if table:
+            table["policies"].pop(names[0], None)
+    elif kind in ("VIEW", "MATERIALIZED VIEW"):
+        for name in names:
+            schema["views"].pop(name, None)
+    elif kind == "FUNCTION":
+        for name in names:
+            schema["functions"].pop(name, None)
+
+
+def ddl_statements(statement: str, line: int):
+    """Yield (statement, line): the statement itself, or the DDL inside a DO block."""
+    if not statement[:2].upper() == "DO":
+        yield statement, line
+        return
+    block = DO_BLOCK.match(statement)
+    if not block:
+        return
+    for inner, inner_line in split_statements(block.group(2)):
+        start = DDL_START.search(inner)
+        if start:
+            offset = inner.count('\n', 0, start.start())
+            yield (inner[start.start():],
+                   line + statement.count('\n', 0, block.start(2)) + inner_line - 1 + offset)
+
+
+def apply_statement(schema: dict, statement: str, file: str, line: int):
+    """Apply one DDL statement to the model; anything else is ignored."""
+    head = statement[:12].upper()
+    if head.startswith("DO"):
+        for inner, inner_line in ddl_statements(statement, line):
+            apply_statement(schema, inner, file, inner_line)
+        return
+    if head.startswith("CREATE"):
+        for pattern, handler in (
+            (CREATE_TABLE, apply_create_table),
+            (CREATE_INDEX, apply_create_index),
+            (CREATE_POLICY, apply_create_policy),
+            (CREATE_FUNCTION, apply_create_function),
+        ):
+            m = pattern.match(statement)
+            if m:
+                handler(schema, m, statement, file, line)
+                return
+        m = CREATE_VIEW.match(statement)
+        if m:
+            schema["views"][ident(m.group(2))] = {
+                "materialized": bool(m.group(1)), "file": file, "line": line
+            }
+    elif head.startswith("ALTER"):
+        m = ALTER_TABLE.match(statement)
+        if m:
+            apply_alter_table(schema, m, statement, file, line)
+    elif head.startswith("DROP"):
+        m = DROP.match(statement)
+        if m:
+            apply_drop(schema, m)
+
+
+# ============================================================================
+# REPLAY
+# ============================================================================
+
+def migration_files(project_path: Path) -> list:
+    """Base schema first, then migrations in filename order."""
+    project_path = Path(project_path)
+    files = []
+    base = project_path / BASE_SCHEMA
+    if base.is_file():
+        files.append(base)
+    migrations = project_path / MIGRATIONS_DIR
+    if migrations.is_dir():
+        files.extend(sorted(migrations.glob("*.sql"), key=lambda f: f.name))
+    return files
+
+
+def replay(files: list, root: Path = None) -> dict:
+    """Build the final schema by applying every file in order."""
+    schema = new_schema()
+    for path in files:
+        name = Path(path).relative_to(root).as_posix() if root else Path(path).name
+        schema["files"].append(name)
+        sql = Path(path).read_text(encoding='utf-8', errors='ignore')
+        for statement, line in split_statements(sql):
+            apply_statement(schema, statement, name, line)
+    return schema
+
+
+def snapshot_key(files: list, root: Path) -> str:
+    """Hash of the model version and every replayed file's name and content."""
+    digest = hashlib.sha256(f"model:{MODEL_VERSION}".encode())
+    for path in files:
+        digest.update(Path(path).relative_to(root).as_posix().encode())
+        digest.update(hashlib.sha256(Path(path).read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def save_snapshot(project_path: Path, key: str, schema: dict):
+    snapshot_path = Path(project_path) / SNAPSHOT_FILE
+    try:
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        snapshot_path.write_text(json.dumps({"key": key, "schema": schema}), encoding='utf-8')
+    except OSError:
+        pass
+
+
+def load_project_schema(project_path: Path, use_cache: bool = True):
+    """Replayed schema of a Supabase project, or None when it has no SQL."""
+    project_path = Path(project_path)
+    files = migration_files(project_path)
+    if not files:
+        return None
+    if not use_cache:
+        return replay(files, project_path)
+    key = snapshot_key(files, project_path)
+    try:
+        data = json.loads((project_path / SNAPSHOT_FILE).read_text(encoding='utf-8'))
+        if data.get("key") == key:
+            return data["schema"]
+    except (OSError, ValueError):
+        pass
+    schema = replay(files, project_path)
+    save_snapshot(project_path, key, schema)
+    return schema
+
+
+# ============================================================================
+# QUERIES
+# ============================================================================
+
+def index_covers(table: dict, columns: list, allow_partial: bool = False) -> bool:
+    """True if some index starts with exactly these columns (in any order)."""
+    wanted = set(columns)
+    for index in table["indexes"].values():
+        if index["where"] and not allow_partial:
+            continue
+        if set(index["columns"][:len(wanted)]) == wanted:
+            return True
+    return False
+
+
+def leading_index(table: dict, column: str):
+    """Name of an index whose first column is column, else None."""
+    for name, index in table["indexes"].items():
+        if index["columns"] and index["columns"][0] == column and not index["where"]:
+            return name
+    return None
+
+
+CALL = re.compile(r'([\w.]+)\s*\(')
+# Functions Supabase policies call that return the same value for every row
+CACHEABLE_FUNCTIONS = {'auth.uid', 'auth.jwt', 'auth.role', 'auth.email', 'current_setting', 'now'}
+NOT_FUNCTIONS = {'exists', 'in', 'any', 'all', 'some', 'select', 'not', 'and', 'or', 'array', 'values', 'row', 'cast'}
+
+
+def function_calls(expression: str) -> list:
+    """Function calls in a policy expression.
+
+    Each call is {"name", "args", "offset", "end", "cached"}; cached means it is the
+    select list of a scalar subquery such as (select auth.uid()), which
+    Postgres evaluates once per statement as an InitPlan instead of per row.
+    """
+    calls = []
+    for m in CALL.finditer(expression):
+        name = m.group(1).lower()
+        if name in NOT_FUNCTIONS:
+            continue
+        args, end = paren_group(expression, m.end() - 1)
+        calls.append({
+            "name": name,
+            "args": ' '.join(args.split()),
+            "offset": m.start(),
+            "end": end,
+            "cached": in_scalar_select(expression, m.start())
+        })
+    return calls
+
+
+def in_scalar_select(expression: str, offset: int) -> bool:
+    """True if offset is in the select list of a parenthesized SELECT."""
+    depth = 0
+    for index in range(offset - 1, -1, -1):
+        ch = expression[index]
+        if ch == ')':
+            depth += 1
+        elif ch == '(':
+            if depth == 0:
+                head = expression[index + 1:offset]
+                return bool(re.match(r'\s*SELECT\b', head, re.I)) and not re.search(r'\b(?:FROM|WHERE)\b', head, re.I)
+            depth -= 1
+    return False
+
+
+def references_columns(args: str) -> bool:
+    """True if call arguments mention anything besides literals."""
+    stripped = re.sub(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|::\s*\w+", ' ', args)
+    return bool(re.search(r'[A-Za-z_]', stripped))
@@ -0,0 +1,555 @@
+#!/usr/bin/env python3
+"""
+Skill: database-design
+Script: synthetic_data.py
+Purpose: Generate high-volume, realistically skewed store/order data as
+         PostgreSQL COPY files, shaped by the migration-derived schema
+Usage: python synthetic_data.py <project_path> [--orders 5000000] [--workers 8] [--seed 42]
+Output: <out>/<table>.<part>.copy, manifest.json and load.sql
+        (psql -f load.sql from the output directory, or
+         query_plan_harness.py --data <out>)
+Note: Columns come from the replayed schema (sql_schema.py): generated
+      columns that no longer exist are dropped, NOT NULL columns without a
+      default are filled by type, and CHECK (col IN (...)) lists bound the
+      values used. Rows are streamed, so memory stays flat at any volume.
+      Output depends only on --seed, the scale and --end-date, not on the
+      number of workers.
+
+Skew:
+    stores     Zipf-sized tenants: a few large chains and a long tail
+    days       weekday pattern (Fri/Sat peaks) and growth towards --end-date
+    hours      lunch (11-14h) and dinner (18-22h) peaks
+    products   power-law popularity within each store's menu
+    customers  repeat buyers dominate; WALK_IN_RATE of orders have no customer
+"""
+import sys
+import json
+import random
+import bisect
+import hashlib
+import argparse
+from pathlib import Path
+from datetime import date, datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, str(Path(__file__).parent))
+from sql_schema import load_project_schema
+
+# Fix Windows console encoding
+try:
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+except:
+    pass
+
+OUTPUT_DIR = ".agent_cache/synthetic_data"
+
+DEFAULT_SCALE = {
+    "stores": 200,
+    "customers": 200000,
+    "orders": 1000000,
+    "products_per_store": 60,
+    "items_per_order": 2.5,
+    "days": 365,
+}
+
+# Orders per worker task; each task covers whole days
+CHUNK_ORDERS = 50000
+
+HOUR_WEIGHTS = [0, 0, 0, 0, 0, 0, 1, 2, 3, 4, 6, 14, 18, 12, 6, 4, 4, 6, 14, 20, 18, 12, 5, 1]
+WEEKDAY_WEIGHTS = [0.8, 0.85, 0.9, 1.0, 1.3, 1.5, 1.2]  # Monday first
+GROWTH = 1.5          # The last day is this much busier than the first
+STORE_SKEW = 1.1      # Zipf exponent over stores
+PRODUCT_SKEW = 3.0    # index = n * random() ** skew
+CUSTOMER_SKEW = 2.5
+WALK_IN_RATE = 0.3
+MAX_ITEMS = 12
+
+FIRST_NAMES = ["Ana", "Bruno", "Carla", "Diego", "Eduarda", "Felipe", "Gabriela", "Hugo", "Isabela", "João",
+               "Larissa", "Marcos", "Natália", "Otávio", "Paula", "Rafael", "Sofia", "Thiago", "Vitória", "William"]
+LAST_NAMES = ["Silva", "Santos", "Oliveira", "Souza", "Lima", "Pereira", "Costa", "Rodrigues", "Almeida", "Nascimento"]
+
+# Columns each generator fills; intersected with the schema at run time
+GENERATED_COLUMNS = {
+    "auth.users": ["id", "email", "created_at"],
+    "user_settings": ["user_id", "app_name", "public_slug", "store_open", "created_at"],
+    "categories": ["id", "user_id", "name", "display_order", "created_at"],
+    "products": ["id", "user_id", "category_id", "name", "price", "available", "display_order", "created_at"],
+    "customers": ["id", "user_id", "name", "phone", "email", "created_at"],
+    "orders": ["id", "user_id", "order_number", "customer_name", "customer_phone", "customer_id", "status",
+               "payment_method", "payment_status", "subtotal", "delivery_fee", "total", "is_delivery",
+               "created_at", "updated_at"],
+    "order_items": ["id", "order_id", "product_id", "product_name", "quantity", "unit_price", "total"],
+    "daily_analytics": ["user_id", "date", "total_revenue", "total_orders", "cancelled_orders", "paid_orders",
+                        "avg_order_value", "delivery_orders", "pickup_orders", "total_customers",
+                        "total_products_sold", "unique_products_sold", "peak_hour", "peak_hour_orders"],
+}
+CATEGORIES = ["Lanches", "Pizzas", "Porções", "Bebidas", "Sobremesas", "Combos", "Pratos", "Açaí"]
+
+# Preferred values, narrowed to the CHECK lists found in the schema
+ACTIVE_STATUSES = ["pending", "preparing", "ready", "delivering", "delivered"]
+PAYMENT_METHODS = [("pix", 45), ("credit", 25), ("debit", 15), ("money", 15)]
+
+
+# ============================================================================
+# DETERMINISTIC VALUES
+# ============================================================================
+
+def det_uuid(seed, kind: str, n) -> str:
+    """UUID-formatted md5 of (seed, kind, n); stable across runs and workers."""
+    h = hashlib.md5(f"{seed}:{kind}:{n}".encode()).hexdigest()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def product_price(store: int, product: int) -> float:
+    return round(8 + ((store * 7919 + product * 104729) % 5200) / 100, 2)
+
+
+def customer_name(n: int) -> str:
+    return f"{FIRST_NAMES[n % len(FIRST_NAMES)]} {LAST_NAMES[(n // len(FIRST_NAMES)) % len(LAST_NAMES)]}"
+
+
+def customer_phone(n: int) -> str:
+    return f"55119{n:08d}"[-13:]
+
+
+def copy_value(value) -> str:
+    """One field in PostgreSQL COPY text format."""
+    if value is None:
+        return r'\N'
+    if value is True:
+        return 't'
+    if value is False:
+        return 'f'
+    text = str(value)
+    if '\\' in text or '\t' in text or '\n' in text or '\r' in text:
+        text = text.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+    return text
+
+
+class CopyWriter:
+    """Streams rows of one table to a COPY file."""
+
+    def __init__(self, path: Path, columns: list, fill: dict):
+        self.path = path
+        self.columns = columns
+        self.fill = fill
+        self.rows = 0
+        self.file = open(path, 'w', encoding='utf-8', newline='\n', buffering=1 << 20)
+
+    def write(self, row: dict):
+        self.file.write('\t'.join(copy_value(row[c] if c in row else self.fill.get(c)) for c in self.columns))
+        self.file.write('\n')
+        self.rows += 1
+
+    def close(self) -> dict:
+        self.file.close()
+        return {"file": self.path.name, "rows": self.rows}
+
+
+# ============================================================================
+# PLAN
+# ============================================================================
+
+def fill_value(column: dict, default_date: str):
+    """Constant for a NOT NULL column nothing generates."""
+    if column["values"]:
+        return column["values"][0]
+    col_type = column["type"]
+    if col_type.startswith(("int", "bigint", "smallint", "numeric", "decimal", "real", "double", "float")):
+        return 0
+    if col_type.startswith("bool"):
+        return False
+    if col_type.startswith("json"):
+        return "{}"
+    if col_type.startswith("date"):
+        return default_date
+    if col_type.startswith("timestamp"):
+        return f"{default_date} 00:00:00+00"
+    if col_type.startswith("uuid"):
+        return "00000000-0000-0000-0000-000000000000"
+    return ""
+
+
+def table_layouts(schema: dict, end_date: date) -> dict:
+    """{table: {"columns", "fill"}} for the generated tables present in the schema."""
+    layouts = {"auth.users": {"columns": GENERATED_COLUMNS["auth.users"], "fill": {}}}
+    for name, generated in GENERATED_COLUMNS.items():
+        table = schema["tables"].get(name)
+        if name == "auth.users" or not table or not table["declared"]:
+            continue
+        columns = [c for c in generated if c in table["columns"]]
+        fill = {}
+        for column, info in table["columns"].items():
+            if column not in columns and info["not_null"] and not info["default"]:
+                columns.append(column)
+                fill[column] = fill_value(info, end_date.isoformat())
+        layouts[name] = {"columns": columns, "fill": fill}
+    return layouts
+
+
+def load_order(schema: dict, tables: list) -> list:
+    """Tables sorted so that foreign key targets load first."""
+    remaining = list(tables)
+    ordered = []
+    while remaining:
+        for name in remaining:
+            table = schema["tables"].get(name, {"foreign_keys": []})
+            deps = {fk["ref_table"] for fk in table["foreign_keys"]} & set(remaining) - {name}
+            if not deps:
+                ordered.append(name)
+                remaining.remove(name)
+                break
+        else:
+            ordered.extend(remaining)  # Cycle: keep the given order
+            break
+    return ordered
+
+
+def domain(schema: dict, table: str, column: str, preferred: list) -> list:
+    """preferred narrowed to the column's CHECK list (or that list when none match)."""
+    info = schema["tables"].get(table, {}).get("columns", {}).get(column)
+    allowed = info["values"] if info else None
+    if not allowed:
+        return preferred
+    return [v for v in preferred if v in allowed] or allowed
+
+
+def largest_remainder(total: int, weights: list) -> list:
+    """Integer split of total proportional to weights."""
+    scale = total / sum(weights)
+    raw = [w * scale for w in weights]
+    counts = [int(r) for r in raw]
+    order = sorted(range(len(raw)), key=lambda i: raw[i] - counts[i], reverse=True)
+    for i in order[:total - sum(counts)]:
+        counts[i] += 1
+    return counts
+
+
+def build_plan(schema: dict, scale: dict, seed, end_date: date) -> dict:
+    stores = scale["stores"]
+    store_weights = [1 / (s + 1) ** STORE_SKEW for s in range(stores)]
+    customers = [max(1, c) for c in largest_remainder(scale["customers"], store_weights)]
+    offsets = [0]
+    for count in customers:
+        offsets.append(offsets[-1] + count)
+
+    days = scale["days"]
+    start = end_date - timedelta(days=days - 1)
+    day_weights = [
+        WEEKDAY_WEIGHTS[(start + timedelta(days=d)).weekday()] * (1 + (GROWTH - 1) * d / max(days - 1, 1))
+        for d in range(days)
+    ]
+    payment_methods = [(m, w) for m, w in PAYMENT_METHODS if m in domain(schema, "orders", "payment_method", [m])]
+    return {
+        "seed": seed,
+        "scale": scale,
+        "start": start.isoformat(),
+        "end": end_date.isoformat(),
+        "store_cum": [sum(store_weights[:i + 1]) for i in range(stores)],
+        "customers_per_store": customers,
+        "customer_offsets": offsets,
+        "orders_per_day": largest_remainder(scale["orders"], day_weights),
+        "statuses": {
+            "active": domain(schema, "orders", "status", ACTIVE_STATUSES),
+            "done": domain(schema, "orders", "status", ["delivered"])[0],
+            "cancelled": domain(schema, "orders", "status", ["cancelled"])[0],
+            "paid": domain(schema, "orders", "payment_status", ["paid"])[0],
+            "unpaid": domain(schema, "orders", "payment_status", ["pending"])[0],
+        },
+        "payment_methods": [m for m, _ in payment_methods] or domain(schema, "orders", "payment_method", ["pix"]),
+        "payment_weights": [w for _, w in payment_methods] or None,
+    }
+
+
+def build_tasks(plan: dict) -> list:
+    tasks = [{"kind": "stores", "part": 0}]
+    total_customers = plan["customer_offsets"][-1]
+    for part, first in enumerate(range(0, total_customers, CHUNK_ORDERS)):
+        tasks.append({"kind": "customers", "part": part, "first": first,
+                      "last": min(first + CHUNK_ORDERS, total_customers)})
+    part = 0
+    first_day = 0
+    order_number = 1
+    pending = 0
+    for day, count in enumerate(plan["orders_per_day"]):
+        pending += count
+        if pending >= CHUNK_ORDERS or day == len(plan["orders_per_day"]) - 1:
+            tasks.append({"kind": "orders", "part": part, "first_day": first_day, "last_day": day + 1,
+                          "first_order": order_number})
+            part += 1
+            order_number += pending
+            first_day = day + 1
+            pending = 0
+    return tasks
+
+
+# ============================================================================
+# GENERATORS (run in worker processes)
+# ============================================================================
+
+def open_writers(out_dir: Path, layouts: dict, tables: list, part: int) -> dict:
+    return {t: CopyWriter(out_dir / f"{t}.{part:05d}.copy", layouts[t]["columns"], layouts[t]["fill"])
+            for t in tables if t in layouts}
+
+
+def generate_stores(task: dict, plan: dict, layouts: dict, out_dir: Path) -> dict:
+    seed = plan["seed"]
+    rng = random.Random(f"{seed}:stores")
+    writers = open_writers(out_dir, layouts, ["auth.users", "user_settings", "categories", "products"], task["part"])
+    opened = f"{plan['start']} 09:00:00+00"
+    for s in range(plan["scale"]["stores"]):
+        user_id = det_uuid(seed, "store", s)
+        writers["auth.users"].write({"id": user_id, "email": f"store{s}@example.com", "created_at": opened})
+        if "user_settings" in writers:
+            writers["user_settings"].write({"user_id": user_id, "app_name": f"Loja {s}", "public_slug": f"loja-{s}",
+                                            "store_open": True, "created_at": opened})
+        if "categories" in writers:
+            for c, name in enumerate(CATEGORIES):
+                writers["categories"].write({"id": det_uuid(seed, "category", f"{s}-{c}"), "user_id": user_id,
+                                             "name": name, "display_order": c, "created_at": opened})
+        if "products" in writers:
+            for p in range(plan["scale"]["products_per_store"]):
+                writers["products"].write({
+                    "id": det_uuid(seed, "product", f"{s}-{p}"), "user_id": user_id,
+                    "category_id": det_uuid(seed, "category", f"{s}-{p % len(CATEGORIES)}"),
+                    "name": f"{CATEGORIES[p % len(CATEGORIES)]} {p}", "price": product_price(s, p),
+                    "available": rng.random() > 0.08, "display_order": p, "created_at": opened
+                })
+    return {table: writer.close() for table, writer in writers.items()}
+
+
+def generate_customers(task: dict, plan: dict, layouts: dict, out_dir: Path) -> dict:
+    seed = plan["seed"]
+    writers = open_writers(out_dir, layouts, ["customers"], task["part"])
+    if not writers:
+        return {}
+    offsets = plan["customer_offsets"]
+    joined = f"{plan['start']} 12:00:00+00"
+    for n in range(task["first"], task["last"]):
+        store = bisect.bisect_right(offsets, n) - 1
+        writers["customers"].write({
+            "id": det_uuid(seed, "customer", n), "user_id": det_uuid(seed, "store", store),
+            "name": customer_name(n), "phone": customer_phone(n), "email": f"cliente{n}@example.com",
+            "created_at": joined
+        })
+    return {table: writer.close() for table, writer in writers.items()}
+
+
+def generate_orders(task: dict, plan: dict, layouts: dict, out_dir: Path) -> dict:
+    """Orders, their items and the matching daily_analytics rows for whole days."""
+    seed = plan["seed"]
+    writers = open_writers(out_dir, layouts, ["orders", "order_items", "daily_analytics"], task["part"])
+    scale = plan["scale"]
+    statuses = plan["statuses"]
+    store_cum = plan["store_cum"]
+    store_total = store_cum[-1]
+    hour_cum = [sum(HOUR_WEIGHTS[:h + 1]) for h in range(24)]
+    extra_items = max(scale["items_per_order"] - 1, 0)
+    start = date.fromisoformat(plan["start"])
+    last_day = len(plan["orders_per_day"]) - 1
+    order_number = task["first_order"]
+    store_ids = [det_uuid(seed, "store", s) for s in range(scale["stores"])]
+    product_ids = {}
+
+    for day in range(task["first_day"], task["last_day"]):
+        current = (start + timedelta(days=day)).isoformat()
+        rng = random.Random(f"{seed}:orders:{day}")
+        daily = {}
+        for _ in range(plan["orders_per_day"][day]):
+            store = min(bisect.bisect_left(store_cum, rng.random() * store_total), len(store_cum) - 1)
+            hour = bisect.bisect_left(hour_cum, rng.random() * hour_cum[-1])
+            minute, second = rng.randrange(60), rng.randrange(60)
+            created = f"{current} {hour:02d}:{minute:02d}:{second:02d}+00"
+            updated = f"{current} {hour:02d}:{min(minute + 35, 59):02d}:{second:02d}+00"
+
+            if rng.random() < WALK_IN_RATE:
+                customer = None
+                name, phone = customer_name(rng.randrange(10000)), None
+            else:
+                local = int(plan["customers_per_store"][store] * rng.random() ** CUSTOMER_SKEW)
+                customer = plan["customer_offsets"][store] + local
+                name, phone = customer_name(customer), customer_phone(customer)
+
+            if day == last_day:
+                status = rng.choice(statuses["active"])
+            else:
+                status = statuses["cancelled"] if rng.random() < 0.04 else statuses["done"]
+            paid = status != statuses["cancelled"] and rng.random() < 0.92
+            delivery = rng.random() < 0.55
+            fee = 5.0 + (store % 4) * 1.5 if delivery else 0.0
+
+            order_id = det_uuid(seed, "order", order_number)
+            count = min(1 + int(rng.expovariate(1 / extra_items)) if extra_items else 1, MAX_ITEMS)
+            subtotal = 0.0
+            products = set()
+            for k in range(count):
+                product = int(scale["products_per_store"] * rng.random() ** PRODUCT_SKEW)
+                quantity = 1 + (rng.random() < 0.25) + (rng.random() < 0.08)
+                price = product_price(store, product)
+                line_total = round(price * quantity, 2)
+                subtotal += line_total
+                products.add(product)
+                if "order_items" in writers:
+                    writers["order_items"].write({
+                        "id": det_uuid(seed, "item", f"{order_number}-{k}"), "order_id": order_id,
+                        "product_id": product_ids.get((store, product))
+                        or product_ids.setdefault((store, product), det_uuid(seed, "product", f"{store}-{product}")),
+                        "product_name": f"{CATEGORIES[product % len(CATEGORIES)]} {product}",
+                        "quantity": quantity, "unit_price": price, "total": line_total
+                    })
+            subtotal = round(subtotal, 2)
+            total = round(subtotal + fee, 2)
+
+            if "orders" in writers:
+                writers["orders"].write({
+                    "id": order_id, "user_id": store_ids[store], "order_number": order_number,
+                    "customer_name": name, "customer_phone": phone,
+                    "customer_id": det_uuid(seed, "customer", customer) if customer is not None else None,
+                    "status": status,
+                    "payment_method": rng.choices(plan["payment_methods"], plan["payment_weights"])[0],
+                    "payment_status": statuses["paid"] if paid else statuses["unpaid"],
+                    "subtotal": subtotal, "delivery_fee": fee, "total": total, "is_delivery": delivery,
+                    "created_at": created, "updated_at": updated
+                })
+            order_number += 1
+
+            stats = daily.setdefault(store, {"revenue": 0.0, "orders": 0, "cancelled": 0, "paid": 0,
+                                             "delivery": 0, "customers": set(), "items": 0,
+                                             "products": set(), "hours": [0] * 24})
+            stats["orders"] += 1
+            stats["cancelled"] += status == statuses["cancelled"]
+            stats["delivery"] += delivery
+            stats["hours"][hour] += 1
+            stats["items"] += count
+            stats["products"] |= products
+            if customer is not None:
+                stats["customers"].add(customer)
+            if paid:
+                stats["paid"] += 1
+                stats["revenue"] += total
+
+        if "daily_analytics" in writers:
+            for store, stats in sorted(daily.items()):
+                peak = max(range(24), key=stats["hours"].__getitem__)
+                writers["daily_analytics"].write({
+                    "user_id": store_ids[store], "date": current,
+                    "total_revenue": round(stats["revenue"], 2), "total_orders": stats["orders"],
+                    "cancelled_orders": stats["cancelled"], "paid_orders": stats["paid"],
+                    "avg_order_value": round(stats["revenue"] / stats["paid"], 2) if stats["paid"] else 0,
+                    "delivery_orders": stats["delivery"], "pickup_orders": stats["orders"] - stats["delivery"],
+                    "total_customers": len(stats["customers"]), "total_products_sold": stats["items"],
+                    "unique_products_sold": len(stats["products"]), "peak_hour": peak,
+                    "peak_hour_orders": stats["hours"][peak]
+                })
+    return {table: writer.close() for table, writer in writers.items()}
+
+
+GENERATORS = {"stores": generate_stores, "customers": generate_customers, "orders": generate_orders}
+
+
+def run_task(args: tuple) -> tuple:
+    task, plan, layouts, out_dir = args
+    return task, GENERATORS[task["kind"]](task, plan, layouts, Path(out_dir))
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def write_load_script(out_dir: Path, order: list, layouts: dict, files: dict, plan: dict):
+    lines = [f"-- synthetic_data.py: seed {plan['seed']}, {plan['start']}..{plan['end']}, scale {json.dumps(plan['scale'])}",
+             "-- Run from this directory: psql -f load.sql"]
+    for table in order:
+        columns = ', '.join(layouts[table]["columns"])
+        for entry in sorted(files.get(table, []), key=lambda e: e["file"]):
+            lines.append(f"\\copy {table} ({columns}) FROM '{entry['file']}'")
+    lines.append("ANALYZE;")
+    (out_dir / "load.sql").write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+
+def generate(project_path: Path, scale: dict, seed, end_date: date, out_dir: Path, workers: int = None) -> dict:
+    schema = load_project_schema(project_path)
+    if schema is None:
+        return None
+    layouts = table_layouts(schema, end_date)
+    plan = build_plan(schema, scale, seed, end_date)
+    tasks = build_tasks(plan)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for stale in out_dir.glob("*.copy"):
+        stale.unlink()
+
+    files = {}
+    jobs = [(task, plan, layouts, str(out_dir)) for task in tasks]
+    if workers == 1:
+        results = map(run_task, jobs)
+        for _, written in results:
+            for table, entry in written.items():
+                files.setdefault(table, []).append(entry)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for _, written in executor.map(run_task, jobs):
+                for table, entry in written.items():
+                    files.setdefault(table, []).append(entry)
+
+    order = load_order(schema, [t for t in layouts if t in files])
+    write_load_script(out_dir, order, layouts, files, plan)
+    manifest = {
+        "seed": seed,
+        "scale": scale,
+        "start": plan["start"],
+        "end": plan["end"],
+        "load_order": order,
+        "tables": {
+            table: {"columns": layouts[table]["columns"],
+                    "rows": sum(e["rows"] for e in files[table]),
+                    "files": sorted(e["file"] for e in files[table])}
+            for table in order
+        }
+    }
+    with open(out_dir / "manifest.json", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate skewed synthetic data as COPY files")
+    parser.add_argument("project", nargs="?", default=".", help="Project path")
+    parser.add_argument("--out", help=f"Output directory (default: <project>/{OUTPUT_DIR})")
+    for name, value in DEFAULT_SCALE.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", dest=name, type=type(value), default=value,
+                            help=f"default {value}")
+    parser.add_argument("--seed", default="42", help="Seed; same seed and scale give identical files")
+    parser.add_argument("--end-date", help="Last day of data, YYYY-MM-DD (default: today)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    project_path = Path(args.project).resolve()
+    out_dir = Path(args.out).resolve() if args.out else project_path / OUTPUT_DIR
+    end_date = date.fromisoformat(args.end_date) if args.end_date else date.today()
+    scale = {name: getattr(args, name) for name in DEFAULT_SCALE}
+    if scale["stores"] < 1 or scale["days"] < 1:
+        parser.error("--stores and --days must be at least 1")
+
+    started = datetime.now()
+    manifest = generate(project_path, scale, args.seed, end_date, out_dir, args.workers)
+    if manifest is None:
+        print(json.dumps({"script": "synthetic_data", "project": str(project_path), "passed": True,
+                          "skipped": True, "message": "No SQL migrations found"}, indent=2))
+        sys.exit(0)
+
+    seconds = (datetime.now() - started).total_seconds()
+    rows = sum(t["rows"] for t in manifest["tables"].values())
+    print(f"\n{'='*60}")
+    print(f"[SYNTHETIC DATA] {rows:,} rows in {seconds:.1f}s ({rows / max(seconds, 0.001):,.0f} rows/s)")
+    print(f"{'='*60}")
+    for table, info in manifest["tables"].items():
+        print(f"  {table:<18} {info['rows']:>12,} rows  {len(info['files'])} file(s)")
+    print(f"\nOutput: {out_dir}")
+    print(f"Load:   cd {out_dir} && psql <dsn> -f load.sql")
+    print(json.dumps({"script": "synthetic_data", "output": str(out_dir), "rows": rows,
+                      "seconds": round(seconds, 1), "seed": args.seed, "passed": True}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
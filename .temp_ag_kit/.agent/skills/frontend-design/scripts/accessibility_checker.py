@@ -4,7 +4,7 @@ Accessibility Checker - WCAG compliance audit
 Checks HTML files for accessibility issues.
 
 Usage:
-    python accessibility_checker.py <project_path>
+    python accessibility_checker.py <project_path> [--workers N] [--no-cache]
 
 Checks:
     - Form labels
@@ -12,14 +12,26 @@ Checks:
     - Color contrast hints
     - Keyboard navigation
     - Semantic HTML
+
+Each file is read in chunks and tokenized into a stream of tag/text events
+(no DOM); every rule watches the same stream, so a file is scanned once and
+memory stays constant however large the file. Files are found in one pruned
+directory walk and checked in parallel; results are cached per file in
+.agent_cache/accessibility_checker.json (by size, mtime and CHECKS_VERSION).
 """
 
+import os
 import sys
 import json
 import re
+import argparse
 from pathlib import Path
 from datetime import datetime
 
+# Shared per-file result cache and process pool (.agent/scripts/result_cache.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "scripts"))
+from result_cache import cached_map
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -27,101 +39,284 @@ except:
     pass
 
 
+SKIP_DIRS = {'node_modules', '.next', 'dist', 'build', '.git', 'coverage', '__pycache__'}
+FILE_EXTENSIONS = {'.html', '.htm', '.jsx', '.tsx'}
+
+CACHE_FILE = ".agent_cache/accessibility_checker.json"
+CHECKS_VERSION = 2
+
+CHUNK_SIZE = 1 << 16
+# An unterminated "<tag" longer than this is text (e.g. `a < b` in code)
+MAX_TAG = 1 << 16
+
+TAG_START = re.compile(r'<(/?)([A-Za-z][\w.:-]*)')
+TAG_SPECIAL = re.compile(r'["\'`{}>]')
+ATTRIBUTE = re.compile(r'\s*(\{|[^\s=/>{}"\']+)(?:\s*=\s*("[^"]*"|\'[^\']*\'|\{))?')
+
+# Elements that are focusable and keyboard-operable on their own
+INTERACTIVE = {'a', 'button', 'input', 'select', 'textarea', 'summary', 'option', 'label', 'link'}
+KEY_HANDLERS = ('onkeydown', 'onkeyup', 'onkeypress')
+
+
 def find_html_files(project_path: Path) -> list:
-    """Find all HTML/JSX/TSX files."""
-    patterns = ['**/*.html', '**/*.jsx', '**/*.tsx']
-    skip_dirs = {'node_modules', '.next', 'dist', 'build', '.git'}
-    
+    """Find all HTML/JSX/TSX files in one pruned walk."""
     files = []
-    for pattern in patterns:
-        for f in project_path.glob(pattern):
-            if not any(skip in f.parts for skip in skip_dirs):
-                files.append(f)
-    
-    return files[:50]
+    for root, dirs, filenames in os.walk(project_path):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS and not d.startswith('.'))
+        for filename in sorted(filenames):
+            if os.path.splitext(filename)[1].lower() in FILE_EXTENSIONS:
+                files.append(Path(root) / filename)
+    return files
+
+
+# ============================================================================
+# TAG STREAM
+# ============================================================================
+
+def skip_braces(text: str, start: int) -> int:
+    """Index after the '}' matching the '{' before start, or -1 if unterminated."""
+    depth = 1
+    pos = start
+    while depth:
+        m = TAG_SPECIAL.search(text, pos)
+        if not m:
+            return -1
+        c = m.group()
+        pos = m.end()
+        if c in '"\'`':
+            end = text.find(c, pos)
+            if end == -1:
+                return -1
+            pos = end + 1
+        elif c == '{':
+            depth += 1
+        elif c == '}':
+            depth -= 1
+    return pos
+
+
+def tag_end(text: str, pos: int) -> int:
+    """Index after the '>' closing a tag whose attributes start at pos; -1 if not in text yet."""
+    depth = 0
+    while True:
+        m = TAG_SPECIAL.search(text, pos)
+        if not m:
+            return -1
+        c = m.group()
+        pos = m.end()
+        if c in '"\'`':
+            end = text.find(c, pos)
+            if end == -1:
+                return -1
+            pos = end + 1
+        elif c == '{':
+            depth += 1
+        elif c == '}':
+            depth = max(0, depth - 1)
+        elif depth == 0:
+            return pos
+
+
+def parse_attrs(text: str) -> dict:
+    """Attribute names (lowercased) to values without quotes/braces; spreads become '...'."""
+    attrs = {}
+    pos = 0
+    while pos < len(text):
+        m = ATTRIBUTE.match(text, pos)
+        if not m or m.end() == pos:
+            pos += 1
+            continue
+        name, value = m.group(1), m.group(2)
+        pos = m.end()
+        if name == '{':
+            end = skip_braces(text, pos)
+            attrs['...'] = text[pos:end - 1].strip() if end != -1 else ''
+            pos = end if end != -1 else len(text)
+            continue
+        if value == '{':
+            end = skip_braces(text, pos)
+            value = text[pos:end - 1].strip() if end != -1 else ''
+            pos = end if end != -1 else len(text)
+        elif value:
+            value = value[1:-1]
+        attrs[name.lower()] = value if value is not None else True
+    return attrs
+
+
+def with_end(chunks):
+    yield from chunks
+    yield None
+
+
+def tag_events(chunks):
+    """
+    Yield ('start', name, attrs_text, self_closing, line), ('end', name, None, False, line)
+    and ('text', text, None, False, line) from an iterable of text chunks.
+    Only an incomplete tag is carried between chunks.
+    """
+    buf = ''
+    line = 1
+    for chunk in with_end(chunks):
+        eof = chunk is None
+        buf += chunk or ''
+        pos = 0
+        while pos < len(buf):
+            lt = buf.find('<', pos)
+            if lt == -1:
+                lt = len(buf)
+            if lt > pos:
+                text = buf[pos:lt]
+                yield ('text', text, None, False, line)
+                line += text.count('\n')
+                pos = lt
+                continue
+            event = None
+            if buf.startswith('<!--', lt):
+                end = buf.find('-->', lt + 4)
+                end = end + 3 if end != -1 else -1
+            elif len(buf) - lt < 4 and '<!--'.startswith(buf[lt:]):
+                end = -1  # Possibly a comment split across chunks
+            else:
+                m = TAG_START.match(buf, lt)
+                if not m and len(buf) - lt > 2:
+                    end = None
+                elif not m or m.end() == len(buf):
+                    end = -1
+                else:
+                    end = tag_end(buf, m.end())
+                    event = m
+            if end is None or (end == -1 and (eof or len(buf) - lt > MAX_TAG)):
+                yield ('text', '<', None, False, line)
+                pos = lt + 1
+                continue
+            if end == -1:
+                break  # Tag continues in the next chunk
+            raw = buf[lt:end]
+            if event is not None:
+                if event.group(1):
+                    yield ('end', event.group(2), None, False, line)
+                else:
+                    attrs = raw[event.end() - lt:-1]
+                    self_closing = attrs.rstrip().endswith('/')
+                    yield ('start', event.group(2), attrs.rstrip().rstrip('/'), self_closing, line)
+            line += raw.count('\n')
+            pos = end
+        buf = buf[pos:]
+
+
+def read_chunks(file_path: Path):
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+# ============================================================================
+# RULES (single pass over the tag stream)
+# ============================================================================
+
+def base_name(tag: str) -> str:
+    """motion.button -> button, Link -> link."""
+    return tag.rsplit('.', 1)[-1].lower()
+
+
+def check_events(events) -> list:
+    """Evaluate every rule against one event stream; each issue is reported once per file."""
+    issues = {}
+    report = lambda message, line: issues.setdefault(message, line)
+    open_buttons = []          # [line, labelled, has_text, nested] per open <button>
+    landmarks = False          # saw <main> or <body>
+    skip_link = False
+    text_tail = ''             # end of the text run so far, for "skip" split across text events
+
+    for kind, name, attr_text, self_closing, line in events:
+        if kind == 'text':
+            if open_buttons and name.strip():
+                open_buttons[-1][2] = True
+            if not skip_link:
+                # Text is emitted per chunk, so one run of text may arrive in pieces
+                window = text_tail + name.lower()
+                skip_link = 'skip' in window
+                text_tail = window[-3:]
+            continue
+        text_tail = ''
+        tag = base_name(name)
+        if kind == 'end':
+            if tag == 'button' and open_buttons:
+                start_line, labelled, has_text, nested = open_buttons.pop()
+                if not (labelled or has_text or nested):
+                    report("Button without accessible text", start_line)
+            continue
+
+        if open_buttons:
+            open_buttons[-1][3] = True
+        attrs = parse_attrs(attr_text) if attr_text.strip() else {}
+        if not skip_link:
+            lowered = attr_text.lower()
+            skip_link = 'skip' in lowered or '#main' in lowered
+
+        if tag == 'input':
+            if str(attrs.get('type', '')).lower() != 'hidden' and not (
+                    'aria-label' in attrs or 'aria-labelledby' in attrs or 'id' in attrs or '...' in attrs):
+                report("Input without label or aria-label", line)
+        elif tag == 'button' and not self_closing:
+            open_buttons.append([line, 'aria-label' in attrs or 'aria-labelledby' in attrs, False, False])
+        elif tag == 'html' and 'lang' not in attrs:
+            report("Missing lang attribute on <html>", line)
+        elif tag in ('main', 'body'):
+            landmarks = True
+
+        if 'onclick' in attrs and tag not in INTERACTIVE and not any(k in attrs for k in KEY_HANDLERS):
+            report("onClick without keyboard handler (onKeyDown)", line)
+        tabindex = str(attrs.get('tabindex', '')).strip()
+        if tabindex.isdigit() and int(tabindex) > 0:
+            report("Avoid positive tabIndex values", line)
+        if 'autoplay' in attrs and 'muted' not in attrs:
+            report("Autoplay media should be muted", line)
+        if str(attrs.get('role', '')).lower() == 'button' and tag not in INTERACTIVE and 'tabindex' not in attrs:
+            report("role='button' without tabindex", line)
+
+    if landmarks and not skip_link:
+        report("Consider adding skip-to-main-content link", None)
+    return [message if line is None else f"{message} (line {line})" for message, line in issues.items()]
 
 
 def check_accessibility(file_path: Path) -> list:
     """Check a single file for accessibility issues."""
-    issues = []
-    
     try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
-        
-        # Check for form inputs without labels
-        inputs = re.findall(r'<input[^>]*>', content, re.IGNORECASE)
-        for inp in inputs:
-            if 'type="hidden"' not in inp.lower():
-                if 'aria-label' not in inp.lower() and 'id=' not in inp.lower():
-                    issues.append("Input without label or aria-label")
-                    break
-        
-        # Check for buttons without accessible text
-        buttons = re.findall(r'<button[^>]*>[^<]*</button>', content, re.IGNORECASE)
-        for btn in buttons:
-            # Check if button has text content or aria-label
-            if 'aria-label' not in btn.lower():
-                text = re.sub(r'<[^>]+>', '', btn)
-                if not text.strip():
-                    issues.append("Button without accessible text")
-                    break
-        
-        # Check for missing lang attribute
-        if '<html' in content.lower() and 'lang=' not in content.lower():
-            issues.append("Missing lang attribute on <html>")
-        
-        # Check for missing skip link
-        if '<main' in content.lower() or '<body' in content.lower():
-            if 'skip' not in content.lower() and '#main' not in content.lower():
-                issues.append("Consider adding skip-to-main-content link")
-        
-        # Check for click handlers without keyboard support
-        onclick_count = content.lower().count('onclick=')
-        onkeydown_count = content.lower().count('onkeydown=') + content.lower().count('onkeyup=')
-        if onclick_count > 0 and onkeydown_count == 0:
-            issues.append("onClick without keyboard handler (onKeyDown)")
-        
-        # Check for tabIndex misuse
-        if 'tabindex=' in content.lower():
-            if 'tabindex="-1"' not in content.lower() and 'tabindex="0"' not in content.lower():
-                positive_tabindex = re.findall(r'tabindex="([1-9]\d*)"', content, re.IGNORECASE)
-                if positive_tabindex:
-                    issues.append("Avoid positive tabIndex values")
-        
-        # Check for autoplay media
-        if 'autoplay' in content.lower():
-            if 'muted' not in content.lower():
-                issues.append("Autoplay media should be muted")
-        
-        # Check for role usage
-        if 'role="button"' in content.lower():
-            # Divs with role button should have tabindex
-            div_buttons = re.findall(r'<div[^>]*role="button"[^>]*>', content, re.IGNORECASE)
-            for div in div_buttons:
-                if 'tabindex' not in div.lower():
-                    issues.append("role='button' without tabindex")
-                    break
-        
+        return check_events(tag_events(read_chunks(file_path)))
     except Exception as e:
-        issues.append(f"Error reading file: {str(e)[:50]}")
-    
-    return issues
+        return [f"Error reading file: {str(e)[:50]}"]
+
+
+def audit_files(project_path: Path, files: list, workers: int = None, use_cache: bool = True) -> list:
+    """check_accessibility for every file, in parallel, reusing cached results for unchanged files."""
+    results = cached_map(project_path, files, check_accessibility, CACHE_FILE, CHECKS_VERSION, workers, use_cache)
+    return [{"file": f.relative_to(project_path).as_posix(), "issues": issues}
+            for f, issues in zip(files, results)]
 
 
 def main():
-    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
-    
+    parser = argparse.ArgumentParser(description="WCAG accessibility audit of HTML/JSX/TSX files")
+    parser.add_argument("project", nargs="?", default=".", help="Project path")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-check every file")
+    args = parser.parse_args()
+    project_path = Path(args.project).resolve()
+
     print(f"\n{'='*60}")
     print(f"[ACCESSIBILITY CHECKER] WCAG Compliance Audit")
     print(f"{'='*60}")
     print(f"Project: {project_path}")
     print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("-"*60)
-    
+
     # Find HTML files
     files = find_html_files(project_path)
     print(f"Found {len(files)} HTML/JSX/TSX files")
-    
+
     if not files:
         output = {
             "script": "accessibility_checker",
@@ -133,38 +328,33 @@ def main():
         }
         print(json.dumps(output, indent=2))
         sys.exit(0)
-    
+
     # Check each file
-    all_issues = []
-    
-    for f in files:
-        issues = check_accessibility(f)
-        if issues:
-            all_issues.append({
-                "file": str(f.name),
-                "issues": issues
-            })
-    
+    all_issues = [
+        item for item in audit_files(project_path, files, args.workers, not args.no_cache)
+        if item["issues"]
+    ]
+
     # Summary
     print("\n" + "="*60)
     print("ACCESSIBILITY ISSUES")
     print("="*60)
-    
+
     if all_issues:
         for item in all_issues[:10]:
             print(f"\n{item['file']}:")
             for issue in item["issues"]:
                 print(f"  - {issue}")
-        
+
         if len(all_issues) > 10:
             print(f"\n... and {len(all_issues) - 10} more files with issues")
     else:
         print("No accessibility issues found!")
-    
+
     total_issues = sum(len(item["issues"]) for item in all_issues)
     # Accessibility issues are important but not blocking
     passed = total_issues < 5  # Allow minor issues
-    
+
     output = {
         "script": "accessibility_checker",
         "project": str(project_path),
@@ -173,9 +363,9 @@ def main():
         "issues_found": total_issues,
         "passed": passed
     }
-    
+
     print("\n" + json.dumps(output, indent=2))
-    
+
     sys.exit(0 if passed else 1)
 
 
@@ -0,0 +1,30 @@
+"""accessibility_checker: results must not depend on where the file is split into chunks."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from accessibility_checker import check_events, tag_events
+
+PAGE = """<html lang="en"><body>
+<a href="#content">Skip to content</a>
+<main id="content"><button onClick={save}></button><input type="text" /></main>
+</body></html>
+"""
+
+
+def check(text: str, size: int) -> list:
+    return check_events(tag_events(text[i:i + size] for i in range(0, len(text), size)))
+
+
+def test_chunk_size_does_not_change_results():
+    whole = check(PAGE, len(PAGE))
+    assert "Consider adding skip-to-main-content link" not in whole
+    for size in (1, 2, 3, 5, 7):
+        assert check(PAGE, size) == whole
+
+
+def test_skip_word_split_by_a_tag_is_not_a_skip_link():
+    page = "<body><main>sk<b>ip</b></main></body>"
+    assert "Consider adding skip-to-main-content link" in check(page, len(page))
+    assert check(page, 1) == check(page, len(page))
+
@@ -14,13 +14,23 @@ WHAT IT CHECKS:
     - NOT markdown files (those are developer docs, not public content)
 
 Usage:
-    python geo_checker.py <project_path>
+    python geo_checker.py <project_path> [--workers N] [--no-cache]
+
+Pages are found in one pruned directory walk and audited in parallel. Results
+are cached per file in .agent_cache/geo_checker.json (by size, mtime and
+CHECKS_VERSION), so unchanged pages are not re-read.
 """
+import os
 import sys
 import re
 import json
+import argparse
 from pathlib import Path
 
+# Shared per-file result cache and process pool (.agent/scripts/result_cache.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "scripts"))
+from result_cache import cached_map
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -36,6 +46,11 @@ SKIP_DIRS = {
     '__tests__', 'spec', 'docs', 'documentation'
 }
 
+PAGE_EXTENSIONS = {'.html', '.htm', '.jsx', '.tsx'}
+
+CACHE_FILE = ".agent_cache/geo_checker.json"
+CHECKS_VERSION = 1
+
 # Files to skip (not public pages)
 SKIP_FILES = {
     'jest.config', 'webpack.config', 'vite.config', 'tsconfig',
@@ -79,29 +94,27 @@ def is_page_file(file_path: Path) -> bool:
 
 
 def find_web_pages(project_path: Path) -> list:
-    """Find public-facing web pages only."""
-    patterns = ['**/*.html', '**/*.htm', '**/*.jsx', '**/*.tsx']
-    
+    """Find public-facing web pages in a single walk that never enters skipped directories."""
     files = []
-    for pattern in patterns:
-        for f in project_path.glob(pattern):
-            # Skip excluded directories
-            if any(skip in f.parts for skip in SKIP_DIRS):
-                continue
-            
+    for root, dirs, filenames in os.walk(project_path):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS and not d.startswith('.')]
+        for filename in filenames:
+            f = Path(root) / filename
             # Check if it's likely a page
-            if is_page_file(f):
+            if f.suffix.lower() in PAGE_EXTENSIONS and is_page_file(f.relative_to(project_path)):
                 files.append(f)
     
-    return files[:30]  # Limit to 30 pages
+    return sorted(files)
 
 
-def check_page(file_path: Path) -> dict:
+def check_page(file_path: Path, project_path: Path = None) -> dict:
     """Check a single web page for GEO elements."""
+    # Next.js routes are all page.tsx/layout.tsx, so report the path
+    label = str(file_path.relative_to(project_path)) if project_path else str(file_path.name)
     try:
         content = file_path.read_text(encoding='utf-8', errors='ignore')
     except Exception as e:
-        return {'file': str(file_path.name), 'passed': [], 'issues': [f"Error: {e}"], 'score': 0}
+        return {'file': label, 'passed': [], 'issues': [f"Error: {e}"], 'score': 0}
     
     issues = []
     passed = []
@@ -212,16 +225,26 @@ def check_page(file_path: Path) -> dict:
     score = (len(passed) / total * 100) if total > 0 else 0
     
     return {
-        'file': str(file_path.name),
+        'file': label,
         'passed': passed,
         'issues': issues,
         'score': round(score)
     }
 
 
+def audit_pages(project_path: Path, pages: list, workers: int = None, use_cache: bool = True) -> list:
+    """check_page for every page, in parallel, reusing cached results for unchanged files."""
+    return cached_map(project_path, pages, check_page, CACHE_FILE, CHECKS_VERSION,
+                      workers, use_cache, args=(project_path,))
+
+
 def main():
-    target = sys.argv[1] if len(sys.argv) > 1 else "."
-    target_path = Path(target).resolve()
+    parser = argparse.ArgumentParser(description="GEO audit of public web pages")
+    parser.add_argument("project", nargs="?", default=".", help="Project path")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-check every page")
+    args = parser.parse_args()
+    target_path = Path(args.project).resolve()
     
     print("\n" + "=" * 60)
     print("  GEO CHECKER - AI Citation Readiness Audit")
@@ -243,10 +266,7 @@ def main():
     print(f"Found {len(pages)} public pages to analyze\n")
     
     # Check each page
-    results = []
-    for page in pages:
-        result = check_page(page)
-        results.append(result)
+    results = audit_pages(target_path, pages, args.workers, not args.no_cache)
     
     # Print results
     for result in results:
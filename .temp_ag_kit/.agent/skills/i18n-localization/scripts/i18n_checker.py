@@ -2,12 +2,28 @@
 """
 i18n Checker - Detects hardcoded strings and missing translations.
 Scans for untranslated text in React, Vue, and Python files.
+
+Usage:
+    python i18n_checker.py <project_path> [--no-cache]
+
+Locale JSON is read in chunks by a streaming key extractor (the catalog is
+never loaded as a whole), and the flattened key sets are cached in
+.agent_cache/i18n_checker.json by file hash. All languages are compared at
+once against the union of their keys. Code files are found in one pruned
+walk and read once, which also indexes the t('key') calls under src/ so
+keys used in code but absent from every catalog are reported.
 """
+import os
 import sys
 import re
 import json
+import argparse
 from pathlib import Path
 
+# Shared per-file result cache (.agent/scripts/result_cache.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "scripts"))
+from result_cache import ResultCache, file_key
+
 # Fix Windows console encoding for Unicode output
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -15,6 +31,21 @@ try:
 except AttributeError:
     pass  # Python < 3.7
 
+# Directories to skip (dot-directories are skipped too)
+SKIP_DIRS = {'node_modules', 'dist', 'build', '__pycache__', 'venv', 'coverage'}
+# Directories whose JSON files are message catalogs
+LOCALE_DIRS = {'locales', 'translations', 'lang', 'i18n'}
+
+CODE_EXTENSIONS = {
+    '.tsx': 'jsx', '.jsx': 'jsx', '.ts': 'jsx', '.js': 'jsx',
+    '.vue': 'vue',
+    '.py': 'python'
+}
+
+CACHE_FILE = ".agent_cache/i18n_checker.json"
+EXTRACTOR_VERSION = 1
+CHUNK_SIZE = 1 << 16
+
 # Patterns that indicate hardcoded strings (should be translated)
 HARDCODED_PATTERNS = {
     'jsx': [
@@ -50,137 +81,243 @@ I18N_PATTERNS = [
     r'i18n\.',             # Generic i18n
 ]
 
+# Literal translation keys: t('a.b'), $t('a.b'), i18n.t('a.b'), <FormattedMessage id="a.b">,
+# formatMessage({ id: 'a.b' }). Template strings with ${...} are dynamic and skipped.
+KEY_USAGE = re.compile(
+    r'''(?<![\w$.])(?:\$t|(?:i18n|i18next)\.t|t)\(\s*(['"`])([^'"`$\n]+?)\1'''
+    r'''|<FormattedMessage\b[^>]*?\bid=(['"])([^'"\n]+)\3'''
+    r'''|formatMessage\(\s*\{\s*id:\s*(['"])([^'"\n]+)\5''')
+# Namespace hooks: useTranslations('Home') (next-intl), useTranslation('common') (i18next)
+NAMESPACE_HOOK = re.compile(r'''\b(?:useTranslations?|getTranslations)\(\s*['"]([^'"]+)['"]''')
+
+# Streaming JSON tokens: string, punctuation, or bare literal (number/true/false/null)
+JSON_TOKEN = re.compile(r'\s*(?:("(?:[^"\\]|\\.)*")|([{}\[\]:,])|([^\s{}\[\]:,"]+))')
+
 def find_locale_files(project_path: Path) -> list:
-    """Find translation/locale files."""
-    patterns = [
-        "**/locales/**/*.json",
-        "**/translations/**/*.json",
-        "**/lang/**/*.json",
-        "**/i18n/**/*.json",
-        "**/messages/*.json",
-        "**/*.po",  # gettext
-    ]
-    
+    """Find translation/locale files in one pruned walk."""
     files = []
-    for pattern in patterns:
-        files.extend(project_path.glob(pattern))
+    for root, dirs, filenames in os.walk(project_path):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS and not d.startswith('.'))
+        parts = set(Path(root).relative_to(project_path).parts)
+        in_locale_dir = bool(parts & LOCALE_DIRS)
+        for filename in sorted(filenames):
+            if filename.endswith('.po') or (
+                    filename.endswith('.json') and (in_locale_dir or Path(root).name == 'messages')):
+                files.append(Path(root) / filename)
+    return files
+
+def locale_id(file_path: Path, project_path: Path) -> tuple:
+    """
+    (language, namespace) of a catalog: locales/en/common.json -> (en, common),
+    messages/en.json -> (en, ''), locales/en/admin/users.json -> (en, admin/users).
+    """
+    parts = file_path.relative_to(project_path).with_suffix('').parts
+    roots = [i for i, part in enumerate(parts[:-1]) if part in LOCALE_DIRS or part == 'messages']
+    rest = parts[roots[-1] + 1:] if roots else parts[-2:]
+    return rest[0], '/'.join(rest[1:])
+
+def with_end(chunks):
+    yield from chunks
+    yield None
+
+def iter_json_keys(chunks):
+    """
+    Yield the flattened leaf keys ("a.b.c") of a JSON object from an iterable of text chunks.
+    Arrays are leaves, like any other non-object value. Only the current token is carried
+    between chunks, so memory does not grow with the catalog. Raises ValueError on bad JSON.
+    """
+    buf = ''
+    stack = []  # One [prefix, key, expecting_key] per open object
+    skip = 0    # Nesting depth inside an array value
+    for chunk in with_end(chunks):
+        eof = chunk is None
+        buf += chunk or ''
+        pos = 0
+        while True:
+            m = JSON_TOKEN.match(buf, pos)
+            if not m or (m.end() == len(buf) and m.group(3) and not eof):
+                break  # Incomplete string or literal: wait for the next chunk
+            pos = m.end()
+            string, punct = m.group(1), m.group(2)
+            if skip:
+                if punct in ('[', '{'):
+                    skip += 1
+                elif punct in (']', '}'):
+                    skip -= 1
+                continue
+            top = stack[-1] if stack else None
+            if punct in ('{', '[') and top is not None and top[2]:
+                raise ValueError(f"unexpected '{punct}'")
+            if punct == '{':
+                if top is None:
+                    stack.append(['', None, True])
+                else:
+                    stack.append([top[0] + top[1] + '.', None, True])
+            elif punct == '[':
+                if top is not None:
+                    yield top[0] + top[1]
+                skip = 1
+            elif punct == '}':
+                if top is None:
+                    raise ValueError("unbalanced '}'")
+                stack.pop()
+            elif punct == ']':
+                raise ValueError("unbalanced ']'")
+            elif punct == ':':
+                if top is None or top[1] is None:
+                    raise ValueError("unexpected ':'")
+                top[2] = False
+            elif punct == ',':
+                if top is not None:
+                    top[2] = True
+            elif top is not None:
+                if top[2]:
+                    if string is None:
+                        raise ValueError(f"bad key {m.group(3)!r}")
+                    top[1] = string[1:-1] if '\\' not in string else json.loads(string)
+                else:
+                    yield top[0] + top[1]
+        buf = buf[pos:]
+    if buf.strip() or stack or skip:
+        raise ValueError("truncated JSON")
+
+def read_chunks(file_path: Path):
+    with open(file_path, 'r', encoding='utf-8-sig') as f:
+        yield from iter(lambda: f.read(CHUNK_SIZE), '')
+
+def load_locales(project_path: Path, locale_files: list, use_cache: bool = True) -> tuple:
+    """
+    ({language: {namespace: keys}}, unreadable catalog paths) for the JSON catalogs,
+    reusing key sets cached by file hash.
+    """
+    cache = ResultCache(project_path, CACHE_FILE, EXTRACTOR_VERSION, use_cache)
+    locales = {}
+    unreadable = []
+    for f in locale_files:
+        if f.suffix != '.json':
+            continue
+        rel = f.relative_to(project_path).as_posix()
+        try:
+            key = file_key(f)
+            keys = cache.get(rel, key)
+            if keys is None:
+                keys = sorted(set(iter_json_keys(read_chunks(f))))
+                cache.put(rel, key, keys)
+        except (OSError, ValueError):
+            unreadable.append(rel)
+            continue
+        lang, namespace = locale_id(f, project_path)
+        locales.setdefault(lang, {})[namespace] = set(keys)
+    cache.save()
     
-    return [f for f in files if 'node_modules' not in str(f)]
+    return locales, unreadable
 
-def check_locale_completeness(locale_files: list) -> dict:
-    """Check if all locales have the same keys."""
-    issues = []
+def locale_label(lang: str, namespace: str) -> str:
+    return f"{lang}/{namespace}" if namespace else lang
+
+def check_locale_completeness(locale_files: list, locales: dict, unreadable: list) -> dict:
+    """Check that every locale has the union of all locales' keys."""
+    issues = [f"[!] {rel}: Not valid JSON, skipped" for rel in unreadable]
     passed = []
     
     if not locale_files:
         return {'passed': [], 'issues': ["[!] No locale files found"]}
     
-    # Group by parent folder (language)
-    locales = {}
-    for f in locale_files:
-        if f.suffix == '.json':
-            try:
-                lang = f.parent.name
-                content = json.loads(f.read_text(encoding='utf-8'))
-                if lang not in locales:
-                    locales[lang] = {}
-                locales[lang][f.stem] = set(flatten_keys(content))
-            except:
-                continue
-    
     if len(locales) < 2:
         passed.append(f"[OK] Found {len(locale_files)} locale file(s)")
         return {'passed': passed, 'issues': issues}
     
-    passed.append(f"[OK] Found {len(locales)} language(s): {', '.join(locales.keys())}")
+    passed.append(f"[OK] Found {len(locales)} language(s): {', '.join(sorted(locales))}")
     
-    # Compare keys across locales
-    all_langs = list(locales.keys())
-    base_lang = all_langs[0]
-    
-    for namespace in locales.get(base_lang, {}):
-        base_keys = locales[base_lang].get(namespace, set())
-        
-        for lang in all_langs[1:]:
-            other_keys = locales.get(lang, {}).get(namespace, set())
-            
-            missing = base_keys - other_keys
+    # One diff per namespace: each language against the union of all of them
+    namespaces = sorted({ns for namespaces in locales.values() for ns in namespaces})
+    for namespace in namespaces:
+        union = set().union(*(locales[lang].get(namespace, ()) for lang in locales))
+        for lang in sorted(locales):
+            keys = locales[lang].get(namespace)
+            label = locale_label(lang, namespace)
+            if keys is None:
+                issues.append(f"[X] {label}: Missing namespace ({len(union)} keys)")
+                continue
+            missing = union - keys
             if missing:
-                issues.append(f"[X] {lang}/{namespace}: Missing {len(missing)} keys")
-            
-            extra = other_keys - base_keys
-            if extra:
-                issues.append(f"[!] {lang}/{namespace}: {len(extra)} extra keys")
+                issues.append(f"[X] {label}: Missing {len(missing)} keys")
+                issues.append(f"   → {', '.join(sorted(missing)[:3])}{', ...' if len(missing) > 3 else ''}")
     
-    if not issues:
+    if not any(i.startswith("[X]") for i in issues):
         passed.append("[OK] All locales have matching keys")
     
     return {'passed': passed, 'issues': issues}
 
-def flatten_keys(d, prefix=''):
-    """Flatten nested dict keys."""
-    keys = set()
-    for k, v in d.items():
-        new_key = f"{prefix}.{k}" if prefix else k
-        if isinstance(v, dict):
-            keys.update(flatten_keys(v, new_key))
-        else:
-            keys.add(new_key)
-    return keys
-
-def check_hardcoded_strings(project_path: Path) -> dict:
-    """Check for hardcoded strings in code files."""
+def find_code_files(project_path: Path) -> list:
+    """Code files in one pruned walk, skipping tests and specs."""
+    files = []
+    for root, dirs, filenames in os.walk(project_path):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS and not d.startswith('.')
+                         and 'test' not in d and 'spec' not in d)
+        for filename in sorted(filenames):
+            if (os.path.splitext(filename)[1] in CODE_EXTENSIONS
+                    and 'test' not in filename and 'spec' not in filename):
+                files.append(Path(root) / filename)
+    return files
+
+def used_keys(content: str, location: str, index: dict):
+    """Add the literal translation keys of one file to index {key: (candidates, location)}."""
+    namespaces = NAMESPACE_HOOK.findall(content)
+    for m in KEY_USAGE.finditer(content):
+        key = m.group(2) or m.group(4) or m.group(6)
+        if key in index:
+            continue
+        candidates = [f"{ns}.{key}" for ns in namespaces]
+        if ':' in key:
+            candidates.append(key.replace(':', '.', 1))  # i18next "ns:key"
+        candidates.append(key)
+        line = content.count('\n', 0, m.start()) + 1
+        index[key] = (candidates, f"{location}:{line}")
+
+def scan_code_files(project_path: Path, code_files: list) -> dict:
+    """Check every code file for hardcoded strings and index the keys used under src/."""
     issues = []
     passed = []
-    
-    # Find code files
-    extensions = {
-        '.tsx': 'jsx', '.jsx': 'jsx', '.ts': 'jsx', '.js': 'jsx',
-        '.vue': 'vue',
-        '.py': 'python'
-    }
-    
-    code_files = []
-    for ext in extensions:
-        code_files.extend(project_path.rglob(f"*{ext}"))
-    
-    code_files = [f for f in code_files if not any(x in str(f) for x in 
-                  ['node_modules', '.git', 'dist', 'build', '__pycache__', 'venv', 'test', 'spec'])]
+    keys = {}
     
     if not code_files:
-        return {'passed': ["[!] No code files found"], 'issues': []}
+        return {'passed': ["[!] No code files found"], 'issues': [], 'used_keys': keys}
+    
+    src = project_path / 'src'
+    index_root = src if src.is_dir() else project_path
     
     files_with_i18n = 0
     files_with_hardcoded = 0
     hardcoded_examples = []
     
-    for file_path in code_files[:50]:  # Limit
+    for file_path in code_files:
         try:
             content = file_path.read_text(encoding='utf-8', errors='ignore')
-            ext = file_path.suffix
-            file_type = extensions.get(ext, 'jsx')
-            
-            # Check for i18n usage
-            has_i18n = any(re.search(p, content) for p in I18N_PATTERNS)
-            if has_i18n:
-                files_with_i18n += 1
-            
-            # Check for hardcoded strings
-            patterns = HARDCODED_PATTERNS.get(file_type, [])
-            hardcoded_found = False
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, content)
-                if matches and not has_i18n:
+        except OSError:
+            continue
+        file_type = CODE_EXTENSIONS.get(file_path.suffix, 'jsx')
+    
+        # Check for i18n usage
+        has_i18n = any(re.search(p, content) for p in I18N_PATTERNS)
+        if has_i18n:
+            files_with_i18n += 1
+            if index_root in file_path.parents:
+                used_keys(content, file_path.relative_to(project_path).as_posix(), keys)
+    
+        # Check for hardcoded strings
+        hardcoded_found = False
+        if not has_i18n:
+            for pattern in HARDCODED_PATTERNS.get(file_type, []):
+                match = re.search(pattern, content)
+                if match:
                     hardcoded_found = True
                     if len(hardcoded_examples) < 5:
-                        hardcoded_examples.append(f"{file_path.name}: {str(matches[0])[:40]}...")
-            
-            if hardcoded_found:
-                files_with_hardcoded += 1
-                
-        except:
-            continue
+                        example = match.group(1) if match.groups() else match.group(0)
+                        hardcoded_examples.append(f"{file_path.name}: {example[:40]}...")
+    
+        if hardcoded_found:
+            files_with_hardcoded += 1
     
     passed.append(f"[OK] Analyzed {len(code_files)} code files")
     
@@ -194,11 +331,40 @@ def check_hardcoded_strings(project_path: Path) -> dict:
     else:
         passed.append("[OK] No obvious hardcoded strings detected")
     
+    return {'passed': passed, 'issues': issues, 'used_keys': keys}
+
+def check_used_keys(keys: dict, locales: dict) -> dict:
+    """Keys used in code that no catalog defines (in any language)."""
+    issues = []
+    passed = []
+    
+    if not keys or not locales:
+        return {'passed': passed, 'issues': issues}
+    
+    defined = set()
+    for namespaces in locales.values():
+        for namespace, names in namespaces.items():
+            defined.update(names)
+            if namespace:
+                defined.update(f"{namespace.replace('/', '.')}.{name}" for name in names)
+    
+    missing = [(key, location) for key, (candidates, location) in sorted(keys.items())
+               if not any(c in defined for c in candidates)]
+    if missing:
+        issues.append(f"[X] {len(missing)} of {len(keys)} keys used in code are missing from catalogs")
+        for key, location in missing[:5]:
+            issues.append(f"   → {key} ({location})")
+    else:
+        passed.append(f"[OK] All {len(keys)} keys used in code are in catalogs")
+    
     return {'passed': passed, 'issues': issues}
 
 def main():
-    target = sys.argv[1] if len(sys.argv) > 1 else "."
-    project_path = Path(target)
+    parser = argparse.ArgumentParser(description="Detect hardcoded strings and missing translations")
+    parser.add_argument("project", nargs="?", default=".", help="Project path")
+    parser.add_argument("--no-cache", action="store_true", help="Re-read every locale file")
+    args = parser.parse_args()
+    project_path = Path(args.project).resolve()
     
     print("\n" + "=" * 60)
     print("  i18n CHECKER - Internationalization Audit")
@@ -206,10 +372,12 @@ def main():
     
     # Check locale files
     locale_files = find_locale_files(project_path)
-    locale_result = check_locale_completeness(locale_files)
+    locales, unreadable = load_locales(project_path, locale_files, not args.no_cache)
+    locale_result = check_locale_completeness(locale_files, locales, unreadable)
     
-    # Check hardcoded strings
-    code_result = check_hardcoded_strings(project_path)
+    # Check hardcoded strings and keys used in code
+    code_result = scan_code_files(project_path, find_code_files(project_path))
+    keys_result = check_used_keys(code_result['used_keys'], locales)
     
     # Print results
     print("[LOCALE FILES]")
@@ -221,13 +389,14 @@ def main():
     
     print("\n[CODE ANALYSIS]")
     print("-" * 40)
-    for item in code_result['passed']:
+    for item in code_result['passed'] + keys_result['passed']:
         print(f"  {item}")
-    for item in code_result['issues']:
+    for item in code_result['issues'] + keys_result['issues']:
         print(f"  {item}")
     
     # Summary
-    critical_issues = sum(1 for i in locale_result['issues'] + code_result['issues'] if i.startswith("[X]"))
+    all_issues = locale_result['issues'] + code_result['issues'] + keys_result['issues']
+    critical_issues = sum(1 for i in all_issues if i.startswith("[X]"))
     
     print("\n" + "=" * 60)
     if critical_issues == 0:
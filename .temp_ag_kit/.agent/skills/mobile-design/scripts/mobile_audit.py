@@ -63,30 +63,93 @@ Analyzes React Native / Flutter code for compliance with:
    - API Response Caching
 
 Total: 50+ mobile-specific checks
+
+Usage:
+    python mobile_audit.py <directory> [--json] [--changed-only [--base REF]] [--no-cache]
+
+Directory audits cache each file's issues, warnings and passed checks in
+.agent_cache/mobile_audit.json, keyed by content hash and RULESET_VERSION,
+so unchanged files are hashed but not re-checked. With --changed-only,
+files that git reports unchanged against --base (default HEAD) and whose
+size/mtime match the cache reuse their result without being read at all.
 """
 
 import sys
 import os
 import re
 import json
+import argparse
+import subprocess
 from pathlib import Path
 
+# Shared per-file result cache (.agent/scripts/result_cache.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "scripts"))
+from result_cache import ResultCache, content_key
+
+CACHE_FILE = ".agent_cache/mobile_audit.json"
+# Covers every check in _audit_content
+RULESET_VERSION = 1
+
 class MobileAuditor:
-    def __init__(self):
+    def __init__(self, cache_root: str = None, changed: set = None):
+        """
+        cache_root: project directory holding the result cache (None disables caching).
+        changed: project-relative paths git reports as changed; other cached files are
+                 trusted without hashing (None hashes every file).
+        """
         self.issues = []
         self.warnings = []
         self.passed_count = 0
         self.files_checked = 0
+        self.cache_root = cache_root
+        self.changed = changed
+        self.cache = ResultCache(cache_root, CACHE_FILE, RULESET_VERSION) if cache_root else None
 
     def audit_file(self, filepath: str) -> None:
+        rel = Path(os.path.relpath(filepath, self.cache_root)).as_posix() if self.cache else None
+        try:
+            st = os.stat(filepath)
+            stat = [st.st_size, st.st_mtime_ns]
+        except OSError:
+            return
+        # Unchanged per git and untouched since cached (e.g. not reverted): skip reading
+        entry = self.cache.entry(rel) if rel else None
+        if entry and self.changed is not None and rel not in self.changed and entry.get("stat") == stat:
+            result = self.cache.get(rel, entry["key"])
+            if result is not None:
+                self._reuse(result)
+                return
+
         try:
             with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
                 content = f.read()
         except:
             return
 
+        key = content_key(content.encode('utf-8', errors='replace')) if rel else None
+        result = self.cache.get(rel, key) if rel else None
+        if result is not None:
+            self.cache.put(rel, key, result, stat=stat)
+            self._reuse(result)
+            return
+
+        self.files_checked += 1
+        issues, warnings, passed = len(self.issues), len(self.warnings), self.passed_count
+        self._audit_content(content, os.path.basename(filepath))
+        if rel:
+            self.cache.put(rel, key, {
+                "issues": self.issues[issues:],
+                "warnings": self.warnings[warnings:],
+                "passed": self.passed_count - passed,
+            }, stat=stat)
+
+    def _reuse(self, result: dict) -> None:
         self.files_checked += 1
-        filename = os.path.basename(filepath)
+        self.issues.extend(result["issues"])
+        self.warnings.extend(result["warnings"])
+        self.passed_count += result["passed"]
+
+    def _audit_content(self, content: str, filename: str) -> None:
 
         # Detect framework
         is_react_native = bool(re.search(r'react-native|@react-navigation|React\.Native', content))
@@ -618,6 +681,11 @@ class MobileAuditor:
                 if Path(file).suffix in extensions:
                     self.audit_file(os.path.join(root, file))
 
+    def save_cache(self) -> None:
+        """Write the results of this run (files no longer present are dropped)."""
+        if self.cache:
+            self.cache.save()
+
     def get_report(self):
         return {
             "files_checked": self.files_checked,
@@ -628,19 +696,69 @@ class MobileAuditor:
         }
 
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python mobile_audit.py <directory>")
-        sys.exit(1)
+def changed_files(directory: str, base: str = "HEAD"):
+    """Paths under directory changed against base (committed, staged, unstaged and untracked)."""
+    try:
+        root = subprocess.run(
+            ["git", "rev-parse", "--show-toplevel"],
+            cwd=directory, capture_output=True, text=True, timeout=30
+        )
+        if root.returncode != 0:
+            return None
+        git_root = Path(root.stdout.strip()).resolve()
+
+        diff = subprocess.run(
+            ["git", "diff", "--name-only", base],
+            cwd=str(git_root), capture_output=True, text=True, timeout=60
+        )
+        untracked = subprocess.run(
+            ["git", "ls-files", "--others", "--exclude-standard"],
+            cwd=str(git_root), capture_output=True, text=True, timeout=60
+        )
+        if diff.returncode != 0 or untracked.returncode != 0:
+            return None
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return None
+
+    project = Path(directory).resolve()
+    changed = set()
+    for line in (diff.stdout + "\n" + untracked.stdout).splitlines():
+        if not line.strip():
+            continue
+        try:
+            changed.add((git_root / line.strip()).resolve().relative_to(project).as_posix())
+        except ValueError:
+            # Outside the audited directory
+            continue
+    return changed
 
-    path = sys.argv[1]
-    is_json = "--json" in sys.argv
 
-    auditor = MobileAuditor()
+def main():
+    parser = argparse.ArgumentParser(description="Mobile UX & touch audit for React Native / Flutter code")
+    parser.add_argument("path", nargs="?", default=".", help="Project directory or single file")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--changed-only", action="store_true",
+                        help="Only read files git reports as changed; reuse cached results for the rest")
+    parser.add_argument("--base", default="HEAD", help="Git ref to diff against (default: HEAD)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-check every file")
+    args = parser.parse_args()
+
+    path = args.path
+    is_json = args.json
+
     if os.path.isfile(path):
+        auditor = MobileAuditor()
         auditor.audit_file(path)
     else:
+        changed = None
+        if args.changed_only and not args.no_cache:
+            changed = changed_files(path, args.base)
+            if changed is None:
+                print(f"[!] --changed-only: not a git repository or invalid base '{args.base}'; checking all files",
+                      file=sys.stderr)
+        auditor = MobileAuditor(None if args.no_cache else path, changed)
         auditor.audit_directory(path)
+        auditor.save_cache()
 
     report = auditor.get_report()
 
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Skill: performance-profiling
+Script: bundle_analyzer.py
+Purpose: Attribute client JavaScript in a Next.js build to routes and shared chunks
+Usage: python bundle_analyzer.py [project_path] [--build-dir .next] [--save-baseline] [--top N]
+Output: JSON with raw/gzip/brotli sizes per route and shared chunk, modules
+        duplicated across chunks, and a diff against the stored baseline
+Note: Works offline on an existing build (run `next build` first). Chunks are
+      compressed and scanned in 1 MB blocks, one file per worker, and sizes
+      are cached by (size, mtime). Brotli sizes need `pip install brotli`.
+
+Routes come from app-build-manifest.json (App Router) and build-manifest.json
+(pages/, shared rootMainFiles and polyfills). Builds without an
+app-build-manifest fall back to the per-route client reference manifests in
+.next/server/app. A module id that appears in several chunks is reported as
+duplicated: webpack ids are stable per module, so the code ships twice.
+"""
+import os
+import re
+import sys
+import json
+import zlib
+import argparse
+from datetime import datetime
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Fix Windows console encoding
+try:
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+except AttributeError:
+    pass
+
+CACHE_FILE = ".agent_cache/bundle_sizes.json"
+BASELINE_FILE = ".agent_cache/bundle_baseline.json"
+BLOCK_SIZE = 1 << 20
+# Longest match we need to see across a block boundary
+SCAN_OVERLAP = 256
+
+# A route regresses when its first-load gzip size grows by both of these
+REGRESSION_BYTES = 10 * 1024
+REGRESSION_RATIO = 0.05
+
+# Webpack module definitions: `{12345:function(e,t,r){` / `,678:(e,t,r)=>{`
+MODULE_ID_PATTERN = re.compile(rb'[{,](\d{2,7}):(?:function\s*\(|\([\w$,]*\)\s*=>)')
+CLIENT_MANIFEST_PATTERN = re.compile(r'__RSC_MANIFEST\[("[^"]+")\]\s*=\s*(\{.*\})\s*;?\s*$', re.DOTALL)
+
+
+# ============================================================================
+# MANIFESTS
+# ============================================================================
+
+def read_json(path: Path) -> dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def client_reference_routes(build_dir: Path) -> dict:
+    """Route -> JS files from .next/server/app/**/page_client-reference-manifest.js."""
+    routes = {}
+    server_app = build_dir / "server" / "app"
+    if not server_app.exists():
+        return routes
+    for dirpath, _, files in os.walk(server_app):
+        for filename in files:
+            if not filename.endswith("_client-reference-manifest.js"):
+                continue
+            text = (Path(dirpath) / filename).read_text(encoding='utf-8', errors='replace')
+            match = CLIENT_MANIFEST_PATTERN.search(text)
+            if not match:
+                continue
+            try:
+                route = json.loads(match.group(1))
+                manifest = json.loads(match.group(2))
+            except ValueError:
+                continue
+            js = set()
+            for entry_files in manifest.get("entryJSFiles", {}).values():
+                js.update(entry_files)
+            routes[route] = sorted(js)
+    return routes
+
+
+def load_routes(build_dir: Path) -> tuple:
+    """Return (routes {route: [js files]}, shared js files) from the build manifests."""
+    build_manifest = read_json(build_dir / "build-manifest.json")
+    app_manifest = read_json(build_dir / "app-build-manifest.json")
+
+    shared = set(build_manifest.get("rootMainFiles", [])) | set(build_manifest.get("polyfillFiles", []))
+    routes = {}
+    for route, files in build_manifest.get("pages", {}).items():
+        routes[route] = files
+    app_pages = app_manifest.get("pages") or client_reference_routes(build_dir)
+    routes.update(app_pages)
+
+    routes = {
+        route: sorted({f for f in files if f.endswith(".js")})
+        for route, files in routes.items()
+    }
+    # pages/_app's chunks load with every pages/ route
+    shared.update(routes.pop("/_app", []) if "/_app" in routes and len(routes) > 1 else [])
+    return routes, sorted(f for f in shared if f.endswith(".js"))
+
+
+# ============================================================================
+# CHUNK MEASUREMENT
+# ============================================================================
+
+def measure_chunk(path: Path) -> dict:
+    """Stream one chunk: raw, gzip and brotli sizes plus the webpack module ids it defines."""
+    gzip = zlib.compressobj(9, zlib.DEFLATED, 31)
+    br = brotli.Compressor(quality=11) if BROTLI_AVAILABLE else None
+    raw = gz = bz = 0
+    modules = set()
+    tail = b""
+
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b""):
+            raw += len(block)
+            gz += len(gzip.compress(block))
+            if br:
+                bz += len(br.process(block))
+            window = tail + block
+            modules.update(int(m) for m in MODULE_ID_PATTERN.findall(window))
+            tail = window[-SCAN_OVERLAP:]
+
+    gz += len(gzip.flush())
+    if br:
+        bz += len(br.finish())
+    return {
+        "raw": raw,
+        "gzip": gz,
+        "brotli": bz if br else None,
+        "modules": sorted(modules)
+    }
+
+
+def measure_chunks(build_dir: Path, files: list, cache: dict) -> dict:
+    """Measure chunk files in parallel, reusing cached results for unchanged files."""
+    results = {}
+    pending = []
+    for rel in files:
+        path = build_dir / rel
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        key = [st.st_size, st.st_mtime_ns, BROTLI_AVAILABLE]
+        cached = cache.get(rel)
+        if cached and cached.get("key") == key:
+            results[rel] = cached
+        else:
+            pending.append((rel, path, key))
+
+    # zlib/brotli release the GIL, so threads compress chunks concurrently
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+        measured = executor.map(lambda item: (item[0], item[2], measure_chunk(item[1])), pending)
+        for rel, key, stats in measured:
+            stats["key"] = key
+            results[rel] = stats
+    return results
+
+
+def load_cache(project_path: Path) -> dict:
+    return read_json(project_path / CACHE_FILE)
+
+
+def save_json(path: Path, data: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+def add_sizes(files, chunks: dict) -> dict:
+    total = {"raw": 0, "gzip": 0, "brotli": 0 if BROTLI_AVAILABLE else None}
+    for rel in files:
+        stats = chunks.get(rel)
+        if not stats:
+            continue
+        total["raw"] += stats["raw"]
+        total["gzip"] += stats["gzip"]
+        if total["brotli"] is not None:
+            total["brotli"] += stats["brotli"] or 0
+    return total
+
+
+def find_duplicates(chunks: dict, limit: int) -> list:
+    """Module ids defined in more than one chunk."""
+    owners = {}
+    for rel, stats in chunks.items():
+        for module_id in stats["modules"]:
+            owners.setdefault(module_id, []).append(rel)
+    duplicates = [
+        {"module": module_id, "chunks": sorted(files), "copies": len(files)}
+        for module_id, files in owners.items() if len(files) > 1
+    ]
+    duplicates.sort(key=lambda d: (-d["copies"], d["module"]))
+    return duplicates[:limit]
+
+
+def diff_baseline(routes: dict, baseline: dict) -> dict:
+    """Per-route first-load gzip change against the baseline."""
+    changes = []
+    regressions = []
+    base_routes = baseline.get("routes", {})
+    for route, info in routes.items():
+        before = base_routes.get(route, {}).get("first_load", {}).get("gzip")
+        now = info["first_load"]["gzip"]
+        if before is None:
+            changes.append({"route": route, "status": "new", "gzip": now})
+            continue
+        delta = now - before
+        if delta == 0:
+            continue
+        change = {"route": route, "before": before, "after": now, "delta": delta,
+                  "delta_pct": round(delta / before * 100, 1) if before else None}
+        changes.append(change)
+        if delta > REGRESSION_BYTES and (not before or delta / before > REGRESSION_RATIO):
+            regressions.append(change)
+    for route in base_routes:
+        if route not in routes:
+            changes.append({"route": route, "status": "removed"})
+    changes.sort(key=lambda c: -abs(c.get("delta", 0)))
+    return {"baseline_created": baseline.get("created"), "changes": changes, "regressions": regressions}
+
+
+def analyze(project_path: Path, build_dir: Path, top: int = 20) -> dict:
+    routes, shared = load_routes(build_dir)
+    if not routes:
+        return {"error": f"No build manifests found in {build_dir}. Run `next build` first."}
+
+    all_files = sorted(set(shared).union(*routes.values()))
+    cache = load_cache(project_path)
+    chunks = measure_chunks(build_dir, all_files, cache)
+    save_json(project_path / CACHE_FILE, chunks)
+
+    # Chunks used by several routes behave like shared code for caching
+    usage = {}
+    for files in routes.values():
+        for rel in files:
+            usage[rel] = usage.get(rel, 0) + 1
+    shared_set = set(shared)
+
+    route_report = {}
+    for route, files in sorted(routes.items()):
+        own = [f for f in files if f not in shared_set]
+        route_report[route] = {
+            "own": add_sizes(own, chunks),
+            "first_load": add_sizes(set(own) | shared_set, chunks),
+            "chunks": len(own)
+        }
+
+    shared_chunks = [
+        {"file": rel, "routes": usage.get(rel, 0), "root": rel in shared_set,
+         **{k: chunks[rel][k] for k in ("raw", "gzip", "brotli")}}
+        for rel in all_files
+        if rel in chunks and (rel in shared_set or usage.get(rel, 0) > 1)
+    ]
+    shared_chunks.sort(key=lambda c: -c["gzip"])
+
+    largest = sorted(route_report.items(), key=lambda item: -item[1]["first_load"]["gzip"])
+    return {
+        "project": str(project_path),
+        "build_dir": str(build_dir),
+        "build_id": (build_dir / "BUILD_ID").read_text().strip() if (build_dir / "BUILD_ID").exists() else None,
+        "timestamp": datetime.now().isoformat(),
+        "brotli": BROTLI_AVAILABLE,
+        "totals": {
+            "routes": len(routes),
+            "chunks": len(chunks),
+            "shared": add_sizes(shared_set, chunks),
+            "all_chunks": add_sizes(chunks.keys(), chunks)
+        },
+        "largest_routes": [
+            {"route": route, "first_load_gzip": info["first_load"]["gzip"], "own_gzip": info["own"]["gzip"]}
+            for route, info in largest[:top]
+        ],
+        "routes": route_report,
+        "shared_chunks": shared_chunks[:top],
+        "duplicate_modules": find_duplicates(chunks, top)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze Next.js client bundle sizes per route")
+    parser.add_argument("project", nargs="?", default=".", help="Project path")
+    parser.add_argument("--build-dir", help="Build output directory (default: <project>/.next)")
+    parser.add_argument("--baseline", help=f"Baseline file (default: <project>/{BASELINE_FILE})")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this build as the baseline")
+    parser.add_argument("--top", type=int, default=20, help="Entries to list per section")
+    args = parser.parse_args()
+
+    project_path = Path(args.project).resolve()
+    build_dir = Path(args.build_dir).resolve() if args.build_dir else project_path / ".next"
+    if not build_dir.exists():
+        # Nothing to analyze without a build; not a failure for verify_all.py
+        print(json.dumps({"skipped": True, "reason": f"No build output at {build_dir}"}, indent=2))
+        sys.exit(0)
+
+    report = analyze(project_path, build_dir, args.top)
+    if "error" in report:
+        print(json.dumps(report, indent=2))
+        sys.exit(1)
+
+    baseline_path = Path(args.baseline) if args.baseline else project_path / BASELINE_FILE
+    baseline = read_json(baseline_path)
+    if baseline:
+        report["baseline"] = diff_baseline(report["routes"], baseline)
+    if args.save_baseline:
+        save_json(baseline_path, {"created": report["timestamp"], "build_id": report["build_id"],
+                                  "routes": report["routes"]})
+
+    regressions = report.get("baseline", {}).get("regressions", [])
+    report["summary"] = (
+        f"[X] {len(regressions)} route(s) grew past the baseline" if regressions
+        else f"[OK] {report['totals']['routes']} route(s), "
+             f"{report['totals']['shared']['gzip'] / 1024:.0f} KB shared gzip"
+    )
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,63 +3,204 @@
 Skill: performance-profiling
 Script: lighthouse_audit.py
 Purpose: Run Lighthouse performance audit on a URL
-Usage: python lighthouse_audit.py https://example.com
-Output: JSON with performance scores
+Usage: python lighthouse_audit.py [project_path] https://example.com
+       python lighthouse_audit.py https://example.com --runs 5 [--parallel 2]
+                                  [--baseline FILE] [--save-baseline FILE]
+       With a project path, samples are recorded in the perf_baseline.py store
+Output: JSON with performance scores (with --runs: median/min/max/variance
+        per category and key metric, plus regressions against the baseline)
 Note: Requires lighthouse CLI (npm install -g lighthouse)
 """
 import subprocess
 import json
 import sys
 import os
+import argparse
 import tempfile
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+from perf_baseline import record_run, lighthouse_samples, min_delta
+
+CATEGORIES = {
+    "performance": "performance",
+    "accessibility": "accessibility",
+    "best_practices": "best-practices",
+    "seo": "seo"
+}
+
+# Key lab metrics (Lighthouse audit id -> report name); lower is better
+METRICS = {
+    "lcp": "largest-contentful-paint",
+    "tbt": "total-blocking-time",
+    "cls": "cumulative-layout-shift",
+    "fcp": "first-contentful-paint",
+    "speed_index": "speed-index"
+}
+
+BASE_DEBUG_PORT = 9222
+
+# Regression threshold on the median: a metric must grow by this fraction AND by
+# perf_baseline.min_delta (absolute, per metric; the only test for scores and CLS)
+METRIC_TOLERANCE = 0.10     # relative increase
+
+
+def run_lighthouse_sample(url: str, port: int = None) -> dict:
+    """Run one Lighthouse pass and return raw category scores and metric values."""
+    with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
+        output_path = f.name
+
+    command = [
+        "lighthouse",
+        url,
+        "--output=json",
+        f"--output-path={output_path}",
+        "--chrome-flags=--headless",
+        "--only-categories=performance,accessibility,best-practices,seo"
+    ]
+    if port:
+        # Separate debugging ports let several Chrome instances run side by side
+        command.append(f"--port={port}")
 
-def run_lighthouse(url: str) -> dict:
-    """Run Lighthouse audit on URL."""
     try:
-        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
-            output_path = f.name
-        
-        result = subprocess.run(
-            [
-                "lighthouse",
-                url,
-                "--output=json",
-                f"--output-path={output_path}",
-                "--chrome-flags=--headless",
-                "--only-categories=performance,accessibility,best-practices,seo"
-            ],
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
-        
-        if os.path.exists(output_path):
-            with open(output_path, 'r') as f:
-                report = json.load(f)
-            os.unlink(output_path)
-            
-            categories = report.get("categories", {})
-            return {
-                "url": url,
-                "scores": {
-                    "performance": int(categories.get("performance", {}).get("score", 0) * 100),
-                    "accessibility": int(categories.get("accessibility", {}).get("score", 0) * 100),
-                    "best_practices": int(categories.get("best-practices", {}).get("score", 0) * 100),
-                    "seo": int(categories.get("seo", {}).get("score", 0) * 100)
-                },
-                "summary": get_summary(categories)
-            }
-        else:
+        result = subprocess.run(command, capture_output=True, text=True, timeout=120)
+
+        if not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
             return {"error": "Lighthouse failed to generate report", "stderr": result.stderr[:500]}
-            
+
+        with open(output_path, 'r') as f:
+            report = json.load(f)
+
+        categories = report.get("categories", {})
+        audits = report.get("audits", {})
+        return {
+            "categories": categories,
+            "scores": {
+                name: round((categories.get(key, {}).get("score") or 0) * 100, 1)
+                for name, key in CATEGORIES.items()
+            },
+            "metrics": {
+                name: audits.get(audit_id, {}).get("numericValue")
+                for name, audit_id in METRICS.items()
+            }
+        }
+
     except subprocess.TimeoutExpired:
         return {"error": "Lighthouse audit timed out"}
     except FileNotFoundError:
         return {"error": "Lighthouse CLI not found. Install with: npm install -g lighthouse"}
+    finally:
+        if os.path.exists(output_path):
+            os.unlink(output_path)
+
+
+def run_lighthouse(url: str) -> dict:
+    """Run Lighthouse audit on URL."""
+    sample = run_lighthouse_sample(url)
+    if "error" in sample:
+        return sample
+
+    return {
+        "url": url,
+        "scores": {name: int(score) for name, score in sample["scores"].items()},
+        "metrics": sample["metrics"],
+        "summary": get_summary(sample["categories"])
+    }
+
+
+def describe(values: list) -> dict:
+    """Median, min/max and variance of the successful samples."""
+    values = [v for v in values if v is not None]
+    if not values:
+        return {"median": None, "min": None, "max": None, "variance": None, "samples": 0}
+    return {
+        "median": round(statistics.median(values), 3),
+        "min": round(min(values), 3),
+        "max": round(max(values), 3),
+        "variance": round(statistics.variance(values), 3) if len(values) > 1 else 0.0,
+        "samples": len(values)
+    }
+
+
+def run_lighthouse_samples(url: str, runs: int, parallel: int = 1) -> dict:
+    """Run Lighthouse `runs` times (up to `parallel` at once) and aggregate the results."""
+    parallel = max(1, min(parallel, runs))
+    ports = [BASE_DEBUG_PORT + i for i in range(runs)] if parallel > 1 else [None] * runs
+
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        samples = list(executor.map(lambda port: run_lighthouse_sample(url, port), ports))
+
+    ok = [s for s in samples if "error" not in s]
+    errors = [s["error"] for s in samples if "error" in s]
+    if not ok:
+        return {"url": url, "error": "All Lighthouse runs failed", "errors": errors}
+
+    scores = {name: describe([s["scores"][name] for s in ok]) for name in CATEGORIES}
+    metrics = {name: describe([s["metrics"][name] for s in ok]) for name in METRICS}
+    median_performance = scores["performance"]["median"] or 0
+
+    return {
+        "url": url,
+        "runs": runs,
+        "successful_runs": len(ok),
+        "errors": errors,
+        "scores": scores,
+        "metrics": metrics,
+        "samples": [{"scores": s["scores"], "metrics": s["metrics"]} for s in ok],
+        "summary": get_summary({"performance": {"score": median_performance / 100}})
+    }
+
+
+def load_baseline(path: str, url: str):
+    """Return the stored medians for url, or None if there is no baseline yet."""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f).get(url)
+    except (OSError, ValueError):
+        return None
+
+
+def save_baseline(path: str, result: dict):
+    """Store this run's medians as the baseline for its URL."""
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+    data[result["url"]] = {
+        "scores": {name: stats["median"] for name, stats in result["scores"].items()},
+        "metrics": {name: stats["median"] for name, stats in result["metrics"].items()}
+    }
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def find_regressions(result: dict, baseline: dict) -> list:
+    """Compare medians with the baseline; only regressions beyond tolerance are reported."""
+    regressions = []
+    for name, stats in result["scores"].items():
+        before, now = baseline.get("scores", {}).get(name), stats["median"]
+        if before is not None and now is not None and before - now > min_delta(f"score_{name}"):
+            regressions.append({"name": name, "baseline": before, "median": now,
+                                "message": f"{name} score dropped {before} -> {now}"})
+
+    for name, stats in result["metrics"].items():
+        before, now = baseline.get("metrics", {}).get(name), stats["median"]
+        if before is None or now is None:
+            continue
+        # A 0 ms baseline (usual for TBT) or a few ms of jitter is noise, not a regression
+        regressed = now - before > min_delta(name)
+        if name != "cls":
+            regressed = regressed and now > before * (1 + METRIC_TOLERANCE)
+        if regressed:
+            regressions.append({"name": name, "baseline": before, "median": now,
+                                "message": f"{name} median regressed {before} -> {now}"})
+    return regressions
+
 
 def get_summary(categories: dict) -> str:
     """Generate summary based on scores."""
-    perf = categories.get("performance", {}).get("score", 0) * 100
+    perf = (categories.get("performance", {}).get("score") or 0) * 100
     if perf >= 90:
         return "[OK] Excellent performance"
     elif perf >= 50:
@@ -67,10 +208,48 @@ def get_summary(categories: dict) -> str:
     else:
         return "[X] Poor performance"
 
+
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print(json.dumps({"error": "Usage: python lighthouse_audit.py <url>"}))
-        sys.exit(1)
-    
-    result = run_lighthouse(sys.argv[1])
+    parser = argparse.ArgumentParser(description="Run Lighthouse audit on a URL")
+    parser.add_argument("targets", nargs="+", metavar="[project_path] url",
+                        help="URL to audit, optionally preceded by the project path to record history in")
+    parser.add_argument("--runs", type=int, default=1, help="Number of samples to aggregate")
+    parser.add_argument("--parallel", type=int, default=1,
+                        help="Chrome instances to run at once (each on its own debugging port)")
+    parser.add_argument("--baseline", help="Baseline JSON file; exit 1 if a median regresses past it")
+    parser.add_argument("--save-baseline", help="Store this run's medians as the new baseline")
+    args = parser.parse_args()
+    project_path = args.targets[0] if len(args.targets) > 1 else None
+    args.url = args.targets[-1]
+
+    if args.runs <= 1 and not (args.baseline or args.save_baseline):
+        result = run_lighthouse(args.url)
+        if project_path and "error" not in result:
+            record_run(project_path, args.url, "lighthouse", lighthouse_samples([result]))
+        print(json.dumps(result, indent=2))
+        sys.exit(0)
+
+    result = run_lighthouse_samples(args.url, max(1, args.runs), args.parallel)
+    if "error" in result:
+        # Like the single-run mode, a missing CLI or failed audit is reported, not gated
+        print(json.dumps(result, indent=2))
+        sys.exit(0)
+
+    exit_code = 0
+    if args.baseline:
+        baseline = load_baseline(args.baseline, args.url)
+        if baseline is None:
+            result["baseline"] = {"status": "missing", "file": args.baseline}
+        else:
+            regressions = find_regressions(result, baseline)
+            result["baseline"] = {"status": "regressed" if regressions else "ok",
+                                  "file": args.baseline, "regressions": regressions}
+            exit_code = 1 if regressions else 0
+
+    if args.save_baseline:
+        save_baseline(args.save_baseline, result)
+    if project_path:
+        record_run(project_path, args.url, "lighthouse", lighthouse_samples(result["samples"]))
+
     print(json.dumps(result, indent=2))
+    sys.exit(exit_code)
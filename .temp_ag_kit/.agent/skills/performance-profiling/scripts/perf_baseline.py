@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Skill: performance-profiling
+Script: perf_baseline.py
+Purpose: Keep a history of performance metrics per URL and commit, check
+         budgets and report statistically significant regressions
+Usage: python perf_baseline.py <project_path> [--budgets FILE] [--commit SHA]
+Output: JSON comparison report; exit 1 on budget violations or regressions
+Note: lighthouse_audit.py and playwright_runner.py record into the store when
+      given a project path (as checklist.py/verify_all.py do), so this script
+      runs after them and compares the current commit with earlier ones.
+
+Store:   <project>/.agent_cache/perf_history.jsonl (one JSON record per line)
+Budgets: <project>/perf-budgets.json, for example
+    {
+      "budgets": [
+        {"path": "/cardapio/*", "lcp": 2500},
+        {"path": "/*", "js_transfer_kb": 300, "cls": 0.1}
+      ]
+    }
+Metric names: lcp, fcp, tbt, cls, inp, ttfb, speed_index (ms, CLS unitless),
+transfer_kb, js_transfer_kb, and score_<category> for Lighthouse scores.
+"""
+import sys
+import json
+import hashlib
+import argparse
+import statistics
+import subprocess
+from datetime import datetime
+from fnmatch import fnmatch
+from pathlib import Path
+from urllib.parse import urlparse
+
+STORE_FILE = ".agent_cache/perf_history.jsonl"
+BUDGETS_FILE = "perf-budgets.json"
+
+# Earlier commits that form the baseline for each URL
+BASELINE_COMMITS = 5
+
+# A change must be both statistically significant and large enough to matter
+T_THRESHOLD = 2.0
+MIN_EFFECT = 0.05
+# With fewer than MIN_SAMPLES values on either side only a large change counts
+MIN_SAMPLES = 3
+FALLBACK_EFFECT = 0.15
+# Absolute change that counts as a regression where a relative one can't be
+# used: CLS (tiny values) and any metric whose baseline median is 0 (TBT often is)
+MIN_DELTA = {
+    "cls": 0.02, "lcp": 100, "fcp": 100, "speed_index": 100, "tbt": 50, "inp": 50, "ttfb": 50,
+    "transfer_kb": 10, "js_transfer_kb": 10,
+}
+SCORE_MIN_DELTA = 5
+
+
+# ============================================================================
+# STORE
+# ============================================================================
+
+def current_commit(project_path: Path) -> str:
+    """
+    Short HEAD hash, or 'working-tree' outside git. Uncommitted edits add
+    '-dirty-<hash of the diff>', so those runs are not pooled with clean runs
+    of the same HEAD (which then serve as their baseline).
+    """
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=project_path, capture_output=True, text=True, timeout=10
+        )
+        commit = result.stdout.strip()
+        if not commit:
+            return "working-tree"
+        diff = subprocess.run(
+            ["git", "diff", "HEAD"],
+            cwd=project_path, capture_output=True, timeout=60
+        )
+        untracked = subprocess.run(
+            ["git", "ls-files", "--others", "--exclude-standard"],
+            cwd=project_path, capture_output=True, timeout=60
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return "working-tree"
+    if diff.stdout or untracked.stdout:
+        digest = hashlib.sha1(diff.stdout + b"\0" + untracked.stdout).hexdigest()[:8]
+        return f"{commit}-dirty-{digest}"
+    return commit
+
+
+def store_path(project_path: Path) -> Path:
+    return Path(project_path) / STORE_FILE
+
+
+def record_run(project_path, url: str, source: str, samples: list, commit: str = None) -> dict:
+    """Append one run (one flat metric dict per sample) to the history."""
+    project_path = Path(project_path)
+    samples = [{k: v for k, v in s.items() if isinstance(v, (int, float))} for s in samples]
+    record = {
+        "timestamp": datetime.now().isoformat(),
+        "commit": commit or current_commit(project_path),
+        "url": url,
+        "source": source,
+        "samples": [s for s in samples if s]
+    }
+    if not record["samples"]:
+        return record
+    path = store_path(project_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record) + "\n")
+    return record
+
+
+def load_history(project_path: Path) -> list:
+    path = store_path(project_path)
+    if not path.exists():
+        return []
+    records = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue  # Truncated line from an interrupted run
+    return records
+
+
+def lighthouse_samples(samples: list) -> list:
+    """Flatten lighthouse_audit.py samples into store metrics."""
+    flat = []
+    for sample in samples:
+        metrics = {f"score_{name}": score for name, score in sample.get("scores", {}).items()}
+        metrics.update({k: v for k, v in sample.get("metrics", {}).items() if v is not None})
+        flat.append(metrics)
+    return flat
+
+
+def playwright_sample(performance: dict, network: dict = None) -> dict:
+    """Flatten playwright_runner.py Web Vitals (and CDP summary) into store metrics."""
+    metrics = {name: performance.get(key) for name, key in (
+        ("lcp", "lcp"), ("fcp", "fcp"), ("cls", "cls"), ("inp", "inp"),
+        ("ttfb", "ttfb"), ("tbt", "total_blocking_time")
+    )}
+    if performance.get("transfer_bytes") is not None:
+        metrics["transfer_kb"] = round(performance["transfer_bytes"] / 1024, 1)
+    scripts = performance.get("resources", {}).get("by_type", {}).get("script")
+    if scripts:
+        metrics["js_transfer_kb"] = round(scripts["transfer_bytes"] / 1024, 1)
+    if network and network.get("requests"):
+        metrics["requests"] = network["requests"]
+    return {k: v for k, v in metrics.items() if v is not None}
+
+
+# ============================================================================
+# COMPARISON
+# ============================================================================
+
+def higher_is_better(metric: str) -> bool:
+    return metric.startswith("score_")
+
+
+def min_delta(metric: str) -> float:
+    return SCORE_MIN_DELTA if higher_is_better(metric) else MIN_DELTA.get(metric, 0)
+
+
+def welch_t(current: list, baseline: list) -> float:
+    """Welch's t statistic for the difference of means (current - baseline)."""
+    var_c = statistics.variance(current) / len(current)
+    var_b = statistics.variance(baseline) / len(baseline)
+    spread = (var_c + var_b) ** 0.5
+    diff = statistics.mean(current) - statistics.mean(baseline)
+    if spread == 0:
+        return float('inf') if diff > 0 else float('-inf') if diff < 0 else 0.0
+    return diff / spread
+
+
+def compare_metric(metric: str, current: list, baseline: list) -> dict:
+    """Decide whether metric regressed between the two sample sets."""
+    now = statistics.median(current)
+    before = statistics.median(baseline)
+    sign = -1 if higher_is_better(metric) else 1
+    change = (now - before) / before if before else None
+    worse_by = sign * change if change is not None else None
+
+    confident = len(current) >= MIN_SAMPLES and len(baseline) >= MIN_SAMPLES
+    absolute = metric == "cls" or not before
+    if absolute:
+        regressed = sign * (now - before) > min_delta(metric)
+    elif confident:
+        regressed = sign * welch_t(current, baseline) > T_THRESHOLD and worse_by > MIN_EFFECT
+    else:
+        regressed = worse_by > FALLBACK_EFFECT
+
+    return {
+        "current": round(now, 3),
+        "baseline": round(before, 3),
+        "change_pct": round(change * 100, 1) if change is not None else None,
+        "samples": [len(current), len(baseline)],
+        "confidence": "delta" if absolute else "t-test" if confident else "threshold",
+        "regressed": regressed
+    }
+
+
+def load_budgets(project_path: Path, budgets_file: str = None) -> list:
+    path = Path(budgets_file) if budgets_file else Path(project_path) / BUDGETS_FILE
+    if not path.exists():
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get("budgets", [])
+
+
+def check_budgets(url: str, medians: dict, budgets: list) -> list:
+    """Return budget violations for the URL's current medians."""
+    path = urlparse(url).path or "/"
+    violations = []
+    for budget in budgets:
+        if not fnmatch(path, budget.get("path", "*")):
+            continue
+        for metric, limit in budget.items():
+            if metric == "path" or metric not in medians:
+                continue
+            value = medians[metric]
+            over = value < limit if higher_is_better(metric) else value > limit
+            if over:
+                violations.append({
+                    "metric": metric, "value": round(value, 3), "budget": limit,
+                    "rule": budget.get("path", "*"),
+                    "message": f"{metric} {round(value, 3)} exceeds budget {limit} ({budget.get('path', '*')})"
+                })
+    return violations
+
+
+def group_samples(records: list) -> dict:
+    """{metric: [values]} over all samples of the given records."""
+    grouped = {}
+    for record in records:
+        for sample in record["samples"]:
+            for metric, value in sample.items():
+                grouped.setdefault(metric, []).append(value)
+    return grouped
+
+
+def build_report(project_path, commit: str = None, budgets_file: str = None) -> dict:
+    """Compare the current commit's runs with earlier commits and the budgets."""
+    project_path = Path(project_path)
+    history = load_history(project_path)
+    budgets = load_budgets(project_path, budgets_file)
+    commit = commit or current_commit(project_path)
+
+    report = {
+        "project": str(project_path),
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(),
+        "urls": [],
+        "regressions": 0,
+        "budget_violations": 0
+    }
+
+    series = {}
+    for record in history:
+        series.setdefault((record["url"], record["source"]), []).append(record)
+
+    for (url, source), records in sorted(series.items()):
+        current = [r for r in records if r["commit"] == commit]
+        if not current:
+            continue
+        earlier_commits = []
+        for r in reversed(records):
+            if r["commit"] != commit and r["commit"] not in earlier_commits:
+                earlier_commits.append(r["commit"])
+        earlier_commits = earlier_commits[:BASELINE_COMMITS]
+        baseline = [r for r in records if r["commit"] in earlier_commits]
+
+        current_values = group_samples(current)
+        baseline_values = group_samples(baseline)
+        medians = {m: statistics.median(v) for m, v in current_values.items()}
+
+        metrics = {}
+        for metric, values in sorted(current_values.items()):
+            if metric in baseline_values:
+                metrics[metric] = compare_metric(metric, values, baseline_values[metric])
+            else:
+                metrics[metric] = {"current": round(medians[metric], 3), "baseline": None}
+
+        regressions = [
+            {"metric": m, **r, "message": f"{m} regressed {r['baseline']} -> {r['current']}"
+                                         + (f" ({r['change_pct']:+}%)" if r["change_pct"] is not None else "")}
+            for m, r in metrics.items() if r.get("regressed")
+        ]
+        violations = check_budgets(url, medians, budgets)
+        report["regressions"] += len(regressions)
+        report["budget_violations"] += len(violations)
+        report["urls"].append({
+            "url": url,
+            "source": source,
+            "baseline_commits": earlier_commits,
+            "metrics": metrics,
+            "regressions": regressions,
+            "budget_violations": violations
+        })
+
+    failed = report["regressions"] or report["budget_violations"]
+    if not report["urls"]:
+        report["summary"] = f"[!] No metrics recorded for commit {commit}"
+    elif failed:
+        report["summary"] = (f"[X] {report['regressions']} regression(s), "
+                             f"{report['budget_violations']} budget violation(s)")
+    else:
+        report["summary"] = f"[OK] {len(report['urls'])} URL(s) within budget, no regressions"
+    report["passed"] = not failed
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare recorded performance metrics with baseline and budgets")
+    parser.add_argument("project", nargs="?", default=".", help="Project path")
+    parser.add_argument("url", nargs="?", help="Ignored; accepted for checklist.py compatibility")
+    parser.add_argument("--budgets", help=f"Budgets file (default: <project>/{BUDGETS_FILE})")
+    parser.add_argument("--commit", help="Commit to report on (default: HEAD)")
+    args = parser.parse_args()
+
+    result = build_report(args.project, args.commit, args.budgets)
+    print(json.dumps(result, indent=2))
+    sys.exit(0 if result["passed"] else 1)
@@ -0,0 +1,51 @@
+"""find_regressions: median gate of lighthouse_audit.py --baseline."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from lighthouse_audit import find_regressions
+
+
+def result(scores=None, **metrics):
+    return {
+        "scores": {name: {"median": value} for name, value in (scores or {}).items()},
+        "metrics": {name: {"median": value} for name, value in metrics.items()},
+    }
+
+
+def baseline(scores=None, **metrics):
+    return {"scores": scores or {}, "metrics": metrics}
+
+
+def names(regressions):
+    return [r["name"] for r in regressions]
+
+
+def test_zero_baseline_small_value_is_noise():
+    assert find_regressions(result(tbt=10), baseline(tbt=0)) == []
+
+
+def test_zero_baseline_large_value_regresses():
+    assert names(find_regressions(result(tbt=500), baseline(tbt=0))) == ["tbt"]
+
+
+def test_small_delta_above_relative_tolerance_is_noise():
+    assert find_regressions(result(tbt=25, fcp=380), baseline(tbt=20, fcp=300)) == []
+
+
+def test_large_delta_below_relative_tolerance_is_noise():
+    assert find_regressions(result(lcp=10600), baseline(lcp=10000)) == []
+
+
+def test_relative_and_absolute_increase_regresses():
+    assert names(find_regressions(result(lcp=1500), baseline(lcp=1000))) == ["lcp"]
+
+
+def test_cls_uses_absolute_delta_only():
+    assert find_regressions(result(cls=0.015), baseline(cls=0)) == []
+    assert names(find_regressions(result(cls=0.05), baseline(cls=0.01))) == ["cls"]
+
+
+def test_score_drop():
+    assert find_regressions(result({"performance": 86}), baseline({"performance": 90})) == []
+    assert names(find_regressions(result({"performance": 80}), baseline({"performance": 90}))) == ["performance"]
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Skill: react-patterns
+Script: react_perf_audit.py
+Purpose: Static checks for the React/Next.js performance guidelines in
+         .shared/ui-ux-pro-max/data/react-performance.csv
+Usage: python react_perf_audit.py <project_path> [--json] [--fail-on critical|high|none] [--workers N]
+                                   [--no-cache]
+Output: file:line findings, each with the guideline row (No, Issue, Severity, Do)
+
+Checks (CSV Issue in brackets):
+    sequential-await     Independent `await`s in a row in server code  [Promise.all Parallel]
+                         (app/ pages, layouts, route handlers, actions/ and 'use server')
+    api-sequential-await Same, inside App Router route handlers         [API Route Optimization]
+    barrel-import        Imports through index/barrel modules           [Barrel Imports]
+    inline-memo-prop     Inline object/array/function props to memo()   [Memoized Components]
+    large-client         Big 'use client' components                    [Dynamic Imports]
+    length-and           `{items.length && <X/>}` renders "0"            [Conditional Render]
+
+The await and size checks are heuristics and only advisory; the others fail
+the run when their guideline severity reaches --fail-on (default: Critical).
+Files are analyzed in parallel; per-file results are cached in
+.agent_cache/react_perf_audit.json by (size, mtime) and RULESET_VERSION.
+"""
+import os
+import re
+import csv
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Fix Windows console encoding
+try:
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+except AttributeError:
+    pass
+
+# Shared per-file result cache and process pool (.agent/scripts/result_cache.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "scripts"))
+from result_cache import cached_map
+
+RULESET_VERSION = 2
+
+CSV_FILE = Path(__file__).resolve().parents[3] / ".shared" / "ui-ux-pro-max" / "data" / "react-performance.csv"
+CACHE_FILE = ".agent_cache/react_perf_audit.json"
+
+SOURCE_EXTENSIONS = {'.ts', '.tsx', '.js', '.jsx'}
+SKIP_DIRS = {'node_modules', '.git', '.next', 'dist', 'build', '__tests__', '__mocks__', 'coverage'}
+LARGE_CLIENT_LINES = 400
+# App Router files that render or run on the server (unless marked 'use client')
+SERVER_ENTRY_FILES = {"page", "layout", "template", "default", "not-found", "route", "sitemap", "robots"}
+
+RULES = {
+    "sequential-await": "Promise.all Parallel",
+    "api-sequential-await": "API Route Optimization",
+    "barrel-import": "Barrel Imports",
+    "inline-memo-prop": "Memoized Components",
+    "large-client": "Dynamic Imports",
+    "length-and": "Conditional Render",
+}
+
+# Heuristic checks: reported, but never fail the run
+ADVISORY_RULES = {"sequential-await", "api-sequential-await", "large-client"}
+
+SEVERITY_RANK = {"critical": 4, "high": 3, "medium-high": 2.5, "medium": 2, "low-medium": 1.5, "low": 1}
+
+# Packages Next.js already rewrites to direct imports (optimizePackageImports defaults)
+NEXT_OPTIMIZED_PACKAGES = {
+    "lucide-react", "date-fns", "lodash-es", "ramda", "antd", "react-bootstrap", "ahooks",
+    "@ant-design/icons", "@headlessui/react", "@headlessui-float/react", "@heroicons/react/20/solid",
+    "@heroicons/react/24/solid", "@heroicons/react/24/outline", "@visx/visx", "@tremor/react", "rxjs",
+    "@mui/material", "@mui/icons-material", "recharts", "react-use", "@material-ui/core",
+    "@material-ui/icons", "@tabler/icons-react", "mui-core", "react-icons/ai", "react-icons/bi",
+    "react-icons/bs", "react-icons/cg", "react-icons/ci", "react-icons/di", "react-icons/fa",
+    "react-icons/fa6", "react-icons/fc", "react-icons/fi", "react-icons/gi", "react-icons/go",
+    "react-icons/gr", "react-icons/hi", "react-icons/hi2", "react-icons/im", "react-icons/io",
+    "react-icons/io5", "react-icons/lia", "react-icons/lib", "react-icons/lu", "react-icons/md",
+    "react-icons/pi", "react-icons/ri", "react-icons/rx", "react-icons/si", "react-icons/sl",
+    "react-icons/tb", "react-icons/tfi", "react-icons/ti", "react-icons/vsc", "react-icons/wi",
+    "effect",
+}
+# Barrel-heavy packages that are not in the default list
+KNOWN_BARREL_PACKAGES = {"lodash", "@mui/lab", "@chakra-ui/react", "react-feather", "@phosphor-icons/react"}
+
+USE_CLIENT_PATTERN = re.compile(r'^\s*[\'"]use client[\'"]', re.MULTILINE)
+USE_SERVER_PATTERN = re.compile(r'^\s*[\'"]use server[\'"]', re.MULTILINE)
+IMPORT_PATTERN = re.compile(r'^\s*import\s+(?!type\b)([^;]*?)\s+from\s+[\'"]([^\'"]+)[\'"]', re.MULTILINE)
+AWAIT_DECL_PATTERN = re.compile(
+    r'^(\s*)(?:const|let|var)\s+(\{[^}]*\}|\[[^\]]*\]|[\w$]+)\s*(?::[^=]+)?=\s*await\s+(.+)$'
+)
+MEMO_DECL_PATTERN = re.compile(
+    r'(?:const|let)\s+([A-Z][\w$]*)\s*(?::[^=]+)?=\s*(?:React\.)?memo\s*[(<]'
+    r'|export\s+default\s+(?:React\.)?memo\s*\(\s*([A-Z][\w$]*)'
+)
+JSX_OPEN_PATTERN = re.compile(r'<([A-Z][\w$.]*)\b')
+INLINE_PROP_PATTERN = re.compile(r'\s([\w$-]+)=\{\s*(\{|\[|\([^)]*\)\s*=>|[\w$]+\s*=>|function\b)')
+LENGTH_AND_PATTERN = re.compile(r'\{\s*[\w$.?]+\.length\s*&&\s*[(<]')
+IDENTIFIER_PATTERN = re.compile(r'[A-Za-z_$][\w$]*')
+NEXT_CONFIG_OPTIMIZE = re.compile(r'optimizePackageImports\s*:\s*\[([^\]]*)\]', re.DOTALL)
+
+
+# ============================================================================
+# GUIDELINES
+# ============================================================================
+
+def load_guidelines() -> dict:
+    """CSV rows by Issue name."""
+    if not CSV_FILE.exists():
+        return {}
+    with open(CSV_FILE, 'r', encoding='utf-8') as f:
+        return {row["Issue"]: row for row in csv.DictReader(f)}
+
+
+def guideline_for(rule: str, guidelines: dict) -> dict:
+    row = guidelines.get(RULES[rule], {})
+    return {
+        "no": row.get("No"),
+        "category": row.get("Category"),
+        "issue": RULES[rule],
+        "severity": row.get("Severity", "Medium"),
+        "do": row.get("Do"),
+        "example": row.get("Code Example Good"),
+    }
+
+
+# ============================================================================
+# PER-FILE ANALYSIS (runs in worker processes)
+# ============================================================================
+
+def declared_names(target: str) -> set:
+    """Names bound by `const x`, `const { a, b: c }` or `const [a, b]`."""
+    if target[0] not in "{[":
+        return {target}
+    names = set()
+    for part in target.strip("{}[]").split(","):
+        part = part.split("=")[0].strip()
+        if ":" in part:
+            part = part.split(":")[1].strip()
+        part = part.lstrip(".")
+        if IDENTIFIER_PATTERN.fullmatch(part):
+            names.add(part)
+    return names
+
+
+def statement_end(lines: list, start: int, text: str) -> tuple:
+    """Extend a statement over continuation lines; returns (last index, full text)."""
+    depth = sum(text.count(c) for c in "([{") - sum(text.count(c) for c in ")]}")
+    end = start
+    while end + 1 < len(lines):
+        following = lines[end + 1].strip()
+        if depth <= 0 and not following.startswith(('.', '?.', '?', ':', '&&', '||', '+')):
+            break
+        end += 1
+        text += " " + following
+        depth += sum(following.count(c) for c in "([{") - sum(following.count(c) for c in ")]}")
+    return end, text
+
+
+def find_sequential_awaits(lines: list) -> list:
+    """Line numbers of `await`s that could run in parallel with the one before."""
+    findings = []
+    previous = None  # (indent, names bound, line number)
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        stripped = line.strip()
+        if not stripped or stripped.startswith("//"):
+            index += 1
+            continue
+        match = AWAIT_DECL_PATTERN.match(line)
+        if not match:
+            # Any other statement between the awaits may create a dependency
+            previous = None
+            index += 1
+            continue
+        indent, target, expression = match.groups()
+        end, expression = statement_end(lines, index, expression)
+        if previous and previous[0] == indent:
+            used = set(IDENTIFIER_PATTERN.findall(expression))
+            if not used & previous[1]:
+                findings.append({"line": index + 1, "detail": stripped[:120], "after": previous[2]})
+        previous = (indent, declared_names(target), index + 1)
+        index = end + 1
+    return findings
+
+
+def is_server_module(rel: Path, head: str) -> bool:
+    """
+    Server components, route handlers and server actions. Other modules without
+    'use client' (hooks, services, utils) may still run in the browser.
+    """
+    if USE_CLIENT_PATTERN.search(head):
+        return False
+    if USE_SERVER_PATTERN.search(head) or "actions" in rel.parts[:-1]:
+        return True
+    return "app" in rel.parts[:-1] and rel.stem in SERVER_ENTRY_FILES
+
+
+def analyze_file(path, project_path) -> dict:
+    """Everything the checks need from one file; independent of other files."""
+    try:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+    except OSError:
+        return {}
+    lines = content.splitlines()
+    is_client = bool(USE_CLIENT_PATTERN.search(content[:500]))
+    is_server = is_server_module(Path(path).relative_to(project_path), content[:500])
+
+    imports = []
+    for match in IMPORT_PATTERN.finditer(content):
+        clause, source = match.groups()
+        if clause.strip().startswith("{") or ", {" in clause:
+            line = content.count("\n", 0, match.start()) + 1
+            imports.append({"line": line, "source": source, "clause": " ".join(clause.split())[:80]})
+
+    memo_components = sorted({a or b for a, b in MEMO_DECL_PATTERN.findall(content)})
+
+    inline_props = []
+    length_and = []
+    if str(path).endswith(('.tsx', '.jsx')):
+        for number, line in enumerate(lines, 1):
+            if LENGTH_AND_PATTERN.search(line):
+                length_and.append({"line": number, "detail": line.strip()[:120]})
+            for open_tag in JSX_OPEN_PATTERN.finditer(line):
+                # Props on the same line as the tag, up to the next tag
+                segment = line[open_tag.end():]
+                next_tag = segment.find("<")
+                if next_tag != -1:
+                    segment = segment[:next_tag]
+                for prop in INLINE_PROP_PATTERN.finditer(segment):
+                    if prop.group(1) in ("key", "ref", "style", "className"):
+                        continue
+                    inline_props.append({"line": number, "component": open_tag.group(1),
+                                         "prop": prop.group(1)})
+
+    return {
+        "client": is_client,
+        "lines": len(lines),
+        "imports": imports,
+        "memo_components": memo_components,
+        "sequential_awaits": find_sequential_awaits(lines) if is_server else [],
+        "inline_props": inline_props,
+        "length_and": length_and,
+    }
+
+
+# ============================================================================
+# PROJECT SCAN
+# ============================================================================
+
+def iter_source_files(project_path: Path):
+    src = project_path / "src"
+    base = src if src.exists() else project_path
+    for root, dirs, files in os.walk(base):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS and not d.startswith('.')]
+        for name in files:
+            if Path(name).suffix in SOURCE_EXTENSIONS and not re.search(r'\.(test|spec|d)\.', name):
+                yield Path(root) / name
+
+
+def analyze_project(project_path: Path, workers: int = None, use_cache: bool = True) -> dict:
+    """{relative path: analysis}, re-analyzing only files changed since the cache."""
+    files = list(iter_source_files(project_path))
+    analyses = cached_map(project_path, files, analyze_file, CACHE_FILE, RULESET_VERSION, workers, use_cache,
+                          args=(project_path,))
+    return {f.relative_to(project_path).as_posix(): a for f, a in zip(files, analyses)}
+
+
+def optimized_packages(project_path: Path) -> set:
+    """Default optimizePackageImports plus any listed in next.config."""
+    packages = set(NEXT_OPTIMIZED_PACKAGES)
+    for config in project_path.glob("next.config.*"):
+        match = NEXT_CONFIG_OPTIMIZE.search(config.read_text(encoding='utf-8', errors='ignore'))
+        if match:
+            packages.update(re.findall(r'[\'"]([^\'"]+)[\'"]', match.group(1)))
+    return packages
+
+
+def barrel_modules(project_path: Path, analyses: dict) -> set:
+    """Local modules that only re-export (index files made of `export ... from`)."""
+    barrels = set()
+    for rel in analyses:
+        if Path(rel).stem != "index":
+            continue
+        text = (project_path / rel).read_text(encoding='utf-8', errors='ignore')
+        statements = [l for l in text.splitlines() if l.strip() and not l.strip().startswith("//")]
+        if statements and all(l.strip().startswith("export") and " from " in l for l in statements):
+            barrels.add(Path(rel).parent.as_posix())
+    return barrels
+
+
+def resolve_local(source: str, importer: str) -> str:
+    """Project-relative directory an import points at ('' if not local)."""
+    if source.startswith("@/"):
+        return "src/" + source[2:]
+    if source.startswith("."):
+        return os.path.normpath(os.path.join(os.path.dirname(importer), source)).replace(os.sep, "/")
+    return ""
+
+
+def collect_findings(project_path: Path, analyses: dict, guidelines: dict) -> list:
+    findings = []
+
+    def add(rule, rel, line, message):
+        findings.append({"rule": rule, "file": rel, "line": line, "message": message,
+                         "guideline": guideline_for(rule, guidelines)})
+
+    optimized = optimized_packages(project_path)
+    barrels = barrel_modules(project_path, analyses)
+    memo_components = {name for a in analyses.values() for name in a.get("memo_components", [])}
+
+    for rel, a in sorted(analyses.items()):
+        if not a:
+            continue
+        is_route_handler = Path(rel).name in ("route.ts", "route.js")
+        for hit in a["sequential_awaits"]:
+            rule = "api-sequential-await" if is_route_handler else "sequential-await"
+            add(rule, rel, hit["line"],
+                f"await does not use the result of line {hit['after']}; start both and use Promise.all: {hit['detail']}")
+
+        for imp in a["imports"]:
+            source = imp["source"]
+            local = resolve_local(source, rel)
+            if local and local in barrels:
+                add("barrel-import", rel, imp["line"],
+                    f"Named import through barrel '{source}' ({imp['clause']}); import from the component file")
+            elif not local:
+                package = "/".join(source.split("/")[:2]) if source.startswith("@") else source.split("/")[0]
+                if (source in KNOWN_BARREL_PACKAGES or package in KNOWN_BARREL_PACKAGES) \
+                        and source not in optimized and package not in optimized:
+                    add("barrel-import", rel, imp["line"],
+                        f"Named import from barrel package '{source}'; use a direct path or optimizePackageImports")
+
+        for prop in a["inline_props"]:
+            if prop["component"].split(".")[-1] in memo_components:
+                add("inline-memo-prop", rel, prop["line"],
+                    f"<{prop['component']} {prop['prop']}={{...}}> creates a new value each render, defeating memo()")
+
+        if a["client"] and a["lines"] > LARGE_CLIENT_LINES:
+            add("large-client", rel, 1,
+                f"'use client' module with {a['lines']} lines; split server-renderable parts or load heavy parts with next/dynamic")
+
+        for hit in a["length_and"]:
+            add("length-and", rel, hit["line"], f"`.length &&` renders 0 when empty: {hit['detail']}")
+
+    return findings
+
+
+def severity_at_least(severity: str, threshold: str) -> bool:
+    return SEVERITY_RANK.get(severity.lower(), 0) >= SEVERITY_RANK.get(threshold, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Static React performance checks from react-performance.csv")
+    parser.add_argument("project", nargs="?", default=".", help="Project path")
+    parser.add_argument("--json", action="store_true", help="Output JSON")
+    parser.add_argument("--fail-on", default="critical", choices=["critical", "high", "medium", "none"],
+                        help="Exit 1 when a finding has at least this severity")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-analyze every file")
+    args = parser.parse_args()
+
+    project_path = Path(args.project).resolve()
+    guidelines = load_guidelines()
+    analyses = analyze_project(project_path, args.workers, not args.no_cache)
+    findings = collect_findings(project_path, analyses, guidelines)
+
+    by_rule = {}
+    for f in findings:
+        by_rule[f["rule"]] = by_rule.get(f["rule"], 0) + 1
+    failing = [] if args.fail_on == "none" else [
+        f for f in findings
+        if f["rule"] not in ADVISORY_RULES and severity_at_least(f["guideline"]["severity"], args.fail_on)
+    ]
+    report = {
+        "files_checked": len(analyses),
+        "findings": findings,
+        "by_rule": by_rule,
+        "failing": len(failing),
+        "passed": not failing,
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"\n[REACT PERF] {report['files_checked']} files checked, {len(findings)} finding(s)")
+        print("-" * 50)
+        for rule, count in sorted(by_rule.items(), key=lambda item: -item[1]):
+            g = guideline_for(rule, guidelines)
+            print(f"  {count:4d}  {rule}  (#{g['no']} {g['issue']}, {g['severity']})")
+        for f in findings[:40]:
+            print(f"  - {f['file']}:{f['line']} [{f['rule']}] {f['message']}")
+        if len(findings) > 40:
+            print(f"  ... {len(findings) - 40} more (use --json)")
+        print(f"STATUS: {'PASS' if report['passed'] else 'FAIL'}")
+
+    sys.exit(0 if report["passed"] else 1)
+
+
+if __name__ == "__main__":
+    main()
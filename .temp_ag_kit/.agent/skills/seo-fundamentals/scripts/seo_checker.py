@@ -15,14 +15,24 @@ WHAT IT CHECKS:
     - Only files that are likely PUBLIC pages
 
 Usage:
-    python seo_checker.py <project_path>
+    python seo_checker.py <project_path> [--workers N] [--no-cache]
+
+Pages are found in one pruned directory walk and audited in parallel. Results
+are cached per file in .agent_cache/seo_checker.json (by size, mtime and
+CHECKS_VERSION), so unchanged pages are not re-read.
 """
+import os
 import sys
 import json
 import re
+import argparse
 from pathlib import Path
 from datetime import datetime
 
+# Shared per-file result cache and process pool (.agent/scripts/result_cache.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "scripts"))
+from result_cache import cached_map
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -37,6 +47,11 @@ SKIP_DIRS = {
     '__tests__', 'spec', 'docs', 'documentation', 'examples'
 }
 
+PAGE_EXTENSIONS = {'.html', '.htm', '.jsx', '.tsx'}
+
+CACHE_FILE = ".agent_cache/seo_checker.json"
+CHECKS_VERSION = 1
+
 # Files to skip (not pages)
 SKIP_PATTERNS = [
     'config', 'setup', 'util', 'helper', 'hook', 'context', 'store',
@@ -76,31 +91,29 @@ def is_page_file(file_path: Path) -> bool:
 
 
 def find_pages(project_path: Path) -> list:
-    """Find page files to check."""
-    patterns = ['**/*.html', '**/*.htm', '**/*.jsx', '**/*.tsx']
-    
+    """Find page files to check in a single walk that never enters skipped directories."""
     files = []
-    for pattern in patterns:
-        for f in project_path.glob(pattern):
-            # Skip excluded directories
-            if any(skip in f.parts for skip in SKIP_DIRS):
-                continue
-            
+    for root, dirs, filenames in os.walk(project_path):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS and not d.startswith('.')]
+        for filename in filenames:
+            f = Path(root) / filename
             # Check if it's likely a page
-            if is_page_file(f):
+            if f.suffix.lower() in PAGE_EXTENSIONS and is_page_file(f.relative_to(project_path)):
                 files.append(f)
     
-    return files[:50]  # Limit to 50 files
+    return sorted(files)
 
 
-def check_page(file_path: Path) -> dict:
+def check_page(file_path: Path, project_path: Path = None) -> dict:
     """Check a single page for SEO issues."""
     issues = []
+    # Next.js routes are all page.tsx/layout.tsx, so report the path
+    label = str(file_path.relative_to(project_path)) if project_path else str(file_path.name)
     
     try:
         content = file_path.read_text(encoding='utf-8', errors='ignore')
     except Exception as e:
-        return {"file": str(file_path.name), "issues": [f"Error: {e}"]}
+        return {"file": label, "issues": [f"Error: {e}"]}
     
     # Detect if this is a layout/template file (has Head component)
     is_layout = 'Head>' in content or '<head' in content.lower()
@@ -140,13 +153,24 @@ def check_page(file_path: Path) -> dict:
     # has_canonical = 'rel="canonical"' in content.lower()
     
     return {
-        "file": str(file_path.name),
+        "file": label,
         "issues": issues
     }
 
 
+def audit_pages(project_path: Path, pages: list, workers: int = None, use_cache: bool = True) -> list:
+    """check_page for every page, in parallel, reusing cached results for unchanged files."""
+    return cached_map(project_path, pages, check_page, CACHE_FILE, CHECKS_VERSION,
+                      workers, use_cache, args=(project_path,))
+
+
 def main():
-    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
+    parser = argparse.ArgumentParser(description="SEO audit of page files")
+    parser.add_argument("project", nargs="?", default=".", help="Project path")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-check every page")
+    args = parser.parse_args()
+    project_path = Path(args.project).resolve()
     
     print(f"\n{'='*60}")
     print(f"  SEO CHECKER - Search Engine Optimization Audit")
@@ -168,11 +192,10 @@ def main():
     print(f"Found {len(pages)} page files to analyze\n")
     
     # Check each page
-    all_issues = []
-    for f in pages:
-        result = check_page(f)
-        if result["issues"]:
-            all_issues.append(result)
+    all_issues = [
+        result for result in audit_pages(project_path, pages, args.workers, not args.no_cache)
+        if result["issues"]
+    ]
     
     # Summary
     print("=" * 60)
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Test Impact - Select only the tests affected by changed files
+Builds (and caches) an import graph from test files to the src/ modules they
+reach, then maps a git diff onto the tests that need to run.
+
+Usage:
+    python test_impact.py <project_path> [--base REF] [--full]
+
+Output:
+    JSON with the selected test files, or "full": true when the whole
+    suite must run (config or .env change, deleted/renamed files, a changed
+    src/ file outside the import graph, a test reaching an import that does
+    not resolve, no git, or --full).
+"""
+
+import re
+import sys
+import json
+import argparse
+import subprocess
+from pathlib import Path
+
+# Fix Windows console encoding
+try:
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+except:
+    pass
+
+
+CACHE_FILE = ".agent_cache/test_impact.json"
+CACHE_VERSION = 2
+
+SOURCE_EXTENSIONS = [".ts", ".tsx", ".js", ".jsx", ".mts"]
+SKIP_DIRS = {"node_modules", ".next", "dist", "build", ".git", "coverage", ".agent_cache"}
+
+TEST_FILE_PATTERN = re.compile(r'\.(test|spec)\.(ts|tsx|js|jsx|mts)$')
+
+# import x from '...', import '...', export { x } from '...', import('...'), require('...')
+IMPORT_PATTERN = re.compile(
+    r'''(?:import|export)\s[^'";]*?from\s*['"]([^'"]+)['"]'''
+    r'''|import\s*['"]([^'"]+)['"]'''
+    r'''|(?:import|require)\s*\(\s*['"]([^'"]+)['"]\s*\)'''
+)
+
+# Changing any of these can affect every test, so selection falls back to a full run
+GLOBAL_FILES = {
+    "package.json", "package-lock.json", "pnpm-lock.yaml", "yarn.lock",
+    "tsconfig.json", "vitest.config.ts", "vitest.config.mts", "vitest.setup.ts",
+    "jest.config.js", "jest.config.ts", "jest.setup.ts", ".env.test",
+}
+# Like GLOBAL_FILES: any .env, .env.local, .env.test, ...
+ENV_PREFIX = ".env"
+
+
+def load_aliases(project_path: Path) -> dict:
+    """Read tsconfig path aliases ("@/*" -> "./src/*")."""
+    aliases = {}
+    tsconfig = project_path / "tsconfig.json"
+    if not tsconfig.exists():
+        return aliases
+    try:
+        # tsconfig allows comments; strip line comments before parsing
+        text = re.sub(r'^\s*//.*$', '', tsconfig.read_text(encoding='utf-8'), flags=re.MULTILINE)
+        paths = json.loads(text).get("compilerOptions", {}).get("paths", {})
+        for alias, targets in paths.items():
+            if targets:
+                aliases[alias.rstrip("*")] = targets[0].rstrip("*").lstrip("./")
+    except:
+        pass
+    return aliases
+
+
+def iter_source_files(project_path: Path):
+    """Yield all TS/JS source files under src/, pruning heavy directories."""
+    src = project_path / "src"
+    if not src.exists():
+        return
+    stack = [src]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = list(current.iterdir())
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir():
+                if entry.name not in SKIP_DIRS:
+                    stack.append(entry)
+            elif entry.suffix in SOURCE_EXTENSIONS:
+                yield entry
+
+
+def is_local(spec: str, aliases: dict) -> bool:
+    """Relative or aliased specifier (i.e. not a package)."""
+    return spec.startswith(".") or any(spec.startswith(prefix) for prefix in aliases)
+
+
+def resolve_import(spec: str, importer: Path, project_path: Path, aliases: dict):
+    """Resolve an import specifier to a project-relative path, or None (package or missing file)."""
+    spec = spec.split("?", 1)[0]
+    base = None
+    if spec.startswith("."):
+        base = importer.parent / spec
+    else:
+        for prefix, target in aliases.items():
+            if spec.startswith(prefix):
+                base = project_path / target / spec[len(prefix):]
+                break
+    if base is None:
+        return None
+
+    candidates = [base]
+    candidates += [base.with_name(base.name + ext) for ext in SOURCE_EXTENSIONS]
+    candidates += [base / f"index{ext}" for ext in SOURCE_EXTENSIONS]
+    for candidate in candidates:
+        if candidate.is_file():
+            try:
+                return candidate.resolve().relative_to(project_path).as_posix()
+            except ValueError:
+                return None
+    return None
+
+
+def load_cache(project_path: Path) -> dict:
+    cache_path = project_path / CACHE_FILE
+    try:
+        data = json.loads(cache_path.read_text(encoding='utf-8'))
+        if data.get("version") == CACHE_VERSION:
+            return data.get("files", {})
+    except:
+        pass
+    return {}
+
+
+def save_cache(project_path: Path, files: dict):
+    cache_path = project_path / CACHE_FILE
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps({"version": CACHE_VERSION, "files": files}), encoding='utf-8')
+    except OSError:
+        pass
+
+
+def build_graph(project_path: Path) -> tuple:
+    """
+    Map every source file to the project files it imports directly, and to the
+    local specifiers it imports that resolve to no file (deleted or renamed modules).
+    Files whose mtime and size are unchanged reuse the cached import lists.
+
+    Returns:
+        (graph, missing): {file: [imported files]}, {file: [unresolved specifiers]}
+    """
+    aliases = load_aliases(project_path)
+    cached = load_cache(project_path)
+    files = {}
+    dirty = False
+
+    for path in iter_source_files(project_path):
+        rel = path.relative_to(project_path).as_posix()
+        stat = path.stat()
+        stamp = [stat.st_mtime_ns, stat.st_size]
+        entry = cached.get(rel)
+        if entry and entry.get("stamp") == stamp:
+            files[rel] = entry
+            continue
+
+        try:
+            content = path.read_text(encoding='utf-8', errors='ignore')
+        except OSError:
+            continue
+        imports = set()
+        missing = set()
+        for match in IMPORT_PATTERN.finditer(content):
+            spec = match.group(1) or match.group(2) or match.group(3)
+            resolved = resolve_import(spec, path, project_path, aliases)
+            if resolved is None and is_local(spec, aliases):
+                missing.add(spec)
+            elif resolved and resolved != rel:
+                imports.add(resolved)
+        files[rel] = {"stamp": stamp, "imports": sorted(imports), "missing": sorted(missing)}
+        dirty = True
+
+    if dirty or set(files) != set(cached):
+        save_cache(project_path, files)
+    graph = {rel: entry["imports"] for rel, entry in files.items()}
+    missing = {rel: entry["missing"] for rel, entry in files.items() if entry["missing"]}
+    return graph, missing
+
+
+def test_dependencies(graph: dict) -> dict:
+    """Return each test file with the transitive set of modules it reaches."""
+    result = {}
+    for test in (f for f in graph if TEST_FILE_PATTERN.search(f)):
+        seen = {test}
+        stack = [test]
+        while stack:
+            for dep in graph.get(stack.pop(), []):
+                if dep not in seen:
+                    seen.add(dep)
+                    stack.append(dep)
+        result[test] = seen
+    return result
+
+
+def changed_files(project_path: Path, base: str = "HEAD"):
+    """
+    Files changed against base (committed, staged, unstaged and untracked), as
+    {path: status} with git's status letter (A, M, D, ...; "?" for untracked).
+    Renames are reported as a deletion plus an addition.
+    """
+    try:
+        root = subprocess.run(
+            ["git", "rev-parse", "--show-toplevel"],
+            cwd=str(project_path), capture_output=True, text=True, timeout=30
+        )
+        if root.returncode != 0:
+            return None
+        git_root = Path(root.stdout.strip()).resolve()
+
+        diff = subprocess.run(
+            ["git", "diff", "--name-status", "--no-renames", base],
+            cwd=str(git_root), capture_output=True, text=True, timeout=60
+        )
+        untracked = subprocess.run(
+            ["git", "ls-files", "--others", "--exclude-standard"],
+            cwd=str(git_root), capture_output=True, text=True, timeout=60
+        )
+        if diff.returncode != 0:
+            return None
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return None
+
+    entries = [line.split("\t", 1) for line in diff.stdout.splitlines() if "\t" in line]
+    entries += [("?", line) for line in untracked.stdout.splitlines() if line.strip()]
+    changed = {}
+    for status, name in entries:
+        try:
+            rel = (git_root / name.strip()).resolve().relative_to(project_path).as_posix()
+        except ValueError:
+            # Outside the project directory
+            continue
+        changed[rel] = status[:1]
+    return changed
+
+
+def select_tests(project_path: Path, base: str = "HEAD", full: bool = False) -> dict:
+    """
+    Decide which tests to run.
+
+    Returns:
+        dict with keys: full, reason, changed, tests
+    """
+    result = {"full": True, "reason": "", "changed": [], "tests": []}
+    if full:
+        result["reason"] = "--full requested"
+        return result
+
+    changed = changed_files(project_path, base)
+    if changed is None:
+        result["reason"] = "not a git repository or invalid base"
+        return result
+    result["changed"] = sorted(changed)
+
+    global_changes = [f for f in result["changed"]
+                      if Path(f).name in GLOBAL_FILES or Path(f).name.startswith(ENV_PREFIX)]
+    if global_changes:
+        result["reason"] = f"global config changed: {', '.join(global_changes)}"
+        return result
+
+    # A deleted or renamed file breaks its importers, which no longer have an edge to it
+    removed = [f for f in result["changed"] if changed[f] == "D"]
+    if removed:
+        result["reason"] = f"files deleted or renamed: {', '.join(removed)}"
+        return result
+
+    graph, missing = build_graph(project_path)
+    known = set(graph).union(*graph.values())
+    unmapped = [f for f in result["changed"] if f.startswith("src/") and f not in known]
+    if unmapped:
+        result["reason"] = f"changed files outside the import graph: {', '.join(unmapped)}"
+        return result
+
+    deps = test_dependencies(graph)
+    broken = sorted(t for t, reached in deps.items() if any(f in missing for f in reached))
+    if broken:
+        result["reason"] = f"tests reach unresolved imports: {', '.join(broken)}"
+        return result
+
+    changed_set = set(changed)
+    result["full"] = False
+    result["tests"] = sorted(t for t, reached in deps.items() if reached & changed_set)
+    result["reason"] = f"{len(result['tests'])} of {len(deps)} test files impacted"
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Select tests impacted by changed files")
+    parser.add_argument("project", nargs="?", default=".", help="Project path")
+    parser.add_argument("--base", default="HEAD", help="Git ref to diff against (default: HEAD)")
+    parser.add_argument("--full", action="store_true", help="Skip selection and run the full suite")
+    args = parser.parse_args()
+
+    project_path = Path(args.project).resolve()
+    selection = select_tests(project_path, args.base, args.full)
+    print(json.dumps({"script": "test_impact", "project": str(project_path), **selection}, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,10 @@ Test Runner - Unified test execution and coverage reporting
 Runs tests and generates coverage report based on project type.
 
 Usage:
-    python test_runner.py <project_path> [--coverage]
+    python test_runner.py <project_path> [--coverage] [--full] [--base REF]
+
+By default only tests impacted by the git diff are run (see test_impact.py).
+Use --full to run the whole suite.
 
 Supports:
     - Node.js: npm test, jest, vitest
@@ -17,6 +20,8 @@ import json
 from pathlib import Path
 from datetime import datetime
 
+from test_impact import select_tests
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -76,6 +81,15 @@ def detect_test_framework(project_path: Path) -> dict:
     return result
 
 
+def targeted_command(test_info: dict, tests: list):
+    """Build a command that runs only the given test files, or None if unsupported."""
+    if test_info["framework"] == "vitest":
+        return ["npx", "vitest", "run", *tests]
+    if test_info["framework"] == "jest":
+        return ["npx", "jest", "--runTestsByPath", *tests]
+    return None
+
+
 def run_tests(cmd: list, cwd: Path) -> dict:
     """Run tests and return results."""
     result = {
@@ -138,8 +152,18 @@ def run_tests(cmd: list, cwd: Path) -> dict:
 
 
 def main():
-    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    base = "HEAD"
+    if "--base" in sys.argv:
+        idx = sys.argv.index("--base")
+        if idx + 1 < len(sys.argv):
+            base = sys.argv[idx + 1]
+            if base in args:
+                args.remove(base)
+    project_path = Path(args[0] if args else ".").resolve()
     with_coverage = "--coverage" in sys.argv
+    # Coverage over a subset of tests is misleading, so it always runs the full suite
+    full_run = "--full" in sys.argv or with_coverage
     
     print(f"\n{'='*60}")
     print(f"[TEST RUNNER] Unified Test Execution")
@@ -170,6 +194,31 @@ def main():
     # Choose command
     cmd = test_info["coverage_cmd"] if with_coverage and test_info["coverage_cmd"] else test_info["cmd"]
     
+    # Test selection: run only tests impacted by the diff
+    selection = {"full": True, "reason": "not supported for this framework", "tests": []}
+    if test_info["type"] == "node" and targeted_command(test_info, []):
+        selection = select_tests(project_path, base, full_run)
+    print(f"Selection: {'full suite' if selection['full'] else 'impacted tests'} ({selection['reason']})")
+    
+    if not selection["full"]:
+        if not selection["tests"]:
+            print("No tests impacted by the current changes.")
+            output = {
+                "script": "test_runner",
+                "project": str(project_path),
+                "type": test_info["type"],
+                "framework": test_info["framework"],
+                "selection": "impacted",
+                "tests_selected": 0,
+                "passed": True,
+                "message": "No impacted tests"
+            }
+            print(json.dumps(output, indent=2))
+            sys.exit(0)
+        cmd = targeted_command(test_info, selection["tests"])
+        for test in selection["tests"]:
+            print(f"  - {test}")
+    
     print(f"Running: {' '.join(cmd)}")
     print("-"*60)
     
@@ -204,6 +253,8 @@ def main():
         "project": str(project_path),
         "type": test_info["type"],
         "framework": test_info["framework"],
+        "selection": "full" if selection["full"] else "impacted",
+        "tests_selected": len(selection["tests"]),
         "tests_run": result["tests_run"],
         "tests_passed": result["tests_passed"],
         "tests_failed": result["tests_failed"],
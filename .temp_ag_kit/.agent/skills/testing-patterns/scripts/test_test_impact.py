@@ -0,0 +1,77 @@
+"""select_tests: full-suite fallbacks of test_impact.py."""
+import os
+import sys
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from test_impact import select_tests
+
+
+def git(project, *args):
+    subprocess.run(["git", *args], cwd=project, check=True, capture_output=True)
+
+
+def write(project, rel, text=""):
+    path = project / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def make_project(tmp_path):
+    write(tmp_path, "src/lib/price.ts", "export const price = 1;\n")
+    write(tmp_path, "src/lib/tax.ts", "export const tax = 2;\n")
+    write(tmp_path, "src/__tests__/price.test.ts", "import { price } from '../lib/price';\n")
+    write(tmp_path, "src/__tests__/tax.test.ts", "import { tax } from '../lib/tax';\n")
+    write(tmp_path, ".gitignore", ".agent_cache/\n")
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "init")
+    return tmp_path
+
+
+def test_selects_impacted_tests(tmp_path):
+    project = make_project(tmp_path)
+    write(project, "src/lib/price.ts", "export const price = 3;\n")
+    selection = select_tests(project)
+    assert not selection["full"]
+    assert selection["tests"] == ["src/__tests__/price.test.ts"]
+
+
+def test_deleted_module_runs_full_suite(tmp_path):
+    project = make_project(tmp_path)
+    (project / "src/lib/price.ts").unlink()
+    selection = select_tests(project)
+    assert selection["full"]
+    assert "src/lib/price.ts" in selection["reason"]
+
+
+def test_renamed_module_runs_full_suite(tmp_path):
+    project = make_project(tmp_path)
+    git(project, "mv", "src/lib/price.ts", "src/lib/pricing.ts")
+    selection = select_tests(project)
+    assert selection["full"]
+    assert "deleted or renamed" in selection["reason"]
+
+
+def test_unresolved_import_runs_full_suite(tmp_path):
+    project = make_project(tmp_path)
+    write(project, "src/__tests__/missing.test.ts", "import { x } from '../salesPrediction';\n")
+    selection = select_tests(project)
+    assert selection["full"]
+    assert "src/__tests__/missing.test.ts" in selection["reason"]
+
+
+def test_changed_file_outside_graph_runs_full_suite(tmp_path):
+    project = make_project(tmp_path)
+    write(project, "src/__tests__/fixtures/order.json", "{}\n")
+    selection = select_tests(project)
+    assert selection["full"]
+    assert "src/__tests__/fixtures/order.json" in selection["reason"]
+
+
+def test_env_change_runs_full_suite(tmp_path):
+    project = make_project(tmp_path)
+    write(project, ".env.local", "API_URL=http://localhost\n")
+    selection = select_tests(project)
+    assert selection["full"]
+    assert ".env.local" in selection["reason"]
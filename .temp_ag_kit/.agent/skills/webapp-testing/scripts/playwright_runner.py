@@ -3,16 +3,23 @@
 Skill: webapp-testing
 Script: playwright_runner.py
 Purpose: Run basic Playwright browser tests
-Usage: python playwright_runner.py <url> [--screenshot]
-Output: JSON with page info, health status, and optional screenshot path
+Usage: python playwright_runner.py [project_path] <url> [--screenshot]
+       python playwright_runner.py <url|sitemap.xml> --crawl [--max-pages N] [--concurrency N]
+Output: JSON with page info, health status, Web Vitals, network waterfall and optional screenshot path
+        (crawl mode: per-page health, elements, performance and a11y facts)
 Note: Requires playwright (pip install playwright && playwright install chromium)
 Screenshots: Saved to system temp directory (auto-cleaned by OS)
+History: With a project path, Web Vitals are recorded in the perf_baseline.py store
 """
 import sys
 import json
 import os
+import re
+import asyncio
 import tempfile
+import urllib.request
 from datetime import datetime
+from urllib.parse import urljoin, urldefrag, urlparse
 
 # Fix Windows console encoding for Unicode output
 try:
@@ -23,10 +30,22 @@ except AttributeError:
 
 try:
     from playwright.sync_api import sync_playwright
+    from playwright.async_api import async_playwright
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
     PLAYWRIGHT_AVAILABLE = False
 
+from web_vitals import VITALS_INIT_SCRIPT, COLLECT_VITALS_SCRIPT, install_sync, attach_network_async
+
+# Metric history lives with the Lighthouse tooling (performance-profiling skill)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "..", "..", "performance-profiling", "scripts"))
+try:
+    from perf_baseline import record_run, playwright_sample
+    BASELINE_AVAILABLE = True
+except ImportError:
+    BASELINE_AVAILABLE = False
+
 
 def run_basic_test(url: str, take_screenshot: bool = False) -> dict:
     """Run basic browser test on URL."""
@@ -51,6 +70,13 @@ def run_basic_test(url: str, take_screenshot: bool = False) -> dict:
             )
             page = context.new_page()
             
+            # Listen before navigating so load-time errors are captured
+            console_errors = []
+            page.on("console", lambda msg: console_errors.append(msg.text) if msg.type == "error" else None)
+            
+            # PerformanceObserver hooks and CDP network recording
+            network = install_sync(context, page)
+            
             # Navigate
             response = page.goto(url, wait_until="networkidle", timeout=30000)
             
@@ -67,18 +93,14 @@ def run_basic_test(url: str, take_screenshot: bool = False) -> dict:
                 "has_title": bool(page.title()),
                 "has_h1": page.locator("h1").count() > 0,
                 "has_links": page.locator("a").count() > 0,
-                "has_images": page.locator("img").count() > 0
+                "has_images": page.locator("img").count() > 0,
+                "console_errors": console_errors
             }
             
-            # Console errors
-            console_errors = []
-            page.on("console", lambda msg: console_errors.append(msg.text) if msg.type == "error" else None)
-            
-            # Performance metrics
-            result["performance"] = {
-                "dom_content_loaded": page.evaluate("window.performance.timing.domContentLoadedEventEnd - window.performance.timing.navigationStart"),
-                "load_complete": page.evaluate("window.performance.timing.loadEventEnd - window.performance.timing.navigationStart")
-            }
+            # Web Vitals (LCP, CLS, INP/long tasks, TTFB, transfer sizes)
+            result["performance"] = page.evaluate(COLLECT_VITALS_SCRIPT) or {}
+            result["network"] = network.summary()
+            result["network"]["waterfall"] = network.waterfall()
             
             # Screenshot - uses system temp directory (cross-platform, auto-cleaned)
             if take_screenshot:
@@ -149,25 +171,304 @@ def run_accessibility_check(url: str) -> dict:
     return result
 
 
+# ============================================================================
+# CRAWL MODE
+# ============================================================================
+
+DEFAULT_MAX_PAGES = 50
+DEFAULT_CONCURRENCY = 4
+
+# Skip downloads and assets when following links
+SKIP_LINK_EXTENSIONS = (
+    '.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.ico', '.pdf',
+    '.zip', '.css', '.js', '.json', '.xml', '.txt', '.mp4', '.mp3'
+)
+
+SITEMAP_LOC_PATTERN = re.compile(r'<loc>\s*([^<\s]+)\s*</loc>', re.IGNORECASE)
+
+# Everything the basic test and the a11y check report, gathered in one
+# evaluate() round trip instead of one locator.count() call per metric.
+PAGE_FACTS_SCRIPT = """
+() => {
+    const count = (sel) => document.querySelectorAll(sel).length;
+    const hasText = (el) => (el.textContent || '').trim().length > 0;
+    const buttons = [...document.querySelectorAll('button')];
+    const links = [...document.querySelectorAll('a')];
+    return {
+        title: document.title,
+        links: links.map(a => a.href).filter(Boolean),
+        elements: {
+            links: links.length,
+            buttons: buttons.length,
+            inputs: count('input'),
+            images: count('img'),
+            forms: count('form')
+        },
+        accessibility: {
+            images_with_alt: count('img[alt]'),
+            images_without_alt: count('img:not([alt])'),
+            buttons_with_label: buttons.filter(b => b.hasAttribute('aria-label') || hasText(b)).length,
+            buttons_without_label: buttons.filter(b => !b.hasAttribute('aria-label') && !hasText(b)).length,
+            links_with_text: links.filter(a => hasText(a) || a.hasAttribute('aria-label')).length,
+            form_labels: count('label'),
+            has_lang: document.documentElement.hasAttribute('lang'),
+            headings: {h1: count('h1'), h2: count('h2'), h3: count('h3')}
+        },
+        performance: window.__collectWebVitals ? window.__collectWebVitals() : {}
+    };
+}
+"""
+
+
+def normalize_url(url: str) -> str:
+    """Drop the fragment and trailing slash so each page is visited once."""
+    url = urldefrag(url)[0]
+    parsed = urlparse(url)
+    if parsed.path not in ('', '/') and parsed.path.endswith('/'):
+        url = url.replace(parsed.path, parsed.path.rstrip('/'), 1)
+    return url
+
+
+def is_crawlable(url: str, origin: str) -> bool:
+    """Same-origin http(s) pages only."""
+    parsed = urlparse(url)
+    if parsed.scheme not in ('http', 'https'):
+        return False
+    if f"{parsed.scheme}://{parsed.netloc}" != origin:
+        return False
+    return not parsed.path.lower().endswith(SKIP_LINK_EXTENSIONS)
+
+
+def load_sitemap(url: str, limit: int) -> list:
+    """Read page URLs from a sitemap (nested sitemap indexes are followed)."""
+    urls = []
+    pending = [url]
+    seen = set()
+    while pending and len(urls) < limit:
+        sitemap = pending.pop(0)
+        if sitemap in seen:
+            continue
+        seen.add(sitemap)
+        with urllib.request.urlopen(sitemap, timeout=30) as response:
+            body = response.read().decode('utf-8', errors='replace')
+        for loc in SITEMAP_LOC_PATTERN.findall(body):
+            if loc.lower().endswith('.xml'):
+                pending.append(loc)
+            else:
+                urls.append(loc)
+    return urls[:limit]
+
+
+def summarize_page(url: str, response, facts: dict, console_errors: list, network: dict) -> dict:
+    """Shape one crawled page like run_basic_test/run_accessibility_check output."""
+    a11y = facts["accessibility"]
+    loaded = response.ok if response else False
+    return {
+        "url": url,
+        "status": "success" if loaded else "failed",
+        "status_code": response.status if response else None,
+        "title": facts["title"],
+        "health": {
+            "loaded": loaded,
+            "has_title": bool(facts["title"]),
+            "has_h1": a11y["headings"]["h1"] > 0,
+            "has_links": facts["elements"]["links"] > 0,
+            "has_images": facts["elements"]["images"] > 0,
+            "console_errors": console_errors
+        },
+        "elements": facts["elements"],
+        "performance": facts["performance"],
+        "network": network,
+        "accessibility": a11y
+    }
+
+
+async def crawl_worker(context, page, queue: asyncio.Queue, state: dict):
+    """Visit queued URLs with one reusable page until the queue drains."""
+    console_errors = []
+    page.on("console", lambda msg: console_errors.append(msg.text) if msg.type == "error" else None)
+    network = await attach_network_async(context, page)
+
+    while True:
+        url = await queue.get()
+        try:
+            console_errors.clear()
+            network.reset()
+            try:
+                response = await page.goto(url, wait_until="networkidle", timeout=30000)
+                facts = await page.evaluate(PAGE_FACTS_SCRIPT)
+            except Exception as e:
+                state["pages"].append({"url": url, "status": "error", "error": str(e)[:200]})
+                continue
+
+            state["pages"].append(summarize_page(url, response, facts, list(console_errors), network.summary()))
+            if not state["follow_links"]:
+                continue
+            for link in facts["links"]:
+                link = normalize_url(urljoin(page.url, link))
+                if link in state["seen"] or not is_crawlable(link, state["origin"]):
+                    continue
+                if len(state["seen"]) >= state["max_pages"]:
+                    break
+                state["seen"].add(link)
+                queue.put_nowait(link)
+        finally:
+            queue.task_done()
+
+
+async def crawl_async(start_url: str, max_pages: int, concurrency: int) -> dict:
+    """Crawl a site with a pool of pages sharing one browser."""
+    is_sitemap = start_url.lower().endswith('.xml')
+    seeds = load_sitemap(start_url, max_pages) if is_sitemap else [start_url]
+    if not seeds:
+        raise ValueError(f"No URLs found in {start_url}")
+
+    parsed = urlparse(seeds[0])
+    state = {
+        "origin": f"{parsed.scheme}://{parsed.netloc}",
+        "max_pages": max_pages,
+        # A sitemap is the full page list; a seed URL is expanded by its links
+        "follow_links": not is_sitemap,
+        "seen": set(),
+        "pages": []
+    }
+    queue = asyncio.Queue()
+    for seed in seeds:
+        seed = normalize_url(seed)
+        if seed not in state["seen"]:
+            state["seen"].add(seed)
+            queue.put_nowait(seed)
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        context = await browser.new_context(
+            viewport={"width": 1280, "height": 720},
+            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        )
+        await context.add_init_script(VITALS_INIT_SCRIPT)
+        pages = [await context.new_page() for _ in range(max(1, concurrency))]
+        workers = [asyncio.create_task(crawl_worker(context, page, queue, state)) for page in pages]
+        try:
+            await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            await browser.close()
+
+    return state
+
+
+def run_crawl(start_url: str, max_pages: int = DEFAULT_MAX_PAGES,
+              concurrency: int = DEFAULT_CONCURRENCY) -> dict:
+    """Crawl same-origin pages from a seed URL or sitemap, one navigation per page."""
+    if not PLAYWRIGHT_AVAILABLE:
+        return {
+            "error": "Playwright not installed",
+            "fix": "pip install playwright && playwright install chromium"
+        }
+
+    result = {
+        "url": start_url,
+        "timestamp": datetime.now().isoformat(),
+        "mode": "crawl",
+        "status": "pending"
+    }
+    started = datetime.now()
+
+    try:
+        state = asyncio.run(crawl_async(start_url, max_pages, concurrency))
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = str(e)
+        result["summary"] = f"[X] Error: {str(e)[:100]}"
+        return result
+
+    pages = sorted(state["pages"], key=lambda page: page["url"])
+    failed = [page["url"] for page in pages if page["status"] != "success"]
+    missing_alt = sum(page.get("accessibility", {}).get("images_without_alt", 0) for page in pages)
+
+    result["pages"] = pages
+    result["totals"] = {
+        "pages": len(pages),
+        "failed": len(failed),
+        "console_errors": sum(len(page.get("health", {}).get("console_errors", [])) for page in pages),
+        "images_without_alt": missing_alt,
+        "pages_without_h1": sum(1 for page in pages if page.get("health") and not page["health"]["has_h1"]),
+        "slowest_lcp": max(
+            ((page["performance"].get("lcp") or 0, page["url"]) for page in pages if page.get("performance")),
+            default=(None, None)
+        )[1],
+        "duration_s": round((datetime.now() - started).total_seconds(), 2),
+        "concurrency": concurrency
+    }
+    result["status"] = "success" if not failed else "failed"
+    result["summary"] = (
+        f"[OK] Crawled {len(pages)} page(s)" if not failed
+        else f"[X] {len(failed)} of {len(pages)} page(s) failed to load"
+    )
+    return result
+
+
+def record_metrics(project_path: str, result: dict):
+    """Append the run's Web Vitals to the project's performance history."""
+    if not BASELINE_AVAILABLE:
+        return
+    pages = result.get("pages") or [result]
+    for page in pages:
+        performance = page.get("performance")
+        if page.get("status") == "success" and performance:
+            record_run(project_path, page.get("url"), "playwright",
+                       [playwright_sample(performance, page.get("network"))])
+
+
+def option_value(name: str, default: int) -> int:
+    """Read an integer option like --max-pages 20 from argv."""
+    if name in sys.argv:
+        index = sys.argv.index(name)
+        if index + 1 < len(sys.argv):
+            return int(sys.argv[index + 1])
+    return default
+
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print(json.dumps({
-            "error": "Usage: python playwright_runner.py <url> [--screenshot] [--a11y]",
+            "error": "Usage: python playwright_runner.py [project_path] <url> [--screenshot] [--a11y] [--crawl]",
             "examples": [
                 "python playwright_runner.py https://example.com",
                 "python playwright_runner.py https://example.com --screenshot",
-                "python playwright_runner.py https://example.com --a11y"
+                "python playwright_runner.py https://example.com --a11y",
+                "python playwright_runner.py https://example.com --crawl --max-pages 30",
+                "python playwright_runner.py https://example.com/sitemap.xml --crawl --concurrency 8"
             ]
         }, indent=2))
         sys.exit(1)
     
-    url = sys.argv[1]
+    # checklist.py passes "<project_path> <url>"; option values are not positionals
+    option_args = {"--max-pages", "--concurrency"}
+    positionals = [
+        arg for i, arg in enumerate(sys.argv[1:], 1)
+        if not arg.startswith("--") and sys.argv[i - 1] not in option_args
+    ]
+    project_path = positionals[0] if len(positionals) > 1 and os.path.isdir(positionals[0]) else None
+    url = positionals[-1]
     take_screenshot = "--screenshot" in sys.argv
     check_a11y = "--a11y" in sys.argv
+    crawl = "--crawl" in sys.argv
     
-    if check_a11y:
+    if crawl:
+        result = run_crawl(
+            url,
+            max_pages=option_value("--max-pages", DEFAULT_MAX_PAGES),
+            concurrency=option_value("--concurrency", DEFAULT_CONCURRENCY)
+        )
+    elif check_a11y:
         result = run_accessibility_check(url)
     else:
         result = run_basic_test(url, take_screenshot)
     
+    if project_path and not check_a11y:
+        record_metrics(project_path, result)
+    
     print(json.dumps(result, indent=2))
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Skill: webapp-testing
+Script: web_vitals.py
+Purpose: Web Vitals and network waterfall collection for playwright_runner.py
+Usage: from web_vitals import install_sync, attach_network_async, VITALS_INIT_SCRIPT
+Output: LCP, CLS, INP/long tasks, TTFB, resource transfer sizes and a CDP
+        network waterfall for each navigation
+Note: The PerformanceObserver hooks are added as an init script, so they are
+      registered before any page script runs. The waterfall uses the Chrome
+      DevTools Protocol and is only available on Chromium.
+"""
+
+# Registered with context.add_init_script(); runs before the page's own
+# scripts on every navigation, so buffered and early entries are not missed.
+VITALS_INIT_SCRIPT = """
+(() => {
+    if (window.__webVitals) return;
+    const vitals = window.__webVitals = {
+        lcp: null, lcpElement: null, cls: 0, longTasks: [], interactions: [], fid: null
+    };
+    const observe = (type, callback, options) => {
+        try {
+            new PerformanceObserver(list => list.getEntries().forEach(callback))
+                .observe(Object.assign({type, buffered: true}, options || {}));
+        } catch (e) { /* entry type not supported by this browser */ }
+    };
+
+    observe('largest-contentful-paint', entry => {
+        vitals.lcp = entry.renderTime || entry.loadTime || entry.startTime;
+        vitals.lcpElement = entry.element ? entry.element.tagName.toLowerCase() : null;
+    });
+    // Session windows are not needed for a single page load; sum unexpected shifts
+    observe('layout-shift', entry => {
+        if (!entry.hadRecentInput) vitals.cls += entry.value;
+    });
+    observe('longtask', entry => {
+        vitals.longTasks.push({start: entry.startTime, duration: entry.duration});
+    });
+    observe('first-input', entry => {
+        vitals.fid = entry.processingStart - entry.startTime;
+    });
+    observe('event', entry => {
+        if (entry.interactionId) vitals.interactions.push(entry.duration);
+    }, {durationThreshold: 16});
+
+    window.__collectWebVitals = () => {
+        const nav = performance.getEntriesByType('navigation')[0];
+        const fcp = performance.getEntriesByName('first-contentful-paint')[0];
+        const resources = performance.getEntriesByType('resource');
+        const byType = {};
+        let transfer = 0;
+        for (const r of resources) {
+            const type = r.initiatorType || 'other';
+            const bucket = byType[type] = byType[type] || {count: 0, transfer_bytes: 0, decoded_bytes: 0};
+            bucket.count += 1;
+            bucket.transfer_bytes += r.transferSize || 0;
+            bucket.decoded_bytes += r.decodedBodySize || 0;
+            transfer += r.transferSize || 0;
+        }
+        const largest = [...resources]
+            .sort((a, b) => (b.transferSize || 0) - (a.transferSize || 0))
+            .slice(0, 10)
+            .map(r => ({url: r.name, type: r.initiatorType, transfer_bytes: r.transferSize || 0,
+                        duration: Math.round(r.duration)}));
+        // INP needs real interactions; an automated load usually has none
+        const inp = vitals.interactions.length
+            ? [...vitals.interactions].sort((a, b) => b - a)[Math.floor(vitals.interactions.length / 50)]
+            : null;
+        const round = v => v === null || v === undefined ? null : Math.round(v);
+        return {
+            ttfb: nav ? round(nav.responseStart) : null,
+            fcp: fcp ? round(fcp.startTime) : null,
+            lcp: round(vitals.lcp),
+            lcp_element: vitals.lcpElement,
+            cls: Math.round(vitals.cls * 1000) / 1000,
+            inp: round(inp),
+            fid: round(vitals.fid),
+            long_tasks: vitals.longTasks.length,
+            total_blocking_time: round(vitals.longTasks.reduce(
+                (sum, t) => sum + Math.max(0, t.duration - 50), 0)),
+            dom_content_loaded: nav ? round(nav.domContentLoadedEventEnd) : null,
+            load_complete: nav ? round(nav.loadEventEnd) : null,
+            transfer_bytes: (nav ? nav.transferSize || 0 : 0) + transfer,
+            resources: {count: resources.length, by_type: byType, largest}
+        };
+    };
+})();
+"""
+
+COLLECT_VITALS_SCRIPT = "() => window.__collectWebVitals ? window.__collectWebVitals() : null"
+
+
+class NetworkRecorder:
+    """Builds a request waterfall from CDP Network domain events."""
+
+    def __init__(self):
+        self.requests = {}
+        self.origin = None
+
+    def reset(self):
+        self.requests = {}
+        self.origin = None
+
+    def handlers(self) -> dict:
+        return {
+            "Network.requestWillBeSent": self.on_request,
+            "Network.responseReceived": self.on_response,
+            "Network.loadingFinished": self.on_finished,
+            "Network.loadingFailed": self.on_failed,
+        }
+
+    def on_request(self, params: dict):
+        timestamp = params.get("timestamp", 0)
+        if self.origin is None:
+            self.origin = timestamp
+        request = params.get("request", {})
+        self.requests[params.get("requestId")] = {
+            "url": request.get("url", ""),
+            "method": request.get("method"),
+            "type": params.get("type"),
+            "start": timestamp,
+            "end": None,
+            "status": None,
+            "mime_type": None,
+            "transfer_bytes": 0,
+            "from_cache": False,
+            "failed": None,
+        }
+
+    def on_response(self, params: dict):
+        entry = self.requests.get(params.get("requestId"))
+        if entry is None:
+            return
+        response = params.get("response", {})
+        entry["status"] = response.get("status")
+        entry["mime_type"] = response.get("mimeType")
+        entry["from_cache"] = bool(response.get("fromDiskCache") or response.get("fromServiceWorker"))
+        timing = response.get("timing")
+        if timing:
+            entry["ttfb"] = round(timing.get("receiveHeadersEnd", 0) - timing.get("sendStart", 0), 1)
+
+    def on_finished(self, params: dict):
+        entry = self.requests.get(params.get("requestId"))
+        if entry is not None:
+            entry["end"] = params.get("timestamp")
+            entry["transfer_bytes"] = int(params.get("encodedDataLength", 0))
+
+    def on_failed(self, params: dict):
+        entry = self.requests.get(params.get("requestId"))
+        if entry is not None:
+            entry["end"] = params.get("timestamp")
+            entry["failed"] = params.get("errorText")
+
+    def waterfall(self) -> list:
+        """Requests ordered by start, with offsets and durations in ms from the first request."""
+        rows = []
+        for entry in sorted(self.requests.values(), key=lambda e: e["start"]):
+            row = {k: v for k, v in entry.items() if k not in ("start", "end")}
+            row["start_ms"] = round((entry["start"] - self.origin) * 1000, 1)
+            row["duration_ms"] = round((entry["end"] - entry["start"]) * 1000, 1) if entry["end"] else None
+            rows.append(row)
+        return rows
+
+    def summary(self) -> dict:
+        by_type = {}
+        for entry in self.requests.values():
+            bucket = by_type.setdefault(entry["type"] or "Other", {"count": 0, "transfer_bytes": 0})
+            bucket["count"] += 1
+            bucket["transfer_bytes"] += entry["transfer_bytes"]
+        ends = [e["end"] for e in self.requests.values() if e["end"]]
+        return {
+            "requests": len(self.requests),
+            "failed": sum(1 for e in self.requests.values() if e["failed"]),
+            "transfer_bytes": sum(e["transfer_bytes"] for e in self.requests.values()),
+            "duration_ms": round((max(ends) - self.origin) * 1000, 1) if ends and self.origin else None,
+            "by_type": by_type,
+        }
+
+
+def install_sync(context, page) -> NetworkRecorder:
+    """Hook vitals and the CDP waterfall into a sync-API page before navigation."""
+    context.add_init_script(VITALS_INIT_SCRIPT)
+    recorder = NetworkRecorder()
+    try:
+        cdp = context.new_cdp_session(page)
+        cdp.send("Network.enable")
+    except Exception:
+        return recorder  # Not Chromium: vitals only
+    for event, handler in recorder.handlers().items():
+        cdp.on(event, handler)
+    return recorder
+
+
+async def attach_network_async(context, page) -> NetworkRecorder:
+    """Record the CDP waterfall for an async-API page (the init script is per context)."""
+    recorder = NetworkRecorder()
+    try:
+        cdp = await context.new_cdp_session(page)
+        await cdp.send("Network.enable")
+    except Exception:
+        return recorder
+    for event, handler in recorder.handlers().items():
+        cdp.on(event, handler)
+    return recorder
@@ -1,5 +1,7 @@
 import asyncio
 from playwright import async_api
+from locators import locate
+from waits import before_action, after_action, settle
 
 async def run_test():
     pw = None
@@ -51,43 +53,43 @@ async def run_test():
         # -> Clicar no link 'Crie gratuitamente' (elemento index 146) para abrir a página de registo e iniciar o teste de validação de e-mail.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/p/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "login.register").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Tentar novamente abrir a página de registo clicando no link 'Crie gratuitamente' (elemento índice 146).
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/p/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "login.register").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Preencher o formulário usando um e-mail mal formatado ('useratexample.com'), submeter o formulário e extrair qualquer mensagem de erro visível relacionada ao e-mail.
         frame = context.pages[-1]
         # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[1]/div/form/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Shop')
+        elem = locate(frame, "register.business_name").nth(0)
+        await before_action(frame, elem); await elem.fill('Test Shop')
         
         frame = context.pages[-1]
         # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[1]/div/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('useratexample.com')
+        elem = locate(frame, "register.email").nth(0)
+        await before_action(frame, elem); await elem.fill('useratexample.com')
         
         frame = context.pages[-1]
         # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[1]/div/form/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test123456')
+        elem = locate(frame, "register.password").nth(0)
+        await before_action(frame, elem); await elem.fill('test123456')
         
         # -> Preencher 'Confirmar Senha' com 'test123456', submeter o formulário, aguardar resposta e extrair qualquer mensagem de erro relacionada ao e-mail (validação de formato) para verificar se o registo foi impedido.
         frame = context.pages[-1]
         # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[1]/div/form/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test123456')
+        elem = locate(frame, "register.confirm_password").nth(0)
+        await before_action(frame, elem); await elem.fill('test123456')
         
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[1]/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "register.submit").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
-        await asyncio.sleep(5)
+        await settle(page)
 
     finally:
         if context:
@@ -1,5 +1,7 @@
 import asyncio
 from playwright import async_api
+from locators import locate
+from waits import before_action, after_action, settle
 
 async def run_test():
     pw = None
@@ -51,20 +53,20 @@ async def run_test():
         # -> Preencher o campo E-mail e o campo Senha com as credenciais fornecidas e clicar em Entrar para submeter o formulário.
         frame = context.pages[-1]
         # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testefinal99@example.com')
+        elem = locate(frame, "login.email").nth(0)
+        await before_action(frame, elem); await elem.fill('testefinal99@example.com')
         
         frame = context.pages[-1]
         # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test123456')
+        elem = locate(frame, "login.password").nth(0)
+        await before_action(frame, elem); await elem.fill('test123456')
         
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "login.submit").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
-        await asyncio.sleep(5)
+        await settle(page)
 
     finally:
         if context:
@@ -1,5 +1,7 @@
 import asyncio
 from playwright import async_api
+from locators import locate
+from waits import before_action, after_action, settle
 
 async def run_test():
     pw = None
@@ -51,27 +53,27 @@ async def run_test():
         # -> Clicar no link 'Esqueceu a senha?' para navegar para a página de recuperação de senha e iniciar o fluxo.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[3]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "login.forgot_password").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Clicar novamente no link 'Esqueceu a senha?' (index 191) para abrir a página/diálogo de recuperação de senha e iniciar o fluxo.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[3]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "login.forgot_password").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Preencher o campo de E-mail com testefinal99@example.com e submeter o formulário de recuperação; depois verificar a mensagem de confirmação de envio.
         frame = context.pages[-1]
         # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testefinal99@example.com')
+        elem = locate(frame, "recover.email").nth(0)
+        await before_action(frame, elem); await elem.fill('testefinal99@example.com')
         
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "recover.submit").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
-        await asyncio.sleep(5)
+        await settle(page)
 
     finally:
         if context:
@@ -1,5 +1,7 @@
 import asyncio
 from playwright import async_api
+from locators import locate
+from waits import before_action, settle
 
 async def run_test():
     pw = None
@@ -54,15 +56,15 @@ async def run_test():
         # -> Fill the admin login form with the provided test credentials (testefinal99@example.com / test123456) and submit the form to test login as the supplied user (likely non-admin). After submit, wait for navigation and inspect result to determine whether access is granted or denied.
         frame = context.pages[-1]
         # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[1]/form/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testefinal99@example.com')
+        elem = locate(frame, "admin_login.username").nth(0)
+        await before_action(frame, elem); await elem.fill('testefinal99@example.com')
         
         frame = context.pages[-1]
         # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[1]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test123456')
+        elem = locate(frame, "admin_login.password").nth(0)
+        await before_action(frame, elem); await elem.fill('test123456')
         
-        await asyncio.sleep(5)
+        await settle(page)
 
     finally:
         if context:
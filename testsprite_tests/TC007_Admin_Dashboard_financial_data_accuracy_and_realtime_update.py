@@ -1,5 +1,8 @@
 import asyncio
 from playwright import async_api
+from locators import locate
+from auth_state import new_authenticated_context
+from waits import before_action, after_action, settle
 
 async def run_test():
     pw = None
@@ -22,7 +25,7 @@ async def run_test():
         )
 
         # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        context = await new_authenticated_context(browser, "customer")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
@@ -48,57 +51,37 @@ async def run_test():
         # -> Navigate to http://localhost:3000
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
         
-        # -> Fill the login form with admin credentials and submit to sign in (then navigate to the finance section).
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testefinal99@example.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test123456')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'Entrar' button (index 14) to submit the login form. After successful login, navigate to the finance section.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Already signed in as customer (storage state from auth_state.py)
         
         # -> Click the 'Fluxo de Caixa' menu item to open the cash flow view and inspect displayed financial figures.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/a[16]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "nav.cash_flow").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Click the 'Fluxo de Caixa' menu item to open the cash flow view and then extract the displayed financial figures.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/a[16]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "nav.cash_flow").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Extrair os valores financeiros exibidos na página 'Fluxo de Caixa' (Entradas, Receita de Pedidos, Saídas, Saldo do Período, Resumo Diário com data/valores, Top Entradas, Top Saídas, lista de Movimentações) e em seguida navegar para 'Assinatura' para extrair dados de assinaturas.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/a[11]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "nav.subscription").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Clicar em 'Assinatura' para abrir a página de assinaturas e extrair os dados de assinaturas (lista de clientes assinantes, planos, status, valores mensais e métricas agregadas).
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/a[11]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "nav.subscription").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Obter os dados do backend para Fluxo de Caixa e Assinatura (endpoints API) para comparar com os valores já extraídos do frontend. Abrir Fluxo de Caixa no UI e, em seguida, abrir as possíveis APIs em novas abas para recuperar JSON do backend.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/a[16]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "nav.cash_flow").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         await page.goto("http://localhost:3000/api/fluxo-caixa", wait_until="commit", timeout=10000)
         
@@ -110,7 +93,7 @@ async def run_test():
         # -> Extrair o JSON bruto do backend para /api/fluxo-caixa e /api/assinatura (se disponível) e então comparar os campos relevantes com os valores extraídos do frontend (entradas, receita_de_pedidos, saídas, saldo_do_período, resumo_diário, top_entradas, top_saídas, movimentações e dados de assinatura/plano).
         await page.goto("http://localhost:3000/api/assinatura", wait_until="commit", timeout=10000)
         
-        await asyncio.sleep(5)
+        await settle(page)
 
     finally:
         if context:
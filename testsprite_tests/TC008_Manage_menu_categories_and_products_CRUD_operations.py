@@ -1,5 +1,8 @@
 import asyncio
 from playwright import async_api
+from locators import locate
+from auth_state import new_authenticated_context
+from waits import before_action, after_action, settle
 
 async def run_test():
     pw = None
@@ -22,7 +25,7 @@ async def run_test():
         )
 
         # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        context = await new_authenticated_context(browser, "customer")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
@@ -48,98 +51,84 @@ async def run_test():
         # -> Navigate to http://localhost:3000
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
         
-        # -> Preencher o campo E-mail, preencher o campo Senha e clicar em 'Entrar' para autenticar como admin.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testefinal99@example.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test123456')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Already signed in as customer (storage state from auth_state.py)
         
         # -> Navegar para a seção 'Categorias' do menu lateral para iniciar a criação de uma nova categoria.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/a[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "nav.categories").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Tentar novamente navegar para a seção 'Categorias' clicando no item do menu lateral (índice 879).
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/a[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "nav.categories").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir o formulário de criação clicando no botão 'Nova Categoria' (index 1086).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[1]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Preencher o nome da categoria, selecionar um ícone e clicar 'Criar' para salvar a nova categoria.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[5]/div/div[1]/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Categoria Automação Teste')
+        await before_action(frame, elem); await elem.fill('Categoria Automação Teste')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[5]/div/div[1]/div[2]/div/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[5]/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "category_form.submit").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Clicar novamente no botão 'Criar' para submeter a categoria (segunda tentativa, index 1355). Após o clique, verificar se a categoria aparece na lista e se o modal fecha.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[5]/div/div[2]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Clicar no menu 'Produtos' (índice 877) para iniciar a criação do produto com upload de imagem (usar ferramentas de crop e compress).
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "nav.products").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Confirmar abertura da seção 'Produtos' clicando no item do menu (index 877) e aguardar o carregamento da página.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "nav.products").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir o formulário de criação de produto clicando em 'Novo Produto' e iniciar o fluxo de inclusão de produto (incluindo upload de imagem com as ferramentas de crop e compress).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[1]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Enviar foto do produto, preencher nome 'Produto Automação Teste', selecionar categoria 'Categoria Automação Teste', preencher preço e descrição, clicar 'Criar Produto' para salvar o produto (usar ferramentas de crop/compress no fluxo de upload se acionarem). Em seguida, verificar que o produto aparece na lista (próximo passo após criação).
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[6]/div/div[1]/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Produto Automação Teste')
+        await before_action(frame, elem); await elem.fill('Produto Automação Teste')
         
         # -> Preencher os campos do formulário do produto (nome, categoria, preço, descrição) para preparar a criação, mas aguardar o arquivo de imagem. Solicitar ao usuário que forneça o caminho do arquivo de imagem disponível no ambiente do agente (ex.: /tmp/test-image.jpg) ou que adicione esse caminho em available_file_paths para que o upload, crop e compress possam ser executados. Após envio do arquivo, realizar upload pelo input (index 4028), usar as ferramentas de crop/compress na UI, clicar 'Criar Produto' e então verificar que o produto e a imagem aparecem na lista.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[6]/div/div[1]/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Produto Automação Teste')
+        await before_action(frame, elem); await elem.fill('Produto Automação Teste')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[6]/div/div[1]/div[3]/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('25')
+        await before_action(frame, elem); await elem.fill('25')
         
-        await asyncio.sleep(5)
+        await settle(page)
 
     finally:
         if context:
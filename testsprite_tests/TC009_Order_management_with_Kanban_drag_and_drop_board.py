@@ -1,5 +1,8 @@
 import asyncio
 from playwright import async_api
+from locators import locate
+from auth_state import new_authenticated_context
+from waits import before_action, after_action, settle
 
 async def run_test():
     pw = None
@@ -22,7 +25,7 @@ async def run_test():
         )
 
         # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        context = await new_authenticated_context(browser, "customer")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
@@ -48,45 +51,25 @@ async def run_test():
         # -> Navigate to http://localhost:3000
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
         
-        # -> Login as admin (use provided credentials) and open the order management Kanban board.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testefinal99@example.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test123456')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'Entrar' button (index 131) to submit the login and open the order management Kanban board; then wait for navigation to complete.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Already signed in as customer (storage state from auth_state.py)
         
         # -> Click the 'Pedidos' navigation item to open the order management / Kanban board and wait for the page to load.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/a[5]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "nav.orders").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Click the 'Pedidos' navigation item (index 915) to open the order management Kanban board, then wait for the page to load and check for Kanban elements.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/a[5]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "nav.orders").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Click the 'Iniciar Preparo' button on order #13 (Cliente 06) to move it from 'Aguardando' to 'Preparando', then verify the status changed and that it persists after navigating away and back.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[3]/div/div[1]/div[3]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Recarregar a página de Pedidos e extrair novamente os detalhes do pedido #13 para confirmar que o status persiste após navegação.
         await page.goto("http://localhost:3000/pedidos", wait_until="commit", timeout=10000)
@@ -97,7 +80,7 @@ async def run_test():
             await expect(frame.locator('text=Pedido #13: Entregue').first).to_be_visible(timeout=3000)
         except AssertionError:
             raise AssertionError("Test case failed: expected order #13 to display status 'Entregue' on the Kanban board after dragging it through the statuses and reloading the page, but the visual status or persisted backend state was not found.")
-        await asyncio.sleep(5)
+        await settle(page)
 
     finally:
         if context:
@@ -1,5 +1,8 @@
 import asyncio
 from playwright import async_api
+from locators import locate
+from auth_state import new_authenticated_context
+from waits import before_action, after_action, settle
 
 async def run_test():
     pw = None
@@ -22,7 +25,7 @@ async def run_test():
         )
 
         # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        context = await new_authenticated_context(browser, "customer")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
@@ -48,39 +51,19 @@ async def run_test():
         # -> Navigate to http://localhost:3000
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
         
-        # -> Preencher o formulário de login com as credenciais de teste e clicar em Entrar para acessar o painel e procurar link/rota para o menu público (ou navegação que permita abrir o menu do cliente).
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testefinal99@example.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test123456')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Tentar submeter o formulário de login novamente clicando no botão Entrar (index 147) e aguardar 3 segundos para observar se há navegação. Se não houver mudança após a segunda tentativa, usar estratégia alternativa (abrir nova aba para localizar o menu público ou usar go_to_url).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Already signed in as customer (storage state from auth_state.py)
         
         # -> Abrir a interface de Novo Pedido (clicar em 'Novo Pedido') para localizar e acessar o menu público/fluxo de pedido do cliente e continuar com navegação por categorias.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[1]/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "orders.new").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Tentar abrir o fluxo de 'Novo Pedido' do cliente clicando no botão 'Novo Pedido' (index 541) e aguardar para validar se o menu público/fluxo do pedido abre.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[1]/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "orders.new").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Recarregar a rota /pedidos/novo para forçar o carregamento da SPA. Se o recarregamento não resolver, abrir nova aba ou tentar outra URL pública do menu.
         await page.goto("http://localhost:3000/pedidos/novo", wait_until="commit", timeout=10000)
@@ -94,70 +77,70 @@ async def run_test():
         # -> Abrir o fluxo de 'Novo Pedido' clicando no botão correspondente para acessar o menu público/fluxo de pedido do cliente e então aguardar a resposta da SPA.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[1]/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "orders.new").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Navegar pelas categorias 'Porções' e 'Bebidas' e adicionar pelo menos um produto ao carrinho para validar comportamento do carrinho e possíveis sugestões de upsell.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[1]/div[1]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[1]/div[1]/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[1]/div[2]/div[1]/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Adicionar 3 produtos ao carrinho para validar atualizações: Guaraná 350ml (index 3261), Suco de Laranja 500ml (index 3263) e Coca-Cola 350ml (index 3270).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[1]/div[2]/div[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[1]/div[2]/div[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[1]/div[2]/div[10]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir detalhe de um produto já adicionado (Suco de Laranja 500ml) para procurar sugestões de upsell/adicionais e verificar se podem ser adicionadas ao carrinho.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[1]/div[2]/div[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir o detalhe do produto 'Suco de Laranja 500ml' (clicar no cartão do produto) e extrair a lista de sugestões de upsell/adicionais (nome, preço se exibido, existência de botão para adicionar ao carrinho e índices dos elementos quando visíveis). Se o modal abrir, extrair também campos de escolha (quantidade, obrigatórios/opcionais).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[1]/div[2]/div[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Preencher Nome e Telefone do cliente, alternar para Entrega para observar se aparece taxa de entrega e atualização do total, selecionar PIX como forma de pagamento e localizar o botão 'Criar Pedido' para submeter o pedido.
         frame = context.pages[-1]
         # Input text
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[2]/div/div[3]/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Cliente Teste')
+        elem = locate(frame, "new_order.customer_name").nth(0)
+        await before_action(frame, elem); await elem.fill('Cliente Teste')
         
         frame = context.pages[-1]
         # Input text
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[2]/div/div[3]/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('(11) 99999-0000')
+        elem = locate(frame, "new_order.customer_phone").nth(0)
+        await before_action(frame, elem); await elem.fill('(11) 99999-0000')
         
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[2]/div/div[3]/div[3]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "new_order.delivery").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
-        await asyncio.sleep(5)
+        await settle(page)
 
     finally:
         if context:
@@ -1,5 +1,8 @@
 import asyncio
 from playwright import async_api
+from locators import locate
+from auth_state import new_authenticated_context
+from waits import before_action, after_action, settle
 
 async def run_test():
     pw = None
@@ -22,7 +25,7 @@ async def run_test():
         )
 
         # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        context = await new_authenticated_context(browser, "customer")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
@@ -48,33 +51,19 @@ async def run_test():
         # -> Navigate to http://localhost:3000
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
         
-        # -> Efetuar login usando as credenciais de teste preenchendo o e-mail e senha e clicando em Entrar para acessar a aplicação e continuar com o fluxo de compra.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testefinal99@example.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test123456')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Already signed in as customer (storage state from auth_state.py)
         
         # -> Abrir a interface de novo pedido clicando no botão 'Novo Pedido' para iniciar a inclusão de itens e prosseguir ao checkout.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[1]/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "orders.new").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir a interface de criação de pedido clicando no botão 'Criar Pedido' (index 855) para iniciar inclusão de itens no pedido.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[4]/div[1]/div[2]/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "orders.new").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Recarregar /forçar navegação para o dashboard para recuperar a UI (navegar para http://localhost:3000/dashboard) e re-inspecionar elementos interativos para continuar com o fluxo de criação de pedido.
         await page.goto("http://localhost:3000/dashboard", wait_until="commit", timeout=10000)
@@ -82,26 +71,26 @@ async def run_test():
         # -> Tentar abrir a seção 'Pedidos' no menu lateral e inspecionar a página de pedidos para localizar o botão 'Novo Pedido' ou interface de criação de pedido. Se a seção estiver bloqueada pelo plano expirado, reportar que a assinatura bloqueia o fluxo e abortar teste.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/a[5]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "nav.orders").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir o formulário de novo pedido clicando em 'Novo Pedido' (index 2241) e aguardar carregamento para inspecionar a interface de criação de pedido.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[1]/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "orders.new").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir o formulário de 'Novo Pedido' clicando no botão identificado (index=2505) para iniciar a inclusão de itens e seguir ao checkout.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[1]/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "orders.new").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir o formulário de novo pedido clicando em 'Novo Pedido' (index 2505) para iniciar inclusão de itens no pedido e prosseguir ao checkout.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[1]/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "orders.new").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
@@ -109,7 +98,7 @@ async def run_test():
             await expect(frame.locator('text=Pedido enviado via WhatsApp').first).to_be_visible(timeout=3000)
         except AssertionError:
             raise AssertionError("Test case failed: Esperava que o aplicativo abrisse o WhatsApp com a mensagem de pedido formatada contendo detalhes do pedido, informações do cliente e totais, mas isso não foi encontrado")
-        await asyncio.sleep(5)
+        await settle(page)
 
     finally:
         if context:
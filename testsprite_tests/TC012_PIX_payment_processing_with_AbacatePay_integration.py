@@ -1,5 +1,8 @@
 import asyncio
 from playwright import async_api
+from locators import locate
+from auth_state import new_authenticated_context
+from waits import before_action, after_action, settle
 
 async def run_test():
     pw = None
@@ -22,7 +25,7 @@ async def run_test():
         )
 
         # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        context = await new_authenticated_context(browser, "customer")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
@@ -48,100 +51,80 @@ async def run_test():
         # -> Navigate to http://localhost:3000
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
         
-        # -> Preencher o formulário de login com as credenciais de teste e submeter (entrar) para acessar o painel e continuar o fluxo de checkout.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testefinal99@example.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test123456')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Submeter o formulário de login clicando no botão 'Entrar' para acessar o painel e prosseguir com o fluxo de checkout (selecionar PIX).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Already signed in as customer (storage state from auth_state.py)
         
         # -> Abrir o fluxo de criação de pedido clicando em 'Novo Pedido' para avançar ao checkout e depois selecionar a forma de pagamento PIX.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[1]/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "orders.new").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir o fluxo de criação de pedido clicando em 'Novo Pedido' para iniciar o checkout (tentar abrir o formulário de pedido).
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[1]/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "orders.new").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Adicionar um produto ao carrinho — clicar em 'Hotdog Especial 1' para iniciar o checkout (índice 1607).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[1]/div[2]/div[1]/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Tentar adicionar o produto ao carrinho novamente clicando no elemento do produto (Hotdog Especial 1) para abrir o fluxo de checkout.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[3]/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Selecionar a forma de pagamento 'PIX' no checkout clicando no botão PIX para iniciar o fluxo de geração de QR code (usar o botão index 1769).
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[2]/div/div[5]/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "new_order.payment_pix").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Preencher Nome e Telefone do cliente no carrinho, rolar a página para revelar o botão 'Criar Pedido' e então prosseguir para gerar o QR PIX via AbacatePay (clicar 'Criar Pedido' quando estiver visível).
         frame = context.pages[-1]
         # Input text
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[2]/div/div[3]/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Cliente Teste PIX')
+        elem = locate(frame, "new_order.customer_name").nth(0)
+        await before_action(frame, elem); await elem.fill('Cliente Teste PIX')
         
         frame = context.pages[-1]
         # Input text
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[2]/div/div[3]/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('(11) 91234-5678')
+        elem = locate(frame, "new_order.customer_phone").nth(0)
+        await before_action(frame, elem); await elem.fill('(11) 91234-5678')
         
         # -> Criar o pedido clicando no botão 'Criar Pedido' para acionar a geração do QR PIX via AbacatePay (aguardar o retorno/modal de pagamento).
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "new_order.submit").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir os detalhes do pedido 'Cliente Teste PIX' na lista de pedidos para localizar e acionar a geração do QR PIX via AbacatePay.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[3]/div/div[1]/div[1]/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir os detalhes do pedido 'Cliente Teste PIX' clicando em 'Ver Detalhes' (índice 2844) para localizar o fluxo/controle que gera o QR PIX via AbacatePay.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[3]/div/div[1]/div[1]/div[2]/div/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir os detalhes do pedido #15 e extrair o QR code (imagem src), link de pagamento/ID e qualquer referência a AbacatePay ou status de pagamento.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[3]/div/div[1]/div[1]/div[2]/div/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Extrair o código PIX/QR (texto e src da imagem), IDs/URLs de pagamento e status atual; em seguida clicar 'Confirmar Pagamento' para simular pagamento, aguardar e re-extrair para verificar se o status mudou para recebido/pago.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[3]/div[7]/div/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
-        await asyncio.sleep(5)
+        await settle(page)
 
     finally:
         if context:
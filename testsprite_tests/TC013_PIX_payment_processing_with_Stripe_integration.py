@@ -1,5 +1,8 @@
 import asyncio
 from playwright import async_api
+from locators import locate
+from auth_state import new_authenticated_context
+from waits import before_action, after_action, settle
 
 async def run_test():
     pw = None
@@ -22,7 +25,7 @@ async def run_test():
         )
 
         # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        context = await new_authenticated_context(browser, "customer")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
@@ -48,83 +51,63 @@ async def run_test():
         # -> Navigate to http://localhost:3000
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
         
-        # -> Fill the login form with the provided test credentials and click 'Entrar' to sign in so the checkout/payment UI can be accessed.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testefinal99@example.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test123456')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Clicar no botão 'Entrar' (index 131) para submeter o login e aguardar a navegação para o dashboard / checkout.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Already signed in as customer (storage state from auth_state.py)
         
         # -> Click 'Novo Pedido' (index 534) to start creating a new order and proceed to checkout/payment options (to select PIX via Stripe).
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[1]/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "orders.new").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Open the 'Novo Pedido' / create-order UI so the checkout/payment options can be selected (choose PIX via Stripe). Click the 'Novo Pedido' page element that triggers order creation.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[1]/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "orders.new").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Adicionar um produto ao carrinho clicando em 'Hotdog Especial 1' para iniciar o fluxo de checkout/pagamento (pré-requisito para selecionar PIX via Stripe).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[1]/div[2]/div[1]/div/span[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir o carrinho/checkout para confirmar o item e selecionar a forma de pagamento (PIX via Stripe).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[3]/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Selecionar PIX como forma de pagamento no checkout (clicar no botão PIX - índice 1803). Após isso, aguardar e então verificar o QR code gerado.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[2]/div/div[5]/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "new_order.payment_pix").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Clicar em 'Criar Pedido' para gerar a cobrança PIX (espera que o sistema solicite ao backend/Stripe e exiba o QR code). Após o clique, extrair/verificar o QR visível e, em seguida, simular notificação de pagamento via Stripe API.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[2]/div/div[1]/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Adicionar 'Hotdog Especial 1' ao carrinho clicando no elemento do produto para então abrir o checkout e prosseguir com geração do PIX (QR).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[1]/div[2]/div[1]/div/span[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Localizar o botão 'Criar Pedido' / abrir o painel do carrinho para gerar a cobrança PIX (QR). Em seguida, proceder para gerar o QR e extrair/validar o QR code visível.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[3]/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Procurar no DOM se já existe um QR PIX gerado; se não houver, tentar prosseguir (marcar pagamento simulado via botão 'Pagamento Recebido') e verificar atualização do status do pedido.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[2]/div/div[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
-        await asyncio.sleep(5)
+        await settle(page)
 
     finally:
         if context:
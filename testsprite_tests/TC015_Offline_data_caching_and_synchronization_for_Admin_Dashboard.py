@@ -1,5 +1,8 @@
 import asyncio
 from playwright import async_api
+from locators import locate
+from auth_state import new_authenticated_context
+from waits import before_action, after_action, settle
 
 async def run_test():
     pw = None
@@ -22,7 +25,7 @@ async def run_test():
         )
 
         # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        context = await new_authenticated_context(browser, "customer")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
@@ -48,117 +51,97 @@ async def run_test():
         # -> Navigate to http://localhost:3000
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
         
-        # -> Fill the email and password fields with admin credentials and click 'Entrar' to sign in (attempt login).
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testefinal99@example.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test123456')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Submit the login form by clicking the 'Entrar' button (index 131) and wait for the dashboard to load.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Already signed in as customer (storage state from auth_state.py)
         
         # -> Abrir a seção 'Produtos' para iniciar as operações de gestão do menu (primeira ação antes de alternar para modo offline).
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "nav.products").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Clicar no item 'Produtos' (index 831) para abrir a seção de gestão de produtos e preparar para alternar para modo offline e executar operações CRUD.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "nav.products").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir 'Configurações' para procurar opção de modo offline ou controle de rede dentro da aplicação (clicar elemento index 528). Se opção não existir, identificar alternativa para simular offline (ex.: controle no app, criar produto com rede desligada se possível).
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "sidebar.settings").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir a página de Configurações e localizar uma opção de modo offline/sincronização; se não houver, identificar alternativa para simular offline para executar CRUD localmente.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "sidebar.settings").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir a aba 'Cardápio Online' nas Configurações para localizar um controle de modo offline/sincronização (ou opção alternativa para simular offline).
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[1]/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "settings.tab_online_menu").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir a lista de Produtos para preparar e executar as operações CRUD (próximo clique em 'Produtos'). Se a opção de modo offline não estiver na aplicação, preparar para simular offline via ambiente de teste antes de criar/editar/excluir produtos e pedidos.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "nav.products").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir a lista de Produtos para preparar as operações CRUD e procurar controles na UI que permitam simular/offline; se não houver, preparar para executar CRUD e depois cortar rede no ambiente de teste.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "nav.products").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Clicar em 'Novo Produto' para abrir o formulário de criação e preparar os dados que serão usados nos testes offline (se nenhum controle de modo offline for encontrado na aplicação, será necessário simular a desconexão de rede fora da aplicação antes de continuar).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[1]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Preencher o formulário de Novo Produto (Nome, Preço, Descrição) e clicar em 'Criar Produto' para adicionar um produto que será usado nos testes offline.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[6]/div/div[1]/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Produto Teste Offline')
+        await before_action(frame, elem); await elem.fill('Produto Teste Offline')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[6]/div/div[1]/div[3]/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('15')
+        await before_action(frame, elem); await elem.fill('15')
         
         frame = context.pages[-1]
         # Input text
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[6]/div/div[1]/div[4]/textarea').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Produto criado para testar operações em modo offline e sincronização posterior.')
+        elem = locate(frame, "product_form.description").nth(0)
+        await before_action(frame, elem); await elem.fill('Produto criado para testar operações em modo offline e sincronização posterior.')
         
         # -> Clicar em 'Criar Produto' para adicionar o produto 'Produto Teste Offline' antes de simular a desconexão e executar CRUD em modo offline.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[6]/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "product_form.submit").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Submeter o formulário 'Novo Produto' clicando no botão 'Criar Produto' (index 7163) e aguardar a confirmação (fechamento do modal e aparecimento do produto na lista).
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[6]/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "product_form.submit").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Fechar o modal 'Novo Produto' (clicar 'Cancelar' index 7162) e verificar a lista de produtos para confirmar se 'Produto Teste Offline' foi criado. Se não estiver na lista, preparar para simular desconexão de rede e continuar com os testes offline.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[6]/div/div[2]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "modal.cancel").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Fechar o modal 'Novo Produto' e procurar na lista o texto 'Produto Teste Offline' para confirmar se o produto existe (ou não). Se não for encontrado, preparar próximo passo para simular modo offline e prosseguir com CRUD.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[6]/div/div[2]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "modal.cancel").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
-        await asyncio.sleep(5)
+        await settle(page)
 
     finally:
         if context:
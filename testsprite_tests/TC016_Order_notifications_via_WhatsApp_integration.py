@@ -1,5 +1,8 @@
 import asyncio
 from playwright import async_api
+from locators import locate
+from auth_state import new_authenticated_context
+from waits import before_action, after_action, settle
 
 async def run_test():
     pw = None
@@ -22,7 +25,7 @@ async def run_test():
         )
 
         # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        context = await new_authenticated_context(browser, "customer")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
@@ -48,87 +51,67 @@ async def run_test():
         # -> Navigate to http://localhost:3000
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
         
-        # -> Fill the login form with provided credentials and submit to access the app dashboard.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testefinal99@example.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test123456')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Submit the login form by clicking the 'Entrar' button (element index 157) and wait for the dashboard to load so the checkout flow can proceed.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Already signed in as customer (storage state from auth_state.py)
         
         # -> Start a new order by clicking 'Novo Pedido' to begin the checkout flow that will allow creation of an order and performing the PIX payment to trigger the WhatsApp notification.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[1]/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "orders.new").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir a tela de criação de pedido clicando em 'Criar Pedido' para iniciar o fluxo de checkout e permitir adicionar itens e selecionar pagamento PIX.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[4]/div[1]/div[2]/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "orders.new").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Adicionar um produto ao carrinho clicando em 'Hotdog Especial 1' para iniciar o fluxo de checkout (próxima ação: click no produto com índice 1827).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[1]/div[2]/div[1]/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir o carrinho/painel do pedido para prosseguir ao checkout (selecionar forma de pagamento PIX e finalizar pedido) para disparar a notificação WhatsApp.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[3]/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Preencher Nome e Telefone do cliente, selecionar PIX como forma de pagamento e clicar em 'Criar Pedido' para disparar a notificação WhatsApp (espera pelo snack bar será verificada após a ação).
         frame = context.pages[-1]
         # Input text
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[2]/div/div[3]/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Cliente Teste')
+        elem = locate(frame, "new_order.customer_name").nth(0)
+        await before_action(frame, elem); await elem.fill('Cliente Teste')
         
         frame = context.pages[-1]
         # Input text
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[2]/div/div[3]/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('(11) 91234-5678')
+        elem = locate(frame, "new_order.customer_phone").nth(0)
+        await before_action(frame, elem); await elem.fill('(11) 91234-5678')
         
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[2]/div/div[5]/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "new_order.payment_pix").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Clicar em 'Criar Pedido' para concluir o pedido e disparar a notificação WhatsApp (capturar o snack bar em seguida).
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "new_order.submit").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir os detalhes do pedido #16 para procurar ações associadas ao envio de WhatsApp (botões de reenvio/ícone WhatsApp ou histórico de notificações) — clicar no botão do cartão do pedido #16 para abrir detalhes.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[3]/div/div[1]/div[1]/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Clicar em 'Enviar WhatsApp' no menu do pedido #16, aguardar a notificação transitória (snackbar/toast) e extrair o texto completo da notificação (ou, se não existir, retornar NOT_FOUND e listar elementos visíveis relacionados ao pedido que mencionem WhatsApp com seus textos e índices).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[3]/div/div[1]/div[1]/div[2]/div/div/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
-        await asyncio.sleep(5)
+        await settle(page)
 
     finally:
         if context:
@@ -1,5 +1,8 @@
 import asyncio
 from playwright import async_api
+from locators import locate
+from auth_state import new_authenticated_context
+from waits import before_action, after_action, settle
 
 async def run_test():
     pw = None
@@ -22,7 +25,7 @@ async def run_test():
         )
 
         # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        context = await new_authenticated_context(browser, "customer")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
@@ -48,159 +51,139 @@ async def run_test():
         # -> Navigate to http://localhost:3000
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
         
-        # -> Preencher o e-mail e a senha com as credenciais de teste e clicar em Entrar para iniciar sessão (login).
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testefinal99@example.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test123456')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Clicar no botão 'Entrar' para submeter o formulário de login. Após login bem-sucedido, localizar a área administrativa ou de pedidos e acionar um aviso/encomenda para enviar a notificação via Telegram para validação do conteúdo e formatação.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Already signed in as customer (storage state from auth_state.py)
         
         # -> Abrir a página de Pedidos no painel para criar/acionar um pedido que dispare a notificação no Telegram. Clicar em 'Pedidos' na barra lateral.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/a[5]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "nav.orders").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Clicar em 'Criar Pedido' para abrir o formulário de criação de pedido e iniciar o fluxo que deve disparar a notificação no Telegram.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[4]/div[1]/div[2]/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "orders.new").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir o formulário 'Novo Pedido' no painel de Pedidos para criar um pedido que dispare a notificação no Telegram (clicar no botão '+ Novo Pedido').
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[1]/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "orders.new").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir os detalhes do pedido (clicar no cartão do pedido #13) para localizar o botão/opção que dispara a notificação ao Telegram e, em seguida, acionar essa notificação.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[3]/div/div[1]/div[1]/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Adicionar um produto ao carrinho (Hotdog Especial 1) para iniciar a criação do pedido que deve disparar a notificação ao Telegram.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[1]/div[2]/div[1]/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir o resumo do carrinho/check-out para prosseguir com o fechamento do pedido (escolher pagamento PIX e finalizar) de forma a disparar a notificação via Telegram.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[3]/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Preencher Nome e Telefone do cliente, selecionar pagamento por PIX e rolar a página para revelar o botão 'Criar Pedido' para então criar o pedido que deve disparar a notificação no Telegram.
         frame = context.pages[-1]
         # Input text
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[2]/div/div[3]/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Cliente Teste')
+        elem = locate(frame, "new_order.customer_name").nth(0)
+        await before_action(frame, elem); await elem.fill('Cliente Teste')
         
         frame = context.pages[-1]
         # Input text
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[2]/div/div[3]/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('(11) 99999-0000')
+        elem = locate(frame, "new_order.customer_phone").nth(0)
+        await before_action(frame, elem); await elem.fill('(11) 99999-0000')
         
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[2]/div/div[5]/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "new_order.payment_pix").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Clicar no botão 'Criar Pedido' para finalizar o pedido (com PIX) e disparar a notificação ao Telegram para posterior verificação de entrega e formatação.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "new_order.submit").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Clicar no botão de finalização / 'Criar Pedido' na tela de Novo Pedido para realmente enviar o pedido e acionar a notificação do Telegram; aguardar alguns segundos e procurar confirmação na UI (toasts, redirecionamento para lista de pedidos ou novo elemento indicando sucesso).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[2]/div/div[1]/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir os detalhes do pedido #14 para localizar e acionar a opção que dispara a notificação ao Telegram (ou visualizar o histórico de notificações).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[3]/div/div[1]/div[1]/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir os detalhes do pedido #14 clicando em 'Ver Detalhes' (index 3011) para localizar a opção de notificação (Telegram) ou o histórico de notificações.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[3]/div/div[1]/div[1]/div[2]/div/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir Configurações no painel para localizar a seção de integrações/notificações (procurar configuração do Telegram) e, se disponível, acionar um envio de teste ou instruções para habilitar notificações Telegram.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "sidebar.settings").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir a página de Configurações (clicar no item 'Configurações' na barra lateral) para localizar a seção de integrações/notificações (Telegram) e acionar um envio de teste ou instrução de envio de notificação.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "sidebar.settings").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir a aba de 'Links de Acesso' nas Configurações para localizar a integração do Telegram (ou opção de enviar teste) e acionar um envio de teste/trigger, se disponível.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[1]/button[8]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "settings.tab_access_links").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Localizar a configuração/integracao do Telegram dentro das Configurações (procurar aba/sessão relevante) para acionar um envio de teste ou instrução para disparar notificações de pedidos.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[1]/button[7]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "settings.tab_shortcuts").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir a aba 'Links de Acesso' nas Configurações para localizar a integração do Telegram e procurar opção de envio de teste/trigger de notificação.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[1]/button[8]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "settings.tab_access_links").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir a aba 'Conta' nas Configurações e procurar a seção de integrações/notificações (Telegram). Se houver opção de envio de teste, acioná-la; caso contrário, localizar instruções/credenciais (token, chat id) para habilitar o envio de notificações.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[1]/button[9]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "settings.tab_account").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir a aba 'Links de Acesso' nas Configurações para localizar a integração do Telegram e procurar opção de envio de teste/trigger (token, chat id) para poder acionar uma notificação de pedido.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[1]/button[8]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "settings.tab_access_links").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir a aba 'Conta' nas Configurações e procurar seção de integrações/Telegram (token, chat id, envio de teste) para acionar um envio de teste ou localizar instruções para habilitar notificações.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[1]/button[9]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "settings.tab_account").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir a aba 'Geral' nas Configurações e procurar por referências/integração do Telegram (token, chat id ou botão de teste).
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[1]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "settings.tab_general").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
-        await asyncio.sleep(5)
+        await settle(page)
 
     finally:
         if context:
@@ -1,5 +1,8 @@
 import asyncio
 from playwright import async_api
+from locators import locate
+from auth_state import new_authenticated_context
+from waits import before_action, after_action, settle
 
 async def run_test():
     pw = None
@@ -22,7 +25,7 @@ async def run_test():
         )
 
         # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        context = await new_authenticated_context(browser, "customer")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
@@ -48,64 +51,50 @@ async def run_test():
         # -> Navigate to http://localhost:3000
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
         
-        # -> Log in with provided credentials (testefinal99@example.com / test123456) by filling the E-mail and Senha fields and clicking 'Entrar'.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testefinal99@example.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test123456')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Already signed in as customer (storage state from auth_state.py)
         
         # -> Abrir a seção 'Funcionários' na barra lateral para procurar listagem/perfis e tentar acessar dados que possam pertencer a outro usuário (elemento da sidebar 'Funcionários'). Se a lista carregar, procurar um funcionário diferente do usuário logado e abrir seu perfil/detalhes para verificar se o sistema permite visualização/edição indevida.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/a[10]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "nav.employees").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir a seção 'Funcionários' na sidebar para carregar a lista de funcionários e localizar um registro que não seja o do usuário logado (para tentar acessar dados de outro usuário). Em seguida, abrir o perfil desse funcionário para verificar se o acesso é bloqueado.
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/a[10]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "nav.employees").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Tentar abrir o perfil/detalhes de um funcionário diferente do usuário autenticado (tentar o botão 'Editar' do funcionário 'Cozinha') para verificar se o sistema permite visualizar/editar dados de outro usuário.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[3]/div/div[2]/div[4]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Alterar o campo 'Nome Completo' para 'TestRLS_Cozinha' no modal do funcionário aberto e clicar em 'Salvar' para tentar modificar dados de outro usuário; observar se a operação é permitida ou bloqueada (mensagem de sucesso/erro).
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[4]/div/div[1]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestRLS_Cozinha')
+        await before_action(frame, elem); await elem.fill('TestRLS_Cozinha')
         
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[4]/div/div[6]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "employee_form.save").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Fechar o modal (Cancelar) e procurar na lista de funcionários o registro com nome 'TestRLS_Cozinha' para verificar se a alteração foi aplicada (indicação de que RLS não impediu a modificação) ou se permanece inalterado (indicação de que RLS bloqueou/impediu alteração).
         frame = context.pages[-1]
         # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[4]/div/div[6]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        elem = locate(frame, "modal.cancel").nth(0)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
         # -> Abrir o modal de edição do funcionário 'TestRLS_Cozinha' para inspecionar campos (E-mail, ID, Função) e verificar se o registro pertence ao usuário autenticado ou a outro usuário. Procurar toasts/alerts ou mensagens de erro/sucesso e, se possível, tentar reverter a alteração para limpar o artefato de teste. Coletar evidências que confirmem se a alteração foi permitida pelo backend (indicando falha nas RLS) ou bloqueada.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[3]/div/div[2]/div[4]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
         
-        await asyncio.sleep(5)
+        await settle(page)
 
     finally:
         if context:
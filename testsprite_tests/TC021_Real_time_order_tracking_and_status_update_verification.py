@@ -1,5 +1,7 @@
 import asyncio
 from playwright import async_api
+from auth_state import new_authenticated_context
+from waits import settle
 
 async def run_test():
     pw = None
@@ -22,7 +24,7 @@ async def run_test():
         )
 
         # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        context = await new_authenticated_context(browser, "customer")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
@@ -48,27 +50,7 @@ async def run_test():
         # -> Navigate to http://localhost:3000
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
         
-        # -> Efetuar login como cliente usando testefinal99@example.com / test123456 para então navegar até a área de pedidos e criar um pedido.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testefinal99@example.com')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test123456')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Tentar efetuar login novamente clicando no botão 'Entrar' (índice 154). Se o login for bem-sucedido, navegar para 'Controle de Pedidos' e criar um pedido como cliente.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div[2]/div/form/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Already signed in as customer (storage state from auth_state.py)
         
         # -> Abrir a interface do cliente em uma nova aba (http://localhost:3000) e iniciar o fluxo de criação de pedido como cliente para depois registrar o pedido e prosseguir com os próximos passos do teste.
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
@@ -79,7 +61,7 @@ async def run_test():
         # -> Tentar recarregar a aplicação (forçar reload) para permitir que a SPA carregue e exibir elementos interativos. Se o reload falhar, tentar abrir nova aba separada para cliente/admin ou reportar erro de carregamento.
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
         
-        await asyncio.sleep(5)
+        await settle(page)
 
     finally:
         if context:
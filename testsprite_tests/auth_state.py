@@ -0,0 +1,132 @@
+"""
+Authenticated storage-state fixtures for the TestSprite TC scripts
+
+Most scenarios begin by driving the login form with the same credentials.
+This module logs in once per role, saves Playwright's ``storage_state``
+(Supabase auth cookies, super-admin localStorage session) under
+``tmp/auth/<role>.json``, and creates new contexts from it, so dependent
+scenarios start already signed in.
+
+Roles:
+    customer  Store account at /login (credentials from tmp/config.json)
+    admin     Super-admin panel at /admin/login
+
+Credentials can be overridden with TESTSPRITE_<ROLE>_USER and
+TESTSPRITE_<ROLE>_PASSWORD; the admin role has no default and requires them.
+Saved states are reused until they are older than STATE_MAX_AGE_S, or
+immediately refreshed with TESTSPRITE_REFRESH_AUTH=1.
+"""
+
+import os
+import json
+import time
+import asyncio
+from pathlib import Path
+
+TESTS_DIR = Path(__file__).resolve().parent
+CONFIG_FILE = TESTS_DIR / "tmp" / "config.json"
+STATE_DIR = TESTS_DIR / "tmp" / "auth"
+
+DEFAULT_BASE_URL = "http://localhost:3000"
+
+# Supabase access tokens expire after an hour; refresh before that
+STATE_MAX_AGE_S = 50 * 60
+LOGIN_TIMEOUT_MS = 30000
+
+ROLES = {
+    "customer": {
+        "login_path": "/login",
+        "user_field": 'input[type="email"]',
+        "password_field": 'input[type="password"]',
+        "landing_url": "**/dashboard**",
+    },
+    "admin": {
+        "login_path": "/admin/login",
+        "user_field": 'input[type="text"]',
+        "password_field": 'input[type="password"]',
+        "landing_url": "**/admin/dashboard**",
+    },
+}
+
+_locks = {}
+_logged_in = set()
+
+
+def load_config() -> dict:
+    try:
+        return json.loads(CONFIG_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def base_url() -> str:
+    url = os.environ.get("TESTSPRITE_BASE_URL") or load_config().get("localEndpoint") or DEFAULT_BASE_URL
+    return url.rstrip("/")
+
+
+def credentials(role: str) -> tuple:
+    """Return (user, password) for a role, from the environment or tmp/config.json."""
+    prefix = f"TESTSPRITE_{role.upper()}"
+    user = os.environ.get(f"{prefix}_USER")
+    password = os.environ.get(f"{prefix}_PASSWORD")
+    if role == "customer":
+        config = load_config()
+        user = user or config.get("loginUser")
+        password = password or config.get("loginPassword")
+    if not user or not password:
+        raise RuntimeError(f"No credentials for role '{role}': set {prefix}_USER and {prefix}_PASSWORD")
+    return user, password
+
+
+def state_path(role: str) -> Path:
+    return STATE_DIR / f"{role}.json"
+
+
+def refresh_requested() -> bool:
+    return os.environ.get("TESTSPRITE_REFRESH_AUTH", "").lower() in ("1", "true", "yes")
+
+
+def is_fresh(path: Path) -> bool:
+    try:
+        return time.time() - path.stat().st_mtime < STATE_MAX_AGE_S
+    except OSError:
+        return False
+
+
+async def log_in(browser, role: str, path: Path):
+    """Drive the role's login form once and save the resulting storage state."""
+    spec = ROLES[role]
+    user, password = credentials(role)
+    context = await browser.new_context()
+    try:
+        page = await context.new_page()
+        await page.goto(base_url() + spec["login_path"], wait_until="domcontentloaded")
+        await page.locator(spec["user_field"]).first.fill(user)
+        await page.locator(spec["password_field"]).first.fill(password)
+        await page.locator('button[type="submit"]').first.click()
+        await page.wait_for_url(spec["landing_url"], timeout=LOGIN_TIMEOUT_MS)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        await context.storage_state(path=str(path))
+    finally:
+        await context.close()
+
+
+async def ensure_storage_state(browser, role: str) -> Path:
+    """Return a fresh storage-state file for role, logging in only if needed."""
+    if role not in ROLES:
+        raise ValueError(f"Unknown role '{role}' (expected one of: {', '.join(ROLES)})")
+    # One login per role even when many scenarios start concurrently
+    lock = _locks.setdefault(role, asyncio.Lock())
+    async with lock:
+        path = state_path(role)
+        forced = refresh_requested() and role not in _logged_in
+        if forced or not is_fresh(path):
+            await log_in(browser, role, path)
+            _logged_in.add(role)
+        return path
+
+
+async def new_authenticated_context(browser, role: str, **kwargs):
+    """Create a BrowserContext that starts signed in as role."""
+    path = await ensure_storage_state(browser, role)
+    return await browser.new_context(storage_state=str(path), **kwargs)
@@ -0,0 +1,146 @@
+"""
+Locator registry for the TestSprite TC scripts
+
+Maps semantic names to selectors anchored on stable attributes (input types,
+link targets, ARIA roles and accessible names) instead of the absolute XPaths
+TestSprite records, such as
+``xpath=html/body/div[2]/div[2]/div[2]/div/form/div[1]/div/input``.
+Those XPaths walk the whole DOM from <body> on every evaluation and break when
+a wrapper div is added or the user reorders the sidebar.
+
+Usage in a TC script:
+
+    from locators import locate
+    elem = locate(frame, "login.email").nth(0)
+
+LEGACY_XPATHS records which recorded XPath each name replaces; it drives
+migrate_locators.py. When a new TC script introduces an unmapped XPath, add
+a name here (preferring a data-testid once the component has one) and re-run
+the migration.
+"""
+
+LOCATORS = {
+    # Login (/login)
+    "login.email": 'form input[type="email"]',
+    "login.password": 'form input[type="password"]',
+    "login.submit": 'form button[type="submit"]',
+    "login.forgot_password": 'a[href="/recuperar-senha"]',
+    "login.register": 'a[href="/registro"]',
+
+    # Registration (/registro)
+    "register.business_name": 'form input[type="text"]',
+    "register.email": 'form input[type="email"]',
+    "register.password": 'form input[type="password"] >> nth=0',
+    "register.confirm_password": 'form input[type="password"] >> nth=1',
+    "register.submit": 'form button[type="submit"]',
+
+    # Password recovery (/recuperar-senha)
+    "recover.email": 'form input[type="email"]',
+    "recover.submit": 'form button[type="submit"]',
+
+    # Super-admin login (/admin/login)
+    "admin_login.username": 'form input[type="text"]',
+    "admin_login.password": 'form input[type="password"]',
+
+    # Sidebar; links are matched by route because the order is user-configurable
+    "sidebar.collapse": 'aside button[aria-label$="sidebar"]',
+    "sidebar.settings": 'aside a[href="/configuracoes"]',
+    "nav.dashboard": 'aside nav a[href="/dashboard"]',
+    "nav.products": 'aside nav a[href="/produtos"]',
+    "nav.categories": 'aside nav a[href="/categorias"]',
+    "nav.orders": 'aside nav a[href="/pedidos"]',
+    "nav.employees": 'aside nav a[href="/funcionarios"]',
+    "nav.subscription": 'aside nav a[href="/assinatura"]',
+    "nav.cash_flow": 'aside nav a[href="/fluxo-caixa"]',
+
+    # Orders (/pedidos)
+    "orders.new": 'main a[href="/pedidos/novo"] button',
+
+    # New order (/pedidos/novo)
+    "new_order.customer_name": 'main input[placeholder="Nome"]',
+    "new_order.customer_phone": 'main input[placeholder="(00) 00000-0000"]',
+    "new_order.delivery": 'main >> role=button[name="Entrega"]',
+    "new_order.payment_pix": 'main >> role=button[name="PIX"]',
+    "new_order.submit": 'main >> role=button[name="Criar Pedido"]',
+
+    # Create/edit modals (categories, products, employees)
+    "modal.cancel": 'main >> role=button[name="Cancelar" s]',
+    "category_form.submit": 'main >> role=button[name="Criar" s]',
+    "product_form.description": 'main textarea',
+    "product_form.submit": 'main >> role=button[name="Criar Produto"]',
+    "employee_form.save": 'main >> role=button[name="Salvar" s]',
+
+    # Settings (/configuracoes)
+    "settings.tab_general": 'main >> role=button[name="Geral" s]',
+    "settings.tab_appearance": 'main >> role=button[name="Aparência"]',
+    "settings.tab_online_menu": 'main >> role=button[name="Cardápio Online"]',
+    "settings.tab_shortcuts": 'main >> role=button[name="Atalhos"]',
+    "settings.tab_access_links": 'main >> role=button[name="Links de Acesso"]',
+    "settings.tab_account": 'main >> role=button[name="Conta" s]',
+}
+
+LEGACY_XPATHS = {
+    "html/body/div[2]/div[2]/div[2]/div/form/div[1]/div/input": "login.email",
+    "html/body/div[2]/div[2]/div[2]/div/form/div[2]/div/input": "login.password",
+    "html/body/div[2]/div[2]/div[2]/div/form/button": "login.submit",
+    "html/body/div[2]/div[2]/div[2]/div/form/div[3]/a": "login.forgot_password",
+    "html/body/div[2]/div[2]/div[2]/div/p/a": "login.register",
+
+    "html/body/div[2]/div[2]/div[1]/div/form/div[1]/div/input": "register.business_name",
+    "html/body/div[2]/div[2]/div[1]/div/form/div[2]/div/input": "register.email",
+    "html/body/div[2]/div[2]/div[1]/div/form/div[3]/div/input": "register.password",
+    "html/body/div[2]/div[2]/div[1]/div/form/div[4]/div/input": "register.confirm_password",
+    "html/body/div[2]/div[2]/div[1]/div/form/button": "register.submit",
+
+    "html/body/div[2]/div[2]/div/form/div/div/input": "recover.email",
+    "html/body/div[2]/div[2]/div/form/button": "recover.submit",
+
+    "html/body/div[2]/div[2]/div[1]/form/div[1]/div/input": "admin_login.username",
+    "html/body/div[2]/div[2]/div[1]/form/div[2]/div/input": "admin_login.password",
+
+    "html/body/div[2]/aside/button": "sidebar.collapse",
+    "html/body/div[2]/aside/div[2]/a": "sidebar.settings",
+    "html/body/div[2]/aside/nav/a[1]": "nav.dashboard",
+    "html/body/div[2]/aside/nav/a[2]": "nav.products",
+    "html/body/div[2]/aside/nav/a[4]": "nav.categories",
+    "html/body/div[2]/aside/nav/a[5]": "nav.orders",
+    "html/body/div[2]/aside/nav/a[10]": "nav.employees",
+    "html/body/div[2]/aside/nav/a[11]": "nav.subscription",
+    "html/body/div[2]/aside/nav/a[16]": "nav.cash_flow",
+
+    "html/body/div[2]/main/div/div[1]/a/button": "orders.new",
+    "html/body/div[2]/main/div/div[4]/div[1]/div[2]/a/button": "orders.new",
+
+    "html/body/div[2]/main/div/div[2]/div[2]/div/div[3]/div[1]/div/input": "new_order.customer_name",
+    "html/body/div[2]/main/div/div[2]/div[2]/div/div[3]/div[2]/div/input": "new_order.customer_phone",
+    "html/body/div[2]/main/div/div[2]/div[2]/div/div[3]/div[3]/button[2]": "new_order.delivery",
+    "html/body/div[2]/main/div/div[2]/div[2]/div/div[5]/div/button[2]": "new_order.payment_pix",
+    "html/body/div[2]/main/div/div[2]/div[2]/div/button": "new_order.submit",
+
+    "html/body/div[2]/main/div/div[6]/div/div[2]/button[1]": "modal.cancel",
+    "html/body/div[2]/main/div/div[4]/div/div[6]/button[1]": "modal.cancel",
+    "html/body/div[2]/main/div/div[5]/div/div[2]/button[2]": "category_form.submit",
+    "html/body/div[2]/main/div/div[6]/div/div[1]/div[4]/textarea": "product_form.description",
+    "html/body/div[2]/main/div/div[6]/div/div[2]/button[2]": "product_form.submit",
+    "html/body/div[2]/main/div/div[4]/div/div[6]/button[2]": "employee_form.save",
+
+    "html/body/div[2]/main/div/div[2]/div[1]/button[1]": "settings.tab_general",
+    "html/body/div[2]/main/div/div[2]/div[1]/button[2]": "settings.tab_appearance",
+    "html/body/div[2]/main/div/div[2]/div[1]/button[3]": "settings.tab_online_menu",
+    "html/body/div[2]/main/div/div[2]/div[1]/button[7]": "settings.tab_shortcuts",
+    "html/body/div[2]/main/div/div[2]/div[1]/button[8]": "settings.tab_access_links",
+    "html/body/div[2]/main/div/div[2]/div[1]/button[9]": "settings.tab_account",
+}
+
+
+def selector(name: str) -> str:
+    """Return the registered selector for name; unknown names fail immediately."""
+    try:
+        return LOCATORS[name]
+    except KeyError:
+        raise KeyError(f"Unknown locator '{name}' (add it to testsprite_tests/locators.py)") from None
+
+
+def locate(frame, name: str):
+    """Resolve a semantic locator name against a page or frame."""
+    return frame.locator(selector(name))
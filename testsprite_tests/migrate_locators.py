@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Migrate absolute XPaths in the TC scripts onto the locator registry
+
+    elem = frame.locator('xpath=html/body/div[2]/aside/nav/a[5]').nth(0)
+becomes
+    elem = locate(frame, "nav.orders").nth(0)
+
+XPaths without an entry in locators.LEGACY_XPATHS are left as they are and
+listed in the report (most used first), so the registry can be extended.
+The migration is idempotent. For freshly regenerated scripts, run it after
+rewrite_waits.py and rewrite_auth.py, which match on the recorded XPaths.
+
+Usage:
+    python testsprite_tests/migrate_locators.py            # Rewrite all TC scripts
+    python testsprite_tests/migrate_locators.py --check    # Report only
+"""
+
+import re
+import argparse
+from pathlib import Path
+from collections import Counter
+
+from locators import LEGACY_XPATHS, LOCATORS
+
+TESTS_DIR = Path(__file__).resolve().parent
+
+IMPORT_ANCHOR = "from playwright import async_api\n"
+IMPORT_LINE = "from locators import locate\n"
+
+XPATH_LOCATOR_PATTERN = re.compile(r"(\w+)\.locator\('xpath=([^']+)'\)")
+
+
+def migrate_source(source: str, unmapped: Counter):
+    """Return (new_source, number_of_locators_migrated); unmapped XPaths are counted."""
+    migrated = 0
+
+    def replace(match: re.Match) -> str:
+        nonlocal migrated
+        target, xpath = match.groups()
+        name = LEGACY_XPATHS.get(xpath)
+        if name is None:
+            unmapped[xpath] += 1
+            return match.group(0)
+        migrated += 1
+        return f'locate({target}, "{name}")'
+
+    source = XPATH_LOCATOR_PATTERN.sub(replace, source)
+    if migrated and IMPORT_LINE not in source and IMPORT_ANCHOR in source:
+        source = source.replace(IMPORT_ANCHOR, IMPORT_ANCHOR + IMPORT_LINE, 1)
+    return source, migrated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replace absolute XPaths in TC scripts with registry locators")
+    parser.add_argument("files", nargs="*", help="TC scripts to migrate (default: all)")
+    parser.add_argument("--check", action="store_true", help="Report without writing")
+    args = parser.parse_args()
+
+    # Catch registry typos before touching any script
+    missing = sorted(set(LEGACY_XPATHS.values()) - set(LOCATORS))
+    if missing:
+        raise SystemExit(f"LEGACY_XPATHS refers to unknown locators: {', '.join(missing)}")
+
+    files = [Path(f) for f in args.files] or sorted(TESTS_DIR.glob("TC[0-9][0-9][0-9]_*.py"))
+    unmapped = Counter()
+    total = 0
+    for path in files:
+        source = path.read_text(encoding="utf-8")
+        new_source, migrated = migrate_source(source, unmapped)
+        if not migrated:
+            continue
+        total += migrated
+        print(f"{path.name}: {migrated} locator(s) {'mappable' if args.check else 'migrated'}")
+        if not args.check:
+            path.write_text(new_source, encoding="utf-8")
+
+    print(f"\nTotal: {total} locator(s) {'mappable' if args.check else 'migrated'}, "
+          f"{sum(unmapped.values())} left as XPath ({len(unmapped)} unique)")
+    if unmapped:
+        print("\nUnmapped XPaths (add to locators.py):")
+        for xpath, count in unmapped.most_common():
+            print(f"  {count:3d}  {xpath}")
+
+
+if __name__ == "__main__":
+    main()
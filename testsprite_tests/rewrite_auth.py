@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Start dependent TC scenarios from a saved login instead of the login form
+
+For scripts whose first interaction after opening the app is signing in with
+the configured test account (and which go on to test something else), this
+pass removes the login-form steps and creates the context with
+``auth_state.new_authenticated_context`` so the scenario starts signed in.
+Wait helpers that were only used by the removed steps are dropped from the
+``from waits import ...`` line.
+
+Scenarios that test authentication itself are left alone: the login must be
+the first step after the initial navigation and must be followed by further
+steps, so TC003/TC004 (login is the whole test), registration and password
+recovery flows, and TC006 (navigates to /admin first) are not rewritten.
+
+Usage:
+    python testsprite_tests/rewrite_auth.py            # Rewrite eligible TC scripts
+    python testsprite_tests/rewrite_auth.py --check    # List eligible scripts only
+"""
+
+import re
+import sys
+import argparse
+from pathlib import Path
+
+from auth_state import load_config
+from rewrite_waits import sync_waits_import
+
+TESTS_DIR = Path(__file__).resolve().parent
+
+IMPORT_ANCHOR = "from playwright import async_api\n"
+IMPORT_LINE = "from auth_state import new_authenticated_context\n"
+
+CONTEXT_LINE = "context = await browser.new_context()"
+INTERACTION_MARKER = "# Interact with the page elements to simulate user flow"
+
+XPATH_PATTERN = re.compile(r"locator\('xpath=([^']+)'\)")
+STEP_LINE_PATTERN = re.compile(
+    r"^\s*(#.*|frame = context\.pages\[-1\]|elem = frame\.locator\(.*\)\.nth\(\d+\)|await .*elem\.(fill|click)\(.*)$"
+)
+
+
+def split_blocks(text: str) -> tuple:
+    """Split a script section into step blocks and the blank-line separators between them."""
+    parts = re.split(r'(\n[ \t]*\n)', text)
+    return parts[0::2], parts[1::2] + [""]
+
+
+def is_step_block(block: str) -> bool:
+    lines = [l for l in block.splitlines() if l.strip()]
+    return bool(lines) and all(STEP_LINE_PATTERN.match(l) for l in lines)
+
+
+def form_prefix(block: str):
+    match = XPATH_PATTERN.search(block)
+    if not match or "/form" not in match.group(1):
+        return None
+    xpath = match.group(1)
+    return xpath[:xpath.index("/form") + len("/form")]
+
+
+def find_login_blocks(blocks: list, user: str, password: str):
+    """
+    Return (start, end) of the login-form blocks that directly follow the
+    initial navigation block, or None if the script does not start that way.
+    """
+    # blocks[0] is the "Navigate to <base url>" step
+    if len(blocks) < 2 or "page.goto(" not in blocks[0]:
+        return None
+    first = blocks[1]
+    if not is_step_block(first) or f".fill('{user}')" not in first:
+        return None
+    prefix = form_prefix(first)
+    if not prefix:
+        return None
+
+    end = 1
+    while end < len(blocks) and is_step_block(blocks[end]):
+        xpaths = XPATH_PATTERN.findall(blocks[end])
+        if not xpaths or not all(x.startswith(prefix) for x in xpaths):
+            break
+        end += 1
+
+    login = "\n".join(blocks[1:end])
+    if f".fill('{password}')" not in login or ".click(" not in login:
+        return None
+    # The scenario must continue after logging in
+    remaining = "\n".join(blocks[end:])
+    if "elem." not in remaining and "page.goto(" not in remaining:
+        return None
+    return 1, end
+
+
+def rewrite_source(source: str, user: str, password: str, role: str = "customer"):
+    """Return the rewritten source, or None if the script is not eligible."""
+    if IMPORT_LINE in source or INTERACTION_MARKER not in source or CONTEXT_LINE not in source:
+        return None
+    head, body = source.split(INTERACTION_MARKER, 1)
+    head += INTERACTION_MARKER
+
+    blocks, separators = split_blocks(body.lstrip("\n"))
+    span = find_login_blocks(blocks, user, password)
+    if span is None:
+        return None
+    start, end = span
+
+    indent = re.match(r'\s*', blocks[start]).group(0)
+    note = f"{indent}# -> Already signed in as {role} (storage state from auth_state.py)"
+    blocks = blocks[:start] + [note] + blocks[end:]
+    separators = separators[:start] + separators[end - 1:]
+
+    head = head.replace(CONTEXT_LINE, f'context = await new_authenticated_context(browser, "{role}")', 1)
+    head = head.replace(IMPORT_ANCHOR, IMPORT_ANCHOR + IMPORT_LINE, 1)
+    return sync_waits_import(head + "\n" + "".join(b + sep for b, sep in zip(blocks, separators)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reuse saved login state in dependent TC scripts")
+    parser.add_argument("files", nargs="*", help="TC scripts to rewrite (default: all)")
+    parser.add_argument("--check", action="store_true", help="List eligible scripts without writing")
+    args = parser.parse_args()
+
+    config = load_config()
+    user, password = config.get("loginUser"), config.get("loginPassword")
+    if not user or not password:
+        print("tmp/config.json has no loginUser/loginPassword; nothing to rewrite.")
+        sys.exit(1)
+
+    files = [Path(f) for f in args.files] or sorted(TESTS_DIR.glob("TC[0-9][0-9][0-9]_*.py"))
+    rewritten = 0
+    for path in files:
+        new_source = rewrite_source(path.read_text(encoding="utf-8"), user, password)
+        if new_source is None:
+            continue
+        rewritten += 1
+        print(f"{path.name}: login steps {'removable' if args.check else 'replaced with saved state'}")
+        if not args.check:
+            path.write_text(new_source, encoding="utf-8")
+
+    print(f"\n{rewritten} of {len(files)} script(s) {'eligible' if args.check else 'rewritten'}")
+
+
+if __name__ == "__main__":
+    main()
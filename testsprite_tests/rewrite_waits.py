@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Rewrite fixed sleeps in the TC scripts into event-driven waits (see waits.py)
+
+    await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+becomes
+    await before_action(frame, elem); await elem.click(timeout=5000); await after_action(frame)
+
+and the trailing ``await asyncio.sleep(5)`` becomes ``await settle(page)``.
+The ``from waits import ...`` line names only the helpers a script calls.
+The rewrite is idempotent, so it can be re-run after TestSprite regenerates
+the scripts.
+
+Usage:
+    python testsprite_tests/rewrite_waits.py            # Rewrite all TC scripts
+    python testsprite_tests/rewrite_waits.py --check    # Report only, exit 1 if sleeps or stale imports remain
+"""
+
+import re
+import sys
+import argparse
+from pathlib import Path
+
+TESTS_DIR = Path(__file__).resolve().parent
+
+IMPORT_ANCHOR = "from playwright import async_api\n"
+IMPORT_PATTERN = re.compile(r'^from waits import [^\n]*\n', re.MULTILINE)
+WAIT_HELPERS = ("before_action", "after_action", "settle")
+
+STEP_PATTERN = re.compile(
+    r'await page\.wait_for_timeout\(\d+\);\s*await (elem)\.(click|fill)\((.*)\)$',
+    re.MULTILINE
+)
+SETTLE_PATTERN = re.compile(r'^(\s*)await asyncio\.sleep\(\d+(?:\.\d+)?\)$', re.MULTILINE)
+
+
+def rewrite_step(match: re.Match) -> str:
+    elem, action, args = match.groups()
+    line = f"await before_action(frame, {elem}); await {elem}.{action}({args})"
+    if action == "click":
+        line += "; await after_action(frame)"
+    return line
+
+
+def sync_waits_import(source: str) -> str:
+    """Import exactly the waits helpers the script calls (also after other rewriters removed steps)."""
+    body = IMPORT_PATTERN.sub("", source, count=1)
+    used = [name for name in WAIT_HELPERS if re.search(rf'\b{name}\(', body)]
+    line = f"from waits import {', '.join(used)}\n" if used else ""
+    if IMPORT_PATTERN.search(source):
+        return IMPORT_PATTERN.sub(lambda _: line, source, count=1)
+    if used and IMPORT_ANCHOR in source:
+        return source.replace(IMPORT_ANCHOR, IMPORT_ANCHOR + line, 1)
+    return source
+
+
+def rewrite_source(source: str):
+    """Return (new_source, number_of_sleeps_replaced)."""
+    source, steps = STEP_PATTERN.subn(rewrite_step, source)
+    source, settles = SETTLE_PATTERN.subn(r'\1await settle(page)', source)
+    return sync_waits_import(source), steps + settles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replace fixed sleeps in TC scripts with event-driven waits")
+    parser.add_argument("files", nargs="*", help="TC scripts to rewrite (default: all)")
+    parser.add_argument("--check", action="store_true", help="Report remaining sleeps without writing")
+    args = parser.parse_args()
+
+    files = [Path(f) for f in args.files] or sorted(TESTS_DIR.glob("TC[0-9][0-9][0-9]_*.py"))
+    total = 0
+    stale = 0
+    for path in files:
+        source = path.read_text(encoding="utf-8")
+        new_source, count = rewrite_source(source)
+        if new_source == source:
+            continue
+        total += count
+        if count:
+            print(f"{path.name}: {count} fixed sleep(s){'' if args.check else ' replaced'}")
+        else:
+            stale += 1
+            print(f"{path.name}: waits import {'out of date' if args.check else 'updated'}")
+        if not args.check:
+            path.write_text(new_source, encoding="utf-8")
+
+    print(f"\nTotal: {total} fixed sleep(s) {'found' if args.check else 'replaced'} in {len(files)} file(s)")
+    sys.exit(1 if args.check and (total or stale) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+TestSprite Suite Runner - run the TC scripts against a shared browser pool
+
+Each generated TC script launches its own Chromium, which makes browser cold
+starts dominate the suite's runtime. This runner launches one browser (or a
+small pool) up front, loads every TC script without executing its module-level
+``asyncio.run(run_test())``, and hands each test case an isolated
+BrowserContext from the pool. Test cases run concurrently under asyncio.
+
+The TC scripts stay untouched and runnable on their own: the runner swaps the
+script's ``async_api`` global for a shim whose ``launch()`` returns the shared
+browser and whose ``close()``/``stop()`` calls are no-ops.
+
+Usage:
+    python testsprite_tests/suite_runner.py                     # All TC scripts
+    python testsprite_tests/suite_runner.py TC003 TC004         # Selected IDs
+    python testsprite_tests/suite_runner.py --concurrency 6 --browsers 2
+    python testsprite_tests/suite_runner.py TC009 --headed --slow   # Debug one case
+
+Results:
+    Per-test status and timing are merged into tmp/test_results.json under
+    the "localRun" key of the matching entry.
+"""
+
+import os
+import ast
+import sys
+import json
+import time
+import types
+import asyncio
+import argparse
+from pathlib import Path
+from datetime import datetime, timezone
+
+TESTS_DIR = Path(__file__).resolve().parent
+RESULTS_FILE = TESTS_DIR / "tmp" / "test_results.json"
+
+LAUNCH_ARGS = [
+    "--window-size=1280,720",
+    "--disable-dev-shm-usage",
+]
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_TIMEOUT = 180
+
+
+class BrowserPool:
+    """A fixed set of browsers handed out round-robin to test cases."""
+
+    def __init__(self, size: int = 1, headless: bool = True):
+        self.size = max(1, size)
+        self.headless = headless
+        self.playwright = None
+        self.browsers = []
+        self._next = 0
+
+    async def start(self):
+        from playwright.async_api import async_playwright
+        self.playwright = await async_playwright().start()
+        self.browsers = await asyncio.gather(*[
+            self.playwright.chromium.launch(headless=self.headless, args=LAUNCH_ARGS)
+            for _ in range(self.size)
+        ])
+        return self
+
+    def acquire(self):
+        browser = self.browsers[self._next % len(self.browsers)]
+        self._next += 1
+        return browser
+
+    async def stop(self):
+        for browser in self.browsers:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        if self.playwright:
+            await self.playwright.stop()
+
+
+class _SharedBrowser:
+    """Browser facade given to a TC script: contexts are real, close() is a no-op."""
+
+    def __init__(self, browser, context_options: dict):
+        self._browser = browser
+        self._context_options = context_options
+        self.contexts = []
+
+    async def new_context(self, **kwargs):
+        context = await self._browser.new_context(**{**self._context_options, **kwargs})
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        pass
+
+    async def release(self):
+        """Close every context the test case opened, even if the script did not."""
+        for context in self.contexts:
+            try:
+                await context.close()
+            except Exception:
+                pass
+
+    def __getattr__(self, name):
+        return getattr(self._browser, name)
+
+
+class _SharedPlaywright:
+    def __init__(self, shared_browser: _SharedBrowser):
+        self.chromium = types.SimpleNamespace(launch=self._launch)
+        self._shared_browser = shared_browser
+
+    async def _launch(self, *args, **kwargs):
+        return self._shared_browser
+
+    async def start(self):
+        return self
+
+    async def stop(self):
+        pass
+
+
+def make_async_api_shim(shared_browser: _SharedBrowser):
+    """Return a stand-in for ``playwright.async_api`` bound to a shared browser."""
+    from playwright import async_api
+
+    shim = types.ModuleType("async_api")
+    shim.__getattr__ = lambda name: getattr(async_api, name)
+    shim.async_playwright = lambda: _SharedPlaywright(shared_browser)
+    return shim
+
+
+def is_entrypoint_call(node: ast.stmt) -> bool:
+    """Match the module-level ``asyncio.run(run_test())`` statement."""
+    if not isinstance(node, ast.Expr) or not isinstance(node.value, ast.Call):
+        return False
+    func = node.value.func
+    return isinstance(func, ast.Attribute) and func.attr == "run"
+
+
+def load_test_case(path: Path) -> dict:
+    """Execute a TC script's definitions and return its globals, without running it."""
+    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    tree.body = [node for node in tree.body if not is_entrypoint_call(node)]
+    namespace = {"__name__": f"testsprite_{path.stem}", "__file__": str(path)}
+    exec(compile(tree, str(path), "exec"), namespace)
+    if "run_test" not in namespace:
+        raise ValueError(f"{path.name} does not define run_test()")
+    return namespace
+
+
+def discover_tests(selected: list) -> list:
+    tests = sorted(TESTS_DIR.glob("TC[0-9][0-9][0-9]_*.py"))
+    if selected:
+        prefixes = tuple(s.upper() for s in selected)
+        tests = [t for t in tests if t.name.upper().startswith(prefixes)]
+    return tests
+
+
+async def run_test_case(path: Path, pool: BrowserPool, semaphore: asyncio.Semaphore,
+                        timeout: float, context_options: dict) -> dict:
+    async with semaphore:
+        from playwright.async_api import expect
+
+        result = {"id": path.name[:5], "file": path.name, "status": "PASSED", "error": None}
+        shared_browser = _SharedBrowser(pool.acquire(), context_options)
+        started = time.perf_counter()
+        result["startedAt"] = datetime.now(timezone.utc).isoformat()
+        try:
+            namespace = load_test_case(path)
+            namespace["async_api"] = make_async_api_shim(shared_browser)
+            # Some generated scripts use expect() without importing it
+            namespace.setdefault("expect", expect)
+            await asyncio.wait_for(namespace["run_test"](), timeout=timeout)
+        except asyncio.TimeoutError:
+            result["status"] = "FAILED"
+            result["error"] = f"Timeout after {timeout:.0f}s"
+        except Exception as e:
+            result["status"] = "FAILED"
+            result["error"] = f"{type(e).__name__}: {str(e)[:500]}"
+        finally:
+            await shared_browser.release()
+            result["durationMs"] = round((time.perf_counter() - started) * 1000)
+
+        mark = "PASS" if result["status"] == "PASSED" else "FAIL"
+        print(f"[{mark}] {result['file']} ({result['durationMs'] / 1000:.1f}s)", flush=True)
+        return result
+
+
+async def run_suite(tests: list, concurrency: int, browsers: int, timeout: float,
+                    headless: bool = True, context_options: dict = None) -> list:
+    pool = await BrowserPool(browsers, headless).start()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    try:
+        return await asyncio.gather(*[
+            run_test_case(path, pool, semaphore, timeout, context_options or {})
+            for path in tests
+        ])
+    finally:
+        await pool.stop()
+
+
+def merge_results(results: list, wall_ms: int):
+    """Store per-test timing in tmp/test_results.json, matched by TC id."""
+    try:
+        entries = json.loads(RESULTS_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        entries = []
+
+    by_id = {e.get("title", "")[:5]: e for e in entries if isinstance(e, dict)}
+    finished_at = datetime.now(timezone.utc).isoformat()
+    for result in results:
+        local_run = {
+            "status": result["status"],
+            "durationMs": result["durationMs"],
+            "startedAt": result["startedAt"],
+            "finishedAt": finished_at,
+            "suiteWallMs": wall_ms,
+            "error": result["error"],
+        }
+        entry = by_id.get(result["id"])
+        if entry is None:
+            stem = Path(result["file"]).stem
+            entry = {"title": f"{stem[:5]}-{stem[6:].replace('_', ' ')}"}
+            entries.append(entry)
+            by_id[result["id"]] = entry
+        entry["localRun"] = local_run
+
+    RESULTS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    RESULTS_FILE.write_text(json.dumps(entries, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run TestSprite TC scripts on a shared browser pool")
+    parser.add_argument("tests", nargs="*", help="TC ids or filename prefixes (default: all)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Max test cases running at once")
+    parser.add_argument("--browsers", type=int, default=1, help="Number of browsers in the pool")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Per-test timeout in seconds")
+    parser.add_argument("--headed", action="store_true", help="Show the browser windows")
+    parser.add_argument("--slow", action="store_true", help="Slow mode: restore fixed sleeps between steps (see waits.py)")
+    parser.add_argument("--refresh-auth", action="store_true", help="Log in again instead of reusing tmp/auth states (see auth_state.py)")
+    parser.add_argument("--no-save", action="store_true", help="Do not write tmp/test_results.json")
+    args = parser.parse_args()
+
+    tests = discover_tests(args.tests)
+    if not tests:
+        print("No matching TC scripts found.")
+        sys.exit(1)
+
+    # TC scripts import helper modules from this directory
+    sys.path.insert(0, str(TESTS_DIR))
+    if args.slow:
+        os.environ["TESTSPRITE_SLOW_MODE"] = "1"
+    if args.refresh_auth:
+        os.environ["TESTSPRITE_REFRESH_AUTH"] = "1"
+
+    print(f"Running {len(tests)} test case(s), concurrency={args.concurrency}, browsers={args.browsers}")
+    started = time.perf_counter()
+    results = asyncio.run(run_suite(tests, args.concurrency, args.browsers, args.timeout, not args.headed))
+    wall_ms = round((time.perf_counter() - started) * 1000)
+
+    if not args.no_save:
+        merge_results(results, wall_ms)
+
+    passed = sum(1 for r in results if r["status"] == "PASSED")
+    total_ms = sum(r["durationMs"] for r in results)
+    print(f"\n{passed}/{len(results)} passed in {wall_ms / 1000:.1f}s wall ({total_ms / 1000:.1f}s summed test time)")
+    sys.exit(0 if passed == len(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
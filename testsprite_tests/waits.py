@@ -0,0 +1,100 @@
+"""
+Event-driven waits for the TestSprite TC scripts
+
+The generated scripts paused ``page.wait_for_timeout(3000)`` before every
+fill/click and ``asyncio.sleep(5)`` at the end of each scenario. These helpers
+replace those fixed sleeps with waits on the thing the step actually needs:
+the target element becoming visible, or in-flight network requests settling
+after an action.
+
+Slow mode restores the original fixed pauses for debugging (watching a headed
+run, reproducing a timing-dependent failure):
+
+    TESTSPRITE_SLOW_MODE=1 python testsprite_tests/TC003_....py
+    python testsprite_tests/suite_runner.py --slow
+"""
+
+import os
+import asyncio
+
+from playwright.async_api import expect
+
+# Generous enough to cover the old 3 s sleep plus the 5 s action timeout
+ELEMENT_TIMEOUT_MS = 10000
+
+# Network is considered settled after this long with no requests in flight
+NETWORK_QUIET_MS = 500
+NETWORK_QUIET_TIMEOUT_MS = 5000
+
+SLOW_MODE_ACTION_DELAY_MS = 3000
+SLOW_MODE_SETTLE_DELAY_MS = 5000
+
+
+def slow_mode() -> bool:
+    """Global debugging switch: fall back to the original fixed sleeps."""
+    return os.environ.get("TESTSPRITE_SLOW_MODE", "").lower() in ("1", "true", "yes")
+
+
+async def wait_for_network_quiet(page, quiet_ms: int = NETWORK_QUIET_MS,
+                                 timeout_ms: int = NETWORK_QUIET_TIMEOUT_MS):
+    """
+    Wait until the page has had no requests in flight for quiet_ms.
+
+    Unlike wait_for_load_state("networkidle"), this also works after
+    client-side navigations and XHR/fetch calls triggered by a click.
+    Gives up silently after timeout_ms (long-polling or realtime traffic).
+    """
+    inflight = set()
+
+    def on_request(request):
+        inflight.add(request)
+
+    def on_done(request):
+        inflight.discard(request)
+
+    page.on("request", on_request)
+    page.on("requestfinished", on_done)
+    page.on("requestfailed", on_done)
+    try:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_ms / 1000
+        quiet_since = loop.time()
+        while loop.time() < deadline:
+            await asyncio.sleep(0.05)
+            if inflight:
+                quiet_since = loop.time()
+            elif loop.time() - quiet_since >= quiet_ms / 1000:
+                return
+    finally:
+        page.remove_listener("request", on_request)
+        page.remove_listener("requestfinished", on_done)
+        page.remove_listener("requestfailed", on_done)
+
+
+async def wait_for_api(page, url_part: str, timeout_ms: int = ELEMENT_TIMEOUT_MS):
+    """Wait for the next response whose URL contains url_part (e.g. "/rest/v1/orders")."""
+    return await page.wait_for_event(
+        "response", lambda response: url_part in response.url, timeout=timeout_ms
+    )
+
+
+async def before_action(page, elem, timeout_ms: int = ELEMENT_TIMEOUT_MS):
+    """Wait until the step's target element is visible."""
+    if slow_mode():
+        await page.wait_for_timeout(SLOW_MODE_ACTION_DELAY_MS)
+    await expect(elem).to_be_visible(timeout=timeout_ms)
+
+
+async def after_action(page):
+    """Let requests triggered by a click (navigation, form submit) settle."""
+    if slow_mode():
+        return
+    await wait_for_network_quiet(page)
+
+
+async def settle(page):
+    """End-of-scenario wait, replacing the trailing asyncio.sleep(5)."""
+    if slow_mode():
+        await page.wait_for_timeout(SLOW_MODE_SETTLE_DELAY_MS)
+        return
+    await wait_for_network_quiet(page)